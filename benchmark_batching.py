@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark for batched AI inference
+Compares images/second of stacked U2-Net background removal (one forward
+pass per batch, u2net.onnx + onnxruntime) against processing one image at
+a time. Recognition has no batch path and is not measured here.
+
+Usage:
+    python benchmark_batching.py [image ...] [--runs N]
+"""
+
+import os
+import sys
+
+from PIL import Image
+
+# Add the src path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.batched_inference import background_remover_batch, size_buckets, measure_throughput
+from src.utils.model_manager import ModelManager
+from src.utils.u2net_batch import U2NetBatchRemover
+
+
+def load_images(paths, count=16):
+    """Loads the benchmark images; without arguments, uses synthetic photos of mixed sizes"""
+    if paths:
+        return [Image.open(path).convert("RGB") for path in paths]
+    sizes = [(640, 480), (600, 450), (480, 640), (512, 512)]
+    return [Image.new("RGB", sizes[i % len(sizes)], (30 * i % 255, 120, 200)) for i in range(count)]
+
+
+def report(name, runner, images, runs):
+    """Prints the throughput of the batched and one-at-a-time paths"""
+    print(f"\n📊 {name}")
+    if not runner.is_batched:
+        # Without a batch API, the "batched" run would measure the same one-at-a-time path again
+        single = measure_throughput(runner.run, images, runs)
+        print(f"   One at a time: {single:8.2f} images/s")
+        print("   ⚠️ The model has no batch API: there is no batched path to compare")
+        return
+    stats = runner.compare_throughput(images, repeats=runs)
+    print(f"   One at a time: {stats['single_ips']:8.2f} images/s")
+    print(f"   Batched:       {stats['batched_ips']:8.2f} images/s (x{stats['speedup']:.2f})")
+
+
+def main():
+    args = sys.argv[1:]
+    runs = 1
+    if "--runs" in args:
+        position = args.index("--runs")
+        runs = int(args[position + 1])
+        del args[position:position + 2]
+
+    images = load_images(args)
+    buckets = size_buckets(images)
+    print("🔬 Batched inference vs one image at a time (CPU)")
+    print("=" * 60)
+    print(f"{len(images)} images in {len(buckets)} size buckets: "
+          + ", ".join(f"{w}x{h} ({len(items)})" for (w, h), items in sorted(buckets.items())))
+
+    try:
+        model_path = ModelManager().get_model_path("background_remover")
+        if not model_path:
+            raise FileNotFoundError("u2net.onnx is not downloaded")
+        remover = background_remover_batch(U2NetBatchRemover(model_path))
+        print(f"U2-Net batch size (from available memory): {remover.batch_size_for(remover.input_size)}")
+        report("Background removal (U2-Net)", remover, images, runs)
+    except Exception as e:
+        print(f"❌ Background removal: {e}")
+
+
+if __name__ == "__main__":
+    main()
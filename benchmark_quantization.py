@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the INT8 CPU mode
+Compares float32 and dynamically quantized models: latency, memory and output drift
+(caption match, CLIP score delta, upscale PSNR).
+
+Usage:
+    python benchmark_quantization.py [image ...] [--runs N]
+"""
+
+import copy
+import os
+import statistics
+import sys
+import time
+
+from PIL import Image
+
+# Add the src path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.model_manager import ModelManager
+from src.utils.model_residency import current_rss_bytes, estimate_footprint
+from src.utils.quantization import caption_similarity, clip_score, psnr
+
+
+def load_images(paths):
+    """Loads the benchmark images; without arguments, uses synthetic test images"""
+    if paths:
+        return [Image.open(path).convert("RGB") for path in paths]
+    images = []
+    for size, color in (((256, 256), (200, 80, 40)), ((320, 240), (40, 120, 200))):
+        image = Image.new("RGB", size, color)
+        image.paste((240, 240, 240), (size[0] // 4, size[1] // 4, size[0] // 2, size[1] // 2))
+        images.append(image)
+    return images
+
+
+def timed(func, runs):
+    """Runs func `runs` times; returns (last result, median seconds)"""
+    times = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times)
+
+
+def load_pair(manager, name, model_class):
+    """Loads the float32 model and its quantized copy; reports memory for both"""
+    rss_before = current_rss_bytes()
+    float_model = model_class()
+    rss_float = current_rss_bytes() - rss_before
+
+    start = time.perf_counter()
+    quantized_model = manager.quantize_model(name, copy.deepcopy(float_model), f"benchmark:{model_class.__name__}")
+    quantize_time = time.perf_counter() - start
+
+    report = manager.get_quantization_report().get(name, {})
+    print(f"\n📦 {name}")
+    print(f"   Load RSS (float32):   {rss_float / 1e6:8.1f} MB")
+    print(f"   Weights float32:      {estimate_footprint(float_model) / 1e6:8.1f} MB")
+    print(f"   Weights INT8:         {estimate_footprint(quantized_model) / 1e6:8.1f} MB")
+    print(f"   Quantization:         {quantize_time:8.2f} s "
+          f"({'from cache' if report.get('from_cache') else 'computed'})")
+    print(f"   Quantized modules:    {', '.join(report.get('modules', [])) or '-'}")
+    if report.get("skipped"):
+        print(f"   Kept in float32:      {', '.join(report['skipped'])} (few Linear layers)")
+    return float_model, quantized_model
+
+
+def benchmark_recognition(manager, images, runs):
+    """BLIP captions and CLIP embeddings: latency, caption match and CLIP score delta"""
+    from src.models.image_recognition import ImageRecognition
+
+    float_model, quantized_model = load_pair(manager, "Recognition", ImageRecognition)
+    for index, image in enumerate(images):
+        float_caption, float_time = timed(lambda: float_model.recognize(image), runs)
+        int8_caption, int8_time = timed(lambda: quantized_model.recognize(image), runs)
+        print(f"   Image {index + 1}: caption {float_time * 1000:7.1f} ms -> {int8_time * 1000:7.1f} ms "
+              f"(x{float_time / int8_time:.2f}), match {caption_similarity(float_caption, int8_caption):.2f}")
+
+        if hasattr(float_model, "get_image_embedding") and hasattr(float_model, "get_text_embedding"):
+            text = float_caption.splitlines()[0] if float_caption else "a photo"
+            float_score = clip_score(float_model.get_image_embedding(image), float_model.get_text_embedding(text))
+            int8_score = clip_score(quantized_model.get_image_embedding(image),
+                                    quantized_model.get_text_embedding(text))
+            print(f"            CLIP score {float_score:.4f} -> {int8_score:.4f} "
+                  f"(delta {int8_score - float_score:+.4f})")
+
+
+def benchmark_upscaler(manager, images, runs):
+    """Upscaler: latency and PSNR of the INT8 output against float32"""
+    from src.models.upscaler import ImageUpscaler
+
+    float_model, quantized_model = load_pair(manager, "Upscaler", ImageUpscaler)
+    for index, image in enumerate(images):
+        small = image.resize((128, 128))
+        float_result, float_time = timed(lambda: float_model.upscale(small), runs)
+        int8_result, int8_time = timed(lambda: quantized_model.upscale(small), runs)
+        value = psnr(float_result.convert("RGB"), int8_result.convert("RGB"))
+        print(f"   Image {index + 1}: upscale {float_time * 1000:7.1f} ms -> {int8_time * 1000:7.1f} ms "
+              f"(x{float_time / int8_time:.2f}), PSNR {value:.1f} dB")
+
+
+def main():
+    args = sys.argv[1:]
+    runs = 3
+    if "--runs" in args:
+        position = args.index("--runs")
+        runs = int(args[position + 1])
+        del args[position:position + 2]
+
+    print("🔬 INT8 dynamic quantization vs float32 (CPU)")
+    print("=" * 60)
+    manager = ModelManager()
+    images = load_images(args)
+    for benchmark in (benchmark_recognition, benchmark_upscaler):
+        try:
+            benchmark(manager, images, runs)
+        except Exception as e:
+            print(f"❌ {benchmark.__name__}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark for model weight loading
+Compares reading a whole checkpoint into memory with memory-mapped loading:
+load time, peak RSS during the load and RSS afterwards.
+
+Usage:
+    python benchmark_weight_loading.py [model_name | checkpoint.pth] [--size-mb N]
+"""
+
+import gc
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Add the src path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.model_manager import ModelManager
+from src.utils.weight_store import convert_checkpoint, load_weights, measure_load, save_weights
+
+
+def synthetic_checkpoint(folder, size_mb):
+    """Writes a synthetic checkpoint (torch if installed, otherwise .npz) of about size_mb"""
+    layers = {f"layer{i}.weight": np.random.default_rng(i).standard_normal((1024, 256), dtype=np.float32)
+              for i in range(max(1, size_mb))}
+    try:
+        import torch
+        path = os.path.join(folder, "synthetic.pth")
+        torch.save({name: torch.from_numpy(array) for name, array in layers.items()}, path)
+    except ImportError:
+        path = os.path.join(folder, "synthetic.npz")
+        np.savez(path, **layers)
+    return path
+
+
+def read_whole(path):
+    """The previous approach: the whole checkpoint is read into process memory"""
+    if path.endswith(".npz"):
+        with np.load(path) as archive:
+            return {name: archive[name] for name in archive.files}
+    import torch
+    return torch.load(path, map_location="cpu", weights_only=True)
+
+
+def touch_all(tensors):
+    """Reads every tensor once, as the first inference would"""
+    return sum(float(np.asarray(tensor).reshape(-1)[::4096].sum()) for tensor in tensors.values())
+
+
+def report(label, stats):
+    print(f"   {label:<22} {stats['seconds'] * 1000:9.1f} ms   "
+          f"peak +{stats['rss_peak_mb'] - stats['rss_before_mb']:8.1f} MB   "
+          f"after +{stats['rss_after_mb'] - stats['rss_before_mb']:8.1f} MB")
+
+
+def main():
+    args = sys.argv[1:]
+    size_mb = 256
+    if "--size-mb" in args:
+        position = args.index("--size-mb")
+        size_mb = int(args[position + 1])
+        del args[position:position + 2]
+
+    manager = ModelManager()
+    with tempfile.TemporaryDirectory() as folder:
+        source = args[0] if args else None
+        if source in manager.model_info:
+            source = manager.get_model_path(source)
+        if not source:
+            source = synthetic_checkpoint(folder, size_mb)
+
+        mapped = os.path.join(folder, "mapped." + ("weights" if manager.weights_format == "weights"
+                                                   else "safetensors"))
+        if source.endswith(".npz"):
+            save_weights(read_whole(source), mapped)
+        else:
+            convert_checkpoint(source, mapped)
+
+        print(f"🔬 Weight loading: {os.path.basename(source)} "
+              f"({os.path.getsize(source) / (1024 * 1024):.0f} MB)")
+        print("=" * 70)
+        as_torch = not source.endswith(".npz")
+        for label, load in (("Read whole checkpoint", lambda: read_whole(source)),
+                            ("Memory-mapped", lambda: load_weights(mapped, as_torch=as_torch))):
+            gc.collect()
+            stats = measure_load(load)
+            report(label, stats)
+            touched = measure_load(lambda: touch_all(stats["result"]))
+            report("  + first access", touched)
+            del stats, touched
+
+
+if __name__ == "__main__":
+    main()
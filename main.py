@@ -1,20 +1,35 @@
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 
 # Adaugă directorul src la Python path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from src.ui.main_window import PhotoEditorApp
-
 def main():
     """Punctul de intrare principal al aplicației."""
+    # Modul fără interfață: python main.py batch <intrări> --recipe ...
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from src.utils.batch_processor import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+    
+    from src.ui.main_window import PhotoEditorApp
     try:
         app = PhotoEditorApp()
+        # Măsurarea pornirii (profile_startup.py): prima fereastră, apoi ieșire
+        if os.environ.get("AI_PHOTO_EDITOR_STARTUP_PROBE"):
+            from src.utils.startup_profiler import report_first_window
+            report_first_window(app.root)
+            app.image_loader.shutdown()
+            app.ai_executor.shutdown()
+            app.root.destroy()
+            return
         app.run()
     except Exception as e:
         print(f"Eroare la pornirea aplicației: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Procesul AI (multiprocessing, spawn) pornește corect și din executabilul PyInstaller
+    multiprocessing.freeze_support()
     main()
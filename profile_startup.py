@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Startup profiler
+Imports the UI in a fresh interpreter with -X importtime and prints the most
+expensive imports, then (when a display is available) measures the time from
+launching main.py to the first window.
+
+Usage:
+    python profile_startup.py [--top N] [--output profile.json] [--no-window]
+"""
+
+import json
+import os
+import sys
+
+# Add the src path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.startup_profiler import measure_first_window, print_report, profile_imports
+
+
+def main():
+    args = sys.argv[1:]
+    top = 15
+    output = None
+    if "--top" in args:
+        top = int(args[args.index("--top") + 1])
+    if "--output" in args:
+        output = args[args.index("--output") + 1]
+
+    print("🔬 Startup profile: import src.ui.main_window")
+    print("=" * 70)
+    profile = profile_imports("src.ui.main_window")
+    print_report(profile, top)
+
+    window = None
+    if "--no-window" not in args:
+        window = measure_first_window()
+        print("=" * 70)
+        if window is None:
+            print("⚠️  First window not reached (no display?)")
+        else:
+            print(f"🪟 main.py -> first window: {window['seconds'] * 1000:.0f} ms "
+                  f"(heavy modules loaded: {', '.join(window['loaded']) or 'none'})")
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({"imports": profile, "first_window": window}, f, indent=2)
+        print(f"💾 Profile saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
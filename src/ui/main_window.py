@@ -5,18 +5,36 @@ from PIL import Image, ImageTk
 import threading
 from pathlib import Path
 import os
-import numpy as np
 import pickle
 import gzip
 from enum import Enum
 from abc import ABC, abstractmethod
 import time
+import functools
+import hashlib
+import importlib.util
 
-from ..models.upscaler import ImageUpscaler
-from ..models.background_remover import BackgroundRemover
-from ..models.generative_fill import GenerativeFill
-from ..models.image_recognition import ImageRecognition
 from ..utils.image_processor import ImageProcessor
+from ..utils.processing_backend import apply_chain, load_backend_profile
+from ..utils.lazy_imports import lazy_import
+from ..utils.lazy_models import LazyModel, ModelWarmup
+from ..utils.model_manager import MODEL_WEIGHTS, ModelManager, worker_model_options
+from ..utils.image_loader import ProgressiveImageLoader
+from ..utils.lossless_transform import export_lossless_jpeg
+from ..utils.tiled_document import STRIP_EXPORT_FORMATS, TILE_OPERATIONS, TiledPipeline, is_large_image
+from ..utils.result_cache import ResultCache, image_content_hash, encode_png, decode_image
+from ..utils.recognition_cache import RecognitionCache
+from ..utils.embedding_index import EmbeddingIndex, FolderIndexer, embed_images, embed_text
+from ..utils.ai_jobs import AIJob, AIJobExecutor, JobPriority
+from ..utils.progress import ProgressReporter, TkProgressBridge, accepts_keyword
+from ..utils.batched_inference import background_remover_batch
+from ..utils.ai_worker import AIWorker
+from ..utils import ai_pipelines
+from ..utils.fill_cache import GenerativeFillCache
+from ..utils.multiscale_inpaint import inpaint_multiscale
+
+# NumPy se importă la prima operație pe pixeli, după afișarea ferestrei
+np = lazy_import("numpy")
 
 class OperationType(Enum):
     """Tipurile de operații pentru sistemul de undo/redo"""
@@ -27,10 +45,12 @@ class OperationType(Enum):
 class UndoState:
     """Stare simplificată pentru undo/redo cu compresie adaptivă"""
     
-    def __init__(self, image: Image.Image, operation_name: str, operation_type: OperationType):
+    def __init__(self, image: Image.Image, operation_name: str, operation_type: OperationType, lossless_ops=None):
         self.operation_name = operation_name
         self.operation_type = operation_type
         self.timestamp = time.time()
+        # Operațiile geometrice fără pierderi de la încărcare (None = imaginea a fost re-procesată)
+        self.lossless_ops = lossless_ops
         
         # Compresie adaptivă bazată pe tipul operației
         if operation_type == OperationType.AI:
@@ -387,8 +407,6 @@ class PhotoEditorApp:
     
     def _calculate_image_diff(self, before_image, after_image):
         """Calculează diferențele între două imagini și returnează doar zona modificată."""
-        import numpy as np
-        
         # Convert to same size if different
         if before_image.size != after_image.size:
             return {
@@ -494,8 +512,12 @@ class PhotoEditorApp:
         
         return f"Undo: {undo_count} | Redo: {redo_count} | Memory: {total_memory_mb:.1f} MB"
     
-    def push_undo(self, operation_name="Operation"):
-        """Versiune simplificată și robustă pentru undo"""
+    def push_undo(self, operation_name="Operation", lossless_op=None):
+        """Versiune simplificată și robustă pentru undo
+
+        lossless_op descrie operațiile geometrice exacte (("transpose", metodă) sau
+        ("crop", box)); orice altă operație invalidează exportul JPEG fără re-encodare.
+        """
         if not self.current_image:
             return
         
@@ -504,7 +526,7 @@ class PhotoEditorApp:
             operation_type = classify_operation(operation_name)
             
             # Salvează starea ÎNAINTE de operație (imaginea curentă)
-            state = UndoState(self.current_image, operation_name, operation_type)
+            state = UndoState(self.current_image, operation_name, operation_type, self._lossless_ops)
             
             # Adaugă în stack
             self.undo_stack.append(state)
@@ -535,6 +557,11 @@ class PhotoEditorApp:
             if len(self._undo_stack) > 30:
                 self._undo_stack.pop(0)
         
+        if lossless_op is not None and self._lossless_ops is not None:
+            self._lossless_ops = self._lossless_ops + [lossless_op]
+        else:
+            self._lossless_ops = None
+        
         self.update_undo_redo_buttons()
 
     def undo(self):
@@ -545,12 +572,13 @@ class PhotoEditorApp:
         try:
             # Salvează imaginea curentă pentru redo
             if self.current_image:
-                current_state = UndoState(self.current_image, "Current State", OperationType.NORMAL)
+                current_state = UndoState(self.current_image, "Current State", OperationType.NORMAL, self._lossless_ops)
                 self.redo_stack.append(current_state)
             
             # Restaurează starea anterioară
             previous_state = self.undo_stack.pop()
             self.current_image = previous_state.get_image()
+            self._lossless_ops = previous_state.lossless_ops
             
             # Actualizează interfața
             self.display_image()
@@ -581,12 +609,13 @@ class PhotoEditorApp:
         try:
             # Salvează imaginea curentă pentru undo
             if self.current_image:
-                current_state = UndoState(self.current_image, "Before Redo", OperationType.NORMAL)
+                current_state = UndoState(self.current_image, "Before Redo", OperationType.NORMAL, self._lossless_ops)
                 self.undo_stack.append(current_state)
             
             # Restaurează starea din redo
             redo_state = self.redo_stack.pop()
             self.current_image = redo_state.get_image()
+            self._lossless_ops = redo_state.lossless_ops
             
             # Actualizează interfața
             self.display_image()
@@ -604,6 +633,17 @@ class PhotoEditorApp:
         self.update_undo_redo_buttons()
 
 
+    # Filtrele disponibile pentru documentele pe tile-uri: nume -> (operație TiledPipeline, parametri)
+    LARGE_DOCUMENT_FILTERS = {
+        "Grayscale": ("grayscale", {}),
+        "Sepia": ("sepia", {}),
+        "Blur": ("blur", {"radius": 2}),
+        "Sharpen": ("sharpen", {}),
+        "Contrast+": ("contrast", {"factor": 1.8}),
+        "Brightness+": ("brightness", {"factor": 1.5}),
+        "Color+": ("saturation", {"factor": 1.5}),
+    }
+
     def apply_filter(self):
         """Displays a dropdown for filter selection and applies the effect to the current image."""
         if not self.current_image:
@@ -638,8 +678,19 @@ class PhotoEditorApp:
             def apply(self):
                 self.result = self.var.get()
 
+        if self.large_document is not None:
+            # Pe tile-uri rulează doar filtrele ImageProcessor, aplicate la export
+            FILTERS = {name: FILTERS[name] for name in self.LARGE_DOCUMENT_FILTERS}
+
         dialog = FilterDialog(self.root, title="Apply Filter")
-        if dialog.result and dialog.result in FILTERS:
+        if dialog.result and dialog.result in FILTERS and self.large_document is not None:
+            operation, params = self.LARGE_DOCUMENT_FILTERS[dialog.result]
+            self.large_pipeline.add(operation, **params)
+            method = getattr(self.image_processor, TILE_OPERATIONS[operation][0])
+            self.current_image = method(self.current_image, **params)
+            self.display_image()
+            self.update_info(f"✅ Filter '{dialog.result}' added; it runs tile by tile on export.")
+        elif dialog.result and dialog.result in FILTERS:
             try:
                 # Save for undo with specific filter name
                 self.push_undo(f"Apply Filter: {dialog.result}")
@@ -667,6 +718,17 @@ class PhotoEditorApp:
         self.saved_files_history = []  # Lista pentru ultimele 5 fișiere salvate
         self.history_file = "recent_files.json"  # Fișier pentru persistența istoricului
         
+        # Încărcare progresivă: previzualizare draft + decodare completă în fundal
+        self.image_loader = ProgressiveImageLoader()
+        self._full_res_controls = []  # Controale care așteaptă rezoluția completă
+        self._pending_full_load = None  # (future, file_path) pentru decodarea în curs
+        # Imaginile foarte mari: pixelii rămân pe disc (TiledDocument), pe ecran doar previzualizarea;
+        # filtrele se adaugă în pipeline și rulează pe tile-uri la export
+        self.large_document = None
+        self.large_pipeline = None
+        self._large_document_controls = []  # Controale disponibile pentru documentele pe tile-uri
+        self._lossless_ops = []  # Operații geometrice exacte aplicate de la încărcare
+        
         # Initialize mixed undo/redo system
         self.init_undo_system()
         
@@ -682,17 +744,227 @@ class PhotoEditorApp:
         # Configure drag and drop
         self.setup_drag_drop()
 
+        # Preîncărcarea modelelor pornește după afișarea ferestrei
+        self.root.after(500, self._refresh_model_status)
+        if self.enable_model_warmup:
+            self.root.after(2000, self.model_warmup.start)
+        # Doar fișierele modificate de la ultima verificare sunt citite din nou
+        self.root.after(3000, self.check_model_files)
 
     def init_ai_models(self):
-        """Initializes AI models."""
+        """Initializes AI models lazily: each model is loaded on first use."""
+        self.image_processor = ImageProcessor()
+        self._backend_profile = None  # PIL/OpenCV per operație (processing_backends.json)
+        self.model_manager = ModelManager()
+        # Un singur worker: două inferențe nu pot scrie simultan în current_image
+        self.ai_executor = AIJobExecutor(max_workers=1)
+
+        # Inferență INT8 pe CPU (opțională) pentru encoderele BLIP/CLIP și upscaler
+        self.quantize_models = False
+        self.quantizable_models = ("Recognition", "Upscaler")
+        # Profilul CPU (fire, channels_last, torch.compile) se calibrează o dată per mașină
+        self._cpu_calibration_scheduled = False
+
+        # Modulele AI (torch, transformers, diffusers) se importă abia la prima utilizare
+        def lazy(display_name, module_name, class_name):
+            return LazyModel(display_name, module_name, class_name, package=__package__,
+                             on_first_use=self._on_model_used,
+                             residency=self.model_manager.residency,
+                             post_load=self._prepare_model,
+                             call_context=self.model_manager.cpu_runtime.inference,
+                             constructor_kwargs=lambda proxy, model_class: self.model_manager.constructor_weights(
+                                 proxy.display_name, model_class))
+
+        self.upscaler = lazy("Upscaler", "..models.upscaler", "ImageUpscaler")
+        self.bg_remover = lazy("Background Remover", "..models.background_remover", "BackgroundRemover")
+        self.gen_fill = lazy("Generative Fill", "..models.generative_fill", "GenerativeFill")
+        self.img_recognition = lazy("Recognition", "..models.image_recognition", "ImageRecognition")
+        self.ai_models = {model.display_name: model for model in
+                          (self.upscaler, self.bg_remover, self.gen_fill, self.img_recognition)}
+        # U2-Net pe loturi stivuite (u2net.onnx + onnxruntime), pentru eliminarea fundalului în serie
+        self.batch_bg_remover = LazyModel(
+            "Background Remover (batch)", "..utils.u2net_batch", "U2NetBatchRemover", package=__package__,
+            residency=self.model_manager.residency,
+            constructor_kwargs=lambda proxy, model_class: {
+                "model_path": self.model_manager.get_model_path("background_remover")})
+
+        # Proces AI separat (opțional): modelele rămân încărcate acolo, iar inferența
+        # și pre/post-procesarea nu mai concurează cu interfața pentru GIL
+        self.use_ai_process = False
+        self.ai_worker = None
+
+        # Preîncărcare în fundal a modelelor folosite în sesiunile anterioare
+        self.enable_model_warmup = True
+        self.model_warmup = ModelWarmup(self.ai_models)
+
+        # Upscale pe plăci: memoria de activare depinde de placă, nu de imagine
+        self.upscale_tile_size = 256
+        self.upscale_tile_overlap = 16
+        self.upscale_workers = None  # None = jumătate din nucleele CPU
+
+        # Generative fill rulează doar pe zona găurii, la rezoluția nativă a modelului
+        self.gen_fill_native_resolution = 512
+        self.gen_fill_context_margin = 64
+        # Umpleri deterministe (seed fix): undo/redo și reluarea aceluiași prompt vin din cache
+        self.gen_fill_seed = 0
+        self.gen_fill_steps = 30
+        self.gen_fill_variations = 4
+        self.fill_cache = GenerativeFillCache()
+
+        # Eliminare rapidă a fundalului: segmentare pe un proxy micșorat, mască mărită ghidat
+        self.fast_background_removal = False
+        self.bg_proxy_max_side = 1024
+
+        # Măștile de fundal, după hash-ul pixelilor (memorie + ~/.ai_photo_editor/cache)
+        self.mask_cache = ResultCache("background_masks", encode=encode_png, decode=decode_image,
+                                      memory_items=8, disk_limit_mb=256)
+        # Descrieri, scoruri și embedding-uri CLIP, partajate între sesiuni
+        # Versiunea: ponderile modelului și modul INT8 (evaluată la fiecare căutare)
+        self.recognition_cache = RecognitionCache(lambda: self.model_cache_version(self.img_recognition))
+        # Indexul CLIP al fotografiilor utilizatorului (deschis la prima căutare)
+        self.embedding_index = None
+
+    def backend_profile(self):
+        """The PIL/OpenCV choice per operation; measured once in the background when missing."""
+        if self._backend_profile is None:
+            self._backend_profile = load_backend_profile(run_if_missing=False)
+            if not self._backend_profile:
+                # Până la terminarea măsurătorii, operațiile rulează pe backend-ul PIL
+                def measure(token):
+                    self._backend_profile = load_backend_profile()
+                self.ai_executor.submit("Backend benchmark", measure, priority=JobPriority.BACKGROUND,
+                                        key="backend_benchmark")
+        return self._backend_profile
+
+    def apply_adjustments(self, image, brightness, contrast, saturation):
+        """Applies the slider adjustments; on one numpy buffer only when the profile picks OpenCV for a step."""
+        steps = [("enhance_brightness", {"factor": brightness}),
+                 ("enhance_contrast", {"factor": contrast}),
+                 ("enhance_saturation", {"factor": saturation})]
+        return apply_chain(image, steps, profile=self.backend_profile(), processor=self.image_processor)
+
+    def model_cache_version(self, model):
+        """Version of a model for result-cache keys: weights digest (or wrapper version) and INT8 mode."""
+        return self.model_manager.model_version(
+            MODEL_WEIGHTS.get(model.display_name), model.source_version(),
+            quantized=self.quantize_models and model.display_name in self.quantizable_models)
+
+    def background_mask_key(self, image, proxy_max_side=None):
+        """Mask-cache key: pixels, background model version (weights, INT8) and proxy resolution."""
+        key = f"{image_content_hash(image)}_{self.model_cache_version(self.bg_remover)}"
+        if proxy_max_side:
+            key += f"_proxy{proxy_max_side}"
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+    def _prepare_model(self, model, instance):
+        """Maps the weights, then applies the CPU runtime profile (and INT8 mode, when enabled) to a loaded model."""
+        instance = self.model_manager.map_loaded_weights(model.display_name, instance)
+        if self.quantize_models and model.display_name in self.quantizable_models:
+            instance = self.model_manager.quantize_model(model.display_name, instance, model.source_version())
         try:
-            self.upscaler = ImageUpscaler()
-            self.bg_remover = BackgroundRemover()
-            self.gen_fill = GenerativeFill()
-            self.img_recognition = ImageRecognition()
-            self.image_processor = ImageProcessor()
+            instance = self.model_manager.cpu_runtime.prepare(instance)
         except Exception as e:
-            messagebox.showerror("Error", f"Could not load AI models: {e}")
+            print(f"Eroare la pregătirea modelului {model.display_name} pentru CPU: {e}")
+        if not self._cpu_calibration_scheduled and not self.model_manager.cpu_runtime.is_calibrated:
+            # Prima utilizare pe această mașină: calibrare după operația curentă
+            self._cpu_calibration_scheduled = True
+            self.ai_executor.submit("CPU calibration", lambda token: self.model_manager.calibrate_cpu_runtime(),
+                                    priority=JobPriority.BACKGROUND, key="cpu_calibration")
+        return instance
+
+    def toggle_quantized_models(self):
+        """Switches INT8 CPU mode; loaded models are unloaded and reload in the new mode."""
+        self.quantize_models = bool(self.quantize_switch.get())
+        for name in self.quantizable_models:
+            self.model_manager.unload_model(name)
+        if self.ai_worker is not None:
+            # Procesul AI repornește cu noile opțiuni la următoarea operație
+            self.ai_worker.shutdown()
+        mode = "INT8 (quantized)" if self.quantize_models else "float32"
+        self.update_info(f"AI models will run in {mode} mode from the next operation.")
+
+    def get_ai_worker(self):
+        """Creates the AI process client (the process itself starts on the first request)."""
+        if self.ai_worker is None:
+            quantized = self.quantizable_models if self.quantize_models else ()
+            self.ai_worker = AIWorker(
+                {model.display_name: (model.module_name, model.class_name) for model in self.ai_models.values()},
+                package=__package__,
+                model_options=functools.partial(worker_model_options, quantized=quantized)
+            )
+        return self.ai_worker
+
+    def model_target(self, model):
+        """The object AI calls go to: the in-process LazyModel or its counterpart in the AI process."""
+        if not self.use_ai_process:
+            return model
+        self._on_model_used(model.display_name)
+        return self.get_ai_worker().model(model.display_name)
+
+    def toggle_ai_process(self):
+        """Moves AI inference to a separate process (or back into the editor process)."""
+        self.use_ai_process = bool(self.ai_process_switch.get())
+        if self.use_ai_process:
+            # Modelele din procesul editorului nu mai sunt folosite: memoria este eliberată
+            for name in self.ai_models:
+                self.model_manager.unload_model(name)
+            worker = self.get_ai_worker()
+            self.model_warmup.models = {name: worker.model(name) for name in self.ai_models}
+            self.update_info("AI models will run in a separate process.")
+        else:
+            self.model_warmup.models = self.ai_models
+            if self.ai_worker is not None:
+                self.ai_worker.shutdown()
+                self.ai_worker = None
+            self.update_info("AI models will run inside the editor process.")
+
+    def toggle_fast_background_removal(self):
+        """Switches background removal between full resolution and a low-resolution proxy."""
+        self.fast_background_removal = bool(self.fast_bg_switch.get())
+        mode = (f"low-resolution proxy ({self.bg_proxy_max_side}px) with guided mask upsampling"
+                if self.fast_background_removal else "full resolution")
+        self.update_info(f"Background removal will run at {mode}.")
+
+    def check_model_files(self, force=False):
+        """Verifies the downloaded model files in the background; reports corrupted ones."""
+        on_progress = None
+        if force:
+            progress = ProgressReporter(self.progress_bridge.post, stage="Verifying models")
+            progress.start(unit="MB")
+
+            def on_progress(done, total):
+                progress.update(done // (1024 * 1024), total // (1024 * 1024))
+
+        def on_done(results, error):
+            if force:
+                self.progress_bridge.reset()
+            corrupted = [name for name, ok in results.items() if ok is False]
+            if error is not None:
+                self.update_info(f"Model verification failed: {error}")
+            elif corrupted:
+                self.update_info("Corrupted model files (delete and download again):\n" + "\n".join(corrupted))
+            elif force:
+                self.update_info(f"All {len(results)} downloaded models verified.")
+
+        self.model_manager.verify_all_models(
+            force=force, progress_callback=on_progress,
+            done_callback=lambda results, error: self.progress_bridge.call(on_done, results, error))
+
+    def _on_model_used(self, display_name):
+        """Records model usage so the next session can warm it up."""
+        self.model_warmup.record_use(display_name)
+
+    def _refresh_model_status(self):
+        """Shows the per-model loading state in the AI panel."""
+        try:
+            if self.use_ai_process and self.ai_worker is not None:
+                lines = [f"{name}: {self.ai_worker.model(name).state}" for name in self.ai_models]
+            else:
+                lines = [f"{name}: {model.state}" for name, model in self.ai_models.items()]
+            self.model_status_label.configure(text="\n".join(lines))
+        except Exception:
+            return
+        self.root.after(500, self._refresh_model_status)
     
     def init_undo_system(self):
         """Inițializează sistemul simplificat de undo/redo"""
@@ -748,6 +1020,7 @@ class PhotoEditorApp:
             width=80
         )
         reset_btn.pack(side="left", padx=5, pady=5)
+        self._full_res_controls.append(reset_btn)
         
         # Button for file history
         history_btn = ctk.CTkButton(
@@ -766,6 +1039,8 @@ class PhotoEditorApp:
             width=120
         )
         export_btn.pack(side="left", padx=5, pady=5)
+        self._full_res_controls.append(export_btn)
+        self._large_document_controls.append(export_btn)
     
     def create_control_panel(self, parent):
         """Creates the AI and image adjustment control panel."""
@@ -777,20 +1052,16 @@ class PhotoEditorApp:
         title.pack(pady=10)
 
         # --- Sliders for brightness, contrast, saturation ---
-        from PIL import ImageEnhance
         self._slider_original = None  # To keep the original image for adjustments
 
+        def adjusted():
+            return self.apply_adjustments(self._slider_original, brightness_slider.get(),
+                                          contrast_slider.get(), saturation_slider.get())
+
         def on_slider_change(event=None):
             if self._slider_original is None:
                 return
-            img = self._slider_original.copy()
-            brightness = brightness_slider.get()
-            img = ImageEnhance.Brightness(img).enhance(brightness)
-            contrast = contrast_slider.get()
-            img = ImageEnhance.Contrast(img).enhance(contrast)
-            saturation = saturation_slider.get()
-            img = ImageEnhance.Color(img).enhance(saturation)
-            self.current_image = img
+            self.current_image = adjusted()
             self.display_image()
 
         def on_slider_start(event=None):
@@ -803,20 +1074,14 @@ class PhotoEditorApp:
             # Save for undo
             self.push_undo("Adjust Image")
             # Final update (optional, since on_slider_change already updates)
-            img = self._slider_original.copy()
-            brightness = brightness_slider.get()
-            img = ImageEnhance.Brightness(img).enhance(brightness)
-            contrast = contrast_slider.get()
-            img = ImageEnhance.Contrast(img).enhance(contrast)
-            saturation = saturation_slider.get()
-            img = ImageEnhance.Color(img).enhance(saturation)
-            self.current_image = img
+            self.current_image = adjusted()
             self._current_operation = "Adjust Image"
             self.display_image()
             self._slider_original = None
 
         def on_slider_start(event=None):
-            if self.current_image:
+            # Bind-urile directe se declanșează și când slider-ul e dezactivat
+            if self.current_image and not self._pending_full_load:
                 self._slider_original = self.current_image.copy()
 
         def reset_sliders():
@@ -828,6 +1093,7 @@ class PhotoEditorApp:
             if self.original_image:
                 self.push_undo("Reset Sliders")
                 self.current_image = self.original_image.copy()
+                self._lossless_ops = []
                 self._current_operation = "Reset Sliders"
                 self.display_image()
 
@@ -862,6 +1128,7 @@ class PhotoEditorApp:
         saturation_slider.bind("<ButtonPress-1>", on_slider_start)
         saturation_slider.bind("<B1-Motion>", on_slider_change)
         saturation_slider.bind("<ButtonRelease-1>", on_slider_release)
+        self._full_res_controls.extend([brightness_slider, contrast_slider, saturation_slider])
 
         # --- Rotate Button ---
         rotate_btn = ctk.CTkButton(control_frame, text="Rotate 90°", width=150, height=38, font=("Arial", 13, "bold"), corner_radius=12, fg_color="#fbbf24", hover_color="#f59e42", command=self.rotate_image)
@@ -878,6 +1145,7 @@ class PhotoEditorApp:
         # --- Crop Button ---
         crop_btn = ctk.CTkButton(control_frame, text="Crop", width=150, height=38, font=("Arial", 13, "bold"), corner_radius=122, fg_color="#38bdf8", hover_color="#0ea5e9", command=self.crop_image)
         crop_btn.pack(pady=5)
+        self._full_res_controls.extend([rotate_btn, mirror_btn, flip_v_btn, crop_btn])
 
         # --- Aspect Ratio Crop Button (Dropdown) ---
         def crop_aspect_ratio():
@@ -922,7 +1190,7 @@ class PhotoEditorApp:
                 top = (h - new_h) // 2
                 right = left + new_w
                 bottom = top + new_h
-                self.push_undo("Aspect Ratio Crop")
+                self.push_undo("Aspect Ratio Crop", lossless_op=("crop", (left, top, right, bottom)))
                 self.current_image = self.current_image.crop((left, top, right, bottom))
                 self._current_operation = "Aspect Ratio Crop"
                 self.display_image()
@@ -941,6 +1209,7 @@ class PhotoEditorApp:
         # --- Upscale Button ---
         upscale_btn = ctk.CTkButton(control_frame, text="Upscale Image", width=150, height=38, font=("Arial", 13, "bold"), corner_radius=12, fg_color="#8b5cf6", hover_color="#7c3aed", command=self.upscale_image)
         upscale_btn.pack(pady=5)
+        self._full_res_controls.extend([crop_aspect_btn, upscale_btn])
 
         # --- AI Operations Frame ---
         ai_frame = ctk.CTkFrame(control_frame)
@@ -948,6 +1217,21 @@ class PhotoEditorApp:
         
         ai_title = ctk.CTkLabel(ai_frame, text="AI Operations", font=("Arial", 13, "bold"))
         ai_title.pack(pady=(10, 5))
+
+        self.model_status_label = ctk.CTkLabel(ai_frame, text="", font=("Arial", 10), justify="left")
+        self.model_status_label.pack(pady=(0, 5))
+
+        self.quantize_switch = ctk.CTkSwitch(ai_frame, text="Fast CPU mode (INT8)",
+                                             command=self.toggle_quantized_models)
+        self.quantize_switch.pack(pady=(0, 5))
+
+        self.fast_bg_switch = ctk.CTkSwitch(ai_frame, text="Fast background removal",
+                                            command=self.toggle_fast_background_removal)
+        self.fast_bg_switch.pack(pady=(0, 5))
+
+        self.ai_process_switch = ctk.CTkSwitch(ai_frame, text="Run AI in separate process",
+                                               command=self.toggle_ai_process)
+        self.ai_process_switch.pack(pady=(0, 5))
         
         bg_remove_btn = ctk.CTkButton(
             ai_frame,
@@ -957,6 +1241,14 @@ class PhotoEditorApp:
         )
         bg_remove_btn.pack(pady=3)
 
+        batch_bg_remove_btn = ctk.CTkButton(
+            ai_frame,
+            text="Batch Remove Background",
+            command=self.batch_remove_background,
+            width=140
+        )
+        batch_bg_remove_btn.pack(pady=3)
+
         bg_replace_btn = ctk.CTkButton(
             ai_frame,
             text="Replace Background",
@@ -973,13 +1265,54 @@ class PhotoEditorApp:
         )
         gen_fill_btn.pack(pady=3)
 
+        fill_variations_btn = ctk.CTkButton(
+            ai_frame,
+            text="Fill Variations",
+            command=self.generative_fill_variations,
+            width=140
+        )
+        fill_variations_btn.pack(pady=3)
+
         recognize_btn = ctk.CTkButton(
             ai_frame,
             text="Recognize Image",
             command=self.recognize_image,
             width=140
         )
-        recognize_btn.pack(pady=(3, 10))
+        recognize_btn.pack(pady=3)
+
+        index_folder_btn = ctk.CTkButton(
+            ai_frame,
+            text="Index Photo Folder",
+            command=self.index_photo_folder,
+            width=140
+        )
+        index_folder_btn.pack(pady=3)
+
+        find_similar_btn = ctk.CTkButton(
+            ai_frame,
+            text="Find Similar Images",
+            command=self.find_similar_images,
+            width=140
+        )
+        find_similar_btn.pack(pady=3)
+
+        search_photos_btn = ctk.CTkButton(
+            ai_frame,
+            text="Search Photos",
+            command=self.search_photos,
+            width=140
+        )
+        search_photos_btn.pack(pady=3)
+
+        verify_models_btn = ctk.CTkButton(
+            ai_frame,
+            text="Verify Model Files",
+            command=lambda: self.check_model_files(force=True),
+            width=140
+        )
+        verify_models_btn.pack(pady=(3, 10))
+        self._full_res_controls.extend([bg_remove_btn, bg_replace_btn, gen_fill_btn, recognize_btn, find_similar_btn])
 
         # --- Image Tools Frame ---
         tools_frame = ctk.CTkFrame(control_frame)
@@ -1011,62 +1344,65 @@ class PhotoEditorApp:
             width=140
         )
         gen_fill_simple_btn.pack(pady=(3, 10))
+        self._full_res_controls.extend([add_text_btn, filter_btn, gen_fill_simple_btn])
+        self._large_document_controls.append(filter_btn)
     def replace_background(self):
         """Removes the background and allows choosing a new background for the image."""
         if not self.current_image:
             messagebox.showwarning("Warning", "Please load an image first!")
             return
 
-        def worker():
-            try:
-                self.progress.set(0.1)
-                self.update_info("Removing background...")
-                # Save for undo before starting
-                self.push_undo("Replace Background")
-                
-                # Remove background (get RGBA image with transparency)
-                fg_img = self.bg_remover.remove_background(self.current_image)
-
-                self.progress.set(0.4)
-                self.update_info("Select a new background image...")
-                # Select background image
-                bg_path = filedialog.askopenfilename(
-                    title="Select background image",
-                    filetypes=[
-                        ("All Images", "*.png *.jpg *.jpeg *.bmp *.tiff *.webp"),
-                        ("PNG", "*.png"),
-                        ("JPEG", "*.jpg *.jpeg"),
-                        ("All files", "*.*")
-                    ]
-                )
-                if not bg_path:
-                    self.update_info("Background replace cancelled.")
-                    self.progress.set(0)
-                    return
+        # Select background image (on the Tk thread, before queueing the AI job)
+        bg_path = filedialog.askopenfilename(
+            title="Select background image",
+            filetypes=[
+                ("All Images", "*.png *.jpg *.jpeg *.bmp *.tiff *.webp"),
+                ("PNG", "*.png"),
+                ("JPEG", "*.jpg *.jpeg"),
+                ("All files", "*.*")
+            ]
+        )
+        if not bg_path:
+            self.update_info("Background replace cancelled.")
+            return
 
-                bg_img = Image.open(bg_path).convert("RGBA")
+        image = self.current_image
 
-                # Resize background to foreground size
-                bg_img = bg_img.resize(fg_img.size, Image.LANCZOS)
+        def apply(result):
+            if self.current_image is not image:
+                self.update_info("The image changed meanwhile; background not replaced.")
+                return
+            # Save for undo before applying
+            self.push_undo("Replace Background")
+            self.current_image = result
+            self._current_operation = "Replace Background"
+            self.display_image()
+            self.update_info("Background replaced successfully!")
 
-                # Ensure foreground is RGBA
-                if fg_img.mode != "RGBA":
-                    fg_img = fg_img.convert("RGBA")
+        def job(token):
+            progress = self.new_progress("Replace Background")
+            progress.start()
+            self.post_info("Removing background...")
 
-                # Combine foreground with background
-                result = Image.alpha_composite(bg_img, fg_img)
+            # Remove background (get RGBA image with transparency)
+            fg_img = self.remove_background_cached(image, progress)
+            token.check()
 
-                self.current_image = result.convert("RGB")
-                self._current_operation = "Replace Background"
-                self.display_image()
-                self.progress.set(1.0)
-                self.update_info("Background replaced successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Background replace failed: {e}")
-            finally:
-                self.progress.set(0)
+            bg_img = Image.open(bg_path).convert("RGBA")
+
+            # Resize background to foreground size
+            bg_img = bg_img.resize(fg_img.size, Image.LANCZOS)
 
-        threading.Thread(target=worker, daemon=True).start()
+            # Ensure foreground is RGBA
+            if fg_img.mode != "RGBA":
+                fg_img = fg_img.convert("RGBA")
+
+            # Combine foreground with background
+            result = Image.alpha_composite(bg_img, fg_img).convert("RGB")
+            token.check()
+            return lambda: apply(result)
+
+        self.submit_ai_job("Replace Background", job, key=("Replace Background", id(image), bg_path))
     
     def create_image_panel(self, parent):
         """Creates the panel for displaying original vs. edited image comparison."""
@@ -1179,6 +1515,17 @@ class PhotoEditorApp:
         self.progress.pack(pady=(0, 10), padx=10, fill="x")
         self.progress.set(0)
         
+        # Progress details (steps/tiles, throughput, ETA), updated from the Tk thread
+        self.progress_label = ctk.CTkLabel(info_frame, text="", font=("Arial", 10))
+        self.progress_label.pack(pady=(0, 5))
+        self.progress_bridge = TkProgressBridge(self.root, self.progress, self.progress_label)
+        self.progress_bridge.start()
+        
+        # --- Cancel button for queued/running AI jobs ---
+        self.cancel_btn = ctk.CTkButton(info_frame, text="Cancel", width=80, state="disabled",
+                                        command=self.cancel_ai_jobs)
+        self.cancel_btn.pack(pady=(0, 5))
+        
         # Text widget for displaying information (read-only)
         self.info_text = ctk.CTkTextbox(info_frame, width=250, height=400)
         self.info_text.pack(pady=10, padx=10, fill="both", expand=True)
@@ -1213,11 +1560,26 @@ class PhotoEditorApp:
             return False
     
     def load_image_from_path(self, file_path):
-        """Loads image from the specified path."""
+        """Loads image from the specified path.
+
+        JPEGs are opened in two phases: a draft-decoded preview at display size is
+        shown immediately, and the full-resolution decode finishes on a worker thread.
+        Images too large for memory are opened tile by tile (see open_large_document).
+        """
         try:
+            # Renunță la o decodare completă rămasă de la imaginea anterioară
+            self._discard_pending_load()
+            self.close_large_document()
+            
             self.image_path = file_path
-            self.original_image = Image.open(file_path)
-            self.current_image = self.original_image.copy()
+            if is_large_image(file_path):
+                # Pixelii rămân pe disc; previzualizarea se construiește în fundal
+                preview, is_preview = None, True
+            else:
+                preview, is_preview = self.image_loader.open_preview(file_path, max_size=self._zoom_display_size)
+            self.original_image = preview
+            self.current_image = preview.copy() if preview else None
+            self._lossless_ops = []
             
             # Resetează sistemul de undo/redo pentru noua imagine
             self.undo_stack.clear()
@@ -1239,17 +1601,120 @@ class PhotoEditorApp:
             self.update_image_info()
             self.update_undo_redo_buttons()
             
-            # Positive feedback
-            self.update_info(f"Image loaded successfully!\n\n{self.get_image_info_text()}")
+            if is_preview and preview is None:
+                self.open_large_document(file_path)
+            elif is_preview:
+                # Editarea așteaptă imaginea completă
+                self.set_full_resolution_controls_state(False)
+                self._pending_full_load = (self.image_loader.load_full_async(file_path), file_path)
+                self.update_info("Preview loaded, decoding full resolution...")
+                self.root.after(30, self._poll_full_image_load)
+            else:
+                self.set_full_resolution_controls_state(True)
+                # Positive feedback
+                self.update_info(f"Image loaded successfully!\n\n{self.get_image_info_text()}")
+                self.show_cached_recognition(self.original_image, file_path)
             
         except Exception as e:
             messagebox.showerror("Error", f"Could not load image: {e}")
     
+    def open_large_document(self, file_path):
+        """Opens an image too large for memory as a tiled document; the preview is built on a worker thread."""
+        self.set_full_resolution_controls_state(False)
+        future = self.image_loader.open_tiled_async(file_path, max_size=self._zoom_display_size)
+        self._pending_full_load = (future, file_path)
+        self.update_info("Large image: reading it tile by tile...")
+        self.root.after(30, self._poll_full_image_load)
+    
+    def close_large_document(self):
+        """Releases the tiled document of the previous image (and its scratch files)."""
+        if self.large_document is not None:
+            self.large_document.close()
+        self.large_document = None
+        self.large_pipeline = None
+    
+    def _discard_pending_load(self):
+        """Cancels a background decode; a tiled document that still finishes is closed."""
+        if not self._pending_full_load:
+            return
+        future = self._pending_full_load[0]
+        self._pending_full_load = None
+        if not future.cancel():
+            def close_document(done):
+                if not done.cancelled() and done.exception() is None and isinstance(done.result(), tuple):
+                    done.result()[0].close()
+            future.add_done_callback(close_document)
+    
+    def _poll_full_image_load(self):
+        """Checks (on the Tk thread) whether the background full decode has finished."""
+        if not self._pending_full_load:
+            return
+        future, file_path = self._pending_full_load
+        if not future.done():
+            self.root.after(30, self._poll_full_image_load)
+            return
+        
+        self._pending_full_load = None
+        if future.cancelled() or file_path != self.image_path:
+            return
+        try:
+            full_image = future.result()
+        except Exception as e:
+            # Previzualizarea nu poate fi editată la rezoluție completă: este eliminată,
+            # iar controalele revin la starea normală
+            self.original_image = None
+            self.current_image = None
+            self.image_path = None
+            self._lossless_ops = []
+            self.display_image()
+            self.set_full_resolution_controls_state(True)
+            messagebox.showerror("Error", f"Could not load image: {e}")
+            return
+        
+        if isinstance(full_image, tuple):
+            # Document pe tile-uri: doar filtrele și exportul, aplicate la export pe tile-uri
+            self.large_document, full_image = full_image
+            self.large_pipeline = TiledPipeline(self.image_processor)
+        
+        # Înlocuiește previzualizarea cu imaginea la rezoluție completă
+        self.original_image = full_image
+        self.current_image = full_image.copy()
+        self.display_image()
+        self.set_full_resolution_controls_state(self.large_document is None)
+        if self.large_document is not None:
+            for control in self._large_document_controls:
+                control.configure(state="normal")
+        self.update_info(f"Image loaded successfully!\n\n{self.get_image_info_text()}")
+        self.show_cached_recognition(self.original_image, file_path)
+    
+    def show_cached_recognition(self, image, file_path):
+        """Shows the cached description of these pixels, if the image was recognized before."""
+        def show(result):
+            if file_path == self.image_path:
+                self.update_info(f"Image loaded successfully!\n\n{self.get_image_info_text()}"
+                                 f"\n\nImage Recognition (cached):\n\n{result['description']}")
+
+        def lookup():
+            result = self.recognition_cache.lookup(image)
+            if result:
+                self.progress_bridge.call(show, result)
+        threading.Thread(target=lookup, daemon=True).start()
+    
+    def set_full_resolution_controls_state(self, enabled):
+        """Enables or disables the editing controls that need the full-resolution image."""
+        state = "normal" if enabled else "disabled"
+        for control in self._full_res_controls:
+            try:
+                control.configure(state=state)
+            except Exception:
+                pass
+    
     def get_image_info_text(self):
         """Generates text with image information."""
         if self.current_image and self.image_path:
+            width, height = self.large_document.size if self.large_document else self.current_image.size
             return f"""File: {Path(self.image_path).name}
-Dimensions: {self.current_image.width} x {self.current_image.height}
+Dimensions: {width} x {height}
 Format: {self.current_image.format}
 Mode: {self.current_image.mode}
 Size: {os.path.getsize(self.image_path) / (1024*1024):.2f} MB"""
@@ -1349,41 +1814,184 @@ Size: {os.path.getsize(self.image_path) / (1024*1024):.2f} MB"""
         self.info_text.insert("1.0", info_text)
         self.info_text.configure(state="disabled")
     
+    def submit_ai_job(self, operation_name, func, key=None, priority=JobPriority.INTERACTIVE):
+        """
+        Queues AI work on the AI executor; failures and cancellation are reported here.
+
+        func(token) runs on the AI thread and must not touch widgets or the editor state. It may
+        return a callable that applies the result; that callable runs on the Tk thread.
+        """
+        def finish(state, apply, error):
+            self.progress_bridge.reset()
+            if state == AIJob.DONE and callable(apply):
+                try:
+                    apply()
+                except Exception as e:
+                    messagebox.showerror("Error", f"Error in {operation_name}: {e}")
+            elif state == AIJob.CANCELLED:
+                self.update_info(f"{operation_name} cancelled.")
+            elif state == AIJob.FAILED:
+                messagebox.showerror("Error", f"Error in {operation_name}: {error}")
+            self.update_cancel_button()
+
+        def on_done(job):
+            # Rulează pe thread-ul AI: rezultatul și raportarea trec pe thread-ul Tk
+            self.progress_bridge.call(finish, job.state, job.result, job.error)
+
+        job = self.ai_executor.submit(operation_name, func, priority=priority, key=key, on_done=on_done)
+        self.update_cancel_button()
+        return job
+
+    def post_info(self, text):
+        """Shows a status message from any thread; the info panel is updated on the Tk thread."""
+        self.progress_bridge.call(self.update_info, text)
+
+    def new_progress(self, stage):
+        """Creates a progress reporter for an AI job: throttled, shown on the Tk thread, cancellable."""
+        return ProgressReporter(self.progress_bridge.post, stage=stage, check=self.ai_executor.check_cancelled)
+
+    def call_model(self, model, method_name, *args, progress=None, **kwargs):
+        """Calls a model method, passing the progress reporter when the method supports it."""
+        return ai_pipelines.call_model(self.model_target(model), method_name, *args, progress=progress, **kwargs)
+
+    def run_pipeline(self, function, models, *args, progress=None, **kwargs):
+        """
+        Runs a whole AI operation (pre/post-processing and inference) next to its models.
+
+        With the AI process enabled, the function runs there, so tiling, blending and mask
+        refinement do not hold the editor's GIL; otherwise it runs on the calling thread.
+        """
+        if not self.use_ai_process:
+            return function(*models, *args, progress=progress, **kwargs)
+        for model in models:
+            self._on_model_used(model.display_name)
+        return self.get_ai_worker().run(function, [model.display_name for model in models], *args,
+                                        progress=progress, **kwargs)
+
+    def update_cancel_button(self):
+        """Enables the Cancel button while AI jobs are queued or running."""
+        try:
+            self.cancel_btn.configure(state="normal" if self.ai_executor.active_count() else "disabled")
+        except Exception:
+            pass
+
+    def cancel_ai_jobs(self):
+        """Cancels all queued AI jobs and asks the running one to stop."""
+        self.ai_executor.cancel_all()
+        self.update_info("Cancelling AI operation...")
+
     def run_ai_operation(self, operation_func, operation_name):
-        """Runs an AI operation in the background and saves for undo."""
-        def worker():
+        """Queues an AI operation on the AI executor and saves for undo."""
+        if not self.current_image:
+            messagebox.showwarning("Warning", "Please load an image first!")
+            return
+
+        image = self.current_image
+
+        def apply(result):
+            if self.current_image is not image:
+                self.update_info(f"The image changed meanwhile; {operation_name} not applied.")
+                return
+            # Save for undo with operation name (the state before the result is applied)
+            self.push_undo(operation_name)
+            self.current_image = result
+            self._current_operation = operation_name  # Track current operation
+            self.display_image()
+            self.update_info(f"{operation_name} completed successfully!")
+
+        def job(token):
+            # Preîncărcarea nu concurează cu operația pentru CPU/memorie
+            self.model_warmup.pause()
             try:
-                self.progress.set(0.1)
-                self.update_info(f"Running {operation_name}...")
-                # Save for undo with operation name
-                self.push_undo(operation_name)
-                result = operation_func(self.current_image)
-                self.progress.set(0.9)
-                self.current_image = result
-                self._current_operation = operation_name  # Track current operation
-                self.display_image()
-                self.progress.set(1.0)
-                self.update_info(f"{operation_name} completed successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Error in {operation_name}: {e}")
+                # Nedeterminat până când operația raportează pași (difuzie, plăci, loturi)
+                progress = self.new_progress(operation_name)
+                progress.start()
+                self.post_info(f"Running {operation_name}...")
+                result = operation_func(image, progress)
+                token.check()
+                return lambda: apply(result)
             finally:
-                self.progress.set(0)
-        if self.current_image:
-            threading.Thread(target=worker, daemon=True).start()
-        else:
-            messagebox.showwarning("Warning", "Please load an image first!")
+                self.model_warmup.resume()
+
+        # Un dublu-click pe același buton nu pune în coadă aceeași operație de două ori
+        self.submit_ai_job(operation_name, job, key=(operation_name, id(image)))
     
     def upscale_image(self):
-        """Upscales the image using AI."""
-        self.run_ai_operation(self.upscaler.upscale, "Upscale")
+        """Upscales the image using AI, tile by tile."""
+        def tiled_upscale(image, progress):
+            return self.run_pipeline(
+                ai_pipelines.tiled_upscale, [self.upscaler], image,
+                tile_size=self.upscale_tile_size,
+                overlap=self.upscale_tile_overlap,
+                max_workers=self.upscale_workers,
+                progress=progress
+            )
+        self.run_ai_operation(tiled_upscale, "Upscale")
     
     def remove_background(self):
         """Removes the background from the image."""
-        self.run_ai_operation(self.bg_remover.remove_background, "Remove Background")
+        self.run_ai_operation(self.remove_background_cached, "Remove Background")
+
+    def remove_background_cached(self, image, progress=None):
+        """Removes the background, reusing the cached mask when the pixels are unchanged."""
+        proxy_max_side = self.bg_proxy_max_side if self.fast_background_removal else None
+        key = self.background_mask_key(image, proxy_max_side)
+        mask = self.mask_cache.get(key)
+        if mask is not None and mask.size == image.size:
+            result = image.convert("RGBA")
+            result.putalpha(mask)
+            return result
+
+        result = self.run_pipeline(
+            ai_pipelines.remove_background, [self.bg_remover], image,
+            proxy_max_side=proxy_max_side, progress=progress)
+        self.mask_cache.put(key, result.getchannel("A"))
+        return result
+
+    def batch_background_remover(self):
+        """The batch model: U2-Net with one forward pass per batch when u2net.onnx and onnxruntime are available."""
+        if (self.model_manager.get_model_path("background_remover")
+                and importlib.util.find_spec("onnxruntime") is not None):
+            return self.batch_bg_remover
+        return self.model_target(self.bg_remover)
+
+    def batch_remove_background(self):
+        """Removes the background from several photos (stacked U2-Net batches when available, else one at a time)."""
+        paths = filedialog.askopenfilenames(
+            title="Select photos",
+            filetypes=[("Image files", "*.png *.jpg *.jpeg *.bmp *.tiff *.webp"), ("All files", "*.*")]
+        )
+        if not paths:
+            return
+        output_dir = filedialog.askdirectory(title="Select the output folder")
+        if not output_dir:
+            return
+
+        def job(token):
+            progress = self.new_progress("Batch Remove Background")
+            images = [Image.open(path).convert("RGB") for path in paths]
+            start = time.time()
+            remover = self.batch_background_remover()
+            runner = background_remover_batch(remover)
+            results = runner.run(images, progress)
+            elapsed = time.time() - start
+            for path, image, result in zip(paths, images, results):
+                token.check()
+                if result.mode != "RGBA":
+                    result = result.convert("RGBA")
+                if remover is not self.batch_bg_remover:
+                    # Cheia măștii descrie modelul interactiv; măștile U2-Net pe loturi nu se amestecă
+                    self.mask_cache.put(self.background_mask_key(image), result.getchannel("A"))
+                result.save(os.path.join(output_dir, f"{Path(path).stem}_no_bg.png"))
+            rate = len(images) / elapsed if elapsed > 0 else float("inf")
+            mode = "batched" if runner.is_batched else "one at a time"
+            return lambda: self.update_info(f"Removed background from {len(images)} photos "
+                                            f"({rate:.2f} images/s, {mode}).\nSaved to: {output_dir}")
+
+        self.submit_ai_job("Batch Remove Background", job, key=("Batch Remove Background", tuple(paths)))
     
-    def generative_fill(self):
-        """Applies generative fill only on the background if it has been removed (RGBA image with transparency)."""
-        # Show prompt dialog
+    def ask_fill_prompt(self):
+        """Asks how to fill the image; returns the prompt, or None if cancelled."""
         class PromptDialog(tk.Toplevel):
             def __init__(self, master):
                 super().__init__(master)
@@ -1412,64 +2020,192 @@ Size: {os.path.getsize(self.image_path) / (1024*1024):.2f} MB"""
 
         dialog = PromptDialog(self.root)
         self.root.wait_window(dialog)
-        prompt = dialog.result
+        return dialog.result
+
+    def fill_with_seeds(self, image, prompt, seeds, progress=None):
+        """Generative fill for each seed; cached results are reused, the missing seeds run in one call."""
+        seeded = accepts_keyword(self.model_target(self.gen_fill).get().fill, "seed")
+        # If the image has an alpha channel (background removed), only the background is filled
+        mask = np.array(image.getchannel("A")) == 0 if image.mode == "RGBA" else None
+
+        def compute(missing):
+            # Modelul primește doar zona găurii (+ context), nu întreaga imagine
+            return self.run_pipeline(
+                ai_pipelines.generative_fill, [self.gen_fill], image, mask, prompt, missing,
+                steps=self.gen_fill_steps,
+                native=self.gen_fill_native_resolution,
+                margin=self.gen_fill_context_margin,
+                progress=progress
+            )
+
+        return self.fill_cache.fill_seeds(image, mask, prompt, seeds, self.gen_fill_steps,
+                                          self.gen_fill.source_version(), compute, deterministic=seeded,
+                                          native=self.gen_fill_native_resolution,
+                                          margin=self.gen_fill_context_margin)
+
+    def generative_fill(self):
+        """Applies generative fill only on the background if it has been removed (RGBA image with transparency)."""
+        prompt = self.ask_fill_prompt()
         if prompt is None:
             self.update_info("Generative fill cancelled.")
             return
-        def fill_background_only(image):
-            # If the image has an alpha channel (background removed)
-            if image.mode == "RGBA":
-                import numpy as np
-                from PIL import Image
-                arr = np.array(image)
-                alpha = arr[..., 3]
-                mask = (alpha == 0)
-                gen_filled = self.gen_fill.fill(image.convert("RGB"), prompt=prompt)
-                gen_filled = gen_filled.convert("RGBA").resize(image.size)
-                gen_arr = np.array(gen_filled)
-                result_arr = arr.copy()
-                result_arr[mask] = gen_arr[mask]
-                result = Image.fromarray(result_arr, mode="RGBA")
-                return result.convert("RGB")
-            else:
-                return self.gen_fill.fill(image, prompt=prompt)
+        seed = self.gen_fill_seed
+
+        def fill_background_only(image, progress):
+            return self.fill_with_seeds(image, prompt, [seed], progress)[0]
         self.run_ai_operation(fill_background_only, "Generative Fill")
-    
-    def generative_fill_simple(self):
-        """Applies simple generative fill (OpenCV inpainting, no AI) to the current image."""
+
+    def generative_fill_variations(self):
+        """Generates several seeded fills in one batched call and lets the user pick one."""
         if not self.current_image:
-            messagebox.showwarning("Warning", "No image loaded!")
+            messagebox.showwarning("Warning", "Please load an image first!")
             return
-        self.push_undo("Generative Fill (No AI)")
-        result = self.gen_fill.generative_fill_no_ai(self.current_image)
-        self.current_image = result
-        self._current_operation = "Generative Fill (No AI)"
-        self.display_image()
-        self.update_info("Simple generative fill applied (no AI).")
+        prompt = self.ask_fill_prompt()
+        if prompt is None:
+            self.update_info("Generative fill cancelled.")
+            return
+        image = self.current_image
+        seeds = [self.gen_fill_seed + offset for offset in range(self.gen_fill_variations)]
+
+        def job(token):
+            progress = self.new_progress("Fill Variations")
+            progress.start()
+            self.post_info(f"Generating {len(seeds)} fill variations...")
+            outputs = self.fill_with_seeds(image, prompt, seeds, progress)
+            token.check()
+            return lambda: self.show_fill_variations(image, seeds, outputs)
+
+        self.submit_ai_job("Fill Variations", job, key=("Fill Variations", id(image), prompt))
+
+    def show_fill_variations(self, source, seeds, outputs):
+        """Shows the fill variations side by side; clicking one applies it."""
+        window = tk.Toplevel(self.root)
+        window.title("Pick a variation")
+        window.resizable(False, False)
+
+        def pick(seed, output):
+            window.destroy()
+            if self.current_image is not source:
+                self.update_info("The image changed meanwhile; variation not applied.")
+                return
+            self.push_undo("Generative Fill")
+            self.current_image = output
+            self._current_operation = "Generative Fill"
+            # Umplerile următoare (și reluările) folosesc seed-ul ales
+            self.gen_fill_seed = seed
+            self.display_image()
+            self.update_info(f"Generative fill variation applied (seed {seed}).")
+
+        window.thumbnails = []
+        for column, (seed, output) in enumerate(zip(seeds, outputs)):
+            thumbnail = output.copy()
+            thumbnail.thumbnail((240, 240), Image.LANCZOS)
+            photo = ImageTk.PhotoImage(thumbnail)
+            window.thumbnails.append(photo)
+            tk.Button(window, image=photo, command=lambda seed=seed, output=output: pick(seed, output)
+                      ).grid(row=0, column=column, padx=5, pady=(10, 2))
+            tk.Label(window, text=f"Seed {seed}").grid(row=1, column=column, pady=(0, 10))
+    
+    def generative_fill_simple(self):
+        """Fills the transparent areas with multi-scale OpenCV inpainting (no AI), off the Tk thread."""
+        def inpaint(image, progress):
+            if image.mode == "RGBA":
+                mask = np.array(image.getchannel("A")) == 0
+                if mask.any():
+                    return inpaint_multiscale(image, mask, progress=progress)
+            return self.call_model(self.gen_fill, "generative_fill_no_ai", image, progress=progress)
+        self.run_ai_operation(inpaint, "Generative Fill (No AI)")
     
     def recognize_image(self):
         """Recognizes the content of the image."""
-        def recognize():
-            if self.current_image:
-                try:
-                    self.progress.set(0.5)
-                    description = self.img_recognition.recognize(self.current_image)
-                    self.update_info(f"Image Recognition:\n\n{description}")
-                    self.progress.set(1.0)
-                except Exception as e:
-                    messagebox.showerror("Error", f"Recognition error: {e}")
-                finally:
-                    self.progress.set(0)
-            else:
-                messagebox.showwarning("Warning", "Please load an image first!")
-        
-        threading.Thread(target=recognize, daemon=True).start()
+        if not self.current_image:
+            messagebox.showwarning("Warning", "Please load an image first!")
+            return
+
+        image = self.current_image
+
+        def job(token):
+            self.new_progress("Image Recognition").start()
+            result = self.recognition_cache.recognize(self.model_target(self.img_recognition), image)
+            token.check()
+            description = result["description"]
+            return lambda: self.update_info(f"Image Recognition:\n\n{description}")
+
+        self.submit_ai_job("Image Recognition", job, key=("Image Recognition", id(image)))
     
+    def get_embedding_index(self):
+        """Opens the local CLIP embedding index on first use."""
+        if self.embedding_index is None:
+            self.embedding_index = EmbeddingIndex()
+        return self.embedding_index
+
+    def index_photo_folder(self):
+        """Computes CLIP embeddings for a folder of photos as a background AI job, batch by batch."""
+        folder = filedialog.askdirectory(title="Select a photo folder to index")
+        if not folder:
+            return
+        index = self.get_embedding_index()
+        indexer = FolderIndexer(index, lambda images: embed_images(self.model_target(self.img_recognition), images))
+
+        def job(token):
+            # Rulează în executorul AI: nu concurează cu alte inferențe, iar Cancel o oprește între loturi
+            self.post_info("Indexing photos...")
+            progress = self.new_progress("Indexing photos")
+            progress.start(unit="images")
+            count = indexer.index_folder(folder, progress_callback=progress.update, check=token.check)
+            return lambda: self.update_info(f"Indexed {count} new or changed photos ({len(index)} in index).")
+
+        # Aceeași cheie: un director ales din nou cât timp așteaptă în coadă nu este indexat de două ori
+        self.submit_ai_job("Index Photo Folder", job, key=("index", folder), priority=JobPriority.BACKGROUND)
+
+    def show_search_results(self, title, results):
+        """Shows similarity search results in the info panel."""
+        if not results:
+            self.update_info(f"{title}:\n\nNo indexed photos. Use 'Index Photo Folder' first.")
+            return
+        lines = [f"{score:.3f}  {Path(path).name}\n       {Path(path).parent}" for path, score in results]
+        self.update_info(f"{title}:\n\n" + "\n".join(lines))
+
+    def find_similar_images(self):
+        """Finds the indexed photos most similar to the current image."""
+        if not self.current_image:
+            messagebox.showwarning("Warning", "Please load an image first!")
+            return
+        image = self.current_image.convert("RGB")
+
+        def job(token):
+            self.post_info("Searching similar images...")
+            image.thumbnail((224, 224), Image.Resampling.BICUBIC)
+            query = embed_images(self.model_target(self.img_recognition), [image])[0]
+            token.check()
+            results = self.get_embedding_index().search(query, k=10)
+            return lambda: self.show_search_results("Similar images", results)
+
+        self.submit_ai_job("Find Similar Images", job, key=("Find Similar Images", id(self.current_image)))
+
+    def search_photos(self):
+        """Finds indexed photos matching a text description (CLIP text-to-image search)."""
+        import tkinter.simpledialog
+        text = tkinter.simpledialog.askstring("Search Photos", "Describe the photo you are looking for:",
+                                              parent=self.root)
+        if not text:
+            return
+
+        def job(token):
+            self.post_info(f"Searching photos for '{text}'...")
+            query = embed_text(self.model_target(self.img_recognition), text)
+            token.check()
+            results = self.get_embedding_index().search(query, k=10)
+            return lambda: self.show_search_results(f"Photos matching '{text}'", results)
+
+        self.submit_ai_job("Search Photos", job, key=("Search Photos", text))
+
     def reset_image(self):
         """Resets the image to its original state and resets adjustment sliders."""
         if self.original_image:
             self.push_undo("Reset Image")
             self.current_image = self.original_image.copy()
+            self._lossless_ops = []
             self._current_operation = "Reset Image"
             # Also resets sliders if they exist
             if hasattr(self, '_reset_sliders_ref') and callable(self._reset_sliders_ref):
@@ -1547,13 +2283,19 @@ Size: {os.path.getsize(self.image_path) / (1024*1024):.2f} MB"""
         """Funcție apelată când se închide aplicația."""
         # Salvează istoricul înainte de închidere
         self.save_history_to_file()
+        self.model_warmup.save_usage()
+        self.ai_executor.shutdown()
+        self.image_loader.shutdown()
+        if self.ai_worker is not None:
+            self.ai_worker.shutdown()
         self.root.destroy()
 
     def rotate_image(self):
         """Rotește imaginea cu 90° la dreapta și salvează pentru undo."""
         if self.current_image:
-            self.push_undo("Rotate 90°")
-            self.current_image = self.current_image.rotate(-90, expand=True)
+            # Rotire exactă prin transpose (fără reeșantionare)
+            self.push_undo("Rotate 90°", lossless_op=("transpose", Image.Transpose.ROTATE_270))
+            self.current_image = self.current_image.transpose(Image.Transpose.ROTATE_270)
             self._current_operation = "Rotate 90°"
             self.display_image()
             self.update_info("Image rotated 90° to the right.")
@@ -1563,7 +2305,7 @@ Size: {os.path.getsize(self.image_path) / (1024*1024):.2f} MB"""
     def mirror_image(self):
         """Reflectă imaginea pe orizontală (mirror) și salvează pentru undo."""
         if self.current_image:
-            self.push_undo("Mirror")
+            self.push_undo("Mirror", lossless_op=("transpose", Image.Transpose.FLIP_LEFT_RIGHT))
             self.current_image = self.current_image.transpose(Image.FLIP_LEFT_RIGHT)
             self._current_operation = "Mirror"
             self.display_image()
@@ -1574,7 +2316,7 @@ Size: {os.path.getsize(self.image_path) / (1024*1024):.2f} MB"""
     def flip_vertical_image(self):
         """Reflectă imaginea pe verticală (flip vertical) și salvează pentru undo."""
         if self.current_image:
-            self.push_undo("Flip Vertical")
+            self.push_undo("Flip Vertical", lossless_op=("transpose", Image.Transpose.FLIP_TOP_BOTTOM))
             self.current_image = self.current_image.transpose(Image.FLIP_TOP_BOTTOM)
             self._current_operation = "Flip Vertical"
             self.display_image()
@@ -1629,7 +2371,7 @@ Size: {os.path.getsize(self.image_path) / (1024*1024):.2f} MB"""
             ry2 = int(y2 * scale_y)
             w, h = rx2 - rx1, ry2 - ry1
             if w > 0 and h > 0 and rx2 <= self.current_image.width and ry2 <= self.current_image.height:
-                self.push_undo("Crop")
+                self.push_undo("Crop", lossless_op=("crop", (rx1, ry1, rx2, ry2)))
                 self.current_image = self.current_image.crop((rx1, ry1, rx2, ry2))
                 self._current_operation = "Crop"
                 self.display_image()
@@ -1647,6 +2389,9 @@ Size: {os.path.getsize(self.image_path) / (1024*1024):.2f} MB"""
         if not self.current_image:
             messagebox.showwarning("Warning", "No image to export!")
             return
+        if self.large_document is not None:
+            self.export_large_document()
+            return
         file_path = filedialog.asksaveasfilename(
             title="Export image as...",
             defaultextension=".png",
@@ -1662,6 +2407,12 @@ Size: {os.path.getsize(self.image_path) / (1024*1024):.2f} MB"""
                 ext = os.path.splitext(file_path)[1].lower()
                 format_map = {".jpg": "JPEG", ".jpeg": "JPEG", ".png": "PNG", ".webp": "WEBP"}
                 fmt = format_map.get(ext, "PNG")
+                # Doar rotiri/oglindiri/crop pe un JPEG: export fără decodare și re-encodare
+                if fmt == "JPEG" and self._lossless_ops is not None and self.image_path:
+                    if export_lossless_jpeg(self.image_path, self._lossless_ops, file_path):
+                        self.add_to_file_history(file_path)
+                        messagebox.showinfo("Success", "Image exported as JPEG (lossless)!")
+                        return
                 save_kwargs = {}
                 if fmt == "JPEG":
                     save_kwargs["quality"] = 95
@@ -1671,6 +2422,39 @@ Size: {os.path.getsize(self.image_path) / (1024*1024):.2f} MB"""
             except Exception as e:
                 messagebox.showerror("Error", f"Could not export image: {e}")
     
+    def export_large_document(self):
+        """Exports a tiled document: the filters run tile by tile and the file is written in strips."""
+        file_path = filedialog.asksaveasfilename(
+            title="Export image as...",
+            defaultextension=".tif",
+            filetypes=[("TIFF", "*.tif;*.tiff"), ("PNG", "*.png")]
+        )
+        if not file_path:
+            return
+        if os.path.splitext(file_path)[1].lower() not in STRIP_EXPORT_FORMATS:
+            messagebox.showerror("Error", "Large images can only be exported as TIFF or PNG.")
+            return
+        document, pipeline = self.large_document, self.large_pipeline
+
+        def job(token):
+            result = pipeline.run(document)
+            try:
+                token.check()
+                saved = result.save(file_path)
+            finally:
+                if result is not document:
+                    result.close()
+
+            def done():
+                if not saved:
+                    messagebox.showerror("Error", "Could not export image.")
+                    return
+                self.add_to_file_history(file_path)
+                messagebox.showinfo("Success", f"Image exported tile by tile to {Path(file_path).name}!")
+            return done
+
+        self.submit_ai_job("Export Large Image", job, key=("Export Large Image", file_path))
+
     def add_to_file_history(self, file_path):
         """Adaugă un fișier în istoricul de fișiere salvate."""
         import time
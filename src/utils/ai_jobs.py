@@ -0,0 +1,216 @@
+import gc
+import heapq
+import itertools
+import threading
+import time
+
+
+class JobCancelled(Exception):
+    """Ridicată în interiorul unei operații AI când aceasta a fost anulată."""
+
+
+class JobPriority:
+    """Prioritățile joburilor (valoare mai mică = rulează mai întâi)."""
+    INTERACTIVE = 0   # Operații pornite de utilizator
+    NORMAL = 1
+    BACKGROUND = 2    # Preîncărcări, indexare
+
+
+class CancelToken:
+    """Semnal de anulare cooperativă, verificat de operație între pași."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        self._event.set()
+
+    def check(self):
+        """Ridică JobCancelled dacă jobul a fost anulat."""
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+class AIJob:
+    """Un job AI din coadă: funcția, prioritatea, starea și rezultatul."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, name, func, priority, key, on_done):
+        self.name = name
+        self.func = func
+        self.priority = priority
+        self.key = key
+        self.on_done = on_done
+        self.token = CancelToken()
+        self.state = self.PENDING
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self._finished = threading.Event()
+
+    def wait(self, timeout=None):
+        """Așteaptă terminarea jobului; returnează True dacă s-a terminat."""
+        return self._finished.wait(timeout)
+
+    @property
+    def finished(self):
+        return self._finished.is_set()
+
+
+class AIJobExecutor:
+    """
+    Executor pentru operațiile AI: un număr limitat de workeri și o coadă cu priorități.
+
+    Joburile identice (aceeași cheie) aflate încă în așteptare nu se adaugă de două ori.
+    Anularea este cooperativă: jobul în așteptare este scos din coadă, iar cel care
+    rulează primește semnalul prin CancelToken (verificat cu check_cancelled()).
+    Referințele unui job terminat sau anulat sunt eliberate imediat.
+    """
+
+    def __init__(self, max_workers=1):
+        """
+        Args:
+            max_workers (int): Numărul maxim de joburi rulate simultan
+        """
+        self.max_workers = max_workers
+        self._queue = []  # (prioritate, număr de ordine, job)
+        self._counter = itertools.count()
+        self._pending_keys = {}
+        self._running = set()
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._shutdown = False
+        self._workers = [
+            threading.Thread(target=self._worker, daemon=True, name=f"ai-job-{i}")
+            for i in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, name, func, priority=JobPriority.NORMAL, key=None, on_done=None):
+        """
+        Adaugă un job în coadă.
+
+        Args:
+            name (str): Numele operației
+            func (callable): Funcția jobului, apelată cu CancelToken-ul jobului
+            priority (int): Prioritatea (JobPriority)
+            key (hashable): Cheia de deduplicare; un job în așteptare cu aceeași cheie este reutilizat
+            on_done (callable): Apelată cu jobul după terminare (inclusiv eroare sau anulare)
+
+        Returns:
+            AIJob: Jobul nou sau jobul identic aflat deja în așteptare
+        """
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Executorul a fost oprit")
+            if key is not None and key in self._pending_keys:
+                return self._pending_keys[key]
+            job = AIJob(name, func, priority, key, on_done)
+            heapq.heappush(self._queue, (priority, next(self._counter), job))
+            if key is not None:
+                self._pending_keys[key] = job
+            self._condition.notify()
+            return job
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._shutdown:
+                    self._condition.wait()
+                if self._shutdown and not self._queue:
+                    return
+                _, _, job = heapq.heappop(self._queue)
+                if job.state == AIJob.CANCELLED:
+                    continue
+                if job.key is not None:
+                    self._pending_keys.pop(job.key, None)
+                job.state = AIJob.RUNNING
+                self._running.add(job)
+            self._run(job)
+
+    def _run(self, job):
+        self._local.token = job.token
+        try:
+            job.token.check()
+            job.result = job.func(job.token)
+            job.state = AIJob.DONE
+        except JobCancelled:
+            job.state = AIJob.CANCELLED
+        except Exception as e:
+            job.error = e
+            job.state = AIJob.FAILED
+        finally:
+            self._local.token = None
+            with self._condition:
+                self._running.discard(job)
+            self._finish(job)
+
+    def _finish(self, job):
+        if job.on_done is not None:
+            try:
+                job.on_done(job)
+            except Exception as e:
+                print(f"Eroare în callback-ul jobului {job.name}: {e}")
+        # Eliberează imaginile și modelele reținute de closure și de rezultat
+        job.func = None
+        job.on_done = None
+        job.result = None
+        job._finished.set()
+        if job.state == AIJob.CANCELLED:
+            gc.collect()
+
+    def current_token(self):
+        """CancelToken-ul jobului care rulează pe thread-ul curent (sau None)."""
+        return getattr(self._local, "token", None)
+
+    def check_cancelled(self):
+        """Ridică JobCancelled dacă jobul de pe thread-ul curent a fost anulat."""
+        token = self.current_token()
+        if token is not None:
+            token.check()
+
+    def cancel(self, job):
+        """
+        Anulează un job: cel în așteptare este scos din coadă, cel care rulează
+        este semnalizat și se oprește la următoarea verificare.
+        """
+        with self._condition:
+            job.token.cancel()
+            if job.state != AIJob.PENDING:
+                return
+            job.state = AIJob.CANCELLED
+            if job.key is not None and self._pending_keys.get(job.key) is job:
+                del self._pending_keys[job.key]
+            self._queue = [item for item in self._queue if item[2] is not job]
+            heapq.heapify(self._queue)
+        self._finish(job)
+
+    def cancel_all(self):
+        """Anulează toate joburile, în așteptare și în curs."""
+        with self._condition:
+            jobs = [item[2] for item in self._queue] + list(self._running)
+        for job in jobs:
+            self.cancel(job)
+
+    def active_count(self):
+        """Numărul de joburi în așteptare sau în curs."""
+        with self._condition:
+            return len(self._queue) + len(self._running)
+
+    def shutdown(self, cancel_pending=True):
+        """Oprește workerii; joburile în așteptare sunt anulate."""
+        if cancel_pending:
+            self.cancel_all()
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
@@ -0,0 +1,107 @@
+from .inpaint_regions import fill_masked_regions, fill_accepts_mask
+from .mask_upsampling import remove_background_proxy
+from .progress import accepts_keyword
+from .tiled_upscaler import TiledUpscaler
+
+
+# Operațiile AI complete (pre-procesare, inferență, post-procesare). Primesc modelele ca
+# prime argumente, deci rulează la fel în procesul editorului și în procesul AI
+# (AIWorker.run), unde împărțirea în plăci, îmbinarea și rafinarea măștii nu mai
+# concurează cu interfața pentru GIL.
+
+
+def call_model(model, method_name, *args, progress=None, **kwargs):
+    """Apelează o metodă a modelului, transmițând progresul doar dacă metoda îl acceptă."""
+    if progress is not None and accepts_keyword(getattr(model.get(), method_name), "progress"):
+        kwargs["progress"] = progress
+    return getattr(model, method_name)(*args, **kwargs)
+
+
+def tiled_upscale(upscaler, image, tile_size, overlap, max_workers=None, progress=None):
+    """
+    Mărește imaginea placă cu placă, cu îmbinare pe zonele suprapuse.
+
+    Args:
+        upscaler: Modelul de mărire (LazyModel)
+        image (PIL.Image): Imaginea de mărit
+        tile_size (int): Latura plăcii, în pixeli
+        overlap (int): Suprapunerea dintre plăci, în pixeli
+        max_workers (int): Numărul maxim de plăci procesate simultan
+        progress (ProgressReporter): Progresul, în plăci
+
+    Returns:
+        PIL.Image: Imaginea mărită
+    """
+    upscaler = TiledUpscaler(upscaler.upscale, tile_size=tile_size, overlap=overlap, max_workers=max_workers)
+    if progress is None:
+        return upscaler.upscale(image)
+    progress.start(unit="tiles")
+    return upscaler.upscale(image, progress_callback=progress.update)
+
+
+def remove_background(remover, image, proxy_max_side=None, progress=None):
+    """
+    Elimină fundalul, la rezoluție completă sau pe un proxy cu masca mărită ghidat.
+
+    Args:
+        remover: Modelul de eliminare a fundalului (LazyModel)
+        image (PIL.Image): Imaginea
+        proxy_max_side (int): Latura maximă a proxy-ului (None = rezoluție completă)
+        progress (ProgressReporter): Progresul modelului, opțional
+
+    Returns:
+        PIL.Image: Imaginea RGBA
+    """
+    if proxy_max_side:
+        result = remove_background_proxy(
+            lambda proxy, progress=None: call_model(remover, "remove_background", proxy, progress=progress),
+            image, max_side=proxy_max_side, progress=progress)
+    else:
+        result = call_model(remover, "remove_background", image, progress=progress)
+    return result if result.mode == "RGBA" else result.convert("RGBA")
+
+
+def generative_fill(generator, image, mask, prompt, seeds, steps=None, native=512, margin=64, progress=None):
+    """
+    Umplerea generativă pentru fiecare seed; cu mască, modelul primește doar zonele găurilor.
+
+    Args:
+        generator: Modelul de umplere generativă (LazyModel)
+        image (PIL.Image): Imaginea de intrare
+        mask (np.ndarray): Masca booleană (None = întreaga imagine)
+        prompt (str): Promptul
+        seeds (list): Seed-urile; modelele fără seed rulează o dată pentru fiecare
+        steps (int): Numărul de pași de difuzie (dacă modelul îl acceptă)
+        native (int): Rezoluția nativă a modelului
+        margin (int): Contextul din jurul fiecărei zone, în pixeli
+        progress (ProgressReporter): Progresul, opțional
+
+    Returns:
+        list: Câte o imagine pentru fiecare seed
+    """
+    model = generator.get()
+    seeded = accepts_keyword(model.fill, "seed")
+    batched = seeded and callable(getattr(model, "fill_batch", None))
+    pass_mask = fill_accepts_mask(model.fill)
+    options = {"prompt": prompt}
+    if steps is not None and accepts_keyword(model.fill, "steps"):
+        options["steps"] = steps
+
+    def fill(region, mask=None, progress=None):
+        kwargs = dict(options)
+        if pass_mask and mask is not None:
+            kwargs["mask"] = mask
+        if batched:
+            return call_model(generator, "fill_batch", region, seeds=seeds, progress=progress, **kwargs)
+        outputs = []
+        for index, seed in enumerate(seeds):
+            if seeded:
+                kwargs["seed"] = seed
+            child = progress.child(index / len(seeds), (index + 1) / len(seeds)) if progress else None
+            outputs.append(call_model(generator, "fill", region, progress=child, **kwargs))
+        return outputs
+
+    if mask is None:
+        return fill(image, progress=progress)
+    outputs = fill_masked_regions(image, mask, fill, native=native, margin=margin, progress=progress)
+    return outputs if isinstance(outputs, list) else [outputs] * len(seeds)
@@ -0,0 +1,505 @@
+import importlib
+import inspect
+import itertools
+import multiprocessing
+import queue
+import threading
+import traceback
+from multiprocessing import shared_memory
+
+from PIL import Image
+
+from .ai_jobs import JobCancelled
+from .lazy_imports import lazy_import
+from .lazy_models import LazyModel
+from .progress import ProgressReporter, accepts_keyword
+
+np = lazy_import("numpy")
+
+# Modurile transferate direct ca tablou (h, w[, c]) uint8; celelalte sunt convertite
+_ARRAY_MODES = ("L", "RGB", "RGBA")
+
+
+class AIWorkerError(Exception):
+    """Eroare raportată de procesul AI (excepția modelului sau oprirea procesului)."""
+
+
+class SharedArray:
+    """Descrierea unui tablou din memoria partajată; doar aceasta trece prin canalul de mesaje."""
+
+    def __init__(self, name, shape, dtype, image=False):
+        self.name = name
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self.image = image
+
+
+def share_array(array, image=False):
+    """
+    Copiază un tablou într-un bloc nou de memorie partajată.
+
+    Returns:
+        tuple: (SharedMemory, SharedArray); blocul trebuie închis și eliberat de creator
+    """
+    array = np.ascontiguousarray(array)
+    block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, SharedArray(block.name, array.shape, array.dtype.str, image)
+
+
+def read_shared(ref, unlink=False):
+    """
+    Copiază conținutul unui bloc partajat într-un tablou (sau imagine) local.
+
+    Args:
+        ref (SharedArray): Descrierea blocului
+        unlink (bool): Eliberează blocul după citire (cititorul este ultimul utilizator)
+    """
+    block = shared_memory.SharedMemory(name=ref.name)
+    try:
+        array = np.ndarray(ref.shape, dtype=np.dtype(ref.dtype), buffer=block.buf).copy()
+    finally:
+        block.close()
+        if unlink:
+            block.unlink()
+    return Image.fromarray(array) if ref.image else array
+
+
+def pack_value(value, blocks):
+    """
+    Înlocuiește imaginile și tablourile (inclusiv din liste, tupluri și dicționare)
+    cu SharedArray; blocurile create sunt adăugate în `blocks`.
+    """
+    if isinstance(value, Image.Image):
+        if value.mode not in _ARRAY_MODES:
+            value = value.convert("RGBA" if "A" in value.getbands() or "transparency" in value.info else "RGB")
+        block, ref = share_array(np.asarray(value), image=True)
+        blocks.append(block)
+        return ref
+    if type(value).__module__ == "numpy" and type(value).__name__ == "ndarray":
+        block, ref = share_array(value)
+        blocks.append(block)
+        return ref
+    if isinstance(value, (list, tuple)):
+        return type(value)(pack_value(item, blocks) for item in value)
+    if isinstance(value, dict):
+        return {key: pack_value(item, blocks) for key, item in value.items()}
+    return value
+
+
+def unpack_value(value, unlink=False):
+    """Operația inversă lui pack_value: citește blocurile partajate."""
+    if isinstance(value, SharedArray):
+        return read_shared(value, unlink=unlink)
+    if isinstance(value, (list, tuple)):
+        return type(value)(unpack_value(item, unlink) for item in value)
+    if isinstance(value, dict):
+        return {key: unpack_value(item, unlink) for key, item in value.items()}
+    return value
+
+
+def _release(blocks, unlink):
+    for block in blocks:
+        try:
+            block.close()
+            if unlink:
+                block.unlink()
+        except Exception:
+            pass
+
+
+def describe_methods(instance):
+    """
+    Metodele publice ale unui model, cu parametrii lor: nume -> [(parametru, tip, are valoare implicită)].
+    Permit reconstruirea semnăturii în procesul interfeței (accepts_keyword, hasattr).
+    """
+    methods = {}
+    for name in dir(instance):
+        if name.startswith("_"):
+            continue
+        try:
+            attribute = getattr(instance, name)
+        except Exception:
+            continue
+        if not callable(attribute):
+            continue
+        try:
+            parameters = inspect.signature(attribute).parameters.values()
+            methods[name] = [(p.name, p.kind.name, p.default is not p.empty) for p in parameters]
+        except (TypeError, ValueError):
+            methods[name] = [("args", "VAR_POSITIONAL", False), ("kwargs", "VAR_KEYWORD", False)]
+    return methods
+
+
+def _worker_main(conn, models, package, model_options):
+    """
+    Bucla procesului AI: modelele rămân încărcate între cereri.
+
+    Un thread primește mesajele (cereri, anulări, eliberări de blocuri), iar
+    thread-ul principal execută cererile pe rând.
+    """
+    options = model_options or (lambda display_name: {})
+    lazy_models = {name: LazyModel(name, module_name, class_name, package=package, **options(name))
+                   for name, (module_name, class_name) in models.items()}
+    requests = queue.Queue()
+    cancelled = set()
+    results = {}  # id -> blocurile rezultatului, ținute până când interfața le-a citit
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            conn.send(message)
+
+    def receive():
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                message = ("stop",)
+            kind = message[0]
+            if kind == "cancel":
+                cancelled.add(message[1])
+            elif kind == "release":
+                _release(results.pop(message[1], []), unlink=False)
+            else:
+                requests.put(message)
+                if kind == "stop":
+                    return
+
+    threading.Thread(target=receive, daemon=True, name="ai-worker-receive").start()
+
+    def reporter(request_id):
+        def check():
+            if request_id in cancelled:
+                raise JobCancelled()
+
+        def forward(info):
+            send(("progress", request_id, info.stage, info.done, info.total, info.unit))
+        return ProgressReporter(forward, min_interval=0.05, check=check)
+
+    def share_result(request_id, value):
+        blocks = []
+        value = pack_value(value, blocks)
+        if blocks:
+            results[request_id] = blocks
+        return value
+
+    def execute(kind, request_id, model_name, *rest):
+        if kind == "run":
+            # O operație completă: funcția primește modelele locale ale procesului AI
+            module_name, function_name = model_name
+            model_names, args, kwargs, wants_progress = rest
+            function = getattr(importlib.import_module(module_name), function_name)
+            args = [lazy_models[name] for name in model_names] + list(unpack_value(args))
+            kwargs = unpack_value(kwargs)
+            if wants_progress:
+                kwargs["progress"] = reporter(request_id)
+            return share_result(request_id, function(*args, **kwargs))
+
+        model = lazy_models[model_name]
+        if kind == "describe":
+            return describe_methods(model.get())
+        if kind == "preload":
+            model.get()
+            return True
+        if kind == "unload":
+            if model.residency is not None:
+                return model.residency.evict(model_name)
+            loaded, model._instance = model._instance is not None, None
+            return loaded
+
+        method_name, args, kwargs, wants_progress = rest
+        method = getattr(model, method_name)
+        args = unpack_value(args)
+        kwargs = unpack_value(kwargs)
+        if wants_progress and accepts_keyword(getattr(model.get(), method_name), "progress"):
+            kwargs["progress"] = reporter(request_id)
+        return share_result(request_id, method(*args, **kwargs))
+
+    while True:
+        message = requests.get()
+        if message[0] == "stop":
+            break
+        request_id = message[1]
+        try:
+            send(("result", request_id, execute(*message)))
+        except JobCancelled:
+            send(("cancelled", request_id))
+        except Exception as e:
+            send(("error", request_id, type(e).__name__, str(e), traceback.format_exc()))
+        finally:
+            cancelled.discard(request_id)
+    for blocks in results.values():
+        _release(blocks, unlink=False)
+
+
+class RemoteModel:
+    """
+    Un model din procesul AI, folosit ca un LazyModel: metodele sunt apelate în
+    proces, cu imaginile transferate prin memorie partajată. Semnăturile metodelor
+    sunt cele reale (accepts_keyword funcționează ca pentru modelul local).
+    """
+
+    def __init__(self, worker, display_name):
+        self.worker = worker
+        self.display_name = display_name
+
+    @property
+    def is_loaded(self):
+        return self.display_name in self.worker.loaded_models
+
+    @property
+    def state(self):
+        return f"{LazyModel.READY} (AI process)" if self.is_loaded else LazyModel.NOT_LOADED
+
+    def get(self):
+        return self
+
+    def preload(self):
+        try:
+            self.worker.preload(self.display_name)
+            return True
+        except Exception as e:
+            print(f"Eroare la preîncărcarea modelului {self.display_name} în procesul AI: {e}")
+            return False
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        methods = self.worker.describe(self.display_name)
+        if name not in methods:
+            raise AttributeError(f"{self.display_name} nu are metoda {name}")
+
+        def remote(*args, **kwargs):
+            return self.worker.call(self.display_name, name, *args, **kwargs)
+        remote.__name__ = name
+        remote.__signature__ = inspect.Signature([
+            inspect.Parameter(param, getattr(inspect.Parameter, kind),
+                              default=None if has_default else inspect.Parameter.empty)
+            for param, kind, has_default in methods[name]
+        ])
+        return remote
+
+
+class AIWorker:
+    """
+    Proces separat, persistent, pentru inferența AI.
+
+    Pre/post-procesarea și inferența nu mai concurează cu interfața pentru GIL,
+    iar o eroare în codul nativ (torch, drivere) oprește doar procesul AI, care
+    este repornit la următoarea cerere. Pixelii trec prin blocuri
+    multiprocessing.shared_memory; prin canalul de mesaje trec doar descrieri mici
+    (nume de bloc, formă, progres).
+    """
+
+    def __init__(self, models, package=None, model_options=None, start_method="spawn"):
+        """
+        Args:
+            models (dict): nume -> (modul, clasă), ca pentru LazyModel
+            package (str): Pachetul de referință pentru importurile relative
+            model_options (callable): Apelată în procesul AI cu numele modelului; returnează
+                                      argumentele suplimentare ale LazyModel (trebuie să fie picklable)
+            start_method (str): Metoda de pornire a procesului ("spawn" este sigură cu Tk și thread-uri)
+        """
+        self.models = dict(models)
+        self.package = package
+        self.model_options = model_options
+        self.context = multiprocessing.get_context(start_method)
+        self.loaded_models = set()
+        self._process = None
+        self._conn = None
+        self._pending = {}
+        self._methods = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._send_lock = threading.Lock()
+
+    @property
+    def is_alive(self):
+        return self._process is not None and self._process.is_alive()
+
+    def start(self):
+        """Pornește procesul AI (dacă nu rulează deja)."""
+        with self._lock:
+            if self.is_alive:
+                return
+            parent_conn, child_conn = self.context.Pipe()
+            process = self.context.Process(
+                target=_worker_main, name="ai-worker", daemon=True,
+                args=(child_conn, self.models, self.package, self.model_options),
+            )
+            process.start()
+            child_conn.close()
+            self._process, self._conn = process, parent_conn
+            self._methods.clear()
+            self.loaded_models.clear()
+            threading.Thread(target=self._receive, args=(process, parent_conn),
+                             daemon=True, name="ai-worker-replies").start()
+
+    def _receive(self, process, conn):
+        """Distribuie răspunsurile procesului către cererile în așteptare."""
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            replies = self._pending.get(message[1])
+            if replies is not None:
+                replies.put(message)
+        process.join(1)
+        with self._lock:
+            if self._process is process:
+                self._process = None
+                self.loaded_models.clear()
+            failed = list(self._pending.items())
+        reason = f"Procesul AI s-a oprit neașteptat (cod {process.exitcode})"
+        for request_id, replies in failed:
+            replies.put(("error", request_id, "AIWorkerError", reason, ""))
+
+    def _send(self, conn, message):
+        with self._send_lock:
+            conn.send(message)
+
+    def _request(self, message, progress=None):
+        """Trimite o cerere și așteaptă răspunsul, aplicând progresul pe thread-ul apelant."""
+        with self._lock:
+            self.start()
+            request_id = next(self._ids)
+            replies = self._pending[request_id] = queue.Queue()
+            conn = self._conn
+        try:
+            self._send(conn, (message[0], request_id) + tuple(message[1:]))
+            stage = None
+            cancelled = False
+            while True:
+                reply = replies.get()
+                if reply[0] != "progress":
+                    break
+                if progress is None or cancelled:
+                    continue
+                _, _, name, done, total, unit = reply
+                try:
+                    if stage != (name, total, unit):
+                        stage = (name, total, unit)
+                        progress.start(total, unit)
+                    progress.update(done)
+                except JobCancelled:
+                    # Procesul AI se oprește la următorul pas raportat
+                    cancelled = True
+                    self._send(conn, ("cancel", request_id))
+        finally:
+            self._pending.pop(request_id, None)
+
+        kind = reply[0]
+        if kind == "result":
+            value = reply[2]
+            try:
+                value = unpack_value(value, unlink=True)
+            finally:
+                try:
+                    self._send(conn, ("release", request_id))
+                except OSError:
+                    pass
+            if cancelled:
+                raise JobCancelled()
+            return value
+        if kind == "cancelled":
+            raise JobCancelled()
+        _, _, error_type, error_message, details = reply
+        if details:
+            print(f"Eroare în procesul AI:\n{details}")
+        raise AIWorkerError(f"{error_type}: {error_message}")
+
+    def call(self, model_name, method_name, *args, progress=None, **kwargs):
+        """
+        Apelează o metodă a unui model în procesul AI.
+
+        Args:
+            model_name (str): Numele modelului (cheie din `models`)
+            method_name (str): Metoda apelată
+            progress (ProgressReporter): Primește progresul raportat de model, opțional;
+                                         anularea lui (JobCancelled) oprește și cererea
+
+        Returns:
+            Rezultatul metodei (imaginile și tablourile sunt copiate din memoria partajată)
+        """
+        blocks = []
+        try:
+            packed_args = pack_value(args, blocks)
+            packed_kwargs = pack_value(kwargs, blocks)
+            result = self._request(("call", model_name, method_name, packed_args, packed_kwargs,
+                                    progress is not None), progress)
+        finally:
+            _release(blocks, unlink=True)
+        self.loaded_models.add(model_name)
+        return result
+
+    def run(self, function, model_names, *args, progress=None, **kwargs):
+        """
+        Rulează în procesul AI o operație completă, nu doar apelul modelului.
+
+        Pre/post-procesarea (plăci, îmbinare, rafinarea măștii) rulează astfel lângă
+        model, fără să țină GIL-ul procesului interfeței.
+
+        Args:
+            function (callable): Funcție la nivel de modul, importabilă în procesul AI;
+                                 apelată cu modelele locale ca prime argumente
+            model_names (list): Numele modelelor transmise funcției
+            progress (ProgressReporter): Primește progresul funcției (argumentul `progress`)
+
+        Returns:
+            Rezultatul funcției (imaginile și tablourile sunt copiate din memoria partajată)
+        """
+        model_names = list(model_names)
+        blocks = []
+        try:
+            packed_args = pack_value(args, blocks)
+            packed_kwargs = pack_value(kwargs, blocks)
+            result = self._request(("run", (function.__module__, function.__name__), model_names,
+                                    packed_args, packed_kwargs, progress is not None), progress)
+        finally:
+            _release(blocks, unlink=True)
+        self.loaded_models.update(model_names)
+        return result
+
+    def describe(self, model_name):
+        """Metodele modelului și parametrii lor (încarcă modelul în procesul AI)."""
+        methods = self._methods.get(model_name)
+        if methods is None:
+            methods = self._request(("describe", model_name))
+            self._methods[model_name] = methods
+            self.loaded_models.add(model_name)
+        return methods
+
+    def preload(self, model_name):
+        """Încarcă modelul în procesul AI fără a-l folosi."""
+        self._request(("preload", model_name))
+        self.loaded_models.add(model_name)
+
+    def unload(self, model_name):
+        """Descarcă modelul din procesul AI (dacă procesul rulează)."""
+        if not self.is_alive:
+            return False
+        self.loaded_models.discard(model_name)
+        return self._request(("unload", model_name))
+
+    def model(self, model_name):
+        """Un RemoteModel pentru modelul dat."""
+        return RemoteModel(self, model_name)
+
+    def shutdown(self, timeout=5):
+        """Oprește procesul AI; modelele sunt eliberate odată cu el."""
+        with self._lock:
+            process, conn = self._process, self._conn
+            self._process = None
+        if process is None:
+            return
+        try:
+            self._send(conn, ("stop",))
+        except OSError:
+            pass
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout)
+        conn.close()
@@ -0,0 +1,460 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from PIL import Image
+
+from .image_processor import ImageProcessor
+from .processing_backend import ProcessingSession, load_backend_profile
+from .tiled_document import STRIP_EXPORT_FORMATS, TILE_OPERATIONS, TiledDocument, TiledPipeline, is_large_image
+
+
+VALID_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.tif', '.webp'}
+
+EXPORT_FORMATS = {
+    "png": ("PNG", ".png"),
+    "jpg": ("JPEG", ".jpg"),
+    "jpeg": ("JPEG", ".jpg"),
+    "webp": ("WEBP", ".webp"),
+    "tiff": ("TIFF", ".tiff"),
+    "bmp": ("BMP", ".bmp"),
+}
+
+# Pașii de rețetă: nume -> (metoda ImageProcessor, convertor pentru argumentele din rețetă)
+RECIPE_STEPS = {
+    "auto_enhance": ("auto_enhance", lambda args: {}),
+    "sepia": ("apply_sepia", lambda args: {}),
+    "grayscale": ("convert_to_grayscale", lambda args: {}),
+    "sharpen": ("apply_sharpen", lambda args: {}),
+    "blur": ("apply_blur", lambda args: {"radius": float(args[0])} if args else {}),
+    "brightness": ("enhance_brightness", lambda args: {"factor": float(args[0])} if args else {}),
+    "contrast": ("enhance_contrast", lambda args: {"factor": float(args[0])} if args else {}),
+    "saturation": ("enhance_saturation", lambda args: {"factor": float(args[0])} if args else {}),
+    "rotate": ("rotate_image", lambda args: {"angle": float(args[0]) if args else 90.0}),
+    "flip_h": ("flip_horizontal", lambda args: {}),
+    "flip_v": ("flip_vertical", lambda args: {}),
+    "resize": ("resize_for_display", lambda args: _parse_size(args[0] if args else "1920x1080")),
+}
+
+# Rețeta cu care a fost produsă fiecare ieșire (în directorul de ieșire)
+MANIFEST_NAME = ".batch_manifest.json"
+
+# Memorie estimată per imagine în lucru: imaginea decodată plus copiile făcute de pași
+_COPIES_PER_IMAGE = 3
+
+_processor = None
+
+
+def _parse_size(text):
+    width, _, height = text.lower().partition("x")
+    return {"max_width": int(width), "max_height": int(height or width)}
+
+
+def parse_recipe(recipe):
+    """
+    Parsează o rețetă de forma "auto_enhance,resize:1280x720,sepia,export:webp:85".
+
+    Args:
+        recipe (str): Pașii separați prin virgulă; argumentele separate prin ':'
+
+    Returns:
+        tuple: (lista de pași (metodă, parametri), formatul de export sau None, calitatea)
+    """
+    steps = []
+    export_format = None
+    quality = 95
+    for token in [t.strip() for t in recipe.split(",") if t.strip()]:
+        name, *args = token.split(":")
+        name = name.lower()
+        if name == "export":
+            if not args or args[0].lower() not in EXPORT_FORMATS:
+                raise ValueError(f"Format de export necunoscut: {token}")
+            export_format = args[0].lower()
+            if len(args) > 1:
+                quality = int(args[1])
+            continue
+        if name not in RECIPE_STEPS:
+            raise ValueError(f"Pas necunoscut în rețetă: {name}")
+        method_name, parse_args = RECIPE_STEPS[name]
+        steps.append((method_name, parse_args(args)))
+    return steps, export_format, quality
+
+
+def collect_inputs(inputs):
+    """
+    Găsește fișierele imagine dintr-o listă de directoare, fișiere sau glob-uri.
+
+    Returns:
+        list: Căile fișierelor, sortate și fără duplicate
+    """
+    files = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            candidates = path.iterdir()
+        elif path.is_file():
+            candidates = [path]
+        else:
+            candidates = (Path(p) for p in glob.glob(item, recursive=True))
+        for candidate in candidates:
+            if candidate.is_file() and candidate.suffix.lower() in VALID_EXTENSIONS:
+                files.add(str(candidate))
+    return sorted(files)
+
+
+def output_path_for(input_path, output_dir, export_format, keep_extension=False):
+    """
+    Calea fișierului de ieșire pentru o imagine de intrare.
+
+    Args:
+        keep_extension (bool): Păstrează extensia sursă în nume (a.jpg -> a_jpg.webp)
+    """
+    input_path = Path(input_path)
+    suffix = EXPORT_FORMATS[export_format][1] if export_format else input_path.suffix
+    stem = input_path.stem
+    if keep_extension and input_path.suffix:
+        stem += "_" + input_path.suffix.lstrip(".").lower()
+    return str(Path(output_dir) / (stem + suffix))
+
+
+def plan_outputs(input_files, output_dir, export_format):
+    """
+    Căile de ieșire, fără ca două intrări să scrie în același fișier.
+
+    Intrările cu același nume și extensii diferite (a.jpg, a.png exportate ca webp)
+    își păstrează extensia sursă în nume (a_jpg.webp, a_png.webp). Intrările care tot
+    ar scrie în același fișier (ex: același nume în directoare diferite) nu sunt procesate.
+
+    Returns:
+        tuple: (intrare -> ieșire, intrare -> mesajul de eroare al conflictului)
+    """
+    def collisions(outputs):
+        groups = {}
+        for input_path, output_path in outputs.items():
+            groups.setdefault(os.path.normcase(output_path), []).append(input_path)
+        return [inputs for inputs in groups.values() if len(inputs) > 1]
+
+    outputs = {path: output_path_for(path, output_dir, export_format) for path in input_files}
+    for inputs in collisions(outputs):
+        for path in inputs:
+            outputs[path] = output_path_for(path, output_dir, export_format, keep_extension=True)
+    conflicts = {}
+    for inputs in collisions(outputs):
+        for path in inputs:
+            others = ", ".join(other for other in inputs if other != path)
+            conflicts[path] = f"Ieșirea {outputs.pop(path)} ar fi scrisă și de: {others}"
+    return outputs, conflicts
+
+
+def recipe_hash(steps, export_format, quality):
+    """Hash-ul rețetei (pași, parametri, format, calitate) care produce ieșirile."""
+    recipe = json.dumps([[name, params] for name, params in steps] + [export_format, quality], sort_keys=True)
+    return hashlib.sha256(recipe.encode("utf-8")).hexdigest()[:16]
+
+
+def load_manifest(output_dir):
+    """Rețetele ieșirilor existente: nume fișier -> hash-ul rețetei."""
+    try:
+        with open(Path(output_dir) / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Eroare la citirea manifestului lotului: {e}")
+        return {}
+
+
+def save_manifest(output_dir, manifest):
+    """Salvează rețetele ieșirilor (scriere atomică)."""
+    path = Path(output_dir) / MANIFEST_NAME
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Eroare la salvarea manifestului lotului: {e}")
+
+
+def is_up_to_date(input_path, output_path, recipe=None, manifest=None):
+    """
+    True dacă ieșirea există, este mai nouă decât intrarea și (dacă `recipe` este dat)
+    a fost produsă cu aceeași rețetă, conform manifestului.
+    """
+    if recipe is not None and (manifest or {}).get(os.path.basename(output_path)) != recipe:
+        return False
+    try:
+        return os.path.getmtime(output_path) >= os.path.getmtime(input_path)
+    except OSError:
+        return False
+
+
+def estimate_memory(input_path):
+    """Estimează memoria necesară procesării unei imagini, citind doar antetul."""
+    try:
+        with Image.open(input_path) as img:
+            return img.width * img.height * 4 * _COPIES_PER_IMAGE
+    except Exception:
+        return os.path.getsize(input_path) * _COPIES_PER_IMAGE
+
+
+def tiled_operations(steps):
+    """
+    Pașii rețetei ca operații TiledPipeline.
+
+    Returns:
+        list: (operație, parametri), sau None dacă un pas nu poate rula pe tile-uri (ex: rotate)
+    """
+    operations_by_method = {method: name for name, (method, _, _) in TILE_OPERATIONS.items()}
+    operations = []
+    for method_name, params in steps:
+        if method_name not in operations_by_method:
+            return None
+        operations.append((operations_by_method[method_name], params))
+    return operations
+
+
+def process_tiled(input_path, output_path, operations):
+    """
+    Procesează o imagine foarte mare pe tile-uri (TiledDocument): pixelii rămân pe disc,
+    iar ieșirea (TIFF sau PNG) este scrisă pe benzi.
+
+    Returns:
+        tuple: (octeți citiți, octeți scriși)
+    """
+    pipeline = TiledPipeline(_processor)
+    for operation, params in operations:
+        pipeline.add(operation, **params)
+    file_format = STRIP_EXPORT_FORMATS[Path(output_path).suffix.lower()]
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp_path = output_path + ".tmp"
+    with TiledDocument.open(input_path) as document:
+        result = pipeline.run(document)
+        try:
+            if not result.save(tmp_path, file_format=file_format):
+                raise OSError(f"Exportul pe benzi a eșuat: {output_path}")
+        finally:
+            if result is not document:
+                result.close()
+    os.replace(tmp_path, output_path)
+    return os.path.getsize(input_path), os.path.getsize(output_path)
+
+
+def process_file(input_path, output_path, steps, export_format, quality, backend="auto", profile=None):
+    """
+    Procesează o singură imagine (rulează în procesul de lucru).
+
+    Pașii rulează pe un buffer numpy (ProcessingSession); imaginea PIL este
+    reconstruită o singură dată, la export. Imaginile foarte mari, exportate ca
+    TIFF/PNG cu pași disponibili pe tile-uri, sunt procesate out-of-core (process_tiled).
+
+    Returns:
+        tuple: (octeți citiți, octeți scriși)
+    """
+    global _processor
+    if _processor is None:
+        _processor = ImageProcessor()
+
+    if Path(output_path).suffix.lower() in STRIP_EXPORT_FORMATS and is_large_image(input_path):
+        operations = tiled_operations(steps)
+        if operations is not None:
+            return process_tiled(input_path, output_path, operations)
+
+    with Image.open(input_path) as img:
+        img.load()
+        session = ProcessingSession(img, backend=backend, profile=profile, processor=_processor)
+        for method_name, params in steps:
+            session.apply(method_name, **params)
+        image = session.to_image()
+
+        if export_format:
+            fmt = EXPORT_FORMATS[export_format][0]
+        else:
+            fmt = img.format or "PNG"
+        save_kwargs = {}
+        if fmt in ("JPEG", "WEBP"):
+            save_kwargs["quality"] = quality
+        if fmt == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        # Scrie într-un fișier temporar ca o ieșire întreruptă să nu pară actualizată
+        tmp_path = output_path + ".tmp"
+        image.save(tmp_path, format=fmt, **save_kwargs)
+        os.replace(tmp_path, output_path)
+
+    return os.path.getsize(input_path), os.path.getsize(output_path)
+
+
+class BatchProcessor:
+    """Procesare în lot a imaginilor într-un pool de procese, cu memorie în lucru limitată."""
+
+    def __init__(self, recipe, output_dir, max_workers=None, memory_budget_mb=1024, force=False, backend="auto"):
+        self.steps, self.export_format, self.quality = parse_recipe(recipe)
+        self.recipe_hash = recipe_hash(self.steps, self.export_format, self.quality)
+        self.backend = backend
+        # Profilul se încarcă o singură dată aici, nu în fiecare proces de lucru
+        self.profile = load_backend_profile() if backend == "auto" else None
+        self.output_dir = output_dir
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.force = force
+
+    def run(self, input_files, progress_callback=None):
+        """
+        Procesează fișierele în paralel.
+
+        Args:
+            input_files (list): Căile imaginilor de procesat
+            progress_callback (callable): Apelată cu statisticile după fiecare imagine
+
+        Returns:
+            dict: Statistici (procesate, sărite, eșuate, imagini/s, MB/s)
+        """
+        outputs, conflicts = plan_outputs(input_files, self.output_dir, self.export_format)
+        manifest = load_manifest(self.output_dir)
+        jobs = []
+        skipped = 0
+        for input_path in input_files:
+            output_path = outputs.get(input_path)
+            if output_path is None:
+                continue
+            if not self.force and is_up_to_date(input_path, output_path, self.recipe_hash, manifest):
+                skipped += 1
+                continue
+            jobs.append((input_path, output_path))
+
+        stats = {
+            "total": len(input_files), "processed": 0, "skipped": skipped, "failed": len(conflicts),
+            "bytes_in": 0, "bytes_out": 0, "elapsed": 0.0,
+            "images_per_second": 0.0, "mb_per_second": 0.0, "errors": list(conflicts.items()),
+        }
+        start = time.time()
+        pending = {}
+        in_flight_bytes = 0
+        queue = list(reversed(jobs))
+
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            while queue or pending:
+                # Trimite joburi cât timp bugetul de memorie permite (cel puțin unul)
+                while queue and len(pending) < self.max_workers * 2:
+                    input_path, output_path = queue[-1]
+                    cost = estimate_memory(input_path)
+                    if pending and in_flight_bytes + cost > self.memory_budget:
+                        break
+                    queue.pop()
+                    try:
+                        future = executor.submit(process_file, input_path, output_path,
+                                                 self.steps, self.export_format, self.quality,
+                                                 self.backend, self.profile)
+                    except BrokenProcessPool:
+                        # Pool-ul s-a stricat între două rezultate: jobul este reluat într-unul nou
+                        executor = self._replace_executor(executor)
+                        queue.append((input_path, output_path))
+                        continue
+                    pending[future] = (input_path, output_path, cost, executor)
+                    in_flight_bytes += cost
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    input_path, output_path, cost, pool = pending.pop(future)
+                    in_flight_bytes -= cost
+                    name = os.path.basename(output_path)
+                    try:
+                        bytes_in, bytes_out = future.result()
+                        manifest[name] = self.recipe_hash
+                        stats["processed"] += 1
+                        stats["bytes_in"] += bytes_in
+                        stats["bytes_out"] += bytes_out
+                    except BrokenProcessPool:
+                        # Un proces de lucru a murit (ex: memorie epuizată, eroare în decodorul nativ);
+                        # toate imaginile aflate atunci în lucru sunt raportate ca eșuate
+                        broken = broken or pool is executor
+                        manifest.pop(name, None)
+                        stats["failed"] += 1
+                        stats["errors"].append((input_path, "Procesul de lucru s-a oprit neașteptat"))
+                    except Exception as e:
+                        manifest.pop(name, None)
+                        stats["failed"] += 1
+                        stats["errors"].append((input_path, str(e)))
+                if broken:
+                    executor = self._replace_executor(executor)
+
+                stats["elapsed"] = time.time() - start
+                if stats["elapsed"] > 0:
+                    stats["images_per_second"] = stats["processed"] / stats["elapsed"]
+                    stats["mb_per_second"] = stats["bytes_in"] / (1024 * 1024) / stats["elapsed"]
+                if progress_callback:
+                    progress_callback(stats)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        stats["elapsed"] = time.time() - start
+        if jobs:
+            save_manifest(self.output_dir, manifest)
+        return stats
+
+    def _replace_executor(self, executor):
+        """Un pool nou în locul celui stricat (procesele rămase ale celui vechi sunt oprite)."""
+        executor.shutdown(wait=False, cancel_futures=True)
+        return ProcessPoolExecutor(max_workers=self.max_workers)
+
+
+def _print_progress(stats):
+    done = stats["processed"] + stats["failed"]
+    todo = stats["total"] - stats["skipped"]
+    sys.stdout.write(
+        f"\r[{done}/{todo}] {stats['images_per_second']:.2f} img/s, "
+        f"{stats['mb_per_second']:.2f} MB/s, failed: {stats['failed']}"
+    )
+    sys.stdout.flush()
+
+
+def main(argv=None):
+    """Punctul de intrare pentru `python main.py batch ...`."""
+    parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        description="Batch-process images with an ImageProcessor recipe (no UI)."
+    )
+    parser.add_argument("inputs", nargs="+", help="Directories, files or glob patterns")
+    parser.add_argument("-r", "--recipe", required=True,
+                        help="Comma-separated steps, e.g. auto_enhance,resize:1920x1080,sepia,export:webp")
+    parser.add_argument("-o", "--output-dir", default="processed", help="Output directory")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--memory-mb", type=int, default=1024, help="Budget for images in flight")
+    parser.add_argument("--force", action="store_true", help="Reprocess outputs that are up to date")
+    parser.add_argument("--backend", choices=["auto", "pil", "opencv"], default="auto",
+                        help="Processing backend (auto = fastest per operation, from the benchmark profile)")
+    args = parser.parse_args(argv)
+
+    try:
+        processor = BatchProcessor(args.recipe, args.output_dir, args.jobs, args.memory_mb, args.force, args.backend)
+    except ValueError as e:
+        print(f"Eroare: {e}")
+        return 2
+
+    files = collect_inputs(args.inputs)
+    if not files:
+        print("No input images found.")
+        return 1
+
+    print(f"Processing {len(files)} image(s) with {processor.max_workers} worker(s)...")
+    stats = processor.run(files, progress_callback=_print_progress)
+    print()
+    for input_path, error in stats["errors"]:
+        print(f"❌ {input_path}: {error}")
+    print(f"✅ Processed: {stats['processed']} | Skipped (up to date): {stats['skipped']} | "
+          f"Failed: {stats['failed']} | {stats['elapsed']:.1f}s | "
+          f"{stats['images_per_second']:.2f} img/s | {stats['mb_per_second']:.2f} MB/s")
+    return 1 if stats["failed"] else 0
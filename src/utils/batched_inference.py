@@ -0,0 +1,229 @@
+import math
+import time
+
+from PIL import Image
+
+from .lazy_imports import lazy_import
+from .model_residency import available_ram_bytes
+
+np = lazy_import("numpy")
+
+
+def bucket_size(size, granularity=64):
+    """Dimensiunea găleții: lățimea și înălțimea rotunjite în sus la multiplu de `granularity`."""
+    width, height = size
+    return (int(math.ceil(width / granularity)) * granularity,
+            int(math.ceil(height / granularity)) * granularity)
+
+
+def size_buckets(images, granularity=64):
+    """
+    Grupează imaginile după dimensiunea rotunjită, ca un lot să conțină imagini
+    care necesită puțină bordare până la o dimensiune comună.
+
+    Returns:
+        dict: dimensiunea găleții -> lista indicilor imaginilor
+    """
+    buckets = {}
+    for index, image in enumerate(images):
+        buckets.setdefault(bucket_size(image.size, granularity), []).append(index)
+    return buckets
+
+
+def pad_image(image, size):
+    """
+    Bordează imaginea (în dreapta și jos) până la dimensiunea dată, replicând marginea,
+    ca modelul să nu vadă o bandă artificială de culoare uniformă.
+    """
+    if image.size == tuple(size):
+        return image
+    array = np.asarray(image)
+    pad = [(0, size[1] - image.height), (0, size[0] - image.width)] + [(0, 0)] * (array.ndim - 2)
+    return Image.fromarray(np.pad(array, pad, mode="edge"))
+
+
+def crop_output(output, original_size, padded_size):
+    """
+    Decupează din rezultatul unei imagini bordate zona imaginii originale.
+
+    Rezultatele care nu sunt imagini (text, dicționare) sunt returnate neschimbate;
+    rezultatele mărite (upscale) sunt decupate proporțional.
+    """
+    if not isinstance(output, Image.Image):
+        return output
+    scale_x = output.width / padded_size[0]
+    scale_y = output.height / padded_size[1]
+    return output.crop((0, 0, int(round(original_size[0] * scale_x)), int(round(original_size[1] * scale_y))))
+
+
+def choose_batch_size(item_bytes, max_batch=16, memory_fraction=0.25, available_bytes=None):
+    """
+    Alege mărimea lotului după memoria disponibilă.
+
+    Args:
+        item_bytes (int): Memoria estimată per imagine (intrare + activări)
+        max_batch (int): Limita superioară
+        memory_fraction (float): Fracțiunea din memoria disponibilă folosită de un lot
+        available_bytes (int): Memoria disponibilă; implicit citită din sistem
+
+    Returns:
+        int: Mărimea lotului (cel puțin 1)
+    """
+    available = available_bytes if available_bytes is not None else available_ram_bytes()
+    if not available or item_bytes <= 0:
+        return 1
+    return int(max(1, min(max_batch, available * memory_fraction // item_bytes)))
+
+
+def measure_throughput(fn, images, repeats=1):
+    """
+    Măsoară debitul unei funcții care procesează o listă de imagini.
+
+    Returns:
+        float: Imagini pe secundă (cel mai bun rezultat din `repeats`)
+    """
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(images)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(images) / best if best else float("inf")
+
+
+def stacked_batch_fn(preprocess, predict, postprocess):
+    """
+    Construiește o funcție de lot care rulează modelul o singură dată pe un tensor stivuit.
+
+    Un wrapper de model obține inferența reală pe loturi expunând rezultatul ca
+    remove_background_batch (ex: U2NetBatchRemover): pre-procesarea aduce imaginile
+    unui lot la aceeași formă, deci tablourile pot fi stivuite pe prima axă.
+
+    Args:
+        preprocess (callable): image -> np.ndarray, aceeași formă pentru imaginile unui lot
+        predict (callable): np.ndarray (N, ...) -> ieșirile modelului, indexabile pe prima axă
+        postprocess (callable): (ieșirea unei imagini, imaginea) -> rezultat
+
+    Returns:
+        callable: list[image] -> list[rezultat]
+    """
+    def batch_fn(images):
+        outputs = predict(np.stack([preprocess(image) for image in images]))
+        return [postprocess(outputs[index], image) for index, image in enumerate(images)]
+    return batch_fn
+
+
+class BatchInference:
+    """
+    Rulează un model pe mai multe imagini, pe loturi.
+
+    Imaginile sunt grupate după dimensiune; în fiecare lot sunt bordate la dimensiunea
+    comună a găleții (dacă modelul cere tensori de aceeași dimensiune), iar rezultatele
+    sunt decupate înapoi și returnate în ordinea inițială. Mărimea lotului este aleasă
+    după memoria disponibilă. Fără funcție de lot (batch_fn), imaginile se procesează
+    una câte una și nu există câștig de debit.
+
+    Pentru modelele cu intrare fixă (input_size), care redimensionează oricum fiecare
+    imagine, toate imaginile formează o singură găleată și nu se bordează.
+    """
+
+    def __init__(self, single_fn, batch_fn=None, pad=True, granularity=64, max_batch=16,
+                 bytes_per_pixel=256, memory_fraction=0.25, input_size=None):
+        """
+        Args:
+            single_fn (callable): image -> rezultat
+            batch_fn (callable): list[image] -> list[rezultat] (opțional)
+            pad (bool): Bordează imaginile unui lot la aceeași dimensiune
+            granularity (int): Pasul dimensiunilor găleților, în pixeli
+            max_batch (int): Mărimea maximă a lotului
+            bytes_per_pixel (int): Memoria estimată per pixel de intrare (activările modelului)
+            memory_fraction (float): Fracțiunea din memoria disponibilă folosită de un lot
+            input_size (tuple): Dimensiunea fixă a intrării modelului (opțional)
+        """
+        self.single_fn = single_fn
+        self.batch_fn = batch_fn
+        self.pad = pad and input_size is None
+        self.input_size = tuple(input_size) if input_size is not None else None
+        self.granularity = granularity
+        self.max_batch = max_batch
+        self.bytes_per_pixel = bytes_per_pixel
+        self.memory_fraction = memory_fraction
+
+    @property
+    def is_batched(self):
+        """True dacă modelul are o funcție de lot (altfel run procesează imaginile una câte una)."""
+        return self.batch_fn is not None
+
+    def batch_size_for(self, size):
+        """Mărimea lotului pentru imagini de dimensiunea dată."""
+        return choose_batch_size(size[0] * size[1] * self.bytes_per_pixel, self.max_batch, self.memory_fraction)
+
+    def run(self, images, progress=None):
+        """
+        Procesează imaginile.
+
+        Args:
+            images (list): Imaginile PIL
+            progress (ProgressReporter): Raportorul de progres (opțional)
+
+        Returns:
+            list: Rezultatele, în ordinea imaginilor
+        """
+        results = [None] * len(images)
+        if progress is not None:
+            progress.start(total=len(images), unit="images")
+        done = 0
+        if self.batch_fn is None:
+            for index, image in enumerate(images):
+                results[index] = self.single_fn(image)
+                done += 1
+                if progress is not None:
+                    progress.update(done)
+            return results
+
+        if self.input_size is not None:
+            buckets = {self.input_size: list(range(len(images)))} if images else {}
+        else:
+            buckets = size_buckets(images, self.granularity)
+        for size, indices in sorted(buckets.items()):
+            batch_size = self.batch_size_for(size)
+            for start in range(0, len(indices), batch_size):
+                chunk = indices[start:start + batch_size]
+                batch = [pad_image(images[i], size) if self.pad else images[i] for i in chunk]
+                outputs = list(self.batch_fn(batch))
+                if len(outputs) != len(chunk):
+                    raise ValueError(f"Modelul a returnat {len(outputs)} rezultate pentru {len(chunk)} imagini")
+                for i, padded, output in zip(chunk, batch, outputs):
+                    results[i] = crop_output(output, images[i].size, padded.size) if self.pad else output
+                done += len(chunk)
+                if progress is not None:
+                    progress.update(done)
+        return results
+
+    def compare_throughput(self, images, repeats=1):
+        """
+        Compară debitul pe loturi cu procesarea imagine cu imagine.
+
+        Fără funcție de lot, ambele măsurători rulează aceeași cale (imagine cu imagine).
+
+        Returns:
+            dict: single_ips, batched_ips, speedup, batched (există o funcție de lot)
+        """
+        single = measure_throughput(lambda items: [self.single_fn(image) for image in items], images, repeats)
+        batched = measure_throughput(self.run, images, repeats)
+        return {"single_ips": single, "batched_ips": batched, "speedup": batched / single if single else None,
+                "batched": self.is_batched}
+
+
+def background_remover_batch(remover, **kwargs):
+    """
+    BatchInference pentru eliminarea fundalului: folosește remove_background_batch
+    dacă modelul o oferă (ex: U2NetBatchRemover), altfel procesează imaginile una câte una.
+    Un model cu intrare fixă (input_size) primește loturi de dimensiuni mixte; altfel
+    măștile sunt la rezoluția intrării, deci imaginile se bordează.
+    """
+    batch_fn = getattr(remover, "remove_background_batch", None)
+    if not callable(batch_fn) or not getattr(remover, "supports_batch", True):
+        batch_fn = None
+    kwargs.setdefault("input_size", getattr(remover, "input_size", None))
+    return BatchInference(remover.remove_background, batch_fn, pad=True, **kwargs)
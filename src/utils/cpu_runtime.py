@@ -0,0 +1,264 @@
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+from .quantization import find_torch_modules, set_attribute_path
+
+
+class RuntimeProfile:
+    """Configurația de execuție pe CPU: fire de execuție, format de memorie, torch.compile."""
+
+    def __init__(self, intra_threads=None, inter_threads=1, channels_last=True, compile=False):
+        """
+        Args:
+            intra_threads (int): Fire pentru un operator (None = toate nucleele)
+            inter_threads (int): Fire pentru operatori independenți
+            channels_last (bool): Format NHWC pentru modelele convoluționale
+            compile (bool): torch.compile pentru modelele convoluționale, dacă este disponibil
+        """
+        self.intra_threads = intra_threads or os.cpu_count() or 1
+        self.inter_threads = inter_threads
+        self.channels_last = channels_last
+        self.compile = compile
+
+    def to_dict(self):
+        return {"intra_threads": self.intra_threads, "inter_threads": self.inter_threads,
+                "channels_last": self.channels_last, "compile": self.compile}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("intra_threads"), data.get("inter_threads", 1),
+                   data.get("channels_last", True), data.get("compile", False))
+
+    def __repr__(self):
+        return (f"RuntimeProfile(threads={self.intra_threads}/{self.inter_threads}, "
+                f"channels_last={self.channels_last}, compile={self.compile})")
+
+
+def machine_signature():
+    """Identifică mașina și versiunea PyTorch; profilul calibrat este valabil doar pentru ele."""
+    try:
+        import torch
+        torch_version = torch.__version__
+    except ImportError:
+        torch_version = None
+    return {"cpu_count": os.cpu_count(), "processor": platform.processor() or platform.machine(),
+            "torch": torch_version}
+
+
+def has_convolutions(module):
+    """True dacă modulul conține straturi convoluționale (beneficiază de channels_last)."""
+    import torch
+
+    return any(isinstance(m, (torch.nn.Conv2d, torch.nn.ConvTranspose2d)) for m in module.modules())
+
+
+def compile_available():
+    """True dacă torch.compile poate fi folosit pe această platformă."""
+    import torch
+
+    return hasattr(torch, "compile") and sys.platform != "win32"
+
+
+def synthetic_benchmark(profile, repeats=3):
+    """
+    Timpul median pentru o rețea de test: bloc convoluțional (ca upscaler-ul) și
+    bloc de straturi Linear (ca encoderele BLIP/CLIP).
+
+    Returns:
+        float: Secunde per iterație
+    """
+    import torch
+
+    torch.manual_seed(0)
+    conv = torch.nn.Sequential(*[layer for _ in range(4) for layer in
+                                 (torch.nn.Conv2d(32, 32, 3, padding=1), torch.nn.LeakyReLU(0.2))]).eval()
+    linear = torch.nn.Sequential(torch.nn.Linear(512, 2048), torch.nn.GELU(), torch.nn.Linear(2048, 512)).eval()
+    image = torch.randn(1, 32, 128, 128)
+    tokens = torch.randn(64, 512)
+    if profile.channels_last:
+        conv = conv.to(memory_format=torch.channels_last)
+        image = image.contiguous(memory_format=torch.channels_last)
+    if profile.compile and compile_available():
+        conv = torch.compile(conv)
+
+    times = []
+    with torch.inference_mode():
+        for iteration in range(repeats + 1):
+            start = time.perf_counter()
+            conv(image)
+            linear(tokens)
+            if iteration:  # Prima iterație include compilarea și alocările
+                times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+class CpuRuntime:
+    """
+    Configurează execuția PyTorch pe CPU pentru modelele AI.
+
+    Setează numărul de fire, pregătește modelele încărcate (eval, channels_last pentru
+    rețelele convoluționale, opțional torch.compile) și oferă contextul de inferență
+    (torch.inference_mode). Profilul cel mai rapid pentru mașina curentă este ales
+    printr-o calibrare și salvat lângă modele (cpu_profile.json).
+    """
+
+    def __init__(self, models_dir):
+        """
+        Args:
+            models_dir (str): Directorul modelelor (profilul calibrat se salvează aici)
+        """
+        self.profile_path = Path(models_dir) / "cpu_profile.json"
+        self.profile = None
+        self.calibration = None
+        self._threads_applied = False
+        self._lock = threading.Lock()
+
+    def load_profile(self):
+        """
+        Profilul salvat, dacă a fost calibrat pe aceeași mașină și versiune PyTorch.
+
+        Returns:
+            RuntimeProfile: Profilul salvat sau None
+        """
+        try:
+            if self.profile_path.exists():
+                with open(self.profile_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("machine") == machine_signature():
+                    self.calibration = data.get("results")
+                    return RuntimeProfile.from_dict(data["profile"])
+        except Exception as e:
+            print(f"Eroare la citirea profilului CPU: {e}")
+        return None
+
+    @property
+    def is_calibrated(self):
+        return self.load_profile() is not None
+
+    def activate(self):
+        """
+        Aplică profilul (salvat sau implicit). Numărul de fire inter-op poate fi
+        setat o singură dată per proces, înainte de prima inferență.
+
+        Returns:
+            RuntimeProfile: Profilul activ
+        """
+        with self._lock:
+            if self.profile is None:
+                self.profile = self.load_profile() or RuntimeProfile()
+            if not self._threads_applied:
+                self._apply_threads(self.profile, inter_op=True)
+                self._threads_applied = True
+            return self.profile
+
+    def _apply_threads(self, profile, inter_op=False):
+        import torch
+
+        torch.set_num_threads(profile.intra_threads)
+        if inter_op:
+            try:
+                torch.set_num_interop_threads(profile.inter_threads)
+            except RuntimeError:
+                pass  # Deja setat sau inferența a început
+
+    def prepare(self, instance):
+        """
+        Pregătește un model încărcat pentru inferența pe CPU.
+
+        Args:
+            instance: Instanța modelului (modulele PyTorch sunt găsite în atributele ei)
+
+        Returns:
+            Instanța pregătită
+        """
+        import torch
+
+        profile = self.activate()
+        for path, module in find_torch_modules(instance):
+            if callable(getattr(module, "eval", None)):
+                module.eval()
+            if not has_convolutions(module):
+                continue
+            if profile.channels_last:
+                module.to(memory_format=torch.channels_last)
+            if profile.compile and compile_available():
+                # Doar rețelele convoluționale: sunt apelate direct (forward), nu prin generate()
+                set_attribute_path(instance, path, torch.compile(module))
+        return instance
+
+    def inference(self):
+        """
+        Contextul pentru un apel de inferență: torch.inference_mode dacă torch este
+        deja încărcat (altfel un context gol, fără a importa torch).
+        """
+        torch = sys.modules.get("torch")
+        if torch is None:
+            return contextlib.nullcontext()
+        return torch.inference_mode()
+
+    def candidate_profiles(self):
+        """Profilurile încercate la calibrare."""
+        cores = os.cpu_count() or 1
+        thread_counts = sorted({1, max(cores // 2, 1), cores})
+        candidates = []
+        for threads in thread_counts:
+            for channels_last in (False, True):
+                candidates.append(RuntimeProfile(threads, 1, channels_last, False))
+        if compile_available():
+            candidates.append(RuntimeProfile(cores, 1, True, True))
+        return candidates
+
+    def calibrate(self, benchmark=None, candidates=None, repeats=3):
+        """
+        Măsoară profilurile candidate și salvează profilul cel mai rapid.
+
+        Args:
+            benchmark (callable): benchmark(profile) -> secunde; implicit synthetic_benchmark
+            candidates (list): Profilurile încercate; implicit candidate_profiles()
+            repeats (int): Repetările per profil
+
+        Returns:
+            RuntimeProfile: Profilul ales
+        """
+        benchmark = benchmark or (lambda profile: synthetic_benchmark(profile, repeats))
+        candidates = candidates or self.candidate_profiles()
+        results = []
+        try:
+            for profile in candidates:
+                self._apply_threads(profile)
+                try:
+                    seconds = benchmark(profile)
+                except Exception as e:
+                    print(f"Eroare la calibrarea profilului {profile}: {e}")
+                    continue
+                results.append({"profile": profile.to_dict(), "seconds": seconds})
+        finally:
+            if self.profile is not None:
+                self._apply_threads(self.profile)
+        if not results:
+            return self.activate()
+
+        best = min(results, key=lambda result: result["seconds"])
+        with self._lock:
+            self.profile = RuntimeProfile.from_dict(best["profile"])
+            self.calibration = results
+        self._apply_threads(self.profile)
+        self._save(best["profile"], results)
+        return self.profile
+
+    def _save(self, profile, results):
+        try:
+            self.profile_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.profile_path.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"machine": machine_signature(), "profile": profile, "results": results}, f, indent=2)
+            os.replace(temp_path, self.profile_path)
+        except Exception as e:
+            print(f"Eroare la salvarea profilului CPU: {e}")
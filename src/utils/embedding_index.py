@@ -0,0 +1,333 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+from PIL import Image
+
+from .batch_processor import collect_inputs
+from .image_loader import ProgressiveImageLoader
+from .lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+
+def default_index_dir():
+    """Directorul implicit al indexului de embedding-uri."""
+    return Path.home() / ".ai_photo_editor" / "index"
+
+
+def normalize_rows(vectors):
+    """Normalizează vectorii (L2), ca produsul scalar să fie similaritatea cosinus."""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def embed_images(recognizer, images):
+    """
+    Calculează embedding-urile CLIP pentru un lot de imagini.
+
+    Folosește get_image_embeddings(images) dacă modelul suportă loturi,
+    altfel get_image_embedding(image) pentru fiecare imagine.
+
+    Returns:
+        np.ndarray: Matricea (n, dim)
+    """
+    batch = getattr(recognizer, "get_image_embeddings", None)
+    if callable(batch):
+        return np.asarray(batch(images), dtype=np.float32)
+    return np.stack([np.asarray(recognizer.get_image_embedding(image), dtype=np.float32).reshape(-1)
+                     for image in images])
+
+
+def embed_text(recognizer, text):
+    """Embedding-ul CLIP al unui text (pentru căutarea text -> imagine)."""
+    return np.asarray(recognizer.get_text_embedding(text), dtype=np.float32).reshape(-1)
+
+
+def kmeans(vectors, clusters, iterations=10, seed=0):
+    """
+    K-means sferic simplu (vectori normalizați, similaritate cosinus).
+
+    Returns:
+        tuple: (centroizi normalizați, indexul clusterului pentru fiecare vector)
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), clusters, replace=False)].astype(np.float32)
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        for cluster in range(clusters):
+            members = vectors[assignment == cluster]
+            if len(members):
+                centroids[cluster] = members.sum(axis=0)
+            else:
+                centroids[cluster] = vectors[rng.integers(len(vectors))]
+        centroids = normalize_rows(centroids)
+    return centroids, np.argmax(vectors @ centroids.T, axis=1)
+
+
+class EmbeddingIndex:
+    """
+    Index local de embedding-uri CLIP pentru căutarea imaginilor similare.
+
+    Embedding-urile normalizate sunt stocate într-o matrice float16 mapată în memorie
+    (embeddings.f16), iar căile și datele fișierelor în metadata.json. Căutarea exactă
+    este un produs matrice-vector pe blocuri; peste `approximate_threshold` imagini se
+    folosește un index IVF (clustere k-means) care scanează doar clusterele apropiate.
+    """
+
+    CHUNK_ROWS = 65536
+
+    def __init__(self, index_dir=None, approximate_threshold=20000):
+        """
+        Args:
+            index_dir (str): Directorul indexului (implicit ~/.ai_photo_editor/index)
+            approximate_threshold (int): Numărul de imagini de la care se folosește indexul aproximativ
+        """
+        self.index_dir = Path(index_dir or default_index_dir())
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.approximate_threshold = approximate_threshold
+        self.matrix_path = self.index_dir / "embeddings.f16"
+        self.metadata_path = self.index_dir / "metadata.json"
+        self.ivf_path = self.index_dir / "ivf.npz"
+        self._lock = threading.RLock()
+        self._ivf = None
+        self._load_metadata()
+
+    def _load_metadata(self):
+        self.dim = None
+        self.capacity = 0
+        self.entries = []  # [{"path", "mtime", "size"}], în ordinea rândurilor
+        if self.metadata_path.exists():
+            with open(self.metadata_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.dim = data["dim"]
+            self.capacity = data["capacity"]
+            self.entries = data["entries"]
+        self.rows = {entry["path"]: row for row, entry in enumerate(self.entries)}
+        self._matrix = None
+
+    def _save_metadata(self):
+        temp_path = self.metadata_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "capacity": self.capacity, "entries": self.entries}, f)
+        os.replace(temp_path, self.metadata_path)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def matrix(self):
+        """Matricea float16 (n, dim) mapată în memorie (doar rândurile folosite)."""
+        if not self.entries:
+            return np.zeros((0, self.dim or 0), dtype=np.float16)
+        if self._matrix is None:
+            self._matrix = np.memmap(self.matrix_path, dtype=np.float16, mode="r+",
+                                     shape=(self.capacity, self.dim))
+        return self._matrix[:len(self.entries)]
+
+    def _ensure_capacity(self, rows):
+        if rows <= self.capacity:
+            return
+        capacity = max(1024, self.capacity)
+        while capacity < rows:
+            capacity *= 2
+        self._matrix = None
+        # Mărirea fișierului păstrează rândurile existente; restul sunt zerouri
+        with open(self.matrix_path, "ab") as f:
+            f.truncate(capacity * self.dim * 2)
+        self.capacity = capacity
+
+    def needs_update(self, path):
+        """True dacă fișierul nu este indexat sau s-a modificat de la indexare."""
+        row = self.rows.get(str(path))
+        if row is None:
+            return True
+        stat = os.stat(path)
+        entry = self.entries[row]
+        return entry["mtime"] != stat.st_mtime or entry["size"] != stat.st_size
+
+    def add(self, paths, embeddings):
+        """
+        Adaugă sau actualizează embedding-urile unor fișiere.
+
+        Args:
+            paths (list): Căile fișierelor
+            embeddings (np.ndarray): Matricea (n, dim), nenormalizată
+        """
+        vectors = normalize_rows(embeddings).astype(np.float16)
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            if vectors.shape[1] != self.dim:
+                raise ValueError(f"Dimensiune embedding {vectors.shape[1]} != {self.dim}")
+            new_paths = [str(path) for path in paths if str(path) not in self.rows]
+            self._ensure_capacity(len(self.entries) + len(new_paths))
+            for path in new_paths:
+                self.rows[path] = len(self.entries)
+                self.entries.append({"path": path, "mtime": 0, "size": 0})
+            matrix = self.matrix()
+            for path, vector in zip(paths, vectors):
+                row = self.rows[str(path)]
+                matrix[row] = vector
+                stat = os.stat(path)
+                self.entries[row]["mtime"] = stat.st_mtime
+                self.entries[row]["size"] = stat.st_size
+            matrix.flush()
+            self._save_metadata()
+            if self._ivf is not None and len(self.entries) > 2 * self._ivf["built_for"]:
+                self._ivf = None  # Colecția s-a dublat: clusterele se recalculează
+
+    def _exact_scores(self, query, rows=None):
+        matrix = self.matrix()
+        if rows is not None:
+            return matrix[rows].astype(np.float32) @ query
+        scores = np.empty(len(matrix), dtype=np.float32)
+        for start in range(0, len(matrix), self.CHUNK_ROWS):
+            block = np.asarray(matrix[start:start + self.CHUNK_ROWS], dtype=np.float32)
+            scores[start:start + len(block)] = block @ query
+        return scores
+
+    def build_approximate_index(self, clusters=None, sample_size=50000):
+        """
+        Construiește indexul IVF: centroizi k-means și lista rândurilor din fiecare cluster.
+
+        Args:
+            clusters (int): Numărul de clustere (implicit ~sqrt(n))
+            sample_size (int): Numărul de vectori folosiți pentru antrenarea k-means
+        """
+        with self._lock:
+            matrix = self.matrix()
+            count = len(matrix)
+            clusters = clusters or max(8, int(np.sqrt(count)))
+            rng = np.random.default_rng(0)
+            sample_rows = np.sort(rng.choice(count, min(sample_size, count), replace=False))
+            centroids, _ = kmeans(np.asarray(matrix[sample_rows], dtype=np.float32), clusters)
+
+            assignment = np.empty(count, dtype=np.int32)
+            for start in range(0, count, self.CHUNK_ROWS):
+                block = np.asarray(matrix[start:start + self.CHUNK_ROWS], dtype=np.float32)
+                assignment[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+            order = np.argsort(assignment, kind="stable").astype(np.int64)
+            offsets = np.searchsorted(assignment[order], np.arange(clusters + 1))
+            np.savez(self.ivf_path, centroids=centroids, order=order, offsets=offsets, built_for=count)
+            self._ivf = {"centroids": centroids, "order": order, "offsets": offsets, "built_for": count}
+
+    def _approximate_candidates(self, query, probes):
+        if self._ivf is None:
+            if self.ivf_path.exists():
+                data = np.load(self.ivf_path)
+                self._ivf = {key: data[key] for key in ("centroids", "order", "offsets")}
+                self._ivf["built_for"] = int(data["built_for"])
+            if self._ivf is None or len(self.entries) > 2 * self._ivf["built_for"]:
+                self.build_approximate_index()
+        ivf = self._ivf
+        nearest = np.argsort(ivf["centroids"] @ query)[::-1][:probes]
+        candidates = [ivf["order"][ivf["offsets"][c]:ivf["offsets"][c + 1]] for c in nearest]
+        # Rândurile adăugate după construirea indexului sunt scanate exact
+        candidates.append(np.arange(ivf["built_for"], len(self.entries)))
+        return np.sort(np.concatenate(candidates))
+
+    def search(self, query, k=10, approximate=None, probes=8):
+        """
+        Caută imaginile cele mai apropiate de un embedding.
+
+        Args:
+            query (np.ndarray): Embedding-ul de căutat (imagine sau text)
+            k (int): Numărul de rezultate
+            approximate (bool): Forțează căutarea exactă/aproximativă; None = automat
+            probes (int): Numărul de clustere scanate în modul aproximativ
+
+        Returns:
+            list: [(cale, scor cosinus)] în ordinea descrescătoare a scorului
+        """
+        with self._lock:
+            if not self.entries:
+                return []
+            query = normalize_rows(query)[0]
+            if approximate is None:
+                approximate = len(self.entries) >= self.approximate_threshold
+            if approximate:
+                rows = self._approximate_candidates(query, probes)
+                scores = self._exact_scores(query, rows)
+            else:
+                rows = None
+                scores = self._exact_scores(query)
+
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            results = []
+            for index in top:
+                row = int(rows[index]) if rows is not None else int(index)
+                results.append((self.entries[row]["path"], float(scores[index])))
+            return results
+
+    def find_similar(self, path, k=10, **kwargs):
+        """Imaginile cele mai asemănătoare cu un fișier deja indexat (fără el însuși)."""
+        row = self.rows[str(path)]
+        query = np.asarray(self.matrix()[row], dtype=np.float32)
+        results = self.search(query, k + 1, **kwargs)
+        return [(p, score) for p, score in results if p != str(path)][:k]
+
+
+class FolderIndexer:
+    """
+    Indexează un director de imagini pe loturi (în editor: ca job AI de fundal).
+
+    Imaginile sunt deschise la rezoluție redusă (draft JPEG), iar fișierele deja
+    indexate și nemodificate sunt sărite.
+    """
+
+    def __init__(self, index, embed_fn, batch_size=16, thumbnail_size=(224, 224)):
+        """
+        Args:
+            index (EmbeddingIndex): Indexul în care se scriu embedding-urile
+            embed_fn (callable): list[PIL.Image] -> np.ndarray (n, dim)
+            batch_size (int): Numărul de imagini per lot
+            thumbnail_size (tuple): Dimensiunea la care sunt deschise imaginile
+        """
+        self.index = index
+        self.embed_fn = embed_fn
+        self.batch_size = batch_size
+        self.thumbnail_size = thumbnail_size
+        self.loader = ProgressiveImageLoader()
+
+    def _open_thumbnail(self, path):
+        image, _ = self.loader.open_preview(path, max_size=self.thumbnail_size)
+        image.thumbnail(self.thumbnail_size, Image.Resampling.BICUBIC)
+        return image.convert("RGB")
+
+    def index_folder(self, folder, recursive=True, progress_callback=None, check=None):
+        """
+        Indexează imaginile noi sau modificate dintr-un director.
+
+        Args:
+            folder (str): Directorul
+            recursive (bool): Include subdirectoarele
+            progress_callback (callable): Apelată cu (imagini procesate, total)
+            check (callable): Apelată înainte de fiecare lot; poate ridica o excepție pentru
+                              anulare (loturile deja scrise rămân în index)
+
+        Returns:
+            int: Numărul de imagini indexate
+        """
+        inputs = [os.path.join(folder, "**", "*")] if recursive else [folder]
+        pending = [path for path in collect_inputs(inputs) if self.index.needs_update(path)]
+        indexed = 0
+        for start in range(0, len(pending), self.batch_size):
+            if check is not None:
+                check()
+            paths, images = [], []
+            for path in pending[start:start + self.batch_size]:
+                try:
+                    images.append(self._open_thumbnail(path))
+                    paths.append(path)
+                except Exception as e:
+                    print(f"Eroare la deschiderea {path}: {e}")
+            if images:
+                self.index.add(paths, self.embed_fn(images))
+                indexed += len(paths)
+            if progress_callback:
+                progress_callback(min(start + self.batch_size, len(pending)), len(pending))
+        return indexed
@@ -0,0 +1,91 @@
+import hashlib
+
+from .lazy_imports import lazy_import
+from .result_cache import ResultCache, image_content_hash, encode_png, decode_image
+
+np = lazy_import("numpy")
+
+
+def mask_hash(mask):
+    """Hash-ul unei măști booleene (formă + biți împachetați); None pentru umplerea întregii imagini."""
+    if mask is None:
+        return "none"
+    mask = np.asarray(mask, dtype=bool)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{mask.shape}:".encode())
+    digest.update(np.packbits(mask).tobytes())
+    return digest.hexdigest()
+
+
+def fill_cache_key(image_hash, mask_digest, prompt, seed, steps, model_id, native, margin):
+    """
+    Cheia unui rezultat: (imagine, mască, prompt, seed, pași, model, rezoluție nativă, margine).
+
+    Rezoluția nativă și marginea de context schimbă decupajele trimise modelului,
+    deci și rezultatul.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (image_hash, mask_digest, prompt, seed, steps, model_id, native, margin):
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class GenerativeFillCache:
+    """
+    Cache adresat după conținut pentru umplerea generativă cu seed fix.
+
+    Cu același seed, modelul produce același rezultat, deci undo/redo sau reluarea
+    aceluiași prompt nu mai rulează difuzia. Rezultatele sunt păstrate per seed, astfel
+    că variantele deja generate se regăsesc și când sunt cerute împreună cu altele noi.
+    """
+
+    def __init__(self, memory_items=8, disk_limit_mb=512, cache_dir=None):
+        self.cache = ResultCache("generative_fill", encode=encode_png, decode=decode_image,
+                                 memory_items=memory_items, disk_limit_mb=disk_limit_mb, cache_dir=cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def fill_seeds(self, image, mask, prompt, seeds, steps, model_id, compute, deterministic=True,
+                   native=512, margin=64):
+        """
+        Rezultatele umplerii pentru fiecare seed, calculând doar seed-urile lipsă.
+
+        Args:
+            image (PIL.Image): Imaginea de intrare
+            mask (np.ndarray): Masca booleană (None = întreaga imagine)
+            prompt (str): Promptul
+            seeds (list): Seed-urile cerute
+            steps (int): Numărul de pași de difuzie
+            model_id (str): Versiunea modelului
+            compute (callable): compute(seed-uri lipsă) -> listă de imagini, într-un singur apel (lot)
+            deterministic (bool): False dacă modelul nu acceptă seed: rezultatele nu se păstrează
+            native (int): Rezoluția nativă folosită la decuparea zonelor
+            margin (int): Contextul din jurul fiecărei zone, în pixeli
+
+        Returns:
+            list: Câte o imagine pentru fiecare seed, în ordinea cerută
+        """
+        seeds = list(seeds)
+        if not deterministic:
+            self.misses += len(seeds)
+            return list(compute(seeds))
+
+        image_hash = image_content_hash(image)
+        mask_digest = mask_hash(mask)
+        keys = {seed: fill_cache_key(image_hash, mask_digest, prompt, seed, steps, model_id, native, margin)
+                for seed in seeds}
+        results = {}
+        for seed in seeds:
+            cached = self.cache.get(keys[seed])
+            if cached is not None:
+                results[seed] = cached
+        self.hits += len(results)
+
+        missing = [seed for seed in seeds if seed not in results]
+        if missing:
+            self.misses += len(missing)
+            for seed, output in zip(missing, compute(missing)):
+                self.cache.put(keys[seed], output)
+                results[seed] = output
+        return [results[seed] for seed in seeds]
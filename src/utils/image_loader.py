@@ -0,0 +1,102 @@
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+from .tiled_document import TiledDocument
+
+
+class ProgressiveImageLoader:
+    """Încărcare în două faze: previzualizare rapidă (draft JPEG) și decodare completă în fundal."""
+
+    # Formatele pentru care PIL poate decoda direct la o rezoluție redusă (scalare DCT)
+    DRAFT_FORMATS = {"JPEG", "MPO"}
+
+    def __init__(self, max_workers=1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-loader")
+
+    def open_preview(self, file_path, max_size=(600, 400)):
+        """
+        Deschide rapid o imagine la dimensiunea de afișare.
+
+        Pentru JPEG folosește Image.draft(), astfel încât decodorul lucrează direct
+        la 1/2, 1/4 sau 1/8 din rezoluție. Pentru celelalte formate nu există o cale
+        mai rapidă, deci imaginea este decodată complet o singură dată.
+
+        Args:
+            file_path (str): Calea către imagine
+            max_size (tuple): Dimensiunea maximă (lățime, înălțime) a previzualizării
+
+        Returns:
+            tuple: (imaginea, is_preview) - is_preview este True dacă imaginea
+                   returnată nu are rezoluția completă și trebuie apelat load_full()
+        """
+        with Image.open(file_path) as img:
+            full_size = img.size
+            if img.format in self.DRAFT_FORMATS:
+                # draft() alege cea mai mică scalare care păstrează cel puțin max_size
+                img.draft("RGB", max_size)
+                if img.size != full_size:
+                    img.load()
+                    preview = img.copy()
+                    preview.thumbnail(max_size, Image.Resampling.LANCZOS)
+                    return preview, True
+
+            # Fără cale rapidă: o singură decodare completă
+            img.load()
+            return img.copy(), False
+
+    def load_full(self, file_path):
+        """
+        Decodează imaginea la rezoluție completă.
+
+        Args:
+            file_path (str): Calea către imagine
+
+        Returns:
+            PIL.Image: Imaginea completă, deja decodată
+        """
+        with Image.open(file_path) as img:
+            img.load()
+            # copy() detașează imaginea de fișier; format-ul se pierde la copiere
+            full_image = img.copy()
+            full_image.format = img.format
+            return full_image
+
+    def load_full_async(self, file_path):
+        """
+        Pornește decodarea completă pe un thread de lucru.
+
+        Decodorul PIL eliberează GIL-ul, deci interfața rămâne responsivă.
+
+        Args:
+            file_path (str): Calea către imagine
+
+        Returns:
+            concurrent.futures.Future: Future cu imaginea completă
+        """
+        return self._executor.submit(self.load_full, file_path)
+
+    def open_tiled(self, file_path, max_size=(600, 400)):
+        """
+        Deschide o imagine prea mare pentru memorie ca document pe tile-uri.
+
+        Args:
+            file_path (str): Calea către imagine
+            max_size (tuple): Dimensiunea maximă a previzualizării
+
+        Returns:
+            tuple: (TiledDocument, previzualizarea construită tile cu tile)
+        """
+        document = TiledDocument.open(file_path)
+        try:
+            return document, document.preview(max_size)
+        except Exception:
+            document.close()
+            raise
+
+    def open_tiled_async(self, file_path, max_size=(600, 400)):
+        """Pornește open_tiled pe thread-ul de lucru; returnează un Future."""
+        return self._executor.submit(self.open_tiled, file_path, max_size)
+
+    def shutdown(self):
+        """Oprește thread-ul de lucru fără a aștepta decodările în curs."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
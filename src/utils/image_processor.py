@@ -1,6 +1,10 @@
 from PIL import Image, ImageEnhance, ImageFilter
-import numpy as np
-import cv2
+
+from .lazy_imports import lazy_import
+from .lossless_transform import rotation_transpose
+
+np = lazy_import("numpy")
+cv2 = lazy_import("cv2")
 
 class ImageProcessor:
     """Clasă pentru procesarea de bază a imaginilor."""
@@ -58,20 +62,31 @@ class ImageProcessor:
             print(f"Eroare la ajustarea luminozității: {e}")
             return image
     
-    def enhance_contrast(self, image, factor=1.2):
+    def enhance_contrast(self, image, factor=1.2, mean=None):
         """
         Ajustează contrastul imaginii.
         
         Args:
             image (PIL.Image): Imaginea de procesat
             factor (float): Factorul de contrast (1.0 = original)
+            mean (float): Media luminanței precalculată pe întreaga imagine
+                (folosită la procesarea pe tile-uri); None = calculată din imagine
         
         Returns:
             PIL.Image: Imaginea cu contrastul ajustat
         """
         try:
-            enhancer = ImageEnhance.Contrast(image)
-            return enhancer.enhance(factor)
+            if mean is None:
+                enhancer = ImageEnhance.Contrast(image)
+                return enhancer.enhance(factor)
+            
+            # Aceeași formulă ca ImageEnhance.Contrast, dar cu media globală
+            degenerate = Image.new('L', image.size, int(mean + 0.5))
+            if degenerate.mode != image.mode:
+                degenerate = degenerate.convert(image.mode)
+            if 'A' in image.getbands():
+                degenerate.putalpha(image.getchannel('A'))
+            return Image.blend(degenerate, image, factor)
         except Exception as e:
             print(f"Eroare la ajustarea contrastului: {e}")
             return image
@@ -139,6 +154,12 @@ class ImageProcessor:
             PIL.Image: Imaginea rotită
         """
         try:
+            # Multiplii de 90° sunt permutări exacte de pixeli, fără reeșantionare
+            transpose = rotation_transpose(angle)
+            if transpose is None:
+                return image.copy()
+            if transpose is not False:
+                return image.transpose(transpose)
             return image.rotate(angle, expand=True)
         except Exception as e:
             print(f"Eroare la rotirea imaginii: {e}")
@@ -266,15 +287,17 @@ class ImageProcessor:
             print(f"Eroare la calcularea histogramei: {e}")
             return {}
     
-    def auto_enhance(self, image):
+    def auto_levels(self, image, levels=None):
         """
-        Îmbunătățește automat imaginea (auto levels, contrast, etc.).
+        Întinde histograma fiecărui canal între percentilele 1% și 99%.
         
         Args:
-            image (PIL.Image): Imaginea de îmbunătățit
+            image (PIL.Image): Imaginea de procesat
+            levels (list): Perechi (p1, p99) precalculate pentru R, G, B
+                (folosite la procesarea pe tile-uri); None = calculate din imagine
         
         Returns:
-            PIL.Image: Imaginea îmbunătățită
+            PIL.Image: Imaginea cu nivelurile ajustate
         """
         try:
             # Convertește la numpy pentru procesare
@@ -287,7 +310,10 @@ class ImageProcessor:
                 channel = img_array[:, :, i]
                 
                 # Calculăm percentilele 1% și 99%
-                p1, p99 = np.percentile(channel, [1, 99])
+                if levels is None:
+                    p1, p99 = np.percentile(channel, [1, 99])
+                else:
+                    p1, p99 = levels[i]
                 
                 # Întindem histograma
                 if p99 > p1:
@@ -297,10 +323,29 @@ class ImageProcessor:
                 else:
                     enhanced[:, :, i] = channel
             
-            result = Image.fromarray(enhanced.astype(np.uint8))
+            return Image.fromarray(enhanced.astype(np.uint8))
+            
+        except Exception as e:
+            print(f"Eroare la ajustarea nivelurilor: {e}")
+            return image
+    
+    def auto_enhance(self, image, levels=None, contrast_mean=None):
+        """
+        Îmbunătățește automat imaginea (auto levels, contrast, etc.).
+        
+        Args:
+            image (PIL.Image): Imaginea de îmbunătățit
+            levels (list): Niveluri precalculate, vezi auto_levels()
+            contrast_mean (float): Media luminanței după auto_levels, vezi enhance_contrast()
+        
+        Returns:
+            PIL.Image: Imaginea îmbunătățită
+        """
+        try:
+            result = self.auto_levels(image, levels)
             
             # Aplică o ușoară îmbunătățire a contrastului
-            result = self.enhance_contrast(result, 1.1)
+            result = self.enhance_contrast(result, 1.1, mean=contrast_mean)
             
             return result
             
@@ -0,0 +1,205 @@
+from PIL import Image
+
+from .lazy_imports import lazy_import
+from .progress import accepts_keyword
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+
+def mask_regions(mask, margin=32, min_area=1):
+    """
+    Zonele dreptunghiulare de reconstruit, cu o margine de context.
+
+    Componentele conexe ale măștii sunt încadrate individual; dreptunghiurile care
+    se suprapun după adăugarea marginii sunt unite.
+
+    Args:
+        mask (np.ndarray): Masca booleană (True = pixel de reconstruit)
+        margin (int): Marginea de context în jurul fiecărei zone, în pixeli
+        min_area (int): Componentele mai mici sunt ignorate
+
+    Returns:
+        list: Dreptunghiuri (left, top, right, bottom)
+    """
+    height, width = mask.shape
+    count, _, stats, _ = cv2.connectedComponentsWithStats(mask.astype(np.uint8), connectivity=8)
+    boxes = []
+    for label in range(1, count):
+        x, y, w, h, area = stats[label]
+        if area < min_area:
+            continue
+        boxes.append([max(x - margin, 0), max(y - margin, 0),
+                      min(x + w + margin, width), min(y + h + margin, height)])
+
+    # Unește dreptunghiurile suprapuse până nu mai există suprapuneri
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(boxes)):
+            for j in range(i + 1, len(boxes)):
+                a, b = boxes[i], boxes[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    boxes[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                    del boxes[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return [tuple(int(v) for v in box) for box in boxes]
+
+
+def expand_to_aspect(box, image_size, aspect=1.0):
+    """
+    Extinde un dreptunghi spre proporția dorită (ex: pătrat pentru Stable Diffusion),
+    cât permite imaginea, ca redimensionarea la rezoluția modelului să nu deformeze.
+    """
+    left, top, right, bottom = box
+    width, height = image_size
+    box_w, box_h = right - left, bottom - top
+    target_w = min(max(box_w, int(round(box_h * aspect))), width)
+    target_h = min(max(box_h, int(round(box_w / aspect))), height)
+
+    def grow(start, end, target, limit):
+        extra = target - (end - start)
+        start = max(start - extra // 2, 0)
+        end = min(start + target, limit)
+        return end - target, end
+
+    left, right = grow(left, right, target_w, width)
+    top, bottom = grow(top, bottom, target_h, height)
+    return left, top, right, bottom
+
+
+def model_input_size(crop_size, native=512, multiple=8):
+    """Dimensiunea de inferență: latura mare = rezoluția nativă, multiplu de 8."""
+    crop_w, crop_h = crop_size
+    scale = native / max(crop_w, crop_h)
+    return (max(multiple, int(round(crop_w * scale / multiple)) * multiple),
+            max(multiple, int(round(crop_h * scale / multiple)) * multiple))
+
+
+def feather_weights(mask, feather=4):
+    """
+    Ponderile de lipire: 0 în afara măștii, cresc gradual pe primii `feather` pixeli
+    din interiorul măștii până la 1. Pixelii din afara măștii nu sunt niciodată modificați.
+
+    Args:
+        mask (np.ndarray): Masca booleană a zonei
+        feather (int): Lățimea tranziției, în pixeli
+
+    Returns:
+        np.ndarray: Ponderi float32 în [0, 1]
+    """
+    if feather <= 0:
+        return mask.astype(np.float32)
+    # Distanța fiecărui pixel mascat până la cel mai apropiat pixel nemascat (0 în afara măștii)
+    distance = cv2.distanceTransform(mask.astype(np.uint8), cv2.DIST_L2, 3)
+    return np.clip(distance / float(feather), 0.0, 1.0).astype(np.float32)
+
+
+def extend_known_pixels(pixels, mask, steps):
+    """
+    Prelungește pixelii cunoscuți cu `steps` pixeli în interiorul măștii (media vecinilor deja
+    cunoscuți), ca tranziția din interiorul găurii să pornească din culorile reale și nu din
+    pixelii ascunși ai găurii (ex: sub transparență).
+
+    Args:
+        pixels (np.ndarray): Pixelii (h, w, c) float32
+        mask (np.ndarray): Masca booleană (True = necunoscut)
+        steps (int): Numărul de pixeli cu care se prelungește
+
+    Returns:
+        np.ndarray: O copie cu banda prelungită; pixelii din afara măștii sunt neschimbați
+    """
+    known = (~mask).astype(np.float32)
+    values = pixels * known[:, :, None]
+    for _ in range(steps):
+        total = cv2.boxFilter(values, -1, (3, 3), normalize=False, borderType=cv2.BORDER_CONSTANT)
+        count = cv2.boxFilter(known, -1, (3, 3), normalize=False, borderType=cv2.BORDER_CONSTANT)
+        reached = (known == 0) & (count > 0)
+        if not reached.any():
+            break
+        values[reached] = total[reached] / count[reached][:, None]
+        known[reached] = 1.0
+    return values
+
+
+def fill_accepts_mask(fill_fn):
+    """True dacă funcția de umplere acceptă un argument `mask`."""
+    return accepts_keyword(fill_fn, "mask")
+
+
+def fill_masked_regions(image, mask, fill_fn, native=512, margin=64, feather=4, progress_callback=None,
+                        progress=None):
+    """
+    Rulează umplerea generativă doar în jurul zonelor mascate.
+
+    Fiecare zonă (dreptunghiul măștii + margine de context, extins spre pătrat) este
+    decupată, adusă la rezoluția nativă a modelului, umplută și lipită înapoi doar peste
+    pixelii mascați, cu o tranziție graduală. Timpul de inferență depinde de mărimea
+    zonelor, nu de mărimea imaginii.
+
+    Args:
+        image (PIL.Image): Imaginea (RGB sau RGBA)
+        mask (np.ndarray): Masca booleană (True = de reconstruit)
+        fill_fn (callable): fill(image, mask=None) -> PIL.Image; masca e trimisă doar dacă e acceptată.
+                            Dacă returnează o listă (ex: variante cu seed-uri diferite dintr-un
+                            singur apel), fiecare variantă este compusă separat
+        native (int): Rezoluția nativă a modelului
+        margin (int): Contextul din jurul zonei, în pixeli
+        feather (int): Lățimea tranziției la lipire
+        progress_callback (callable): Apelată cu (zone terminate, total zone)
+        progress (ProgressReporter): Raportorul de progres; fiecare zonă primește o sub-etapă
+                                     (progress=...) dacă fill_fn acceptă argumentul
+
+    Returns:
+        PIL.Image: Imaginea RGB cu zonele umplute (o listă dacă fill_fn returnează liste)
+    """
+    base = image.convert("RGB")
+    results = None
+    batched = False
+    pass_mask = fill_accepts_mask(fill_fn)
+    regions = mask_regions(mask, margin=max(margin, 2 * feather))
+    pass_progress = progress is not None and accepts_keyword(fill_fn, "progress")
+    if progress is not None:
+        progress.start(total=len(regions), unit="regions")
+
+    for index, box in enumerate(regions):
+        box = expand_to_aspect(box, base.size, aspect=1.0)
+        left, top, right, bottom = box
+        crop = base.crop(box)
+        crop_mask = mask[top:bottom, left:right]
+        size = model_input_size(crop.size, native)
+
+        model_input = crop.resize(size, Image.Resampling.LANCZOS)
+        kwargs = {}
+        if pass_mask:
+            kwargs["mask"] = Image.fromarray(crop_mask.astype(np.uint8) * 255).resize(size, Image.Resampling.NEAREST)
+        if pass_progress:
+            # Pașii de difuzie ai zonei avansează bara în intervalul zonei
+            kwargs["progress"] = progress.child(index / len(regions), (index + 1) / len(regions),
+                                                stage=f"{progress.stage} (region {index + 1}/{len(regions)})")
+        outputs = fill_fn(model_input, **kwargs)
+        batched = isinstance(outputs, (list, tuple))
+        if not batched:
+            outputs = [outputs]
+        if results is None:
+            results = [np.array(base, dtype=np.float32) for _ in outputs]
+
+        # Tranziția este în interiorul măștii, pornind din pixelii reali prelungiți
+        weights = feather_weights(crop_mask, feather)[:, :, None]
+        region = extend_known_pixels(np.asarray(crop, np.float32), crop_mask, feather + 1)
+        for result, filled in zip(results, outputs):
+            filled = filled.convert("RGB").resize(crop.size, Image.Resampling.LANCZOS)
+            result[top:bottom, left:right] = region * (1.0 - weights) + np.asarray(filled, np.float32) * weights
+        if progress_callback:
+            progress_callback(index + 1, len(regions))
+        if progress is not None:
+            progress.update(index + 1, len(regions))
+
+    if results is None:
+        # Nicio zonă de umplut
+        return base
+    images = [Image.fromarray(np.clip(np.round(result), 0, 255).astype(np.uint8)) for result in results]
+    return images if batched else images[0]
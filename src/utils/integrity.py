@@ -0,0 +1,223 @@
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+from pathlib import Path
+
+
+def file_digest(path, algorithm="sha256", block_size=16 * 1024 * 1024, progress_callback=None):
+    """
+    Calculează digest-ul unui fișier prin mmap, în blocuri mari.
+
+    Fișierul nu este copiat în memoria procesului: paginile sunt citite de sistem
+    direct din cache-ul de fișiere.
+
+    Args:
+        path (str): Fișierul
+        algorithm (str): Algoritmul hashlib (sha256, md5...)
+        block_size (int): Dimensiunea unui bloc transmis funcției hash
+        progress_callback (callable): Apelată cu (bytes procesați, total)
+
+    Returns:
+        str: Digest-ul hex
+    """
+    digest = hashlib.new(algorithm)
+    size = os.path.getsize(path)
+    if size == 0:
+        return digest.hexdigest()  # Un fișier gol nu poate fi mapat
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            for offset in range(0, size, block_size):
+                digest.update(view[offset:offset + block_size])
+                if progress_callback:
+                    progress_callback(min(offset + block_size, size), size)
+        finally:
+            view.release()
+    return digest.hexdigest()
+
+
+def sha256_mmap(path, block_size=16 * 1024 * 1024, progress_callback=None):
+    """Calculează sha256 al unui fișier prin mmap (vezi file_digest)."""
+    return file_digest(path, "sha256", block_size, progress_callback)
+
+
+def split_checksum(expected):
+    """
+    Separă algoritmul de digest: "md5:<hex>" -> ("md5", hex); un digest fără prefix este sha256.
+    """
+    algorithm, _, value = expected.rpartition(":")
+    return algorithm or "sha256", value.lower()
+
+
+def file_fingerprint(path):
+    """(dimensiune, mtime în ns, inode): se schimbă la orice rescriere a fișierului."""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+class IntegrityManifest:
+    """
+    Evidența digest-urilor sha256 ale fișierelor de model.
+
+    Pentru fiecare fișier se păstrează digest-ul împreună cu amprenta
+    (dimensiune, mtime, inode) din momentul calculului. Cât timp amprenta nu se
+    schimbă, digest-ul este refolosit și fișierul nu mai este citit.
+    """
+
+    def __init__(self, manifest_path):
+        """
+        Args:
+            manifest_path (str): Fișierul JSON al evidenței (ex: models_dir / "integrity.json")
+        """
+        self.manifest_path = Path(manifest_path)
+        self._lock = threading.Lock()
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            if self.manifest_path.exists():
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Eroare la citirea evidenței de integritate: {e}")
+        return {}
+
+    def save(self):
+        """Salvează evidența (scriere atomică)."""
+        with self._lock:
+            entries = dict(self.entries)
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.manifest_path.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2)
+            os.replace(temp_path, self.manifest_path)
+        except Exception as e:
+            print(f"Eroare la salvarea evidenței de integritate: {e}")
+
+    def _key(self, path):
+        return os.path.abspath(path)
+
+    def cached_digest(self, path, algorithm="sha256"):
+        """Digest-ul salvat, dacă amprenta fișierului nu s-a schimbat (altfel None)."""
+        with self._lock:
+            entry = self.entries.get(self._key(path))
+        if entry and entry["fingerprint"] == file_fingerprint(path):
+            return entry.get(algorithm)
+        return None
+
+    def record(self, path, digest, save=True, algorithm="sha256"):
+        """Înregistrează digest-ul unui fișier (ex: imediat după o descărcare verificată)."""
+        fingerprint = file_fingerprint(path)
+        with self._lock:
+            entry = self.entries.get(self._key(path))
+            if not entry or entry["fingerprint"] != fingerprint:
+                entry = {"fingerprint": fingerprint}
+            # Digest-urile altor algoritmi rămân valabile cât timp amprenta este aceeași
+            entry[algorithm] = digest.lower()
+            entry["verified_at"] = time.time()
+            self.entries[self._key(path)] = entry
+        if save:
+            self.save()
+
+    def digest(self, path, force=False, progress_callback=None, save=True, algorithm="sha256"):
+        """
+        Digest-ul fișierului, recalculat doar dacă fișierul s-a schimbat.
+
+        Args:
+            path (str): Fișierul
+            force (bool): Recalculează chiar dacă amprenta este neschimbată
+            progress_callback (callable): Apelată cu (bytes procesați, total)
+            save (bool): Salvează evidența după recalculare
+            algorithm (str): Algoritmul (sha256 sau md5, pentru modelele publicate doar cu MD5)
+
+        Returns:
+            str: Digest-ul hex
+        """
+        if not force:
+            cached = self.cached_digest(path, algorithm)
+            if cached is not None:
+                return cached
+        fingerprint = file_fingerprint(path)
+        digest = file_digest(path, algorithm, progress_callback=progress_callback)
+        if file_fingerprint(path) == fingerprint:  # Fișierul nu a fost modificat în timpul citirii
+            self.record(path, digest, save=save, algorithm=algorithm)
+        return digest
+
+    def verify(self, path, expected, force=False, progress_callback=None):
+        """True dacă digest-ul fișierului este cel așteptat (sha256 sau "md5:<hex>")."""
+        algorithm, value = split_checksum(expected)
+        return self.digest(path, force, progress_callback, algorithm=algorithm) == value
+
+    def forget(self, path):
+        """Elimină un fișier din evidență (ex: după ștergere)."""
+        with self._lock:
+            removed = self.entries.pop(self._key(path), None)
+        if removed is not None:
+            self.save()
+
+
+class IntegrityVerifier:
+    """
+    Re-verifică toate fișierele de model pe un thread de fundal, cu progres
+    cumulat în bytes.
+    """
+
+    def __init__(self, manifest):
+        self.manifest = manifest
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def verify_all(self, files, force=True, progress_callback=None):
+        """
+        Args:
+            files (dict): nume -> (cale, checksum așteptat: sha256, "md5:<hex>" sau None)
+            force (bool): Recalculează toate digest-urile, ignorând evidența
+            progress_callback (callable): Apelată cu (bytes procesați, total bytes)
+
+        Returns:
+            dict: nume -> True (corect), False (diferit) sau None (fără checksum cunoscut)
+        """
+        total = sum(os.path.getsize(path) for path, _ in files.values())
+        processed = 0
+        results = {}
+        for name, (path, expected) in files.items():
+            if self._cancelled.is_set():
+                break
+            base = processed
+            algorithm, value = split_checksum(expected) if expected else ("sha256", None)
+            digest = self.manifest.digest(
+                path, force=force, save=False, algorithm=algorithm,
+                progress_callback=(lambda done, size, base=base: progress_callback(base + done, total))
+                if progress_callback else None
+            )
+            processed += os.path.getsize(path)
+            if progress_callback:
+                progress_callback(processed, total)
+            results[name] = None if not expected else digest == value
+        self.manifest.save()
+        return results
+
+    def start(self, files, force=True, progress_callback=None, done_callback=None):
+        """Pornește verificarea pe un thread de fundal; done_callback primește (rezultate, eroare)."""
+        self._cancelled.clear()
+
+        def worker():
+            try:
+                results = self.verify_all(files, force, progress_callback)
+                if done_callback:
+                    done_callback(results, None)
+            except Exception as e:
+                if done_callback:
+                    done_callback({}, e)
+
+        self._thread = threading.Thread(target=worker, daemon=True, name="model-verifier")
+        self._thread.start()
+        return self._thread
+
+    def cancel(self):
+        """Oprește verificarea după fișierul curent."""
+        self._cancelled.set()
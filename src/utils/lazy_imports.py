@@ -0,0 +1,58 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    """
+    Modul importat abia la primul acces la un atribut.
+
+    Folosit pentru dependențele grele (numpy, cv2, requests) în modulele încărcate
+    la pornire: `np = lazy_import("numpy")` se comportă ca `import numpy as np`,
+    dar costul importului se plătește la prima operație care folosește modulul,
+    după ce fereastra a apărut.
+    """
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with self.__dict__["_lock"]:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self.__dict__["_name"])
+                    self.__dict__["_module"] = module
+        return module
+
+    @property
+    def is_loaded(self):
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._load(), name, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_import(name):
+    """
+    Returnează un proxy pentru modulul dat, importat la prima utilizare.
+
+    Args:
+        name (str): Numele complet al modulului (ex: "numpy", "cv2", "requests")
+
+    Returns:
+        LazyModule: Proxy-ul modulului
+    """
+    return LazyModule(name)
@@ -0,0 +1,244 @@
+import importlib
+import importlib.util
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class LazyModel:
+    """
+    Proxy care construiește un model AI abia la prima utilizare.
+
+    Modulul modelului (și, tranzitiv, torch/transformers/diffusers) nu este importat
+    până când nu se accesează un atribut al proxy-ului, deci fereastra principală
+    poate apărea fără a aștepta bibliotecile AI.
+    """
+
+    NOT_LOADED = "not loaded"
+    LOADING = "loading…"
+    READY = "ready"
+    EVICTED = "evicted"
+    FAILED = "failed"
+
+    def __init__(self, display_name, module_name, class_name, package=None, on_first_use=None,
+                 residency=None, post_load=None, call_context=None, constructor_kwargs=None):
+        """
+        Args:
+            display_name (str): Numele afișat în interfață
+            module_name (str): Modulul care conține clasa (poate fi relativ, ex: "..models.upscaler")
+            class_name (str): Numele clasei modelului
+            package (str): Pachetul de referință pentru importurile relative
+            on_first_use (callable): Apelată cu display_name la fiecare utilizare (statistici)
+            residency (ModelResidency): Dacă este dat, instanța este ținută de acesta și
+                                        poate fi descărcată/reîncărcată în limita bugetului
+            post_load (callable): Apelată cu (proxy, instanță) după construire, inclusiv la
+                                  reîncărcare; returnează instanța folosită (ex: cuantizată)
+            call_context (callable): Returnează contextul în care rulează fiecare apel de
+                                     metodă (ex: torch.inference_mode)
+            constructor_kwargs (callable): Apelată cu (proxy, clasa modelului) înainte de
+                                           construire; returnează argumentele constructorului
+                                           (ex: ponderile mapate în memorie)
+        """
+        self.display_name = display_name
+        self.module_name = module_name
+        self.class_name = class_name
+        self.package = package
+        self.on_first_use = on_first_use
+        self.residency = residency
+        self.post_load = post_load
+        self.call_context = call_context
+        self.constructor_kwargs = constructor_kwargs
+        self._state = self.NOT_LOADED
+        self.error = None
+        self.load_time = None
+        self._instance = None
+        self._lock = threading.RLock()
+        if residency is not None:
+            residency.register(display_name, self._construct)
+
+    @property
+    def is_loaded(self):
+        if self.residency is not None:
+            return self.residency.is_loaded(self.display_name)
+        return self._instance is not None
+
+    @property
+    def state(self):
+        if self._state == self.READY and not self.is_loaded:
+            return self.EVICTED
+        return self._state
+
+    def source_version(self):
+        """
+        Identificator al versiunii modelului, obținut fără a-l încărca.
+
+        Se bazează pe dimensiunea și data modificării fișierului sursă al modulului,
+        deci se schimbă când codul modelului este actualizat.
+        """
+        try:
+            spec = importlib.util.find_spec(self.module_name, self.package)
+            stat = os.stat(spec.origin)
+            return f"{self.module_name}.{self.class_name}:{stat.st_size}:{int(stat.st_mtime)}"
+        except Exception:
+            return f"{self.module_name}.{self.class_name}"
+
+    def _construct(self):
+        module = importlib.import_module(self.module_name, self.package)
+        model_class = getattr(module, self.class_name)
+        kwargs = self.constructor_kwargs(self, model_class) if self.constructor_kwargs is not None else {}
+        instance = model_class(**kwargs)
+        if self.post_load is not None:
+            instance = self.post_load(self, instance)
+        return instance
+
+    def _load(self, loader):
+        with self._lock:
+            self._state = self.LOADING
+            start = time.time()
+            try:
+                instance = loader()
+            except Exception as e:
+                self._state = self.FAILED
+                self.error = e
+                raise
+            self.load_time = time.time() - start
+            self.error = None
+            self._state = self.READY
+            return instance
+
+    def get(self):
+        """
+        Returnează instanța modelului, încărcând-o dacă este nevoie.
+
+        Apelurile simultane așteaptă aceeași încărcare (warm-up în fundal + utilizare).
+        """
+        if self.residency is not None:
+            if self.residency.is_loaded(self.display_name):
+                return self.residency.acquire(self.display_name)
+            return self._load(lambda: self.residency.acquire(self.display_name))
+
+        instance = self._instance
+        if instance is not None:
+            return instance
+        with self._lock:
+            if self._instance is None:
+                self._instance = self._load(self._construct)
+            return self._instance
+
+    def preload(self):
+        """Încarcă modelul fără a-l folosi; erorile sunt doar raportate."""
+        try:
+            self.get()
+            return True
+        except Exception as e:
+            print(f"Eroare la preîncărcarea modelului {self.display_name}: {e}")
+            return False
+
+    def __getattr__(self, name):
+        # Apelat doar pentru atributele care nu aparțin proxy-ului
+        if name.startswith("__"):
+            raise AttributeError(name)
+        instance = self.get()
+        if self.on_first_use is not None:
+            self.on_first_use(self.display_name)
+        attribute = getattr(instance, name)
+        if not callable(attribute) or (self.residency is None and self.call_context is None):
+            return attribute
+
+        def call(target, args, kwargs):
+            if self.call_context is None:
+                return getattr(target, name)(*args, **kwargs)
+            with self.call_context():
+                return getattr(target, name)(*args, **kwargs)
+
+        if self.residency is None:
+            return lambda *args, **kwargs: call(instance, args, kwargs)
+
+        # Modelul nu poate fi descărcat cât timp rulează metoda
+        def pinned(*args, **kwargs):
+            self.get()
+            with self.residency.use(self.display_name) as current:
+                return call(current, args, kwargs)
+        return pinned
+
+
+class ModelWarmup:
+    """
+    Coadă de preîncărcare a modelelor în timpul inactivității.
+
+    Ordinea este dată de cât de des a folosit utilizatorul fiecare model în sesiunile
+    anterioare; modelele nefolosite niciodată nu sunt preîncărcate. Preîncărcarea
+    se oprește cât timp rulează o operație AI (pause/resume).
+    """
+
+    def __init__(self, models, usage_file=None, max_models=2):
+        """
+        Args:
+            models (dict): nume -> LazyModel
+            usage_file (str): Fișierul JSON cu numărul de utilizări per model
+            max_models (int): Numărul maxim de modele preîncărcate
+        """
+        self.models = models
+        self.usage_file = Path(usage_file) if usage_file else Path.home() / ".ai_photo_editor" / "model_usage.json"
+        self.max_models = max_models
+        self.usage = self._load_usage()
+        self._counted = set()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread = None
+
+    def _load_usage(self):
+        try:
+            if self.usage_file.exists():
+                with open(self.usage_file, "r", encoding="utf-8") as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Eroare la citirea statisticilor de utilizare: {e}")
+        return {}
+
+    def save_usage(self):
+        """Salvează statisticile de utilizare pentru sesiunile următoare."""
+        try:
+            self.usage_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.usage_file, "w", encoding="utf-8") as f:
+                json.dump(self.usage, f, indent=2)
+        except Exception as e:
+            print(f"Eroare la salvarea statisticilor de utilizare: {e}")
+
+    def record_use(self, name):
+        """Contorizează o sesiune în care modelul a fost folosit (o dată per sesiune)."""
+        if name in self._counted:
+            return
+        self._counted.add(name)
+        self.usage[name] = self.usage.get(name, 0) + 1
+
+    def warmup_order(self):
+        """Modelele de preîncărcat, în ordinea probabilității de utilizare."""
+        used = [name for name, count in self.usage.items() if count > 0 and name in self.models]
+        used.sort(key=lambda name: self.usage[name], reverse=True)
+        return used[:self.max_models]
+
+    def pause(self):
+        """Suspendă preîncărcarea (de ex. cât timp rulează o operație AI)."""
+        self._idle.clear()
+
+    def resume(self):
+        """Reia preîncărcarea."""
+        self._idle.set()
+
+    def start(self):
+        """Pornește preîncărcarea pe un thread de fundal."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True, name="model-warmup")
+        self._thread.start()
+
+    def _run(self):
+        for name in self.warmup_order():
+            model = self.models[name]
+            if model.is_loaded:
+                continue
+            self._idle.wait()
+            model.preload()
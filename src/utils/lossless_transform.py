@@ -0,0 +1,248 @@
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+
+from PIL import Image
+
+from .lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+
+ORIENTATION_TAG = 0x0112
+
+# Orientarea EXIF -> transformarea PIL care afișează imaginea corect (ca ImageOps.exif_transpose)
+ORIENTATION_TRANSPOSE = {
+    1: None,
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+# Transformare PIL -> argumentele jpegtran (rotațiile jpegtran sunt în sensul acelor de ceas)
+_JPEGTRAN_ARGS = {
+    Image.Transpose.ROTATE_90: ["-rotate", "270"],
+    Image.Transpose.ROTATE_180: ["-rotate", "180"],
+    Image.Transpose.ROTATE_270: ["-rotate", "90"],
+    Image.Transpose.FLIP_LEFT_RIGHT: ["-flip", "horizontal"],
+    Image.Transpose.FLIP_TOP_BOTTOM: ["-flip", "vertical"],
+    Image.Transpose.TRANSPOSE: ["-transpose"],
+    Image.Transpose.TRANSVERSE: ["-transverse"],
+}
+
+_SWAPS_AXES = {Image.Transpose.ROTATE_90, Image.Transpose.ROTATE_270,
+               Image.Transpose.TRANSPOSE, Image.Transpose.TRANSVERSE}
+
+
+def rotation_transpose(angle):
+    """
+    Transformarea exactă pentru o rotație cu multiplu de 90°.
+
+    Args:
+        angle (float): Unghiul în grade, în sens trigonometric (ca Image.rotate)
+
+    Returns:
+        Image.Transpose: Transformarea echivalentă, None pentru identitate,
+                         sau False dacă unghiul nu este multiplu de 90°
+    """
+    quarter_turns = angle / 90.0
+    if quarter_turns != int(quarter_turns):
+        return False
+    return {
+        0: None,
+        1: Image.Transpose.ROTATE_90,
+        2: Image.Transpose.ROTATE_180,
+        3: Image.Transpose.ROTATE_270,
+    }[int(quarter_turns) % 4]
+
+
+def compose_orientation(ops):
+    """
+    Orientarea EXIF echivalentă unei succesiuni de transformări (fără crop).
+
+    Args:
+        ops (list): Operații ("transpose", Image.Transpose)
+
+    Returns:
+        int: Orientarea EXIF (1-8) sau None dacă lista conține alte operații
+    """
+    # Un tablou asimetric identifică în mod unic fiecare element din grupul de simetrie
+    probe = Image.fromarray(np.arange(6, dtype=np.uint8).reshape(2, 3))
+    result = probe
+    for op in ops:
+        if op[0] != "transpose":
+            return None
+        result = result.transpose(op[1])
+    target = np.array(result)
+    for orientation, method in ORIENTATION_TRANSPOSE.items():
+        candidate = probe if method is None else probe.transpose(method)
+        if candidate.size == result.size and np.array_equal(np.array(candidate), target):
+            return orientation
+    return None
+
+
+def _iter_jpeg_segments(data):
+    """Generează (poziție, marker, lungime totală) pentru segmentele de dinaintea SOS."""
+    if data[:2] != b"\xff\xd8":
+        raise ValueError("Nu este un fișier JPEG")
+    position = 2
+    while position + 4 <= len(data):
+        if data[position] != 0xFF:
+            raise ValueError("Structură JPEG invalidă")
+        marker = data[position + 1]
+        if marker == 0xDA:  # SOS - urmează datele comprimate
+            return
+        length = struct.unpack(">H", data[position + 2:position + 4])[0]
+        yield position, marker, length + 2
+        position += length + 2
+
+
+def _patch_orientation_in_place(payload, orientation):
+    """Modifică tag-ul Orientation direct în blocul EXIF; None dacă tag-ul lipsește."""
+    tiff = bytearray(payload[6:])
+    endian = "<" if tiff[:2] == b"II" else ">"
+    ifd_offset = struct.unpack(endian + "I", tiff[4:8])[0]
+    count = struct.unpack(endian + "H", tiff[ifd_offset:ifd_offset + 2])[0]
+    for i in range(count):
+        entry = ifd_offset + 2 + i * 12
+        tag, value_type = struct.unpack(endian + "HH", tiff[entry:entry + 4])
+        if tag == ORIENTATION_TAG and value_type == 3:
+            tiff[entry + 8:entry + 10] = struct.pack(endian + "H", orientation)
+            return payload[:6] + bytes(tiff)
+    return None
+
+
+def set_jpeg_orientation(data, orientation):
+    """
+    Setează orientarea EXIF a unui JPEG fără a re-encoda imaginea.
+
+    Args:
+        data (bytes): Conținutul fișierului JPEG
+        orientation (int): Orientarea EXIF (1-8)
+
+    Returns:
+        bytes: Fișierul JPEG cu segmentul APP1 actualizat
+    """
+    insert_at = 2
+    for position, marker, length in _iter_jpeg_segments(data):
+        payload = data[position + 4:position + length]
+        if marker == 0xE0:  # APP0 (JFIF) trebuie să rămână primul
+            insert_at = position + length
+        if marker == 0xE1 and payload.startswith(b"Exif\x00\x00"):
+            patched = _patch_orientation_in_place(payload, orientation)
+            if patched is None:
+                exif = Image.Exif()
+                exif.load(payload)
+                exif[ORIENTATION_TAG] = orientation
+                patched = exif.tobytes()
+            segment = b"\xff\xe1" + struct.pack(">H", len(patched) + 2) + patched
+            return data[:position] + segment + data[position + length:]
+
+    exif = Image.Exif()
+    exif[ORIENTATION_TAG] = orientation
+    payload = exif.tobytes()
+    segment = b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload
+    return data[:insert_at] + segment + data[insert_at:]
+
+
+def jpeg_mcu_size(file_path):
+    """Dimensiunea blocului MCU (în pixeli) a unui JPEG, din factorii de eșantionare."""
+    with Image.open(file_path) as img:
+        layers = getattr(img, "layer", None) or [("", 1, 1, 0)]
+        max_h = max(layer[1] for layer in layers)
+        max_v = max(layer[2] for layer in layers)
+    return 8 * max_h, 8 * max_v
+
+
+def is_jpeg(file_path):
+    """True dacă fișierul este un JPEG."""
+    try:
+        with Image.open(file_path) as img:
+            return img.format == "JPEG"
+    except Exception:
+        return False
+
+
+def _export_with_jpegtran(jpegtran, source_path, ops, output_path):
+    """Aplică operațiile pe coeficienții DCT cu jpegtran, câte una pe rând."""
+    mcu_w, mcu_h = jpeg_mcu_size(source_path)
+    work_dir = tempfile.mkdtemp()
+    current = source_path
+    try:
+        for index, op in enumerate(ops):
+            if op[0] == "transpose":
+                args = _JPEGTRAN_ARGS[op[1]]
+                if op[1] in _SWAPS_AXES:
+                    mcu_w, mcu_h = mcu_h, mcu_w
+            else:
+                left, top, right, bottom = op[1]
+                # jpegtran mută colțul crop-ului la granița MCU; altfel rezultatul ar diferi
+                if left % mcu_w or top % mcu_h:
+                    return False
+                args = ["-crop", f"{right - left}x{bottom - top}+{left}+{top}"]
+            step_output = os.path.join(work_dir, f"step{index}.jpg")
+            completed = subprocess.run(
+                [jpegtran, "-copy", "all", "-perfect", *args, "-outfile", step_output, current],
+                capture_output=True
+            )
+            if completed.returncode != 0:
+                return False
+            current = step_output
+
+        with open(current, "rb") as f:
+            data = f.read()
+        # Pixelii au fost deja transformați; orientarea veche nu mai trebuie aplicată
+        with Image.open(current) as img:
+            if img.getexif().get(ORIENTATION_TAG, 1) != 1:
+                data = set_jpeg_orientation(data, 1)
+        with open(output_path, "wb") as f:
+            f.write(data)
+        return True
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def export_lossless_jpeg(source_path, ops, output_path):
+    """
+    Exportă un JPEG editat doar prin operații geometrice, fără re-encodare.
+
+    Folosește jpegtran (transformări pe coeficienții DCT, inclusiv crop aliniat la MCU)
+    dacă este instalat; altfel, pentru rotații și oglindiri, copiază fișierul original
+    și setează orientarea EXIF.
+
+    Args:
+        source_path (str): JPEG-ul original
+        ops (list): Operațiile aplicate, ("transpose", Image.Transpose) sau ("crop", box)
+        output_path (str): Fișierul de ieșire
+
+    Returns:
+        bool: True dacă exportul fără pierderi a reușit; False dacă trebuie re-encodat
+    """
+    try:
+        if not is_jpeg(source_path):
+            return False
+
+        jpegtran = shutil.which("jpegtran")
+        if jpegtran and _export_with_jpegtran(jpegtran, source_path, ops, output_path):
+            return True
+
+        orientation = compose_orientation(ops)
+        if orientation is None:
+            return False
+        with open(source_path, "rb") as f:
+            data = f.read()
+        # Orientarea veche se înlocuiește: editorul a lucrat pe pixelii neorientați
+        data = set_jpeg_orientation(data, orientation)
+        with open(output_path, "wb") as f:
+            f.write(data)
+        return True
+
+    except Exception as e:
+        print(f"Eroare la exportul JPEG fără pierderi: {e}")
+        return False
@@ -0,0 +1,108 @@
+from PIL import Image
+
+from .lazy_imports import lazy_import
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+
+def proxy_size(size, max_side=1024):
+    """
+    Dimensiunea imaginii proxy: latura cea mai mare redusă la `max_side`,
+    cu raportul de aspect păstrat. Imaginile mai mici nu sunt mărite.
+    """
+    width, height = size
+    scale = max_side / float(max(width, height))
+    if scale >= 1.0:
+        return (width, height)
+    return (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+
+
+def _box(array, radius):
+    """Media pe o fereastră (2r+1)x(2r+1), cu marginile reflectate."""
+    size = 2 * radius + 1
+    return cv2.boxFilter(array, cv2.CV_32F, (size, size), borderType=cv2.BORDER_REFLECT)
+
+
+def _to_float(image, mode):
+    return np.asarray(image.convert(mode), dtype=np.float32) / 255.0
+
+
+def guided_upsample(mask, guide, radius=4, eps=1e-3):
+    """
+    Mărește o mască la rezoluția imaginii de ghidaj, cu un filtru ghidat rapid.
+
+    Coeficienții liniari locali (mască ≈ a * ghidaj + b) sunt calculați la
+    rezoluția măștii, pe ghidajul micșorat, apoi sunt interpolați și aplicați
+    ghidajului la rezoluție completă. Marginile măștii urmează astfel marginile
+    reale din imagine (păr, contururi), nu pixelii măriți ai măștii, iar costul
+    rămâne cel al rezoluției mici plus o operație pe pixel.
+
+    Args:
+        mask (PIL.Image): Masca la rezoluție mică (L)
+        guide (PIL.Image): Imaginea la rezoluție completă
+        radius (int): Raza ferestrei, în pixeli ai măștii
+        eps (float): Regularizarea; valori mici păstrează mai multe margini
+
+    Returns:
+        PIL.Image: Masca (L) la dimensiunea ghidajului
+    """
+    guide_full = _to_float(guide, "L")
+    if mask.size == guide.size:
+        guide_small = guide_full
+    else:
+        guide_small = _to_float(guide.convert("L").resize(mask.size, Image.BILINEAR), "L")
+    p = _to_float(mask, "L")
+
+    mean_i = _box(guide_small, radius)
+    mean_p = _box(p, radius)
+    var_i = _box(guide_small * guide_small, radius) - mean_i * mean_i
+    cov_ip = _box(guide_small * p, radius) - mean_i * mean_p
+    a = cov_ip / (var_i + eps)
+    b = mean_p - a * mean_i
+    mean_a = _box(a, radius)
+    mean_b = _box(b, radius)
+
+    full = (guide.width, guide.height)
+    if mean_a.shape[::-1] != full:
+        mean_a = cv2.resize(mean_a, full, interpolation=cv2.INTER_LINEAR)
+        mean_b = cv2.resize(mean_b, full, interpolation=cv2.INTER_LINEAR)
+    result = np.clip(mean_a * guide_full + mean_b, 0.0, 1.0)
+    return Image.fromarray((result * 255.0 + 0.5).astype(np.uint8), mode="L")
+
+
+def remove_background_proxy(remove_fn, image, max_side=1024, radius=4, eps=1e-3, progress=None):
+    """
+    Elimină fundalul rulând segmentarea pe o copie micșorată a imaginii.
+
+    Masca obținută este mărită cu guided_upsample, cu imaginea completă ca ghidaj,
+    și aplicată pixelilor originali. Imaginile care încap deja în `max_side`
+    sunt procesate direct.
+
+    Args:
+        remove_fn (callable): remove_background(image[, progress]) -> imagine RGBA
+        image (PIL.Image): Imaginea la rezoluție completă
+        max_side (int): Latura maximă a imaginii proxy
+        radius (int): Raza filtrului ghidat, în pixeli ai proxy-ului
+        eps (float): Regularizarea filtrului ghidat
+        progress: ProgressReporter transmis funcției de segmentare, opțional
+
+    Returns:
+        PIL.Image: Imaginea RGBA la rezoluție completă
+    """
+    kwargs = {"progress": progress} if progress is not None else {}
+    size = proxy_size(image.size, max_side)
+    if size == image.size:
+        return remove_fn(image, **kwargs)
+
+    proxy = image.convert("RGB").resize(size, Image.LANCZOS)
+    segmented = remove_fn(proxy, **kwargs)
+    if segmented.mode != "RGBA":
+        segmented = segmented.convert("RGBA")
+    mask = segmented.getchannel("A")
+    if mask.size != size:
+        mask = mask.resize(size, Image.BILINEAR)
+
+    result = image.convert("RGBA")
+    result.putalpha(guided_upsample(mask, image, radius=radius, eps=eps))
+    return result
@@ -0,0 +1,243 @@
+import json
+import os
+import threading
+
+from .integrity import file_digest
+from .lazy_imports import lazy_import
+
+requests = lazy_import("requests")
+
+
+class DownloadError(Exception):
+    """Descărcarea a eșuat sau fișierul descărcat nu corespunde checksum-ului."""
+
+
+def split_ranges(size, parts):
+    """Împarte [0, size) în `parts` intervale contigue (start, end inclusiv)."""
+    step = -(-size // parts)
+    return [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+
+
+class ParallelDownloader:
+    """
+    Descarcă fișiere mari cu cereri HTTP Range paralele, cu reluare și verificare sha256.
+
+    Datele se scriu în `<fișier>.tmp`; progresul fiecărei părți este salvat în
+    `<fișier>.parts.tmp`, deci o descărcare întreruptă continuă de la octeții deja
+    primiți. Fișierul final apare (prin redenumire atomică) doar după verificarea
+    dimensiunii și a checksum-ului. Serverele fără suport Range sunt descărcate
+    secvențial.
+    """
+
+    def __init__(self, connections=4, min_part_size=8 * 1024 * 1024, chunk_size=256 * 1024,
+                 timeout=30, retries=3, session=None):
+        """
+        Args:
+            connections (int): Numărul maxim de conexiuni paralele
+            min_part_size (int): Dimensiunea minimă a unei părți; fișierele mici folosesc o conexiune
+            chunk_size (int): Dimensiunea bucăților citite din răspuns
+            timeout (float): Timpul maxim de așteptare pentru server, în secunde
+            retries (int): Reîncercările per parte, după o eroare de rețea
+            session (requests.Session): Sesiunea HTTP (implicit una nouă)
+        """
+        self.connections = connections
+        self.min_part_size = min_part_size
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.retries = retries
+        self._session = session
+
+    @property
+    def session(self):
+        """Sesiunea HTTP, creată la prima descărcare (requests se importă abia atunci)."""
+        if self._session is None:
+            self._session = requests.Session()
+        return self._session
+
+    def download(self, url, destination, sha256=None, progress_callback=None, md5=None):
+        """
+        Descarcă un fișier.
+
+        Args:
+            url (str): Adresa fișierului
+            destination (str): Calea finală
+            sha256 (str): Checksum-ul așteptat (hex); None = fără verificare
+            progress_callback (callable): Apelată cu fracțiunea descărcată (0..1)
+            md5 (str): Checksum-ul MD5 așteptat, pentru fișierele publicate doar cu MD5
+
+        Returns:
+            str: Calea fișierului descărcat
+
+        Raises:
+            DownloadError: Eroare de rețea persistentă sau checksum diferit
+        """
+        destination = str(destination)
+        temp_path = destination + ".tmp"
+        state_path = destination + ".parts.tmp"
+        size, accepts_ranges = self._probe(url)
+
+        completed = False
+        if accepts_ranges and size:
+            completed = self._download_ranges(url, temp_path, state_path, size, progress_callback)
+            if not completed:
+                # Serverul a ignorat Range: fișierul prealocat nu poate fi reluat secvențial
+                accepts_ranges = False
+        if not completed:
+            self._remove(state_path)
+            self._download_stream(url, temp_path, size, accepts_ranges, progress_callback)
+
+        actual_size = os.path.getsize(temp_path)
+        if size and actual_size != size:
+            raise DownloadError(f"Descărcare incompletă: {actual_size} din {size} bytes")
+        for algorithm, expected in (("sha256", sha256), ("md5", md5)):
+            if not expected:
+                continue
+            actual = file_digest(temp_path, algorithm)
+            if actual.lower() != expected.lower():
+                # Datele sunt corupte: reluarea ar păstra octeții greșiți
+                self._remove(temp_path)
+                self._remove(state_path)
+                raise DownloadError(f"Checksum {algorithm} diferit: {actual} (așteptat {expected})")
+        os.replace(temp_path, destination)
+        self._remove(state_path)
+        return destination
+
+    def _probe(self, url):
+        """Dimensiunea fișierului și suportul pentru cereri Range."""
+        try:
+            response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+            response.raise_for_status()
+            size = int(response.headers.get("Content-Length", 0)) or None
+            accepts_ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+            return size, accepts_ranges
+        except (requests.RequestException, ValueError):
+            return None, False
+
+    def _load_state(self, state_path, temp_path, url, size):
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state["url"] == url and state["size"] == size and os.path.getsize(temp_path) == size:
+                return state
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def _download_ranges(self, url, temp_path, state_path, size, progress_callback):
+        """
+        Descărcare în părți paralele. Returnează False dacă serverul ignoră cererile Range.
+        """
+        state = self._load_state(state_path, temp_path, url, size)
+        if state is None:
+            parts = max(1, min(self.connections, size // self.min_part_size))
+            state = {"url": url, "size": size,
+                     "parts": [[start, end, 0] for start, end in split_ranges(size, parts)]}
+            with open(temp_path, "wb") as f:
+                f.truncate(size)
+            self._save_state(state_path, state)
+
+        lock = threading.Lock()
+        errors = []
+        ranges_ignored = threading.Event()
+
+        def report():
+            if progress_callback:
+                progress_callback(sum(part[2] for part in state["parts"]) / size)
+
+        def fetch(part):
+            attempts = 0
+            while part[0] + part[2] <= part[1] and not ranges_ignored.is_set():
+                try:
+                    self._fetch_part(url, temp_path, part, state_path, state, lock, ranges_ignored, report)
+                except requests.RequestException as e:
+                    attempts += 1
+                    if attempts > self.retries:
+                        errors.append(e)
+                        return
+
+        report()
+        threads = [threading.Thread(target=fetch, args=(part,), daemon=True) for part in state["parts"]
+                   if part[0] + part[2] <= part[1]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self._save_state(state_path, state)
+
+        if ranges_ignored.is_set():
+            return False
+        if errors:
+            raise DownloadError(f"Descărcarea a eșuat (poate fi reluată): {errors[0]}")
+        return True
+
+    def _fetch_part(self, url, temp_path, part, state_path, state, lock, ranges_ignored, report):
+        start, end, done = part
+        headers = {"Range": f"bytes={start + done}-{end}"}
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                ranges_ignored.set()
+                return
+            with open(temp_path, "r+b") as f:
+                f.seek(start + done)
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if ranges_ignored.is_set():
+                        return
+                    chunk = chunk[:end + 1 - (start + part[2])]
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    f.flush()
+                    with lock:
+                        # Progresul salvat nu depășește niciodată octeții scriși
+                        part[2] += len(chunk)
+                        self._save_state(state_path, state)
+                    report()
+        if part[0] + part[2] <= part[1]:
+            raise requests.ConnectionError(f"Conexiune închisă la octetul {part[0] + part[2]}")
+
+    def _download_stream(self, url, temp_path, size, accepts_ranges, progress_callback):
+        """Descărcare pe o singură conexiune, reluată de la dimensiunea fișierului .tmp."""
+        if not accepts_ranges:
+            self._remove(temp_path)
+        attempts = 0
+        while True:
+            existing = os.path.getsize(temp_path) if os.path.exists(temp_path) else 0
+            if size and existing >= size:
+                if existing > size:
+                    self._remove(temp_path)
+                    continue
+                return
+            headers = {"Range": f"bytes={existing}-"} if accepts_ranges and existing else {}
+            try:
+                with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+                    response.raise_for_status()
+                    mode = "ab" if response.status_code == 206 else "wb"
+                    downloaded = existing if mode == "ab" else 0
+                    with open(temp_path, mode) as f:
+                        for chunk in response.iter_content(chunk_size=self.chunk_size):
+                            if chunk:
+                                f.write(chunk)
+                                downloaded += len(chunk)
+                                if progress_callback and size:
+                                    progress_callback(downloaded / size)
+                if not size or downloaded >= size:
+                    return
+                raise requests.ConnectionError(f"Conexiune închisă la octetul {downloaded}")
+            except requests.RequestException as e:
+                attempts += 1
+                if attempts > self.retries or not accepts_ranges:
+                    raise DownloadError(f"Descărcarea a eșuat: {e}")
+
+    def _save_state(self, state_path, state):
+        temp_state = os.path.splitext(state_path)[0] + ".new.tmp"
+        with open(temp_state, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp_state, state_path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
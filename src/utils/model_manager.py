@@ -1,29 +1,67 @@
 import os
-import torch
-import requests
 from pathlib import Path
 import hashlib
 
+from .integrity import IntegrityManifest, IntegrityVerifier, split_checksum
+from .model_download import ParallelDownloader
+from .model_residency import ModelResidency
+from .progress import accepts_keyword
+from .quantization import ModelQuantizer, find_torch_modules
+from .weight_store import assign_weights, convert_checkpoint, load_weights, safetensors_available
+from .cpu_runtime import CpuRuntime
+
+# Modelele din aplicație (display_name) ale căror ponderi sunt descărcate aici (cheie din model_info)
+MODEL_WEIGHTS = {"Upscaler": "upscaler", "Background Remover": "background_remover"}
+
 class ModelManager:
-    """Clasă pentru gestionarea modelelor AI (descărcare, cache, etc.)."""
+    """Clasă pentru gestionarea modelelor AI (descărcare, cache, memorie etc.)."""
     
-    def __init__(self):
+    def __init__(self, memory_budget_mb=None):
+        """
+        Args:
+            memory_budget_mb (float): Memoria maximă pentru modelele încărcate;
+                                      None = jumătate din RAM-ul sistemului
+        """
         self.models_dir = Path.home() / ".ai_photo_editor" / "models"
         self.models_dir.mkdir(parents=True, exist_ok=True)
         
+        # Modelele încărcate în memorie, descărcate LRU la depășirea bugetului
+        budget_bytes = int(memory_budget_mb * 1024 * 1024) if memory_budget_mb else None
+        self.residency = ModelResidency(budget_bytes)
+        
+        # Variantele INT8 ale modelelor (mod opțional pentru inferența pe CPU)
+        self.quantizer = ModelQuantizer(self.models_dir / "quantized")
+        
+        # Configurația de execuție pe CPU (fire, channels_last, torch.compile)
+        self.cpu_runtime = CpuRuntime(self.models_dir)
+        
+        # Descărcări: părți paralele (HTTP Range), reluare din .tmp, verificare sha256
+        self.downloader = ParallelDownloader()
+        
+        # Digest-urile verificate, refolosite cât timp (dimensiune, mtime, inode) nu se schimbă
+        self.integrity = IntegrityManifest(self.models_dir / "integrity.json")
+        
+        # Ponderile checkpoint-urilor PyTorch sunt convertite o dată într-un format mapabil
+        self.weights_format = "safetensors" if safetensors_available() else "weights"
+        
         # Dicționar cu informații despre modele
+        # sha256: checksum-ul fișierului publicat; md5: checksum-ul publicat de sursele care
+        # nu dau sha256 (rembg); fără niciunul, doar dimensiunea este verificată
         self.model_info = {
             "upscaler": {
                 "name": "Real-ESRGAN",
                 "url": "https://github.com/xinntao/Real-ESRGAN/releases/download/v0.1.0/RealESRGAN_x4plus.pth",
                 "filename": "RealESRGAN_x4plus.pth",
-                "size": "67MB"
+                "size": "67MB",
+                "sha256": "4fa0d38905f75ac06eb49a7951b426670021be3018265fd191d2125df9d682f1"
             },
             "background_remover": {
                 "name": "U2-Net",
                 "url": "https://github.com/danielgatis/rembg/releases/download/v0.0.0/u2net.onnx",
                 "filename": "u2net.onnx",
-                "size": "176MB"
+                "size": "176MB",
+                "sha256": None,
+                "md5": "60024c5c889badc19c04ad937298a77b"
             }
         }
     
@@ -31,6 +69,10 @@ class ModelManager:
         """
         Descarcă un model dacă nu există local.
         
+        Fișierul este descărcat în <fișier>.tmp (în părți paralele, dacă serverul
+        permite), verificat cu sha256 (sau MD5) din model_info și abia apoi redenumit; o
+        descărcare întreruptă este reluată la următorul apel.
+        
         Args:
             model_name (str): Numele modelului
             progress_callback (callable): Funcție pentru actualizarea progresului
@@ -53,21 +95,13 @@ class ModelManager:
             print(f"Descărcare model {model_name} ({model_data['size']})...")
             
             # Descarcă modelul
-            response = requests.get(model_data["url"], stream=True)
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            
-            with open(model_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        if progress_callback and total_size > 0:
-                            progress = downloaded / total_size
-                            progress_callback(progress)
+            self.downloader.download(model_data["url"], model_path, sha256=model_data.get("sha256"),
+                                     md5=model_data.get("md5"), progress_callback=progress_callback)
+            checksum = self.expected_checksum(model_name)
+            if checksum:
+                # Fișierul tocmai a fost verificat: nu mai este citit la următoarea verificare
+                algorithm, value = split_checksum(checksum)
+                self.integrity.record(model_path, value, algorithm=algorithm)
             
             print(f"Modelul {model_name} descărcat cu succes la: {model_path}")
             return str(model_path)
@@ -76,6 +110,31 @@ class ModelManager:
             print(f"Eroare la descărcarea modelului {model_name}: {e}")
             return None
     
+    def model_version(self, model_name, fallback, quantized=False):
+        """
+        Versiunea unui model, pentru cheile cache-urilor de rezultate.
+
+        Pentru modelele descărcate aici se folosește digest-ul sha256 al ponderilor din
+        evidența de integritate (calculat o singură dată), deci rezultatele sunt invalidate
+        doar când ponderile se schimbă. Modul INT8 dă alte rezultate, deci face parte din versiune.
+
+        Args:
+            model_name (str): Numele modelului (cheie din model_info)
+            fallback (str): Versiunea folosită când ponderile nu sunt gestionate aici
+            quantized (bool): Modelul rulează în modul INT8
+
+        Returns:
+            str: Identificatorul versiunii
+        """
+        version = fallback
+        model_path = self.get_model_path(model_name) if model_name else None
+        if model_path:
+            try:
+                version = f"sha256:{self.integrity.digest(model_path)}"
+            except Exception as e:
+                print(f"Eroare la calcularea versiunii modelului {model_name}: {e}")
+        return f"{version}:{'int8' if quantized else 'float32'}"
+    
     def get_model_path(self, model_name):
         """
         Returnează calea către un model local.
@@ -138,6 +197,10 @@ class ModelManager:
             model_path = self.get_model_path(model_name)
             if model_path:
                 os.remove(model_path)
+                self.integrity.forget(model_path)
+                mapped_path = self.get_mapped_weights_path(model_name)
+                if mapped_path.exists():
+                    os.remove(mapped_path)
                 print(f"Modelul {model_name} a fost șters.")
                 return True
             else:
@@ -164,12 +227,33 @@ class ModelManager:
             return info
         return None
     
-    def verify_model_integrity(self, model_name):
+    def expected_checksum(self, model_name):
+        """
+        Checksum-ul publicat al unui model: sha256 (hex), "md5:<hex>" sau None.
+        
+        Args:
+            model_name (str): Numele modelului
+        
+        Returns:
+            str: Checksum-ul, în formatul acceptat de IntegrityManifest.verify
+        """
+        model_data = self.model_info[model_name]
+        if model_data.get("sha256"):
+            return model_data["sha256"]
+        if model_data.get("md5"):
+            return f"md5:{model_data['md5']}"
+        return None
+    
+    def verify_model_integrity(self, model_name, force=False):
         """
         Verifică integritatea unui model descărcat.
         
+        Digest-ul (sha256 sau MD5) este recalculat doar dacă fișierul s-a schimbat de la
+        ultima verificare (sau dacă force=True).
+        
         Args:
             model_name (str): Numele modelului
+            force (bool): Recalculează digest-ul chiar dacă fișierul pare neschimbat
         
         Returns:
             bool: True dacă modelul e integru, False altfel
@@ -179,8 +263,11 @@ class ModelManager:
             if not model_path:
                 return False
             
-            # Pentru simplicitate, verificăm doar dacă fișierul există și nu e gol
-            # În viitor se pot adăuga checksum-uri
+            expected = self.expected_checksum(model_name)
+            if expected:
+                return self.integrity.verify(model_path, expected, force=force)
+            
+            # Fără checksum cunoscut: verificăm doar dacă fișierul nu e gol
             file_size = os.path.getsize(model_path)
             return file_size > 0
             
@@ -188,6 +275,127 @@ class ModelManager:
             print(f"Eroare la verificarea integrității modelului {model_name}: {e}")
             return False
     
+    def get_mapped_weights_path(self, model_name):
+        """
+        Calea ponderilor în format mapabil (.safetensors sau arhivă brută .weights).
+        
+        Args:
+            model_name (str): Numele modelului
+        
+        Returns:
+            Path: Calea (fișierul poate să nu existe încă)
+        """
+        filename = Path(self.model_info[model_name]["filename"])
+        return self.models_dir / f"{filename.stem}.{self.weights_format}"
+    
+    def load_model_weights(self, model_name):
+        """
+        Încarcă ponderile unui model mapate în memorie, fără a citi fișierul integral.
+        
+        La prima utilizare checkpoint-ul PyTorch descărcat este convertit în format
+        mapabil; conversia se repetă doar dacă checkpoint-ul este mai nou. Tensorii
+        returnați sunt vederi peste fișier, paginate la cerere și partajate între
+        procese (se atribuie modulului cu weight_store.assign_weights).
+        
+        Args:
+            model_name (str): Numele modelului
+        
+        Returns:
+            dict: nume -> tensor sau None dacă modelul nu este un checkpoint PyTorch
+        """
+        try:
+            model_path = self.get_model_path(model_name)
+            if not model_path:
+                raise FileNotFoundError(f"Modelul {model_name} nu este descărcat")
+            if Path(model_path).suffix not in (".pth", ".pt", ".bin", ".ckpt"):
+                return None
+            
+            mapped_path = self.get_mapped_weights_path(model_name)
+            if not mapped_path.exists() or mapped_path.stat().st_mtime < os.path.getmtime(model_path):
+                print(f"Conversie ponderi {model_name} în format mapabil ({mapped_path.suffix})...")
+                convert_checkpoint(model_path, mapped_path)
+            return load_weights(mapped_path)
+            
+        except Exception as e:
+            print(f"Eroare la încărcarea ponderilor modelului {model_name}: {e}")
+            return None
+    
+    def constructor_weights(self, display_name, model_class):
+        """
+        Argumentele de construire ale unui model cu checkpoint PyTorch gestionat aici.
+        
+        O clasă de model care acceptă argumentul `weights` primește tensorii mapați
+        (load_model_weights) și îi atribuie modulului cu weight_store.assign_weights,
+        fără a citi integral checkpoint-ul.
+        
+        Args:
+            display_name (str): Numele modelului în aplicație (ex: "Upscaler")
+            model_class (type): Clasa modelului
+        
+        Returns:
+            dict: {"weights": tensori} sau {} dacă modelul nu folosește ponderile mapate
+        """
+        weights_name = MODEL_WEIGHTS.get(display_name)
+        if not weights_name or not accepts_keyword(model_class, "weights"):
+            return {}
+        if not self.get_model_path(weights_name):
+            return {}
+        tensors = self.load_model_weights(weights_name)
+        return {"weights": tensors} if tensors is not None else {}
+    
+    def map_loaded_weights(self, display_name, instance):
+        """
+        Trece pe ponderile mapate un model construit din checkpoint-ul citit integral.
+        
+        Pentru clasele care nu acceptă `weights` la construire: modulul PyTorch ale cărui
+        ponderi au aceleași nume ca în checkpoint primește tensorii mapați (assign_weights),
+        iar copia din memoria procesului este eliberată. Paginile mapate sunt partajate
+        cu procesul AI și pot fi eliberate de sistem sub presiune de memorie.
+        
+        Args:
+            display_name (str): Numele modelului în aplicație
+            instance: Instanța modelului
+        
+        Returns:
+            Instanța (cu ponderile mapate, dacă a fost găsit modulul corespunzător)
+        """
+        weights_name = MODEL_WEIGHTS.get(display_name)
+        if not weights_name or accepts_keyword(type(instance), "weights") or not self.get_model_path(weights_name):
+            return instance
+        modules = find_torch_modules(instance)
+        if not modules:
+            return instance
+        tensors = self.load_model_weights(weights_name)
+        if not tensors:
+            return instance
+        for _, module in modules:
+            if set(module.state_dict()) == set(tensors):
+                try:
+                    assign_weights(module, tensors)
+                except Exception as e:
+                    print(f"Eroare la maparea ponderilor modelului {display_name}: {e}")
+                break
+        return instance
+    
+    def verify_all_models(self, force=True, progress_callback=None, done_callback=None):
+        """
+        Re-verifică toate modelele descărcate pe un thread de fundal.
+        
+        Args:
+            force (bool): Recalculează toate digest-urile (False = doar fișierele modificate)
+            progress_callback (callable): Apelată cu (bytes verificați, total bytes)
+            done_callback (callable): Apelată cu (rezultate, eroare); rezultatele sunt
+                                      nume -> True/False, sau None fără checksum cunoscut
+        
+        Returns:
+            IntegrityVerifier: Verificarea pornită (poate fi oprită cu cancel())
+        """
+        files = {name: (self.get_model_path(name), self.expected_checksum(name))
+                 for name in self.list_downloaded_models()}
+        verifier = IntegrityVerifier(self.integrity)
+        verifier.start(files, force, progress_callback, done_callback)
+        return verifier
+    
     def check_pytorch_device(self):
         """
         Verifică ce dispozitive sunt disponibile pentru PyTorch.
@@ -195,6 +403,9 @@ class ModelManager:
         Returns:
             dict: Informații despre dispozitivele disponibile
         """
+        # Import local: torch este încărcat doar când este nevoie de el
+        import torch
+        
         info = {
             "cuda_available": torch.cuda.is_available(),
             "cuda_version": torch.version.cuda if torch.cuda.is_available() else None,
@@ -205,8 +416,108 @@ class ModelManager:
         if torch.cuda.is_available():
             info["gpu_names"] = [torch.cuda.get_device_name(i) for i in range(torch.cuda.device_count())]
         
+        # Execuția pe CPU: profilul activ (calibrat sau implicit)
+        profile = self.cpu_runtime.activate()
+        info["cpu_count"] = os.cpu_count()
+        info["cpu_threads"] = torch.get_num_threads()
+        info["cpu_interop_threads"] = torch.get_num_interop_threads()
+        info["cpu_profile"] = profile.to_dict()
+        info["cpu_profile_calibrated"] = self.cpu_runtime.calibration is not None
+        
         return info
     
+    def calibrate_cpu_runtime(self):
+        """
+        Alege configurația CPU cea mai rapidă pentru această mașină (fire, channels_last,
+        torch.compile) și o salvează în models_dir/cpu_profile.json.
+        
+        Returns:
+            dict: Profilul ales
+        """
+        return self.cpu_runtime.calibrate().to_dict()
+    
+    def register_loaded_model(self, model_name, loader, unloader=None, footprint_bytes=None):
+        """
+        Înregistrează un model pentru gestionarea memoriei.
+        
+        Args:
+            model_name (str): Numele modelului
+            loader (callable): Construiește instanța modelului (apelată și la reîncărcare)
+            unloader (callable): Eliberează resursele instanței la descărcare (opțional)
+            footprint_bytes (int): Memoria ocupată, dacă este cunoscută
+        """
+        self.residency.register(model_name, loader, unloader, footprint_bytes)
+    
+    def acquire_model(self, model_name):
+        """
+        Returnează instanța unui model înregistrat, reîncărcând-o dacă a fost descărcată.
+        
+        Args:
+            model_name (str): Numele modelului
+        
+        Returns:
+            Instanța modelului
+        """
+        return self.residency.acquire(model_name)
+    
+    def unload_model(self, model_name):
+        """
+        Descarcă un model din memorie; va fi reîncărcat la următoarea utilizare.
+        
+        Returns:
+            bool: True dacă modelul era încărcat
+        """
+        return self.residency.evict(model_name)
+    
+    def set_memory_budget(self, memory_budget_mb):
+        """
+        Schimbă memoria maximă pentru modele, descărcând modelele care nu mai încap.
+        
+        Args:
+            memory_budget_mb (float): Bugetul în MB
+        """
+        self.residency.set_budget(int(memory_budget_mb * 1024 * 1024))
+    
+    def get_residency_stats(self):
+        """
+        Returnează starea modelelor din memorie.
+        
+        Returns:
+            dict: Bugetul, memoria ocupată, ordinea LRU și, per model, starea
+                  încărcat/descărcat, dimensiunea, reîncărcările și evacuările
+        """
+        return self.residency.stats()
+    
+    def quantize_model(self, model_name, instance, fallback_version):
+        """
+        Trece un model încărcat în modul INT8 (cuantizare dinamică), folosind cache-ul
+        din models_dir/quantized.
+        
+        Cheia cache-ului este versiunea ponderilor (model_version), deci modulele INT8
+        salvate nu înlocuiesc ponderi descărcate din nou sau actualizate.
+        
+        Args:
+            model_name (str): Numele modelului (display_name)
+            instance: Instanța modelului, cu ponderile float32 încărcate
+            fallback_version (str): Versiunea folosită când ponderile nu sunt gestionate aici
+        
+        Returns:
+            Instanța cu modulele cuantizate; instanța neschimbată dacă cuantizarea eșuează
+        """
+        try:
+            version = self.model_version(MODEL_WEIGHTS.get(model_name), fallback_version, quantized=True)
+            return self.quantizer.apply(model_name, instance, version)
+        except Exception as e:
+            print(f"Eroare la cuantizarea modelului {model_name}: {e}")
+            return instance
+    
+    def get_quantization_report(self):
+        """
+        Returnează, per model, modulele cuantizate, cele rămase în float32 și
+        dacă rezultatul a fost citit din cache.
+        """
+        return dict(self.quantizer.reports)
+    
     def cleanup_cache(self):
         """
         Curăță cache-ul de modele (șterge fișierele temporare).
@@ -250,3 +561,39 @@ class ModelManager:
         except Exception as e:
             print(f"Eroare la calcularea spațiului folosit: {e}")
             return {"total_size_bytes": 0, "total_size_mb": 0, "model_sizes": {}}
+
+
+_worker_manager = None
+
+
+def worker_model_options(display_name, quantized=()):
+    """
+    Argumentele LazyModel pentru modelele încărcate în procesul AI (AIWorker):
+    bugetul de memorie, modul INT8 și profilul CPU se aplică și acolo.
+
+    Args:
+        display_name (str): Numele modelului
+        quantized (tuple): Modelele rulate în modul INT8
+
+    Returns:
+        dict: residency, post_load, call_context, constructor_kwargs
+    """
+    global _worker_manager
+    if _worker_manager is None:
+        _worker_manager = ModelManager()
+    manager = _worker_manager
+
+    def post_load(proxy, instance):
+        instance = manager.map_loaded_weights(proxy.display_name, instance)
+        if proxy.display_name in quantized:
+            instance = manager.quantize_model(proxy.display_name, instance, proxy.source_version())
+        try:
+            return manager.cpu_runtime.prepare(instance)
+        except Exception as e:
+            print(f"Eroare la pregătirea modelului {proxy.display_name} pentru CPU: {e}")
+            return instance
+
+    return {"residency": manager.residency, "post_load": post_load,
+            "call_context": manager.cpu_runtime.inference,
+            "constructor_kwargs": lambda proxy, model_class: manager.constructor_weights(proxy.display_name,
+                                                                                        model_class)}
@@ -0,0 +1,286 @@
+import gc
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+def current_rss_bytes():
+    """Memoria rezidentă a procesului curent (0 dacă nu poate fi citită)."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return 0
+
+
+def total_ram_bytes():
+    """Memoria RAM fizică totală (None dacă nu poate fi determinată)."""
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+def available_ram_bytes():
+    """Memoria RAM disponibilă acum (None dacă nu poate fi determinată)."""
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except Exception:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return None
+
+
+def _tensor_bytes(module):
+    """Dimensiunea parametrilor și buffer-elor unui modul PyTorch."""
+    total = 0
+    seen = set()
+    for collection in ("parameters", "buffers"):
+        for tensor in getattr(module, collection)():
+            if id(tensor) not in seen:
+                seen.add(id(tensor))
+                total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def estimate_footprint(instance, max_depth=3):
+    """
+    Estimează memoria ocupată de un model (parametri PyTorch și tablouri NumPy).
+
+    Parcurge atributele obiectului (ex: self.model, self.pipeline.unet) până la
+    max_depth niveluri și însumează tensorii găsiți o singură dată.
+
+    Args:
+        instance: Obiectul modelului
+        max_depth (int): Adâncimea maximă de parcurgere a atributelor
+
+    Returns:
+        int: Numărul estimat de bytes
+    """
+    total = 0
+    visited = set()
+
+    def visit(obj, depth):
+        nonlocal total
+        if obj is None or id(obj) in visited or depth > max_depth:
+            return
+        visited.add(id(obj))
+        if callable(getattr(obj, "parameters", None)) and callable(getattr(obj, "buffers", None)):
+            try:
+                total += _tensor_bytes(obj)
+                return
+            except Exception:
+                pass
+        nbytes = getattr(obj, "nbytes", None)
+        if isinstance(nbytes, int) and hasattr(obj, "dtype"):
+            total += nbytes
+            return
+        if isinstance(obj, (list, tuple)):
+            children = obj
+        elif isinstance(obj, dict):
+            children = obj.values()
+        elif hasattr(obj, "__dict__"):
+            children = vars(obj).values()
+        else:
+            return
+        for child in children:
+            if not isinstance(child, (str, bytes, int, float, bool)):
+                visit(child, depth + 1)
+
+    visit(instance, 0)
+    return total
+
+
+class ModelResidency:
+    """
+    Păstrează în memorie modelele folosite recent, în limita unui buget de RAM.
+
+    Modelele sunt înregistrate cu o funcție de încărcare. La depășirea bugetului,
+    modelele folosite cel mai demult (și care nu rulează în acel moment) sunt
+    descărcate; la următoarea utilizare sunt reîncărcate automat.
+    """
+
+    def __init__(self, budget_bytes=None):
+        """
+        Args:
+            budget_bytes (int): Bugetul de memorie pentru modele; None = jumătate din RAM
+        """
+        if budget_bytes is None:
+            total = total_ram_bytes()
+            budget_bytes = total // 2 if total else 4 * 1024 ** 3
+        self.budget_bytes = budget_bytes
+        self._entries = {}
+        self._lru = OrderedDict()  # nume -> None, cel mai vechi primul
+        self._lock = threading.RLock()
+
+    def register(self, name, loader, unloader=None, footprint_bytes=None):
+        """
+        Înregistrează un model.
+
+        Args:
+            name (str): Numele modelului
+            loader (callable): Construiește și returnează instanța modelului
+            unloader (callable): Apelată cu instanța la descărcare (opțional)
+            footprint_bytes (int): Dimensiunea cunoscută; altfel se estimează la încărcare
+        """
+        with self._lock:
+            self._entries[name] = {
+                "loader": loader,
+                "unloader": unloader,
+                "instance": None,
+                "known_footprint": footprint_bytes,
+                "footprint_bytes": footprint_bytes or 0,
+                "loads": 0,
+                "evictions": 0,
+                "in_use": 0,
+                "last_used": None,
+                "load_time": None,
+                "load_lock": threading.Lock(),
+            }
+
+    def is_loaded(self, name):
+        entry = self._entries.get(name)
+        return entry is not None and entry["instance"] is not None
+
+    def acquire(self, name):
+        """
+        Returnează instanța modelului, încărcând-o (sau reîncărcând-o) dacă este nevoie.
+
+        Args:
+            name (str): Numele modelului
+
+        Returns:
+            Instanța modelului
+        """
+        return self._acquire(name, pin=False)
+
+    @contextmanager
+    def use(self, name):
+        """Context în care modelul nu poate fi descărcat (ex: pe durata unei inferențe)."""
+        instance = self._acquire(name, pin=True)
+        try:
+            yield instance
+        finally:
+            with self._lock:
+                self._entries[name]["in_use"] -= 1
+
+    def _acquire(self, name, pin):
+        entry = self._entries[name]
+        # Încărcarea unui model nu blochează accesul la celelalte modele
+        with entry["load_lock"]:
+            with self._lock:
+                instance = entry["instance"]
+                if instance is not None:
+                    self._touch(name, entry, pin)
+                    return instance
+            instance = self._load(name, entry)
+            with self._lock:
+                entry["instance"] = instance
+                self._touch(name, entry, pin)
+                self._enforce_budget(keep=name)
+                return instance
+
+    def _touch(self, name, entry, pin):
+        entry["last_used"] = time.time()
+        if pin:
+            entry["in_use"] += 1
+        self._lru.pop(name, None)
+        self._lru[name] = None
+
+    def _load(self, name, entry):
+        # Eliberează loc înainte, dacă dimensiunea este cunoscută dintr-o încărcare anterioară
+        with self._lock:
+            self._enforce_budget(reserve=entry["footprint_bytes"], keep=name)
+        rss_before = current_rss_bytes()
+        start = time.time()
+        instance = entry["loader"]()
+        entry["load_time"] = time.time() - start
+        entry["loads"] += 1
+        if entry["known_footprint"]:
+            entry["footprint_bytes"] = entry["known_footprint"]
+        else:
+            measured = max(current_rss_bytes() - rss_before, 0)
+            entry["footprint_bytes"] = max(estimate_footprint(instance), measured)
+        return instance
+
+    def loaded_bytes(self):
+        """Memoria totală ocupată de modelele încărcate."""
+        return sum(entry["footprint_bytes"] for entry in self._entries.values()
+                   if entry["instance"] is not None)
+
+    def _enforce_budget(self, reserve=0, keep=None):
+        for name in list(self._lru):
+            if self.loaded_bytes() + reserve <= self.budget_bytes:
+                return
+            if name != keep and self._entries[name]["in_use"] == 0:
+                self.evict(name)
+
+    def evict(self, name):
+        """
+        Descarcă un model din memorie (rămâne înregistrat pentru reîncărcare).
+
+        Returns:
+            bool: True dacă modelul era încărcat
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry["instance"] is None:
+                return False
+            instance = entry["instance"]
+            entry["instance"] = None
+            entry["evictions"] += 1
+            self._lru.pop(name, None)
+        if entry["unloader"] is not None:
+            try:
+                entry["unloader"](instance)
+            except Exception as e:
+                print(f"Eroare la descărcarea modelului {name}: {e}")
+        del instance
+        gc.collect()
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        return True
+
+    def set_budget(self, budget_bytes):
+        """Schimbă bugetul și descarcă modelele care nu mai încap."""
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            self._enforce_budget()
+
+    def stats(self):
+        """
+        Starea fiecărui model înregistrat.
+
+        Returns:
+            dict: Bugetul, memoria ocupată și, pentru fiecare model, starea
+                  (încărcat/descărcat), dimensiunea, numărul de încărcări,
+                  reîncărcări și evacuări
+        """
+        with self._lock:
+            models = {}
+            for name, entry in self._entries.items():
+                models[name] = {
+                    "loaded": entry["instance"] is not None,
+                    "footprint_mb": entry["footprint_bytes"] / (1024 * 1024),
+                    "loads": entry["loads"],
+                    "reloads": max(entry["loads"] - 1, 0),
+                    "evictions": entry["evictions"],
+                    "in_use": entry["in_use"] > 0,
+                    "last_used": entry["last_used"],
+                    "load_time": entry["load_time"],
+                }
+            return {
+                "budget_mb": self.budget_bytes / (1024 * 1024),
+                "loaded_mb": self.loaded_bytes() / (1024 * 1024),
+                "lru_order": list(self._lru),
+                "models": models,
+            }
@@ -0,0 +1,135 @@
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from PIL import Image
+
+from .inpaint_regions import mask_regions
+from .lazy_imports import lazy_import
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+
+def pyramid_levels(hole_size, crop_size, coarse_hole=32, min_side=16):
+    """
+    Numărul de niveluri de micșorare (factor 2) pentru o zonă.
+
+    Se micșorează până când gaura are cel mult `coarse_hole` pixeli pe latura mare,
+    fără ca decupajul să scadă sub `min_side` pixeli.
+    """
+    levels = 0
+    while (hole_size / 2 ** levels > coarse_hole
+           and min(crop_size) / 2 ** (levels + 1) >= min_side):
+        levels += 1
+    return levels
+
+
+def _shrink_mask(mask, size):
+    # Un pixel mic este gaură dacă oricare dintre pixelii pe care îi acoperă este gaură,
+    # ca valorile din gaură (ex: pixeli transparenți) să nu intre în context
+    shrunk = cv2.resize(mask.astype(np.uint8) * 255, size, interpolation=cv2.INTER_AREA)
+    return shrunk > 0
+
+
+def inpaint_region(pixels, mask, radius=3, coarse_hole=32, band=6, method=None):
+    """
+    Reconstruiește o zonă pe mai multe scări.
+
+    Gaura este umplută cu cv2.inpaint la nivelul cel mai mic al piramidei, unde este
+    mică; la fiecare nivel superior rezultatul este mărit în interiorul găurii, iar
+    cv2.inpaint rulează din nou doar pe banda de `band` pixeli de la marginea găurii,
+    unde rezultatul mărit trebuie racordat la pixelii reali. Costul depinde astfel
+    de conturul găurii, nu de aria ei.
+
+    Args:
+        pixels (np.ndarray): Decupajul (h, w, 3) uint8
+        mask (np.ndarray): Masca booleană a decupajului (True = de reconstruit)
+        radius (int): Raza de vecinătate a cv2.inpaint
+        coarse_hole (int): Latura maximă a găurii la nivelul cel mai mic
+        band (int): Lățimea benzii rafinate la fiecare nivel
+        method (int): cv2.INPAINT_TELEA (implicit) sau cv2.INPAINT_NS
+
+    Returns:
+        np.ndarray: Decupajul reconstruit
+    """
+    method = cv2.INPAINT_TELEA if method is None else method
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    if not len(rows):
+        return pixels.copy()
+    hole_size = max(rows[-1] - rows[0] + 1, cols[-1] - cols[0] + 1)
+    levels = pyramid_levels(hole_size, mask.shape, coarse_hole)
+
+    images, masks = [pixels], [mask]
+    for level in range(1, levels + 1):
+        height, width = mask.shape
+        size = (max(1, int(math.ceil(width / 2 ** level))), max(1, int(math.ceil(height / 2 ** level))))
+        images.append(cv2.resize(pixels, size, interpolation=cv2.INTER_AREA))
+        masks.append(_shrink_mask(mask, size))
+
+    filled = cv2.inpaint(images[-1], masks[-1].astype(np.uint8), radius, method)
+    kernel = np.ones((2 * band + 1, 2 * band + 1), np.uint8)
+    for level in range(levels - 1, -1, -1):
+        target, level_mask = images[level], masks[level]
+        height, width = level_mask.shape
+        upsampled = cv2.resize(filled, (width, height), interpolation=cv2.INTER_LINEAR)
+        current = target.copy()
+        current[level_mask] = upsampled[level_mask]
+        # Banda: pixelii găurii aflați la cel mult `band` pixeli de pixelii cunoscuți
+        interior = cv2.erode(level_mask.astype(np.uint8), kernel, borderType=cv2.BORDER_REPLICATE)
+        ring = level_mask & (interior == 0)
+        filled = cv2.inpaint(current, ring.astype(np.uint8), radius, method)
+    return filled
+
+
+def inpaint_multiscale(image, mask, radius=3, coarse_hole=32, band=6, margin=32, max_workers=None,
+                       progress=None):
+    """
+    Umple zonele mascate ale unei imagini fără AI, pe mai multe scări.
+
+    Componentele disjuncte ale măștii (cu marginea de context) sunt procesate
+    în paralel; cv2 eliberează GIL-ul, deci firele rulează efectiv simultan.
+
+    Args:
+        image (PIL.Image): Imaginea (pixelii din mască sunt ignorați)
+        mask (np.ndarray): Masca booleană (True = de reconstruit)
+        radius (int): Raza de vecinătate a cv2.inpaint
+        coarse_hole (int): Latura maximă a găurii la nivelul cel mai mic
+        band (int): Lățimea benzii rafinate la fiecare nivel
+        margin (int): Contextul din jurul fiecărei zone, în pixeli
+        max_workers (int): Numărul maxim de zone procesate simultan (implicit: nucleele CPU)
+        progress (ProgressReporter): Progresul, în zone terminate
+
+    Returns:
+        PIL.Image: Imaginea RGB reconstruită
+    """
+    result = np.array(image.convert("RGB"))
+    mask = np.asarray(mask, dtype=bool)
+    regions = mask_regions(mask, margin=margin)
+    if progress is not None:
+        progress.start(total=len(regions), unit="regions")
+    if not regions:
+        return Image.fromarray(result)
+
+    def process(box):
+        left, top, right, bottom = box
+        crop_mask = mask[top:bottom, left:right]
+        filled = inpaint_region(result[top:bottom, left:right], crop_mask, radius, coarse_hole, band)
+        return box, crop_mask, filled
+
+    workers = max_workers or min(len(regions), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(process, box) for box in regions]
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                (left, top, right, bottom), crop_mask, filled = future.result()
+                # Zonele nu se suprapun: fiecare scrie doar pixelii propriei măști
+                result[top:bottom, left:right][crop_mask] = filled[crop_mask]
+                if progress is not None:
+                    progress.update(done, len(regions))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return Image.fromarray(result)
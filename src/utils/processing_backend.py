@@ -0,0 +1,352 @@
+import json
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from .image_processor import ImageProcessor
+from .lazy_imports import lazy_import
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+
+# Parametrii folosiți la benchmark pentru fiecare operație
+BENCHMARK_PARAMS = {
+    "enhance_brightness": {"factor": 1.2},
+    "enhance_contrast": {"factor": 1.2},
+    "enhance_saturation": {"factor": 1.2},
+    "apply_blur": {"radius": 2},
+    "apply_sharpen": {},
+    "rotate_image": {"angle": 30},
+    "flip_horizontal": {},
+    "flip_vertical": {},
+    "convert_to_grayscale": {},
+    "apply_sepia": {},
+    "auto_enhance": {},
+    "resize_for_display": {"max_width": 800, "max_height": 600},
+}
+
+# Nucleul ImageFilter.SHARPEN din PIL (liste simple: numpy se importă la prima utilizare)
+_SHARPEN_KERNEL = [[-2, -2, -2], [-2, 32, -2], [-2, -2, -2]]
+
+_SEPIA_MATRIX = [
+    [0.393, 0.769, 0.189],
+    [0.349, 0.686, 0.168],
+    [0.272, 0.534, 0.131]
+]
+
+
+def default_profile_path():
+    """Fișierul în care se păstrează alegerea backend-ului pentru fiecare operație."""
+    return Path.home() / ".ai_photo_editor" / "processing_backends.json"
+
+
+class PILBackend:
+    """Backend de referință: rulează metodele ImageProcessor pe imagini PIL."""
+
+    name = "pil"
+
+    def __init__(self, processor=None):
+        self.processor = processor or ImageProcessor()
+
+    def supports(self, operation, mode):
+        return hasattr(self.processor, operation)
+
+    def apply(self, operation, array, mode, **params):
+        image = Image.fromarray(array, mode=mode)
+        result = getattr(self.processor, operation)(image, **params)
+        return np.array(result), result.mode
+
+
+class OpenCVBackend:
+    """
+    Implementări cv2 care lucrează direct pe buffer-ul numpy.
+
+    Operațiile punctuale folosesc LUT-uri construite cu aceeași formulă ca
+    ImageEnhance, deci rezultatele sunt identice cu backend-ul PIL; filtrele
+    (GaussianBlur, filter2D) și rotația (warpAffine) diferă doar prin rotunjiri.
+    """
+
+    name = "opencv"
+
+    def __init__(self):
+        self._operations = {
+            "enhance_brightness": self._brightness,
+            "enhance_contrast": self._contrast,
+            "enhance_saturation": self._saturation,
+            "apply_blur": self._blur,
+            "apply_sharpen": self._sharpen,
+            "rotate_image": self._rotate,
+            "flip_horizontal": lambda array, mode: (cv2.flip(array, 1), mode),
+            "flip_vertical": lambda array, mode: (cv2.flip(array, 0), mode),
+            "convert_to_grayscale": self._grayscale,
+            "apply_sepia": self._sepia,
+            "auto_enhance": self._auto_enhance,
+            "resize_for_display": self._resize,
+        }
+
+    def supports(self, operation, mode):
+        if mode not in ("RGB", "RGBA"):
+            return False
+        return operation in self._operations
+
+    def apply(self, operation, array, mode, **params):
+        return self._operations[operation](array, mode, **params)
+
+    @staticmethod
+    def _blend_lut(base, factor):
+        """LUT pentru Image.blend(constantă, imagine, factor), cu trunchiere ca în PIL."""
+        values = np.arange(256, dtype=np.float32)
+        return np.clip(np.trunc(base + factor * (values - base)), 0, 255).astype(np.uint8)
+
+    @staticmethod
+    def _apply_to_color(array, func):
+        """Aplică func pe canalele de culoare și păstrează alfa neschimbat."""
+        if array.shape[2] == 4:
+            result = array.copy()
+            result[..., :3] = func(np.ascontiguousarray(array[..., :3]))
+            return result
+        return func(array)
+
+    def _brightness(self, array, mode, factor=1.2):
+        lut = self._blend_lut(0.0, factor)
+        return self._apply_to_color(array, lambda rgb: cv2.LUT(rgb, lut)), mode
+
+    def _contrast(self, array, mode, factor=1.2, mean=None):
+        if mean is None:
+            gray = cv2.cvtColor(np.ascontiguousarray(array[..., :3]), cv2.COLOR_RGB2GRAY)
+            mean = float(gray.mean())
+        lut = self._blend_lut(float(int(mean + 0.5)), factor)
+        return self._apply_to_color(array, lambda rgb: cv2.LUT(rgb, lut)), mode
+
+    def _saturation(self, array, mode, factor=1.2):
+        def saturate(rgb):
+            gray = cv2.cvtColor(cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY), cv2.COLOR_GRAY2RGB)
+            return cv2.addWeighted(rgb, factor, gray, 1.0 - factor, 0)
+        return self._apply_to_color(array, saturate), mode
+
+    def _blur(self, array, mode, radius=2):
+        if radius <= 0:
+            return array, mode
+        return cv2.GaussianBlur(array, (0, 0), sigmaX=radius, borderType=cv2.BORDER_REPLICATE), mode
+
+    def _sharpen(self, array, mode):
+        return cv2.filter2D(array, -1, np.array(_SHARPEN_KERNEL, dtype=np.float32) / 16.0, borderType=cv2.BORDER_REPLICATE), mode
+
+    def _rotate(self, array, mode, angle):
+        quarter_turns = angle / 90.0
+        if quarter_turns == int(quarter_turns):
+            # Multiplii de 90° sunt permutări exacte, fără reeșantionare
+            return np.ascontiguousarray(np.rot90(array, int(quarter_turns) % 4)), mode
+        height, width = array.shape[:2]
+        matrix = cv2.getRotationMatrix2D((width / 2.0, height / 2.0), angle, 1.0)
+        # Aceeași dimensiune ca Image.rotate(expand=True): cutia colțurilor rotite
+        corners = np.array([[0, 0, 1], [width, 0, 1], [width, height, 1], [0, height, 1]], dtype=np.float64)
+        rotated_corners = corners @ matrix.T
+        new_width = int(np.ceil(rotated_corners[:, 0].max()) - np.floor(rotated_corners[:, 0].min()))
+        new_height = int(np.ceil(rotated_corners[:, 1].max()) - np.floor(rotated_corners[:, 1].min()))
+        matrix[0, 2] += new_width / 2.0 - width / 2.0
+        matrix[1, 2] += new_height / 2.0 - height / 2.0
+        rotated = cv2.warpAffine(array, matrix, (new_width, new_height),
+                                 flags=cv2.INTER_NEAREST, borderValue=0)
+        return rotated, mode
+
+    def _grayscale(self, array, mode):
+        gray = cv2.cvtColor(np.ascontiguousarray(array[..., :3]), cv2.COLOR_RGB2GRAY)
+        return cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB), "RGB"
+
+    def _sepia(self, array, mode):
+        return cv2.transform(np.ascontiguousarray(array[..., :3]), np.array(_SEPIA_MATRIX, dtype=np.float32)), "RGB"
+
+    def _auto_enhance(self, array, mode):
+        rgb = np.ascontiguousarray(array[..., :3])
+        values = np.arange(256, dtype=np.float64)
+        stretched = np.empty_like(rgb)
+        for i in range(3):
+            channel = np.ascontiguousarray(rgb[..., i])
+            p1, p99 = np.percentile(channel, [1, 99])
+            if p99 > p1:
+                lut = np.clip(255 * (values - p1) / (p99 - p1), 0, 255).astype(np.uint8)
+                stretched[..., i] = cv2.LUT(channel, lut)
+            else:
+                stretched[..., i] = channel
+        return self._contrast(stretched, "RGB", factor=1.1)
+
+    def _resize(self, array, mode, max_width=800, max_height=600):
+        height, width = array.shape[:2]
+        scale = min(max_width / width, max_height / height, 1.0)
+        if scale >= 1.0:
+            return array, mode
+        size = (int(width * scale), int(height * scale))
+        return cv2.resize(array, size, interpolation=cv2.INTER_AREA), mode
+
+
+BACKENDS = {"pil": PILBackend, "opencv": OpenCVBackend}
+
+
+def benchmark_backends(size=(1920, 1080), repeats=3, operations=None):
+    """
+    Măsoară fiecare operație pe fiecare backend, pe o imagine sintetică.
+
+    Timpul backend-ului PIL include conversiile numpy <-> PIL, pentru că acesta
+    este costul real când buffer-ul de lucru este un array numpy.
+
+    Args:
+        size (tuple): Dimensiunea imaginii de test
+        repeats (int): Numărul de repetări (se păstrează cel mai bun timp)
+        operations (list): Operațiile măsurate; None = toate din BENCHMARK_PARAMS
+
+    Returns:
+        dict: operație -> {backend: secunde}
+    """
+    rng = np.random.default_rng(0)
+    array = rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+    backends = [cls() for cls in BACKENDS.values()]
+    results = {}
+    for operation in operations or BENCHMARK_PARAMS:
+        params = BENCHMARK_PARAMS.get(operation, {})
+        timings = {}
+        for backend in backends:
+            if not backend.supports(operation, "RGB"):
+                continue
+            best = float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                backend.apply(operation, array, "RGB", **params)
+                best = min(best, time.perf_counter() - start)
+            timings[backend.name] = best
+        results[operation] = timings
+    return results
+
+
+def choose_backends(timings):
+    """Alege backend-ul cel mai rapid pentru fiecare operație."""
+    return {operation: min(results, key=results.get) for operation, results in timings.items() if results}
+
+
+def load_backend_profile(path=None, run_if_missing=True):
+    """
+    Încarcă alegerea backend-urilor; la prima rulare face un benchmark rapid și îl salvează.
+
+    Returns:
+        dict: operație -> nume backend
+    """
+    path = Path(path) if path else default_profile_path()
+    try:
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["choices"]
+    except Exception as e:
+        print(f"Eroare la citirea profilului de backend-uri: {e}")
+    if not run_if_missing:
+        return {}
+    timings = benchmark_backends(size=(640, 480), repeats=2)
+    choices = choose_backends(timings)
+    save_backend_profile(choices, timings, path)
+    return choices
+
+
+def save_backend_profile(choices, timings=None, path=None):
+    """Salvează alegerea backend-urilor (și timpii măsurați) în format JSON."""
+    path = Path(path) if path else default_profile_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"choices": choices, "timings": timings or {}}, f, indent=2)
+    except Exception as e:
+        print(f"Eroare la salvarea profilului de backend-uri: {e}")
+
+
+class ProcessingSession:
+    """
+    Buffer de lucru numpy pe care se aplică o succesiune de operații.
+
+    Imaginea este convertită din PIL o singură dată la început și înapoi în PIL
+    doar la to_image() (afișare / export). Fiecare operație rulează pe backend-ul
+    ales de profil; dacă acesta nu o suportă, se folosește backend-ul PIL.
+    """
+
+    def __init__(self, image, backend="auto", profile=None, processor=None):
+        if image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        self.array = np.array(image)
+        self.mode = image.mode
+        self._pil = PILBackend(processor)
+        self._backends = {"pil": self._pil, "opencv": OpenCVBackend()}
+        self._default = backend
+        if backend == "auto":
+            self._profile = profile if profile is not None else load_backend_profile()
+        else:
+            self._profile = {}
+
+    @property
+    def size(self):
+        return (self.array.shape[1], self.array.shape[0])
+
+    def backend_for(self, operation):
+        """Backend-ul care va rula operația pe buffer-ul curent."""
+        name = self._profile.get(operation, "pil") if self._default == "auto" else self._default
+        backend = self._backends.get(name, self._pil)
+        if not backend.supports(operation, self.mode):
+            backend = self._pil
+        return backend
+
+    def apply(self, operation, **params):
+        """
+        Aplică o operație ImageProcessor pe buffer.
+
+        Args:
+            operation (str): Numele metodei ImageProcessor (ex: "apply_blur")
+            **params: Parametrii metodei
+
+        Returns:
+            ProcessingSession: Sesiunea, pentru înlănțuire
+        """
+        try:
+            self.array, self.mode = self.backend_for(operation).apply(operation, self.array, self.mode, **params)
+        except Exception as e:
+            print(f"Eroare la aplicarea operației {operation}: {e}")
+        return self
+
+    def to_image(self):
+        """Convertește buffer-ul în imagine PIL (granița afișare / export)."""
+        return Image.fromarray(self.array, mode=self.mode)
+
+
+def apply_chain(image, steps, profile=None, processor=None):
+    """
+    Aplică o succesiune de operații ImageProcessor pe backend-urile alese de profil.
+
+    Buffer-ul numpy (ProcessingSession) se folosește doar dacă profilul trimite cel
+    puțin o operație la OpenCV; fără profil (încă nemăsurat) sau când PIL este mai
+    rapid pentru toate operațiile, lanțul rulează direct pe imagini PIL, fără copii numpy.
+
+    Args:
+        image (PIL.Image): Imaginea de intrare
+        steps (list): Perechi (operație, parametri)
+        profile (dict): operație -> nume backend; None sau gol = PIL
+        processor (ImageProcessor): Procesorul folosit de backend-ul PIL
+
+    Returns:
+        PIL.Image: Imaginea procesată
+    """
+    if not profile or all(profile.get(operation, "pil") == "pil" for operation, _ in steps):
+        processor = processor or ImageProcessor()
+        for operation, params in steps:
+            image = getattr(processor, operation)(image, **params)
+        return image
+    session = ProcessingSession(image, backend="auto", profile=profile, processor=processor)
+    for operation, params in steps:
+        session.apply(operation, **params)
+    return session.to_image()
+
+
+if __name__ == "__main__":
+    results = benchmark_backends()
+    selected = choose_backends(results)
+    for op, op_timings in results.items():
+        row = "  ".join(f"{name}: {seconds * 1000:8.2f} ms" for name, seconds in op_timings.items())
+        print(f"{op:<22} {row}  -> {selected.get(op)}")
+    save_backend_profile(selected, results)
+    print(f"Profil salvat în {default_profile_path()}")
@@ -0,0 +1,254 @@
+import inspect
+import threading
+import time
+
+from .lazy_imports import lazy_import
+
+tkinter = lazy_import("tkinter")
+
+
+def accepts_keyword(fn, name):
+    """True dacă funcția acceptă argumentul cu numele dat (sau **kwargs)."""
+    try:
+        parameters = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+    return name in parameters or any(p.kind == p.VAR_KEYWORD for p in parameters.values())
+
+
+def format_duration(seconds):
+    """Formatează o durată ca m:ss sau h:mm:ss."""
+    seconds = int(round(seconds))
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class ProgressInfo:
+    """Starea progresului unei operații la un moment dat."""
+
+    def __init__(self, stage, fraction, done=None, total=None, unit="", rate=None, eta=None):
+        self.stage = stage
+        self.fraction = fraction      # None = progres nedeterminat
+        self.done = done
+        self.total = total
+        self.unit = unit
+        self.rate = rate              # Unități pe secundă
+        self.eta = eta                # Secunde rămase
+
+    @property
+    def text(self):
+        """Textul afișat sub bara de progres (ex: "Upscale: 12/48 tiles · 3.1 tiles/s · ETA 0:12")."""
+        parts = [self.stage] if self.stage else []
+        if self.total:
+            parts = [f"{self.stage}: {self.done}/{self.total} {self.unit}".strip()]
+        if self.rate:
+            parts.append(f"{self.rate:.1f} {self.unit}/s" if self.rate >= 1 else f"{1 / self.rate:.1f} s/{self.unit}")
+        if self.eta is not None:
+            parts.append(f"ETA {format_duration(self.eta)}")
+        return " · ".join(parts)
+
+
+class ProgressReporter:
+    """
+    Protocolul prin care operațiile AI raportează progresul real.
+
+    Operația (sau modelul, dacă metoda lui acceptă argumentul `progress`) apelează
+    start(total, unit) și apoi advance()/update() pentru fiecare pas de difuzie,
+    placă sau lot. Pentru diffusers se pot folosi direct diffusers_step_end
+    (callback_on_step_end) sau diffusers_legacy_callback (callback).
+
+    Viteza este o medie exponențială, iar ETA = unități rămase / viteză. Notificările
+    sunt limitate la cel mult una la `min_interval` secunde; check() (ex: anularea
+    jobului) este apelat la fiecare pas.
+    """
+
+    def __init__(self, callback, stage="", min_interval=0.1, check=None, span=(0.0, 1.0)):
+        """
+        Args:
+            callback (callable): Primește un ProgressInfo (poate fi apelată de pe orice thread)
+            stage (str): Numele operației
+            min_interval (float): Intervalul minim dintre două notificări, în secunde
+            check (callable): Apelată la fiecare pas; poate ridica o excepție pentru anulare
+            span (tuple): Intervalul din bara totală ocupat de acest raportor
+        """
+        self.callback = callback
+        self.stage = stage
+        self.min_interval = min_interval
+        self.check = check
+        self.span = span
+        self.total = None
+        self.unit = ""
+        self.done = 0
+        self.rate = None
+        self._lock = threading.Lock()
+        self._last_emit = 0.0
+        self._last_time = None
+        self._last_done = 0
+
+    def start(self, total=None, unit="steps", stage=None):
+        """
+        Începe o etapă.
+
+        Args:
+            total (int): Numărul total de unități; None = progres nedeterminat
+            unit (str): Unitatea (steps, tiles, images...)
+            stage (str): Numele etapei (opțional)
+        """
+        with self._lock:
+            self.total = total
+            self.unit = unit
+            if stage is not None:
+                self.stage = stage
+            self.done = 0
+            self.rate = None
+            self._last_time = time.time()
+            self._last_done = 0
+        self._emit(force=True)
+
+    def advance(self, count=1):
+        """Marchează terminarea a `count` unități (apelabilă simultan de pe mai multe thread-uri)."""
+        self._set(lambda done: done + count)
+
+    def update(self, done, total=None):
+        """Setează numărul de unități terminate (și, opțional, totalul)."""
+        self._set(lambda _: done, total)
+
+    def _set(self, new_done, total=None):
+        # new_done(done curent) rulează sub lacăt: incrementele concurente nu se pierd
+        if self.check is not None:
+            self.check()
+        now = time.time()
+        with self._lock:
+            done = new_done(self.done)
+            if total is not None:
+                self.total = total
+            if self._last_time is None:
+                self._last_time = now
+            elapsed = now - self._last_time
+            if done > self._last_done and elapsed > 0:
+                instant = (done - self._last_done) / elapsed
+                self.rate = instant if self.rate is None else 0.3 * instant + 0.7 * self.rate
+                self._last_time = now
+                self._last_done = done
+            self.done = done
+        self._emit(force=self.total is not None and done >= self.total)
+
+    def finish(self):
+        """Marchează etapa ca terminată."""
+        if self.total:
+            self.update(self.total)
+
+    def child(self, start, end, stage=None):
+        """
+        Un raportor pentru o sub-etapă, care ocupă fracțiunea [start, end] din acest raportor.
+
+        Exemplu: fiecare zonă a unui generative fill, cu pașii de difuzie ai zonei.
+        """
+        low, high = self.span
+        width = high - low
+        return ProgressReporter(self.callback, stage or self.stage, self.min_interval, self.check,
+                                (low + start * width, low + end * width))
+
+    def info(self):
+        """Starea curentă ca ProgressInfo."""
+        with self._lock:
+            low, high = self.span
+            if self.total:
+                local = min(self.done / self.total, 1.0)
+                fraction = low + local * (high - low)
+                eta = (self.total - self.done) / self.rate if self.rate else None
+            else:
+                fraction, eta = None, None
+            return ProgressInfo(self.stage, fraction, self.done, self.total, self.unit, self.rate, eta)
+
+    def _emit(self, force=False):
+        now = time.time()
+        if not force and now - self._last_emit < self.min_interval:
+            return
+        self._last_emit = now
+        self.callback(self.info())
+
+    def diffusers_step_end(self, pipeline, step, timestep, callback_kwargs):
+        """Callback compatibil cu `callback_on_step_end` din diffusers."""
+        total = getattr(pipeline, "num_timesteps", None) or self.total
+        self.update(step + 1, total)
+        return callback_kwargs
+
+    def diffusers_legacy_callback(self, step, timestep, latents):
+        """Callback compatibil cu argumentul `callback` (versiunile vechi de diffusers)."""
+        self.update(step + 1)
+
+
+class TkProgressBridge:
+    """
+    Transferă progresul raportat de pe thread-urile de lucru pe thread-ul Tk.
+
+    Thread-urile de lucru doar salvează ultima stare (post) sau pun în coadă funcții
+    care ating interfața (call); thread-ul Tk le preia periodic cu root.after.
+    """
+
+    def __init__(self, root, progress_bar, label=None, interval_ms=100):
+        self.root = root
+        self.progress_bar = progress_bar
+        self.label = label
+        self.interval_ms = interval_ms
+        self._latest = None
+        self._calls = []
+        self._lock = threading.Lock()
+        self._indeterminate = False
+
+    def post(self, info):
+        """Salvează ultima stare (apelabilă de pe orice thread)."""
+        with self._lock:
+            self._latest = info
+
+    def call(self, func, *args):
+        """Rulează func(*args) pe thread-ul Tk, la următoarea preluare (apelabilă de pe orice thread)."""
+        with self._lock:
+            self._calls.append((func, args))
+
+    def reset(self):
+        """Golește bara de progres (apelabilă de pe orice thread)."""
+        self.post(ProgressInfo("", 0.0))
+
+    def start(self):
+        """Pornește preluarea periodică pe thread-ul Tk."""
+        self.root.after(self.interval_ms, self._poll)
+
+    def _poll(self):
+        with self._lock:
+            info, self._latest = self._latest, None
+            calls, self._calls = self._calls, []
+        try:
+            if info is not None:
+                self._apply(info)
+        except Exception as e:
+            print(f"Eroare la afișarea progresului: {e}")
+        for func, args in calls:
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Eroare în callback-ul de pe thread-ul Tk: {e}")
+        try:
+            self.root.after(self.interval_ms, self._poll)
+        except tkinter.TclError:
+            pass  # Fereastra a fost distrusă: preluarea se oprește
+
+    def _apply(self, info):
+        if info.fraction is None:
+            # Modelul nu raportează pași: animație nedeterminată
+            if not self._indeterminate:
+                self.progress_bar.configure(mode="indeterminate")
+                self.progress_bar.start()
+                self._indeterminate = True
+        else:
+            if self._indeterminate:
+                self.progress_bar.stop()
+                self.progress_bar.configure(mode="determinate")
+                self._indeterminate = False
+            self.progress_bar.set(info.fraction)
+        if self.label is not None:
+            self.label.configure(text=info.text)
@@ -0,0 +1,216 @@
+import hashlib
+import os
+import re
+import time
+from pathlib import Path
+
+from .lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+
+def find_torch_modules(instance, max_depth=3):
+    """
+    Găsește modulele PyTorch ținute de un model (ex: self.model, self.pipeline.unet).
+
+    Parcurge atributele obiectului până la max_depth niveluri; un modul găsit nu
+    este parcurs mai departe (submodulele lui sunt cuantizate împreună cu el).
+
+    Args:
+        instance: Obiectul modelului
+        max_depth (int): Adâncimea maximă de parcurgere a atributelor
+
+    Returns:
+        list: Perechi (calea atributului ca tuplu, modul)
+    """
+    found = []
+    visited = set()
+
+    def visit(obj, path, depth):
+        if obj is None or id(obj) in visited or depth > max_depth:
+            return
+        visited.add(id(obj))
+        if path and callable(getattr(obj, "parameters", None)) and callable(getattr(obj, "named_modules", None)):
+            found.append((path, obj))
+            return
+        if isinstance(obj, (str, bytes, int, float, bool)) or not hasattr(obj, "__dict__"):
+            return
+        for name, child in vars(obj).items():
+            if not name.startswith("__"):
+                visit(child, path + (name,), depth + 1)
+
+    visit(instance, (), 0)
+    return found
+
+
+def set_attribute_path(instance, path, value):
+    """Înlocuiește atributul de la calea dată (ex: ("pipeline", "text_encoder"))."""
+    parent = instance
+    for name in path[:-1]:
+        parent = getattr(parent, name)
+    setattr(parent, path[-1], value)
+
+
+def linear_parameter_fraction(module):
+    """
+    Fracțiunea parametrilor aflați în straturi Linear (singurele cuantizate dinamic).
+
+    Un model convoluțional (ex: Real-ESRGAN) are fracțiunea aproape 0, deci
+    cuantizarea dinamică nu îl accelerează.
+    """
+    import torch
+
+    total = sum(p.numel() for p in module.parameters())
+    linear = sum(p.numel() for m in module.modules() if isinstance(m, torch.nn.Linear)
+                 for p in m.parameters(recurse=False))
+    return linear / total if total else 0.0
+
+
+def quantize_module(module):
+    """
+    Cuantizare dinamică INT8 a straturilor Linear (ponderi int8, activări cuantizate la rulare).
+
+    Args:
+        module (torch.nn.Module): Modulul float32
+
+    Returns:
+        torch.nn.Module: Modulul cuantizat
+    """
+    import torch
+
+    module.eval()
+    return torch.ao.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class ModelQuantizer:
+    """
+    Modul opțional de inferență INT8 pe CPU pentru modelele PyTorch.
+
+    Modulele cu straturi Linear (encoderele BLIP/CLIP) sunt cuantizate o singură dată;
+    rezultatul este salvat în directorul modelelor, iar la încărcările următoare
+    modulele cuantizate sunt citite direct din cache. Cheia cache-ului include
+    versiunea modelului și versiunea PyTorch.
+    """
+
+    def __init__(self, cache_dir, min_linear_fraction=0.05):
+        """
+        Args:
+            cache_dir (str): Directorul modulelor cuantizate (ex: models_dir / "quantized")
+            min_linear_fraction (float): Modulele cu mai puțini parametri în straturi Linear
+                                         rămân în float32
+        """
+        self.cache_dir = Path(cache_dir)
+        self.min_linear_fraction = min_linear_fraction
+        self.reports = {}
+
+    def cache_path(self, name, version):
+        """Fișierul cache pentru modelul și versiunea date."""
+        import torch
+
+        digest = hashlib.blake2b(f"{version}:{torch.__version__}".encode(), digest_size=8).hexdigest()
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_").lower()
+        return self.cache_dir / f"{safe_name}-{digest}.int8.pt"
+
+    def apply(self, name, instance, version):
+        """
+        Înlocuiește modulele PyTorch ale modelului cu variantele cuantizate.
+
+        Args:
+            name (str): Numele modelului
+            instance: Instanța modelului (cu modulele float32 deja încărcate)
+            version (str): Versiunea modelului (invalidează cache-ul la schimbare)
+
+        Returns:
+            Instanța, cu modulele cuantizate (sau neschimbată dacă nu are ce cuantiza)
+        """
+        import torch
+
+        modules = find_torch_modules(instance)
+        if not modules:
+            return instance
+        path = self.cache_path(name, version)
+        start = time.time()
+        cached = None
+        if path.exists():
+            try:
+                cached = torch.load(path, map_location="cpu", weights_only=False)
+            except Exception as e:
+                print(f"Eroare la citirea modelului cuantizat {name}: {e}")
+
+        quantized = {}
+        if cached is not None:
+            quantized = {tuple(key): module for key, module in cached}
+        else:
+            for module_path, module in modules:
+                if linear_parameter_fraction(module) >= self.min_linear_fraction:
+                    quantized[module_path] = quantize_module(module)
+            if quantized:
+                self._save(path, quantized)
+
+        for module_path, module in quantized.items():
+            set_attribute_path(instance, module_path, module)
+        self.reports[name] = {
+            "modules": [".".join(module_path) for module_path in quantized],
+            "skipped": [".".join(module_path) for module_path, _ in modules if module_path not in quantized],
+            "from_cache": cached is not None,
+            "seconds": time.time() - start,
+        }
+        return instance
+
+    def _save(self, path, quantized):
+        import torch
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(".tmp")
+            torch.save([(list(key), module) for key, module in quantized.items()], temp_path)
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"Eroare la salvarea modelului cuantizat: {e}")
+
+    def clear(self):
+        """Șterge modulele cuantizate salvate (de ex. după actualizarea modelelor)."""
+        for path in self.cache_dir.glob("*.int8.pt"):
+            try:
+                path.unlink()
+            except OSError as e:
+                print(f"Eroare la ștergerea {path}: {e}")
+
+
+def psnr(reference, candidate):
+    """
+    PSNR între două imagini de aceeași dimensiune, în dB (inf = identice).
+
+    Args:
+        reference: Imaginea de referință (PIL.Image sau np.ndarray)
+        candidate: Imaginea comparată
+    """
+    a = np.asarray(reference, dtype=np.float64)
+    b = np.asarray(candidate, dtype=np.float64)
+    if a.shape != b.shape:
+        raise ValueError(f"Dimensiuni diferite: {a.shape} vs {b.shape}")
+    mse = np.mean((a - b) ** 2)
+    return float("inf") if mse == 0 else float(10 * np.log10(255.0 ** 2 / mse))
+
+
+def caption_similarity(reference, candidate):
+    """
+    Cât de apropiate sunt două descrieri: 1.0 = identice, altfel scorul F1 pe cuvinte.
+    """
+    ref_words = re.findall(r"\w+", reference.lower())
+    cand_words = re.findall(r"\w+", candidate.lower())
+    if ref_words == cand_words:
+        return 1.0
+    common = sum(min(ref_words.count(w), cand_words.count(w)) for w in set(cand_words))
+    if not common:
+        return 0.0
+    precision = common / len(cand_words)
+    recall = common / len(ref_words)
+    return 2 * precision * recall / (precision + recall)
+
+
+def clip_score(image_embedding, text_embedding):
+    """Scorul CLIP: similaritatea cosinus dintre embedding-ul imaginii și al textului."""
+    a = np.asarray(image_embedding, dtype=np.float64).reshape(-1)
+    b = np.asarray(text_embedding, dtype=np.float64).reshape(-1)
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-12))
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import struct
+
+from .lazy_imports import lazy_import
+from .result_cache import ResultCache, image_content_hash
+
+np = lazy_import("numpy")
+
+
+def encode_recognition(result):
+    """
+    Serializează un rezultat de recunoaștere: antet JSON + embedding float16.
+
+    Args:
+        result (dict): description, caption, labels (etichetă -> scor), embedding (np.ndarray)
+
+    Returns:
+        bytes: Reprezentarea compactă
+    """
+    metadata = {key: value for key, value in result.items() if key != "embedding"}
+    header = json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+    embedding = result.get("embedding")
+    payload = b"" if embedding is None else np.asarray(embedding, dtype=np.float16).tobytes()
+    return struct.pack("<I", len(header)) + header + payload
+
+
+def decode_recognition(data):
+    """Deserializează un rezultat salvat cu encode_recognition."""
+    header_length = struct.unpack("<I", data[:4])[0]
+    result = json.loads(data[4:4 + header_length].decode("utf-8"))
+    payload = data[4 + header_length:]
+    result["embedding"] = np.frombuffer(payload, dtype=np.float16).copy() if payload else None
+    return result
+
+
+def run_recognition(recognizer, image):
+    """
+    Rulează recunoașterea și colectează toate rezultatele pe care modelul le oferă.
+
+    Dacă modelul are o metodă analyze(image) care returnează un dicționar (caption,
+    labels, embedding), aceasta este folosită; altfel se păstrează descrierea text
+    din recognize(image). Embedding-ul CLIP se adaugă prin get_image_embedding, dacă există.
+
+    Args:
+        recognizer: Modelul de recunoaștere (ImageRecognition)
+        image (PIL.Image): Imaginea
+
+    Returns:
+        dict: description, caption, labels, embedding
+    """
+    analyze = getattr(recognizer, "analyze", None)
+    if callable(analyze):
+        result = dict(analyze(image))
+    else:
+        result = {"description": recognizer.recognize(image)}
+
+    if result.get("embedding") is None:
+        get_embedding = getattr(recognizer, "get_image_embedding", None)
+        if callable(get_embedding):
+            result["embedding"] = get_embedding(image)
+    return normalize_recognition(result)
+
+
+def run_recognition_batch(recognizer, images, progress=None):
+    """
+    Ca run_recognition, pentru mai multe imagini, cu raportarea progresului.
+
+    Modelul de recunoaștere nu are o cale pe loturi, deci imaginile sunt
+    procesate una câte una.
+
+    Returns:
+        list: Rezultatele, în ordinea imaginilor
+    """
+    if progress is not None:
+        progress.start(total=len(images), unit="images")
+    results = []
+    for image in images:
+        results.append(run_recognition(recognizer, image))
+        if progress is not None:
+            progress.update(len(results))
+    return results
+
+
+def normalize_recognition(result):
+    """Completează descrierea și aduce scorurile și embedding-ul la tipuri serializabile."""
+    if "description" not in result:
+        lines = [result["caption"]] if result.get("caption") else []
+        labels = result.get("labels") or {}
+        lines += [f"{label}: {score:.1%}" for label, score in
+                  sorted(labels.items(), key=lambda item: item[1], reverse=True)]
+        result["description"] = "\n".join(lines)
+
+    if result.get("labels"):
+        result["labels"] = {str(label): float(score) for label, score in result["labels"].items()}
+    if result.get("embedding") is not None:
+        result["embedding"] = np.asarray(result["embedding"], dtype=np.float32).reshape(-1)
+    result.setdefault("caption", None)
+    result.setdefault("labels", {})
+    result.setdefault("embedding", None)
+    return result
+
+
+class RecognitionCache:
+    """
+    Cache persistent pentru rezultatele recunoașterii imaginilor.
+
+    Cheia combină hash-ul pixelilor cu versiunea modelului, deci o imagine deschisă
+    din nou (ex: din Recent Files) își regăsește descrierea fără a rula BLIP/CLIP,
+    iar schimbarea ponderilor sau a modului INT8 invalidează rezultatele vechi.
+    """
+
+    def __init__(self, model_version, cache_dir=None, memory_items=64, disk_limit_mb=64):
+        """
+        Args:
+            model_version (str | callable): Identificatorul versiunii modelului de recunoaștere,
+                                            sau o funcție care îl returnează (evaluată la fiecare
+                                            cheie, ex: după comutarea modului INT8)
+            cache_dir (str): Directorul rădăcină al cache-ului
+            memory_items (int): Numărul de rezultate ținute în memorie
+            disk_limit_mb (float): Dimensiunea maximă pe disc
+        """
+        self.model_version = model_version
+        self.cache = ResultCache("recognition", encode_recognition, decode_recognition,
+                                 memory_items=memory_items, disk_limit_mb=disk_limit_mb,
+                                 cache_dir=cache_dir)
+
+    def key_for(self, image, content_hash=None):
+        """Cheia cache-ului pentru o imagine (hash conținut + versiune model)."""
+        content_hash = content_hash or image_content_hash(image)
+        version = self.model_version() if callable(self.model_version) else self.model_version
+        return hashlib.blake2b(f"{version}:{content_hash}".encode(), digest_size=16).hexdigest()
+
+    def lookup(self, image):
+        """
+        Caută rezultatul fără a rula modelul.
+
+        Returns:
+            dict: Rezultatul din cache sau None
+        """
+        return self.cache.get(self.key_for(image))
+
+    def recognize(self, recognizer, image):
+        """
+        Returnează rezultatul din cache sau rulează recunoașterea și îl salvează.
+
+        Returns:
+            dict: description, caption, labels, embedding
+        """
+        return self.cache.get_or_compute(self.key_for(image), lambda: run_recognition(recognizer, image))
+
+    def recognize_many(self, recognizer, images, progress=None):
+        """
+        Rezultatele pentru mai multe imagini: cele din cache sunt returnate direct,
+        restul sunt recunoscute și salvate.
+
+        Returns:
+            list: Rezultatele, în ordinea imaginilor
+        """
+        keys = [self.key_for(image) for image in images]
+        results = [self.cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            computed = run_recognition_batch(recognizer, [images[i] for i in missing], progress)
+            for i, result in zip(missing, computed):
+                self.cache.put(keys[i], result)
+                results[i] = result
+        return results
+
+    def stats(self):
+        """Statisticile cache-ului (hit-uri, miss-uri, dimensiune)."""
+        return self.cache.stats()
@@ -0,0 +1,199 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from PIL import Image
+
+
+def default_cache_dir():
+    """Directorul implicit pentru cache-ul rezultatelor AI."""
+    return Path.home() / ".ai_photo_editor" / "cache"
+
+
+def image_content_hash(image):
+    """
+    Hash rapid al conținutului unei imagini (mod, dimensiune și pixeli).
+
+    Două imagini cu aceiași pixeli au același hash, indiferent de fișierul sursă,
+    deci rezultatul se regăsește și după undo/redo.
+
+    Args:
+        image (PIL.Image): Imaginea
+
+    Returns:
+        str: Hash hexazecimal (128 biți)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def encode_png(image):
+    """Serializează o imagine PIL ca PNG (fără pierderi)."""
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+def decode_image(data):
+    """Deserializează o imagine salvată cu encode_png."""
+    with Image.open(io.BytesIO(data)) as img:
+        img.load()
+        return img.copy()
+
+
+class ResultCache:
+    """
+    Cache cu două niveluri pentru rezultatele operațiilor AI.
+
+    Nivelul din memorie este un LRU cu număr limitat de elemente; nivelul de pe disc
+    (~/.ai_photo_editor/cache/<namespace>) persistă între sesiuni și este limitat ca
+    dimensiune, eliminând fișierele accesate cel mai demult.
+    """
+
+    def __init__(self, namespace, encode, decode, memory_items=16, disk_limit_mb=512, cache_dir=None):
+        """
+        Args:
+            namespace (str): Subdirectorul cache-ului (ex: "masks")
+            encode (callable): Valoare -> bytes, pentru stocarea pe disc
+            decode (callable): bytes -> valoare
+            memory_items (int): Numărul maxim de elemente ținute în memorie
+            disk_limit_mb (float): Dimensiunea maximă pe disc; 0 dezactivează discul
+            cache_dir (str): Directorul rădăcină (implicit ~/.ai_photo_editor/cache)
+        """
+        self.encode = encode
+        self.decode = decode
+        self.memory_items = memory_items
+        self.disk_limit_bytes = int(disk_limit_mb * 1024 * 1024)
+        self.directory = Path(cache_dir or default_cache_dir()) / namespace
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.disk_limit_bytes > 0:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key):
+        return self.directory / f"{key}.bin"
+
+    def get(self, key):
+        """
+        Caută o valoare în memorie, apoi pe disc.
+
+        Returns:
+            Valoarea sau None dacă nu există
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+        if self.disk_limit_bytes > 0:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    value = self.decode(f.read())
+                os.utime(path)  # Marchează elementul ca folosit recent
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, value)
+                return value
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Eroare la citirea din cache: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """Salvează o valoare în memorie și pe disc."""
+        self._remember(key, value)
+        if self.disk_limit_bytes <= 0:
+            return
+        try:
+            path = self._path(key)
+            temp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(temp_path, "wb") as f:
+                f.write(self.encode(value))
+            os.replace(temp_path, path)
+            self._enforce_disk_limit()
+        except Exception as e:
+            print(f"Eroare la scrierea în cache: {e}")
+
+    def get_or_compute(self, key, compute):
+        """Returnează valoarea din cache sau o calculează și o salvează."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def _disk_entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".bin"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def disk_usage(self):
+        """Dimensiunea totală a fișierelor din cache, în bytes."""
+        if self.disk_limit_bytes <= 0:
+            return 0
+        return sum(size for _, size, _ in self._disk_entries())
+
+    def _enforce_disk_limit(self):
+        entries = self._disk_entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_limit_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """Golește cache-ul din memorie și de pe disc."""
+        with self._lock:
+            self._memory.clear()
+        if self.disk_limit_bytes > 0:
+            for _, _, path in self._disk_entries():
+                os.remove(path)
+
+    def stats(self):
+        """
+        Statistici de utilizare.
+
+        Returns:
+            dict: Hit-uri (memorie/disc), miss-uri, rata de hit și dimensiunile cache-ului
+        """
+        disk_bytes = self.disk_usage()
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "disk_bytes": disk_bytes,
+            }
@@ -0,0 +1,141 @@
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Variabila de mediu care pornește aplicația în modul de măsurare a pornirii
+STARTUP_PROBE_ENV = "AI_PHOTO_EDITOR_STARTUP_PROBE"
+# Linia scrisă de main.py după ce prima fereastră a fost desenată
+FIRST_WINDOW_MARKER = "STARTUP_FIRST_WINDOW"
+
+# Dependențele care nu trebuie importate înainte de prima fereastră
+HEAVY_MODULES = ("numpy", "cv2", "requests", "torch", "transformers", "diffusers")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(text):
+    """
+    Interpretează ieșirea `python -X importtime` (stderr).
+
+    Args:
+        text (str): Textul scris de interpretor pe stderr
+
+    Returns:
+        list: dict-uri cu module, self_ms, cumulative_ms, depth, în ordinea importului
+    """
+    entries = []
+    for line in text.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        entries.append({
+            "module": module,
+            "self_ms": int(self_us) / 1000.0,
+            "cumulative_ms": int(cumulative_us) / 1000.0,
+            "depth": (len(indent) - 1) // 2,
+        })
+    return entries
+
+
+def top_imports(entries, count=15, key="cumulative_ms"):
+    """Cele mai costisitoare importuri, după timpul cumulat sau propriu."""
+    return sorted(entries, key=lambda entry: entry[key], reverse=True)[:count]
+
+
+def total_import_ms(entries):
+    """Timpul total de import: suma importurilor de la nivelul cel mai de sus."""
+    return sum(entry["cumulative_ms"] for entry in entries if entry["depth"] == 0)
+
+
+def profile_imports(target="src.ui.main_window", python=None, cwd=None, timeout=120):
+    """
+    Importă un modul într-un proces nou cu `-X importtime`.
+
+    Un proces nou garantează că nimic nu este deja în sys.modules.
+
+    Args:
+        target (str): Modulul importat
+        python (str): Interpretorul (implicit cel curent)
+        cwd (str): Directorul de lucru (implicit rădăcina proiectului)
+        timeout (float): Limita de timp, în secunde
+
+    Returns:
+        dict: entries, total_ms, loaded (dependențele grele prezente după import)
+    """
+    script = (
+        f"import sys; import {target}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", script],
+        cwd=str(cwd or PROJECT_ROOT), capture_output=True, text=True, timeout=timeout,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importul {target} a eșuat:\n{result.stderr[-2000:]}")
+    entries = parse_importtime(result.stderr)
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return {"entries": entries, "total_ms": total_import_ms(entries), "loaded": loaded}
+
+
+def measure_first_window(script="main.py", python=None, cwd=None, timeout=120):
+    """
+    Pornește aplicația și măsoară timpul până la desenarea primei ferestre.
+
+    main.py, rulat cu STARTUP_PROBE_ENV setat, desenează fereastra, scrie
+    FIRST_WINDOW_MARKER și se închide. Timpul include pornirea interpretorului.
+
+    Returns:
+        dict: seconds (până la prima fereastră), loaded (dependențele grele
+              importate până atunci) sau None dacă aplicația nu a ajuns la fereastră
+    """
+    env = dict(os.environ)
+    env[STARTUP_PROBE_ENV] = "1"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [python or sys.executable, script], cwd=str(cwd or PROJECT_ROOT), env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    seconds = None
+    loaded = []
+    try:
+        for line in process.stdout:
+            if line.startswith(FIRST_WINDOW_MARKER):
+                seconds = time.perf_counter() - start
+                loaded = [name for name in line.strip().split(" ", 1)[-1].split(",")
+                          if name and name != FIRST_WINDOW_MARKER]
+                break
+        process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+    if seconds is None:
+        return None
+    return {"seconds": seconds, "loaded": loaded}
+
+
+def report_first_window(root):
+    """
+    Apelat de main.py în modul de măsurare: desenează fereastra și raportează.
+
+    Args:
+        root: Fereastra principală Tk
+    """
+    root.update()
+    loaded = ",".join(name for name in HEAVY_MODULES if name in sys.modules)
+    print(f"{FIRST_WINDOW_MARKER} {loaded}", flush=True)
+
+
+def print_report(profile, count=15):
+    """Afișează importurile cele mai costisitoare."""
+    print(f"⏱️  Import total: {profile['total_ms']:.1f} ms")
+    print(f"   Dependențe grele încărcate: {', '.join(profile['loaded']) or 'niciuna'}")
+    print(f"   {'cumulat (ms)':>12} {'propriu (ms)':>12}  modul")
+    for entry in top_imports(profile["entries"], count):
+        print(f"   {entry['cumulative_ms']:12.1f} {entry['self_ms']:12.1f}  "
+              f"{'  ' * entry['depth']}{entry['module']}")
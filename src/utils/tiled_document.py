@@ -0,0 +1,686 @@
+import io
+import math
+import os
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+
+from PIL import Image
+
+from .image_processor import ImageProcessor
+from .lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+
+# Moduri raw PIL care pot fi mapate direct în memorie: rawmode -> (mod, benzi, inversare canale)
+_RAW_LAYOUTS = {
+    "L": ("L", 1, False),
+    "RGB": ("RGB", 3, False),
+    "RGBA": ("RGBA", 4, False),
+    "BGR": ("RGB", 3, True),
+}
+
+_MODE_BANDS = {"L": 1, "RGB": 3, "RGBA": 4}
+
+# Peste această dimensiune (în pixeli) editorul și procesarea în lot folosesc documentul pe tile-uri
+LARGE_IMAGE_PIXELS = 64 * 1024 * 1024
+
+# Formatele care nu pot fi citite pe regiuni (PNG, ...) sunt decodate întregi în memorie;
+# peste această limită (în pixeli) documentul nu este deschis
+MAX_DECODE_PIXELS = 16 * 1024 * 1024
+
+# Formatele exportate pe benzi: extensie -> format
+STRIP_EXPORT_FORMATS = {".tif": "TIFF", ".tiff": "TIFF", ".png": "PNG"}
+
+# Etichetele TIFF care descriu formatul pixelilor și compresia, copiate în TIFF-ul unei benzi
+_BAND_TIFF_TAGS = (258, 259, 262, 277, 284, 317, 320, 338, 339, 347, 530, 532)
+
+# Operațiile ImageProcessor disponibile pe tile-uri:
+# nume -> (metoda ImageProcessor, halo necesar în pixeli, statistici globale necesare)
+TILE_OPERATIONS = {
+    "brightness": ("enhance_brightness", None, None),
+    "contrast": ("enhance_contrast", None, "contrast_mean"),
+    "saturation": ("enhance_saturation", None, None),
+    "blur": ("apply_blur", lambda params: 3 * math.ceil(params.get("radius", 2)) + 2, None),
+    "sharpen": ("apply_sharpen", lambda params: 2, None),
+    "grayscale": ("convert_to_grayscale", None, None),
+    "sepia": ("apply_sepia", None, None),
+    "auto_enhance": ("auto_enhance", None, "auto_levels"),
+}
+
+
+def default_scratch_dir():
+    """Directorul implicit pentru fișierele temporare ale documentelor pe tile-uri."""
+    scratch_dir = Path.home() / ".ai_photo_editor" / "scratch"
+    scratch_dir.mkdir(parents=True, exist_ok=True)
+    return scratch_dir
+
+
+def open_image_header(file_path):
+    """
+    Deschide o imagine (doar antetul) fără limita globală anti "decompression bomb".
+
+    Imaginile gigapixel depășesc intenționat Image.MAX_IMAGE_PIXELS, iar modificarea
+    limitei globale ar dezactiva protecția pentru toate thread-urile. TIFF, PNG, BMP și
+    PPM sunt deschise direct prin pluginul PIL; celelalte formate trec prin Image.open.
+    Limita pentru decodarea în memorie este aplicată separat (max_decode_pixels).
+    """
+    from PIL import BmpImagePlugin, PngImagePlugin, PpmImagePlugin, TiffImagePlugin
+
+    for factory in (TiffImagePlugin.TiffImageFile, PngImagePlugin.PngImageFile,
+                    BmpImagePlugin.BmpImageFile, PpmImagePlugin.PpmImageFile):
+        try:
+            return factory(file_path)
+        except SyntaxError:
+            continue  # Alt format
+    return Image.open(file_path)
+
+
+def is_large_image(file_path, threshold=LARGE_IMAGE_PIXELS):
+    """True dacă imaginea (citită doar din antet) depășește threshold pixeli."""
+    try:
+        with open_image_header(file_path) as img:
+            return img.width * img.height > threshold
+    except Exception:
+        return False
+
+
+def _band_tiff(tags, fp, width, rows, first, count):
+    """
+    Construiește un TIFF minimal cu benzile (sau tile-urile) first..first+count ale unui TIFF.
+
+    Datele comprimate sunt copiate neschimbate; etichetele de format și compresie sunt
+    aceleași, deci PIL decodează doar această bandă.
+
+    Returns:
+        bytes: Fișierul TIFF al benzii
+    """
+    from PIL import TiffImagePlugin
+
+    tiled = 322 in tags
+    offsets_tag, counts_tag = (324, 325) if tiled else (273, 279)
+    counts = tuple(tags[counts_tag][first:first + count])
+    chunks = []
+    relative = []
+    position = 0
+    for offset, size in zip(tags[offsets_tag][first:first + count], counts):
+        fp.seek(offset)
+        chunks.append(fp.read(size))
+        relative.append(position)
+        position += size
+
+    ifd = TiffImagePlugin.ImageFileDirectory_v2(prefix=b"II")
+    for tag in _BAND_TIFF_TAGS:
+        if tag in tags:
+            ifd[tag] = tags[tag]
+            ifd.tagtype[tag] = tags.tagtype[tag]
+    ifd[256] = width
+    ifd[257] = rows
+    if tiled:
+        ifd[322] = tags[322]
+        ifd[323] = tags[323]
+    else:
+        ifd[278] = tags.get(278, rows)
+    ifd[counts_tag] = counts
+    ifd.tagtype[counts_tag] = 4
+    # Datele urmează după IFD; PIL mută singur StripOffsets după IFD, TileOffsets nu
+    ifd[offsets_tag] = tuple(relative)
+    ifd.tagtype[offsets_tag] = 4
+    directory = ifd.tobytes(8)
+    if tiled:
+        ifd[offsets_tag] = tuple(8 + len(directory) + offset for offset in relative)
+        directory = ifd.tobytes(8)
+    return b"II*\x00" + struct.pack("<I", 8) + directory + b"".join(chunks)
+
+
+def percentile_from_histogram(histogram, q):
+    """
+    Calculează percentila q dintr-o histogramă, identic cu np.percentile (interpolare liniară).
+
+    Args:
+        histogram (np.ndarray): Numărul de pixeli pentru fiecare valoare 0..255
+        q (float): Percentila (0-100)
+
+    Returns:
+        float: Valoarea percentilei
+    """
+    cumulative = np.cumsum(histogram)
+    total = int(cumulative[-1])
+    position = q / 100.0 * (total - 1)
+    lower = int(math.floor(position))
+    upper = min(lower + 1, total - 1)
+    # Valoarea de pe poziția k în șirul sortat = prima valoare cu cumulative > k
+    lower_value = int(np.searchsorted(cumulative, lower, side="right"))
+    upper_value = int(np.searchsorted(cumulative, upper, side="right"))
+    return lower_value + (position - lower) * (upper_value - lower_value)
+
+
+class _RawFileSource:
+    """Citește regiuni direct din datele necomprimate ale fișierului, prin memory-mapping."""
+
+    def __init__(self, path, entries, mode, bands):
+        self.mode = mode
+        self.bands = bands
+        self._data = np.memmap(path, dtype=np.uint8, mode="r")
+        # (x0, y0, x1, y1, offset, stride, orientare, inversare canale)
+        self._entries = entries
+
+    def read(self, x0, y0, x1, y1):
+        region = np.empty((y1 - y0, x1 - x0, self.bands), dtype=np.uint8)
+        for ex0, ey0, ex1, ey1, offset, stride, orientation, swap in self._entries:
+            ix0, iy0 = max(x0, ex0), max(y0, ey0)
+            ix1, iy1 = min(x1, ex1), min(y1, ey1)
+            if ix0 >= ix1 or iy0 >= iy1:
+                continue
+            rows = ey1 - ey0
+            block = self._data[offset:offset + rows * stride].reshape(rows, stride)
+            block = block[:, :(ex1 - ex0) * self.bands].reshape(rows, ex1 - ex0, self.bands)
+            if orientation < 0:
+                block = block[::-1]
+            pixels = block[iy0 - ey0:iy1 - ey0, ix0 - ex0:ix1 - ex0]
+            if swap:
+                pixels = pixels[..., ::-1]
+            region[iy0 - y0:iy1 - y0, ix0 - x0:ix1 - x0] = pixels
+        return region
+
+    def close(self):
+        self._data = None
+
+
+class _ScratchSource:
+    """Pixeli stocați într-un fișier temporar memory-mapped."""
+
+    def __init__(self, width, height, mode, scratch_dir):
+        self.mode = mode
+        self.bands = _MODE_BANDS[mode]
+        fd, self.path = tempfile.mkstemp(suffix=".tiles", dir=scratch_dir)
+        os.close(fd)
+        self.array = np.memmap(self.path, dtype=np.uint8, mode="w+",
+                               shape=(height, width, self.bands))
+
+    def read(self, x0, y0, x1, y1):
+        return np.array(self.array[y0:y1, x0:x1])
+
+    def write(self, x0, y0, pixels):
+        self.array[y0:y0 + pixels.shape[0], x0:x0 + pixels.shape[1]] = pixels
+
+    def flush(self):
+        self.array.flush()
+
+    def close(self):
+        self.array = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class TiledDocument:
+    """
+    Document imagine out-of-core: pixelii rămân pe disc și sunt procesați pe tile-uri.
+
+    TIFF-urile necomprimate (și alte formate raw: BMP, PPM) sunt citite leneș direct
+    din fișier, prin memory-mapping. TIFF-urile comprimate (LZW, Deflate, PackBits, JPEG)
+    sunt decodate bandă cu bandă, după offset-urile benzilor/tile-urilor din fișier, într-un
+    fișier temporar memory-mapped. Celelalte formate comprimate (PNG) nu pot fi decodate
+    pe regiuni: sunt decodate întregi doar până la max_decode_pixels, altfel sunt refuzate.
+    """
+
+    def __init__(self, source, width, height, tile_size=512, scratch_dir=None):
+        self._source = source
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.scratch_dir = scratch_dir or default_scratch_dir()
+
+    @classmethod
+    def open(cls, file_path, tile_size=512, scratch_dir=None, max_decode_pixels=MAX_DECODE_PIXELS):
+        """
+        Deschide o imagine mare fără a o încărca în memorie.
+
+        Args:
+            file_path (str): Calea către imagine (TIFF, PNG, BMP, ...)
+            tile_size (int): Latura unui tile în pixeli
+            scratch_dir (str): Directorul pentru fișierele temporare
+            max_decode_pixels (int): Numărul maxim de pixeli al unei imagini care nu poate fi
+                                     decodată pe regiuni (ex: PNG) și se decodează întreagă
+                                     în memorie (None = fără limită)
+
+        Returns:
+            TiledDocument: Documentul deschis
+
+        Raises:
+            ValueError: Imaginea nu poate fi decodată pe regiuni și depășește max_decode_pixels
+        """
+        scratch_dir = scratch_dir or default_scratch_dir()
+        with open_image_header(file_path) as img:
+            width, height = img.size
+            source = cls._raw_source(file_path, img)
+            if source is None and img.format == "TIFF":
+                source = cls._decode_tiff_bands(file_path, img, scratch_dir, tile_size)
+            if source is None:
+                if max_decode_pixels is not None and width * height > max_decode_pixels:
+                    raise ValueError(
+                        f"Imaginea {img.format} de {width}x{height} nu poate fi decodată pe regiuni și ar trebui "
+                        f"decodată întreagă în memorie (limita: {max_decode_pixels} pixeli). "
+                        f"Salvați-o ca TIFF pentru procesarea pe tile-uri."
+                    )
+                source = cls._decode_to_scratch(img, scratch_dir, tile_size)
+        return cls(source, width, height, tile_size, scratch_dir)
+
+    @staticmethod
+    def _raw_source(file_path, img):
+        """Construiește o sursă memory-mapped dacă toate tile-urile PIL sunt necomprimate."""
+        entries = []
+        layout = None
+        for tile in img.tile:
+            codec, extents, offset, args = tile[0], tile[1], tile[2], tile[3]
+            if codec != "raw":
+                return None
+            if isinstance(args, str):
+                args = (args, 0, 1)
+            rawmode = args[0]
+            stride = args[1] if len(args) > 1 else 0
+            orientation = args[2] if len(args) > 2 else 1
+            if rawmode not in _RAW_LAYOUTS or _RAW_LAYOUTS[rawmode][0] != img.mode:
+                return None
+            mode, bands, swap = _RAW_LAYOUTS[rawmode]
+            layout = (mode, bands)
+            x0, y0, x1, y1 = extents
+            if stride <= 0:
+                stride = (x1 - x0) * bands
+            entries.append((x0, y0, x1, y1, offset, stride, orientation, swap))
+        if not entries:
+            return None
+        return _RawFileSource(file_path, entries, *layout)
+
+    @staticmethod
+    def _decode_tiff_bands(file_path, img, scratch_dir, band_height):
+        """
+        Decodează un TIFF comprimat bandă cu bandă și scrie pixelii pe disc.
+
+        Fiecare bandă (benzile sau rândul de tile-uri de ~band_height rânduri) devine un
+        TIFF minimal decodat separat, deci memoria depinde de bandă, nu de imagine.
+
+        Returns:
+            _ScratchSource: Pixelii decodați, sau None dacă fișierul nu are benzi utilizabile
+        """
+        tags = img.tag_v2
+        if tags.get(284, 1) != 1:
+            return None  # Planuri separate: fiecare canal are propriile benzi
+        if 322 in tags:
+            chunk_height = tags[323]
+            across = -(-img.width // tags[322])
+            offsets, counts = tags.get(324), tags.get(325)
+        else:
+            chunk_height = tags.get(278, img.height)
+            across = 1
+            offsets, counts = tags.get(273), tags.get(279)
+        if not offsets or not counts or len(offsets) != len(counts):
+            return None
+        from PIL import TiffImagePlugin
+
+        per_band = across * max(1, band_height // chunk_height)
+        source = None
+        try:
+            with open(file_path, "rb") as fp:
+                for first in range(0, len(offsets), per_band):
+                    y = first // across * chunk_height
+                    if y >= img.height:
+                        break
+                    count = min(per_band, len(offsets) - first)
+                    rows = min(count // across * chunk_height, img.height - y)
+                    data = _band_tiff(tags, fp, img.width, rows, first, count)
+                    band = TiffImagePlugin.TiffImageFile(io.BytesIO(data))
+                    band.load()
+                    if band.mode not in _MODE_BANDS:
+                        band = band.convert("RGBA" if "A" in band.getbands() else "RGB")
+                    if source is None:
+                        source = _ScratchSource(img.width, img.height, band.mode, scratch_dir)
+                    source.write(0, y, np.array(band).reshape(rows, img.width, source.bands))
+        except Exception:
+            if source is not None:
+                source.close()
+            raise
+        if source is not None:
+            source.flush()
+        return source
+
+    @staticmethod
+    def _decode_to_scratch(img, scratch_dir, strip_height):
+        """Decodează o singură dată și mută pixelii pe disc, în benzi."""
+        print(f"Formatul {img.format} nu permite citirea pe regiuni; imaginea se decodează o dată.")
+        if img.mode not in _MODE_BANDS:
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+        img.load()
+        source = _ScratchSource(img.width, img.height, img.mode, scratch_dir)
+        for y in range(0, img.height, strip_height):
+            strip = np.array(img.crop((0, y, img.width, min(y + strip_height, img.height))))
+            source.write(0, y, strip.reshape(strip.shape[0], strip.shape[1], source.bands))
+        source.flush()
+        return source
+
+    @property
+    def mode(self):
+        return self._source.mode
+
+    @property
+    def size(self):
+        return (self.width, self.height)
+
+    def tiles(self):
+        """Generează coordonatele (x0, y0, x1, y1) ale tuturor tile-urilor."""
+        for y in range(0, self.height, self.tile_size):
+            for x in range(0, self.width, self.tile_size):
+                yield (x, y, min(x + self.tile_size, self.width), min(y + self.tile_size, self.height))
+
+    def read_region(self, box):
+        """Citește o regiune ca array numpy (înălțime, lățime, benzi)."""
+        x0, y0, x1, y1 = box
+        return self._source.read(x0, y0, x1, y1)
+
+    def read_tile_image(self, box, halo=0):
+        """
+        Citește un tile ca imagine PIL, extins cu halo pixeli pe fiecare parte.
+
+        Returns:
+            tuple: (imaginea, (x, y) poziția tile-ului în interiorul imaginii)
+        """
+        x0, y0, x1, y1 = box
+        rx0, ry0 = max(0, x0 - halo), max(0, y0 - halo)
+        rx1, ry1 = min(self.width, x1 + halo), min(self.height, y1 + halo)
+        region = self.read_region((rx0, ry0, rx1, ry1))
+        return _array_to_image(region, self.mode), (x0 - rx0, y0 - ry0)
+
+    def histogram(self):
+        """Histogramele canalelor R, G, B, calculate tile cu tile."""
+        histograms = np.zeros((3, 256), dtype=np.int64)
+        for box in self.tiles():
+            tile, _ = self.read_tile_image(box)
+            pixels = np.array(tile.convert("RGB")).reshape(-1, 3)
+            for i in range(3):
+                histograms[i] += np.bincount(pixels[:, i], minlength=256)
+        return histograms
+
+    def luminance_mean(self, transform=None):
+        """Media luminanței (mod 'L'), opțional după aplicarea unei transformări pe fiecare tile."""
+        total = 0
+        for box in self.tiles():
+            tile, _ = self.read_tile_image(box)
+            if transform is not None:
+                tile = transform(tile)
+            total += int(np.array(tile.convert("L"), dtype=np.int64).sum())
+        return total / float(self.width * self.height)
+
+    def map_tiles(self, transform, halo=0):
+        """
+        Aplică transform(imagine_tile) pe fiecare tile și scrie rezultatul într-un document nou.
+
+        Rezultatul intermediar este stocat într-un fișier temporar memory-mapped,
+        deci memoria folosită depinde doar de mărimea tile-ului.
+
+        Returns:
+            TiledDocument: Documentul rezultat
+        """
+        output = None
+        for box in self.tiles():
+            tile, (ox, oy) = self.read_tile_image(box, halo)
+            result = transform(tile)
+            if result.mode not in _MODE_BANDS:
+                result = result.convert("RGB")
+            if output is None:
+                output = _ScratchSource(self.width, self.height, result.mode, self.scratch_dir)
+            elif result.mode != output.mode:
+                result = result.convert(output.mode)
+            inner = result.crop((ox, oy, ox + box[2] - box[0], oy + box[3] - box[1]))
+            pixels = np.array(inner).reshape(inner.height, inner.width, output.bands)
+            output.write(box[0], box[1], pixels)
+        output.flush()
+        return TiledDocument(output, self.width, self.height, self.tile_size, self.scratch_dir)
+
+    def preview(self, max_size=(800, 600)):
+        """Construiește o imagine micșorată pentru afișare, tile cu tile."""
+        scale = min(max_size[0] / self.width, max_size[1] / self.height, 1.0)
+        preview_size = (max(1, int(self.width * scale)), max(1, int(self.height * scale)))
+        preview = Image.new(self.mode, preview_size)
+        for box in self.tiles():
+            tile, _ = self.read_tile_image(box)
+            left, top = int(box[0] * scale), int(box[1] * scale)
+            right = max(left + 1, int(box[2] * scale))
+            bottom = max(top + 1, int(box[3] * scale))
+            preview.paste(tile.resize((right - left, bottom - top), Image.Resampling.BILINEAR), (left, top))
+        return preview
+
+    def save(self, file_path, strip_height=256, file_format=None):
+        """
+        Exportă documentul în benzi orizontale, fără a-l încărca întreg în memorie.
+
+        Formate suportate: TIFF necomprimat (BigTIFF peste 4GB) și PNG.
+
+        Args:
+            file_path (str): Calea fișierului de ieșire
+            strip_height (int): Numărul de rânduri scrise la un pas
+            file_format (str): "TIFF" sau "PNG"; implicit dedus din extensie
+
+        Returns:
+            bool: True dacă exportul a reușit, False altfel
+        """
+        try:
+            ext = os.path.splitext(str(file_path))[1].lower()
+            file_format = file_format or STRIP_EXPORT_FORMATS.get(ext)
+            if file_format == "TIFF":
+                _write_tiff_strips(self, file_path, strip_height)
+            elif file_format == "PNG":
+                _write_png_strips(self, file_path, strip_height)
+            else:
+                raise ValueError(f"Format neacceptat pentru export pe benzi: {file_format or ext}")
+            return True
+        except Exception as e:
+            print(f"Eroare la exportul documentului: {e}")
+            return False
+
+    def close(self):
+        """Eliberează maparea fișierului și șterge fișierele temporare."""
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class TiledPipeline:
+    """
+    Pipeline de operații ImageProcessor executat în flux pe tile-uri.
+
+    Operațiile consecutive sunt aplicate împreună pe fiecare tile (halo-urile se adună).
+    Operațiile care au nevoie de statistici globale (contrast, auto_enhance) încep o etapă
+    nouă: rezultatul etapei anterioare este scris pe disc și statisticile se calculează
+    din el înainte de a continua.
+    """
+
+    def __init__(self, processor=None):
+        self.processor = processor or ImageProcessor()
+        self.steps = []
+
+    def add(self, operation, **params):
+        """
+        Adaugă o operație în pipeline.
+
+        Args:
+            operation (str): Numele operației (vezi TILE_OPERATIONS)
+            **params: Parametrii metodei ImageProcessor (ex: factor=1.3, radius=2)
+
+        Returns:
+            TiledPipeline: Pipeline-ul, pentru înlănțuire
+        """
+        if operation not in TILE_OPERATIONS:
+            raise ValueError(f"Operație necunoscută pentru procesarea pe tile-uri: {operation}")
+        self.steps.append((operation, params))
+        return self
+
+    def _stages(self):
+        stages = []
+        for operation, params in self.steps:
+            if not stages or TILE_OPERATIONS[operation][2] is not None:
+                stages.append([])
+            stages[-1].append((operation, params))
+        return stages
+
+    def _global_params(self, document, operation):
+        """Calculează statisticile globale cerute de o operație."""
+        stats = TILE_OPERATIONS[operation][2]
+        if stats == "contrast_mean":
+            return {"mean": document.luminance_mean()}
+        if stats == "auto_levels":
+            histograms = document.histogram()
+            levels = [(percentile_from_histogram(h, 1), percentile_from_histogram(h, 99)) for h in histograms]
+            contrast_mean = document.luminance_mean(lambda tile: self.processor.auto_levels(tile, levels))
+            return {"levels": levels, "contrast_mean": contrast_mean}
+        return {}
+
+    def run(self, document):
+        """
+        Execută pipeline-ul pe un document.
+
+        Args:
+            document (TiledDocument): Documentul de intrare (nu este modificat)
+
+        Returns:
+            TiledDocument: Documentul rezultat, stocat în fișiere temporare
+        """
+        current = document
+        for stage in self._stages():
+            calls = []
+            halo = 0
+            for index, (operation, params) in enumerate(stage):
+                method_name, halo_fn, _ = TILE_OPERATIONS[operation]
+                call_params = dict(params)
+                if index == 0:
+                    call_params.update(self._global_params(current, operation))
+                calls.append((getattr(self.processor, method_name), call_params))
+                if halo_fn is not None:
+                    halo += halo_fn(params)
+
+            def transform(tile, calls=calls):
+                for method, call_params in calls:
+                    tile = method(tile, **call_params)
+                return tile
+
+            result = current.map_tiles(transform, halo=halo)
+            if current is not document:
+                current.close()
+            current = result
+        return current
+
+
+def _array_to_image(array, mode):
+    if array.shape[2] == 1:
+        array = array[:, :, 0]
+    return Image.fromarray(np.ascontiguousarray(array), mode=mode)
+
+
+def _write_tiff_strips(document, file_path, strip_height):
+    """Scrie un TIFF baseline necomprimat, cu benzi; trece la BigTIFF peste 4GB."""
+    bands = _MODE_BANDS[document.mode]
+    width, height = document.size
+    row_bytes = width * bands
+    strips = [(y, min(strip_height, height - y)) for y in range(0, height, strip_height)]
+    byte_counts = [rows * row_bytes for _, rows in strips]
+    big = sum(byte_counts) + 4096 + 16 * len(strips) > 0xFFFFFFFF
+
+    if big:
+        offset_type, offset_size, entry_fmt, count_fmt, inline = 16, 8, "<HHQ", "<Q", 8
+    else:
+        offset_type, offset_size, entry_fmt, count_fmt, inline = 4, 4, "<HHI", "<H", 4
+    offset_fmt = "<Q" if big else "<I"
+    array_fmt = {3: "H", 4: "I", 16: "Q"}
+
+    entries = [
+        (256, 4, [width]),
+        (257, 4, [height]),
+        (258, 3, [8] * bands),
+        (259, 3, [1]),
+        (262, 3, [1 if bands == 1 else 2]),
+        (273, offset_type, None),  # StripOffsets, completat mai jos
+        (277, 3, [bands]),
+        (278, 4, [strip_height]),
+        (279, offset_type, byte_counts),
+        (284, 3, [1]),
+    ]
+    if bands == 4:
+        entries.append((338, 3, [2]))  # ExtraSamples: alfa neasociat
+
+    header_size = 16 if big else 8
+    ifd_size = struct.calcsize(count_fmt) + len(entries) * (struct.calcsize(entry_fmt) + inline) + offset_size
+    # Valorile care nu încap în intrarea IFD sunt scrise după IFD
+    extra_offset = header_size + ifd_size
+    extra_sizes = {}
+    for tag, value_type, values in entries:
+        count = len(strips) if values is None else len(values)
+        size = count * struct.calcsize(array_fmt[value_type])
+        if size > inline:
+            extra_sizes[tag] = size
+    data_offset = extra_offset + sum(extra_sizes.values())
+    strip_offsets = []
+    position = data_offset
+    for count in byte_counts:
+        strip_offsets.append(position)
+        position += count
+
+    with open(file_path, "wb") as f:
+        if big:
+            f.write(b"II" + struct.pack("<HHHQ", 43, 8, 0, header_size))
+        else:
+            f.write(b"II" + struct.pack("<HI", 42, header_size))
+        f.write(struct.pack(count_fmt, len(entries)))
+        extra_data = b""
+        for tag, value_type, values in entries:
+            if values is None:
+                values = strip_offsets
+            packed = struct.pack("<" + array_fmt[value_type] * len(values), *values)
+            f.write(struct.pack(entry_fmt, tag, value_type, len(values)))
+            if tag in extra_sizes:
+                f.write(struct.pack(offset_fmt, extra_offset + len(extra_data)))
+                extra_data += packed
+            else:
+                f.write(packed.ljust(inline, b"\0"))
+        f.write(struct.pack(offset_fmt, 0))  # nu mai urmează alt IFD
+        f.write(extra_data)
+
+        for y, rows in strips:
+            f.write(document.read_region((0, y, width, y + rows)).tobytes())
+
+
+def _write_png_chunk(f, chunk_type, data):
+    f.write(struct.pack(">I", len(data)))
+    f.write(chunk_type)
+    f.write(data)
+    f.write(struct.pack(">I", zlib.crc32(chunk_type + data) & 0xFFFFFFFF))
+
+
+def _write_png_strips(document, file_path, strip_height):
+    """Scrie un PNG cu stream zlib incremental (filtru 'None' pe fiecare rând)."""
+    bands = _MODE_BANDS[document.mode]
+    color_type = {1: 0, 3: 2, 4: 6}[bands]
+    width, height = document.size
+    compressor = zlib.compressobj(6)
+
+    with open(file_path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        _write_png_chunk(f, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+        for y in range(0, height, strip_height):
+            strip = document.read_region((0, y, width, min(y + strip_height, height)))
+            rows = strip.reshape(strip.shape[0], width * bands)
+            # Fiecare rând PNG începe cu octetul de tip filtru
+            filtered = np.concatenate([np.zeros((rows.shape[0], 1), dtype=np.uint8), rows], axis=1)
+            data = compressor.compress(filtered.tobytes())
+            if data:
+                _write_png_chunk(f, b"IDAT", data)
+        _write_png_chunk(f, b"IDAT", compressor.flush())
+        _write_png_chunk(f, b"IEND", b"")
@@ -0,0 +1,168 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from .lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+
+def tile_starts(length, tile_size, overlap):
+    """
+    Pozițiile de început ale plăcilor pe o axă, cu suprapunere.
+
+    Ultima placă este aliniată la margine, deci toate plăcile au dimensiunea completă
+    (cu excepția cazului în care imaginea este mai mică decât o placă).
+    """
+    if length <= tile_size:
+        return [0]
+    stride = max(tile_size - overlap, 1)
+    starts = list(range(0, length - tile_size, stride))
+    starts.append(length - tile_size)
+    return starts
+
+
+def feather_ramp(length, ramp_before, ramp_after):
+    """Ponderi 1D: cresc liniar pe ramp_before pixeli și scad pe ultimii ramp_after pixeli."""
+    weights = np.ones(length, dtype=np.float32)
+    if ramp_before > 0:
+        ramp = (np.arange(ramp_before, dtype=np.float32) + 0.5) / ramp_before
+        weights[:ramp_before] = np.minimum(weights[:ramp_before], ramp[:length])
+    if ramp_after > 0:
+        ramp = (np.arange(ramp_after, dtype=np.float32) + 0.5) / ramp_after
+        weights[-ramp_after:] = np.minimum(weights[-ramp_after:], ramp[::-1][-length:])
+    return weights
+
+
+class TiledUpscaler:
+    """
+    Mărește imagini oricât de mari, placă cu placă.
+
+    Plăcile se suprapun cu `overlap` pixeli și sunt îmbinate cu ponderi liniare
+    (feathering), ca să nu apară cusături. Plăcile unui rând rulează în paralel;
+    rezultatul se acumulează pe benzi, deci memoria de lucru depinde de dimensiunea
+    plăcii și de lățimea imaginii, nu de înălțimea ei.
+    """
+
+    def __init__(self, upscale_fn, tile_size=256, overlap=16, max_workers=None):
+        """
+        Args:
+            upscale_fn (callable): Funcția de mărire (PIL.Image -> PIL.Image), ex: upscaler.upscale
+            tile_size (int): Dimensiunea plăcii de intrare, în pixeli
+            overlap (int): Suprapunerea dintre plăci, în pixeli de intrare
+            max_workers (int): Numărul maxim de plăci procesate simultan
+        """
+        if overlap * 2 >= tile_size:
+            raise ValueError("Suprapunerea trebuie să fie mai mică decât jumătate din placă")
+        self.upscale_fn = upscale_fn
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) // 2)
+
+    def _upscale_tile(self, image, box, scale, mode):
+        tile = image.crop(box)
+        result = self.upscale_fn(tile)
+        if result.mode != mode:
+            result = result.convert(mode)
+        expected = ((box[2] - box[0]) * scale, (box[3] - box[1]) * scale)
+        if result.size != expected:
+            result = result.resize(expected, Image.Resampling.LANCZOS)
+        return np.asarray(result, dtype=np.float32)
+
+    def upscale(self, image, progress_callback=None):
+        """
+        Mărește imaginea pe plăci.
+
+        Args:
+            image (PIL.Image): Imaginea de intrare
+            progress_callback (callable): Apelată cu (plăci terminate, total plăci)
+
+        Returns:
+            PIL.Image: Imaginea mărită
+        """
+        alpha = image.getchannel("A") if "A" in image.getbands() else None
+        source = image.convert("RGB") if image.mode != "RGB" else image
+        width, height = source.size
+        xs = tile_starts(width, self.tile_size, self.overlap)
+        ys = tile_starts(height, self.tile_size, self.overlap)
+        total = len(xs) * len(ys)
+        tile_w, tile_h = min(self.tile_size, width), min(self.tile_size, height)
+
+        # Prima placă determină factorul de mărire și modul rezultatului
+        first = self.upscale_fn(source.crop((xs[0], ys[0], xs[0] + tile_w, ys[0] + tile_h)))
+        scale = max(1, int(round(first.width / tile_w)))
+        mode = first.mode if first.mode in ("RGB", "L") else "RGB"
+        channels = len(Image.new(mode, (1, 1)).getbands())
+        result = Image.new(mode, (width * scale, height * scale))
+
+        done = 0
+        progress_lock = threading.Lock()
+
+        def process(x, y):
+            nonlocal done
+            box = (x, y, x + tile_w, y + tile_h)
+            if (x, y) == (xs[0], ys[0]):
+                tile = first.convert(mode) if first.mode != mode else first
+                if tile.size != (tile_w * scale, tile_h * scale):
+                    tile = tile.resize((tile_w * scale, tile_h * scale), Image.Resampling.LANCZOS)
+                pixels = np.asarray(tile, dtype=np.float32)
+            else:
+                pixels = self._upscale_tile(source, box, scale, mode)
+            with progress_lock:
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total)
+            return x, pixels
+
+        # Acumulatorul acoperă doar banda de rânduri încă nefinalizată
+        band_top = 0
+        accumulator = np.zeros((0, width * scale, channels), dtype=np.float32)
+        weight_sum = np.zeros((0, width * scale, 1), dtype=np.float32)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for row, y in enumerate(ys):
+                out_top, out_bottom = y * scale, (y + tile_h) * scale
+                grow = out_bottom - band_top - accumulator.shape[0]
+                if grow > 0:
+                    accumulator = np.concatenate(
+                        [accumulator, np.zeros((grow, width * scale, channels), np.float32)])
+                    weight_sum = np.concatenate([weight_sum, np.zeros((grow, width * scale, 1), np.float32)])
+
+                # Ponderile scad doar spre plăcile vecine, nu spre marginile imaginii
+                ramp_top = (ys[row - 1] + tile_h - y) * scale if row > 0 else 0
+                ramp_bottom = (y + tile_h - ys[row + 1]) * scale if row + 1 < len(ys) else 0
+                weight_y = feather_ramp(tile_h * scale, ramp_top, ramp_bottom)
+
+                for x, pixels in executor.map(lambda x: process(x, y), xs):
+                    col = xs.index(x)
+                    ramp_left = (xs[col - 1] + tile_w - x) * scale if col > 0 else 0
+                    ramp_right = (x + tile_w - xs[col + 1]) * scale if col + 1 < len(xs) else 0
+                    weight_x = feather_ramp(tile_w * scale, ramp_left, ramp_right)
+                    weights = (weight_y[:, None] * weight_x[None, :])[:, :, None]
+                    if pixels.ndim == 2:
+                        pixels = pixels[:, :, None]
+                    rows = slice(out_top - band_top, out_bottom - band_top)
+                    cols = slice(x * scale, (x + tile_w) * scale)
+                    accumulator[rows, cols] += pixels * weights
+                    weight_sum[rows, cols] += weights
+
+                # Rândurile de deasupra următorului rând de plăci sunt finale
+                final_bottom = ys[row + 1] * scale if row + 1 < len(ys) else height * scale
+                finished = final_bottom - band_top
+                if finished > 0:
+                    strip = accumulator[:finished] / np.maximum(weight_sum[:finished], 1e-6)
+                    strip = np.clip(np.round(strip), 0, 255).astype(np.uint8)
+                    if channels == 1:
+                        strip = strip[:, :, 0]
+                    result.paste(Image.fromarray(strip), (0, band_top))
+                    accumulator = accumulator[finished:]
+                    weight_sum = weight_sum[finished:]
+                    band_top = final_bottom
+
+        if alpha is not None:
+            if result.mode != "RGB":
+                result = result.convert("RGB")
+            result.putalpha(alpha.resize(result.size, Image.Resampling.LANCZOS))
+        return result
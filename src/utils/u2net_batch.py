@@ -0,0 +1,97 @@
+from PIL import Image
+
+from .batched_inference import stacked_batch_fn
+from .lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+onnxruntime = lazy_import("onnxruntime")
+
+
+# Intrarea fixă a rețelei U2-Net și normalizarea ImageNet folosită la antrenare (ca în rembg)
+U2NET_INPUT_SIZE = (320, 320)
+U2NET_MEAN = (0.485, 0.456, 0.406)
+U2NET_STD = (0.229, 0.224, 0.225)
+
+
+def u2net_preprocess(image, size=U2NET_INPUT_SIZE):
+    """
+    Tabloul de intrare U2-Net al unei imagini: RGB redimensionat, normalizat, în format CHW.
+
+    Args:
+        image (PIL.Image): Imaginea
+        size (tuple): Dimensiunea intrării rețelei
+
+    Returns:
+        np.ndarray: Tabloul (3, h, w) float32
+    """
+    array = np.asarray(image.convert("RGB").resize(size, Image.Resampling.LANCZOS), dtype=np.float32)
+    array = array / max(float(array.max()), 1e-6)
+    array = (array - np.array(U2NET_MEAN, dtype=np.float32)) / np.array(U2NET_STD, dtype=np.float32)
+    return array.transpose(2, 0, 1).astype(np.float32)
+
+
+def u2net_postprocess(prediction, image):
+    """
+    Aplică predicția U2-Net a unei imagini ca alfa: masca normalizată min-max și mărită.
+
+    Args:
+        prediction (np.ndarray): Prima ieșire a rețelei pentru imagine, (1, h, w)
+        image (PIL.Image): Imaginea originală
+
+    Returns:
+        PIL.Image: Imaginea RGBA, cu fundalul transparent
+    """
+    prediction = np.asarray(prediction, dtype=np.float32).reshape(prediction.shape[-2:])
+    low, high = float(prediction.min()), float(prediction.max())
+    prediction = (prediction - low) / (high - low) if high > low else np.zeros_like(prediction)
+    mask = Image.fromarray((prediction * 255).astype(np.uint8), mode="L")
+    result = image.convert("RGBA")
+    result.putalpha(mask.resize(image.size, Image.Resampling.LANCZOS))
+    return result
+
+
+class U2NetBatchRemover:
+    """
+    Eliminarea fundalului cu U2-Net (u2net.onnx descărcat de ModelManager), pe loturi reale.
+
+    Fiecare imagine este redusă la intrarea fixă a rețelei, deci imaginile unui lot se
+    stivuiesc într-un singur tensor NCHW, iar rețeaua rulează o singură dată pe lot.
+    """
+
+    input_size = U2NET_INPUT_SIZE
+
+    def __init__(self, model_path, session=None):
+        """
+        Args:
+            model_path (str): Fișierul u2net.onnx
+            session: Sesiunea ONNX Runtime (implicit una nouă, pe CPU)
+        """
+        if session is None:
+            session = onnxruntime.InferenceSession(str(model_path), providers=["CPUExecutionProvider"])
+        self.session = session
+        model_input = session.get_inputs()[0]
+        self.input_name = model_input.name
+        # Un export cu axa lotului fixată la 1 nu acceptă tensori stivuiți
+        self.supports_batch = model_input.shape[0] != 1
+        self._run_batch = stacked_batch_fn(u2net_preprocess, self._predict, u2net_postprocess)
+
+    def _predict(self, batch):
+        return self.session.run(None, {self.input_name: batch})[0]
+
+    def remove_background(self, image):
+        """Elimină fundalul unei imagini."""
+        return self._run_batch([image])[0]
+
+    def remove_background_batch(self, images):
+        """
+        Elimină fundalul mai multor imagini, cu un singur apel al rețelei.
+
+        Args:
+            images (list): Imaginile PIL (de orice dimensiune)
+
+        Returns:
+            list: Imaginile RGBA, în ordinea intrării
+        """
+        if not self.supports_batch:
+            return [self.remove_background(image) for image in images]
+        return self._run_batch(images)
@@ -0,0 +1,209 @@
+import importlib.util
+import json
+import os
+import struct
+import threading
+import time
+
+from .lazy_imports import lazy_import
+from .model_residency import current_rss_bytes
+
+np = lazy_import("numpy")
+
+# Antet: "AIPW" + versiune + lungimea JSON-ului; datele încep la un offset aliniat
+MAGIC = b"AIPW"
+VERSION = 1
+ALIGNMENT = 64
+
+# Checkpoint-urile PyTorch păstrează adesea ponderile sub o cheie (ex: Real-ESRGAN: params_ema)
+STATE_DICT_KEYS = ("params_ema", "params", "state_dict", "model")
+
+
+def safetensors_available():
+    """True dacă pachetul safetensors este instalat."""
+    return importlib.util.find_spec("safetensors") is not None
+
+
+def _to_numpy(tensor):
+    """Tensor PyTorch sau tablou -> (np.ndarray, numele dtype-ului original)."""
+    if isinstance(tensor, np.ndarray):
+        return np.ascontiguousarray(tensor), str(tensor.dtype)
+    tensor = tensor.detach().cpu().contiguous()
+    dtype = str(tensor.dtype).replace("torch.", "")
+    if dtype == "bfloat16":
+        # NumPy nu are bfloat16: se salvează biții brut, ca uint16
+        import torch
+        return tensor.view(torch.int16).numpy().view(np.uint16), dtype
+    return tensor.numpy(), dtype
+
+
+def save_weights(tensors, path):
+    """
+    Salvează ponderile într-o arhivă brută, mapabilă în memorie.
+
+    Fiecare tensor este scris contiguu, la un offset aliniat la 64 de bytes, după
+    un antet JSON (nume -> dtype, formă, offset). Scrierea este atomică (.tmp + redenumire).
+
+    Args:
+        tensors (dict): nume -> tensor PyTorch sau np.ndarray
+        path (str): Fișierul arhivei
+    """
+    arrays = {name: _to_numpy(tensor) for name, tensor in tensors.items()}
+    entries = {}
+    offset = 0
+    for name, (array, dtype) in arrays.items():
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        entries[name] = {"dtype": dtype, "storage": str(array.dtype), "shape": list(array.shape),
+                         "offset": offset, "nbytes": int(array.nbytes)}
+        offset += array.nbytes
+    header = json.dumps(entries).encode("utf-8")
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    temp_path = str(path) + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<II", VERSION, len(header)) + header)
+        for name, (array, _) in arrays.items():
+            f.seek(data_start + entries[name]["offset"])
+            f.write(array.tobytes(order="C"))
+        f.truncate(data_start + offset)
+    os.replace(temp_path, path)
+
+
+def read_header(path):
+    """Antetul arhivei: (intrări, offset-ul datelor)."""
+    with open(path, "rb") as f:
+        prefix = f.read(len(MAGIC) + 8)
+        if prefix[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Nu este o arhivă de ponderi: {path}")
+        version, header_length = struct.unpack("<II", prefix[len(MAGIC):])
+        if version != VERSION:
+            raise ValueError(f"Versiune necunoscută a arhivei de ponderi: {version}")
+        entries = json.loads(f.read(header_length).decode("utf-8"))
+    data_start = -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
+    return entries, data_start
+
+
+def load_weights(path, as_torch=True):
+    """
+    Încarcă ponderile fără a le copia: tensorii sunt vederi peste fișierul mapat.
+
+    Paginile sunt citite de sistem abia la prima accesare și sunt partajate între
+    procesele care mapează același fișier. Maparea este copy-on-write, deci
+    modificarea unui tensor nu afectează fișierul.
+
+    Args:
+        path (str): Arhiva (.weights) sau un fișier .safetensors
+        as_torch (bool): Returnează tensori PyTorch (altfel np.ndarray)
+
+    Returns:
+        dict: nume -> tensor
+    """
+    if str(path).endswith(".safetensors"):
+        if as_torch:
+            from safetensors.torch import load_file
+        else:
+            from safetensors.numpy import load_file
+        return load_file(str(path))
+
+    entries, data_start = read_header(path)
+    mapped = np.memmap(path, dtype=np.uint8, mode="c")
+    tensors = {}
+    for name, entry in entries.items():
+        start = data_start + entry["offset"]
+        array = mapped[start:start + entry["nbytes"]].view(entry["storage"]).reshape(entry["shape"])
+        tensors[name] = array
+    if not as_torch:
+        return tensors
+
+    import torch
+    result = {}
+    for name, array in tensors.items():
+        tensor = torch.from_numpy(array)
+        if entries[name]["dtype"] == "bfloat16":
+            tensor = tensor.view(torch.bfloat16)
+        result[name] = tensor
+    return result
+
+
+def extract_state_dict(checkpoint):
+    """Ponderile dintr-un checkpoint (dicționarul direct sau sub o cheie cunoscută)."""
+    for key in STATE_DICT_KEYS:
+        if isinstance(checkpoint, dict) and isinstance(checkpoint.get(key), dict):
+            return checkpoint[key]
+    return checkpoint
+
+
+def convert_checkpoint(source, destination):
+    """
+    Convertește un checkpoint PyTorch (.pth/.pt/.bin) în format mapabil.
+
+    Formatul rezultat este safetensors dacă destinația are extensia .safetensors,
+    altfel arhiva brută.
+
+    Returns:
+        str: Calea fișierului convertit
+    """
+    import torch
+
+    checkpoint = torch.load(str(source), map_location="cpu", weights_only=True)
+    state_dict = {name: tensor for name, tensor in extract_state_dict(checkpoint).items()
+                  if hasattr(tensor, "shape")}
+    if str(destination).endswith(".safetensors"):
+        from safetensors.torch import save_file
+        temp_path = str(destination) + ".tmp"
+        save_file({name: tensor.contiguous() for name, tensor in state_dict.items()}, temp_path)
+        os.replace(temp_path, destination)
+    else:
+        save_weights(state_dict, destination)
+    return str(destination)
+
+
+def measure_load(load_fn, interval=0.002):
+    """
+    Măsoară timpul de încărcare și memoria rezidentă maximă în timpul încărcării.
+
+    RSS-ul este eșantionat pe un thread separat, deci vârfurile de materializare a
+    tensorilor (copia temporară la citirea unui checkpoint) sunt prinse.
+
+    Args:
+        load_fn (callable): Funcția de încărcare; rezultatul ei este ținut în viață până la final
+        interval (float): Intervalul de eșantionare, în secunde
+
+    Returns:
+        dict: seconds, rss_before_mb, rss_peak_mb, rss_after_mb, result
+    """
+    before = current_rss_bytes()
+    peak = [before]
+    stop = threading.Event()
+
+    def sample():
+        while not stop.is_set():
+            peak[0] = max(peak[0], current_rss_bytes())
+            stop.wait(interval)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        result = load_fn()
+    finally:
+        seconds = time.perf_counter() - start
+        stop.set()
+        sampler.join()
+    after = current_rss_bytes()
+    peak[0] = max(peak[0], after)
+    mb = 1024 * 1024
+    return {"seconds": seconds, "rss_before_mb": before / mb, "rss_peak_mb": peak[0] / mb,
+            "rss_after_mb": after / mb, "result": result}
+
+
+def assign_weights(module, tensors, strict=True):
+    """
+    Încarcă ponderile într-un modul PyTorch fără copiere: parametrii devin chiar
+    tensorii mapați (load_state_dict cu assign=True, PyTorch >= 2.1). Pe versiunile
+    mai vechi ponderile sunt copiate.
+    """
+    try:
+        return module.load_state_dict(tensors, strict=strict, assign=True)
+    except TypeError:
+        return module.load_state_dict(tensors, strict=strict)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test pentru executorul de joburi AI (priorități, anulare, deduplicare)
+"""
+
+import sys
+import os
+import threading
+import time
+import weakref
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.ai_jobs import AIJob, AIJobExecutor, JobPriority
+
+
+def block_executor(executor):
+    """Ocupă workerul până la eliberarea evenimentului returnat"""
+    started, release = threading.Event(), threading.Event()
+
+    def blocker(token):
+        started.set()
+        release.wait(5)
+
+    job = executor.submit("blocker", blocker)
+    started.wait(5)
+    return job, release
+
+
+def test_priorities_and_single_worker():
+    """Joburile rulează pe rând, în ordinea priorității"""
+    print("🧪 TESTARE PRIORITĂȚI")
+    executor = AIJobExecutor(max_workers=1)
+    _, release = block_executor(executor)
+    order = []
+    jobs = [
+        executor.submit("background", lambda t: order.append("background"), priority=JobPriority.BACKGROUND),
+        executor.submit("normal", lambda t: order.append("normal"), priority=JobPriority.NORMAL),
+        executor.submit("interactive", lambda t: order.append("interactive"), priority=JobPriority.INTERACTIVE),
+    ]
+    release.set()
+    for job in jobs:
+        assert job.wait(5)
+    assert order == ["interactive", "normal", "background"]
+    executor.shutdown()
+
+
+def test_deduplicates_pending_jobs():
+    """Un job identic aflat în așteptare nu se adaugă a doua oară"""
+    print("🧪 TESTARE DEDUPLICARE")
+    executor = AIJobExecutor(max_workers=1)
+    _, release = block_executor(executor)
+    calls = []
+    first = executor.submit("upscale", lambda t: calls.append(1), key=("Upscale", 1))
+    second = executor.submit("upscale", lambda t: calls.append(1), key=("Upscale", 1))
+    other = executor.submit("upscale", lambda t: calls.append(1), key=("Upscale", 2))
+    assert first is second and other is not first
+    release.set()
+    other.wait(5)
+    assert len(calls) == 2
+    executor.shutdown()
+
+
+def test_cancellation_releases_memory():
+    """Anularea oprește jobul la următoarea verificare și eliberează referințele"""
+    print("🧪 TESTARE ANULARE")
+    executor = AIJobExecutor(max_workers=1)
+
+    class LargeBuffer:
+        pass
+
+    buffer = LargeBuffer()
+    buffer_ref = weakref.ref(buffer)
+    started = threading.Event()
+    steps = []
+
+    def long_job(token, buffer=buffer):
+        started.set()
+        for step in range(1000):
+            executor.check_cancelled()
+            steps.append(step)
+            time.sleep(0.005)
+
+    states = []
+    running = executor.submit("long", long_job, on_done=lambda job: states.append(job.state))
+    pending = executor.submit("pending", lambda t: steps.append("pending ran"))
+    del buffer, long_job  # Doar jobul mai reține buffer-ul
+    started.wait(5)
+    executor.cancel_all()
+    assert running.wait(5) and pending.wait(5)
+    assert running.state == AIJob.CANCELLED and pending.state == AIJob.CANCELLED
+    assert len(steps) < 1000 and "pending ran" not in steps
+    assert states == [AIJob.CANCELLED]
+    assert buffer_ref() is None
+    assert executor.active_count() == 0
+    executor.shutdown()
+
+
+def test_failures_are_reported():
+    """Excepțiile jobului ajung în callback, iar workerul continuă"""
+    print("🧪 TESTARE ERORI")
+    executor = AIJobExecutor(max_workers=1)
+    errors = []
+
+    def failing(token):
+        raise ValueError("model missing")
+
+    failed = executor.submit("fail", failing, on_done=lambda job: errors.append(job.error))
+    ok = executor.submit("ok", lambda t: 42)
+    assert failed.wait(5) and ok.wait(5)
+    assert failed.state == AIJob.FAILED and isinstance(errors[0], ValueError)
+    assert ok.state == AIJob.DONE
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    test_priorities_and_single_worker()
+    test_deduplicates_pending_jobs()
+    test_cancellation_releases_memory()
+    test_failures_are_reported()
+    print("✅ Toate testele au trecut!")
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Test pentru procesul AI separat (memorie partajată, progres, anulare, repornire după o oprire)
+"""
+
+import sys
+import os
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.ai_jobs import JobCancelled
+from src.utils.ai_pipelines import tiled_upscale
+from src.utils.ai_worker import AIWorker, AIWorkerError, pack_value, unpack_value
+from src.utils.progress import ProgressReporter, accepts_keyword
+
+
+class EchoModel:
+    """Model de test, încărcat în procesul AI."""
+
+    def __init__(self):
+        self.pid = os.getpid()
+
+    def invert(self, image, progress=None):
+        if progress is not None:
+            progress.start(4, unit="tiles")
+            for step in range(4):
+                progress.update(step + 1)
+        return Image.fromarray(255 - np.asarray(image))
+
+    def upscale(self, image):
+        return image.resize((image.width * 2, image.height * 2), Image.NEAREST)
+
+    def fill(self, image, prompt, mask=None):
+        return {"prompt": prompt, "mask_sum": int(mask.sum()), "size": image.size, "worker_pid": self.pid}
+
+    def busy(self, seconds, progress=None):
+        """Buclă Python pură (ține GIL-ul procesului AI)."""
+        end = time.time() + seconds
+        count = 0
+        while time.time() < end:
+            count += 1
+            if progress is not None and count % 10000 == 0:
+                progress.update(count)
+        return count
+
+    def fail(self):
+        raise ValueError("model error")
+
+    def crash(self):
+        os._exit(3)
+
+
+def make_worker():
+    return AIWorker({"Echo": ("test_ai_worker", "EchoModel")})
+
+
+def test_pack_roundtrip():
+    """Imaginile și tablourile trec prin memorie partajată, restul prin mesaj"""
+    print("🧪 TESTARE MEMORIE PARTAJATĂ")
+    image = Image.new("RGBA", (64, 32), (10, 20, 30, 40))
+    mask = np.arange(12, dtype=np.float32).reshape(3, 4)
+    blocks = []
+    packed = pack_value({"image": image, "items": [mask, "text", 3]}, blocks)
+    assert len(blocks) == 2
+    unpacked = unpack_value(packed, unlink=True)
+    assert unpacked["image"].mode == "RGBA" and unpacked["image"].size == (64, 32)
+    assert np.array_equal(np.asarray(unpacked["image"]), np.asarray(image))
+    assert np.array_equal(unpacked["items"][0], mask) and unpacked["items"][1:] == ["text", 3]
+    for block in blocks:
+        block.close()
+    print("   ✅ Transfer corect")
+
+
+def test_remote_calls_and_progress():
+    """Apelurile rulează în procesul AI, cu semnătura reală și progresul transmis"""
+    print("🧪 TESTARE APELURI ÎN PROCESUL AI")
+    worker = make_worker()
+    try:
+        model = worker.model("Echo")
+        assert accepts_keyword(model.invert, "progress")
+        assert accepts_keyword(model.fill, "mask") and not accepts_keyword(model.fill, "progress")
+        assert not hasattr(model, "missing")
+
+        image = Image.fromarray(np.random.default_rng(0).integers(0, 256, (48, 80, 3), dtype=np.uint8))
+        updates = []
+        progress = ProgressReporter(lambda info: updates.append((info.done, info.total)), min_interval=0)
+        result = worker.call("Echo", "invert", image, progress=progress)
+        assert np.array_equal(np.asarray(result), 255 - np.asarray(image))
+        assert updates[-1] == (4, 4)
+
+        info = model.fill(image, prompt="sky", mask=np.ones((4, 4), dtype=np.uint8))
+        assert info["prompt"] == "sky" and info["mask_sum"] == 16 and info["size"] == (80, 48)
+        assert info["worker_pid"] != os.getpid() and "Echo" in worker.loaded_models
+
+        try:
+            model.fail()
+            assert False, "Eroarea modelului trebuia transmisă"
+        except AIWorkerError as e:
+            assert "model error" in str(e)
+    finally:
+        worker.shutdown()
+    print("   ✅ Apeluri corecte")
+
+
+def whole_operation(echo, image, progress=None):
+    """Operație completă rulată în procesul AI: pre-procesare, model, post-procesare."""
+    flipped = image.transpose(Image.FLIP_LEFT_RIGHT)
+    inverted = echo.invert(flipped, progress=progress)
+    return {"image": inverted.transpose(Image.FLIP_LEFT_RIGHT), "pid": os.getpid()}
+
+
+def test_run_whole_operations():
+    """Operațiile complete (plăci, îmbinare) rulează în procesul AI, lângă model"""
+    print("🧪 TESTARE OPERAȚII COMPLETE ÎN PROCESUL AI")
+    worker = make_worker()
+    try:
+        image = Image.fromarray(np.random.default_rng(1).integers(0, 256, (40, 60, 3), dtype=np.uint8))
+        updates = []
+        progress = ProgressReporter(lambda info: updates.append((info.done, info.total)), min_interval=0)
+        result = worker.run(whole_operation, ["Echo"], image, progress=progress)
+        assert result["pid"] != os.getpid() and "Echo" in worker.loaded_models
+        assert np.array_equal(np.asarray(result["image"]), 255 - np.asarray(image))
+        assert updates[-1] == (4, 4)
+
+        upscaled = worker.run(tiled_upscale, ["Echo"], image, tile_size=32, overlap=8, max_workers=2,
+                              progress=ProgressReporter(lambda info: None, min_interval=0))
+        expected = image.resize((120, 80), Image.NEAREST)
+        assert upscaled.size == (120, 80)
+        assert np.abs(np.asarray(upscaled, np.int16) - np.asarray(expected)).max() <= 1
+    finally:
+        worker.shutdown()
+    print("   ✅ Operații complete corecte")
+
+
+def test_cancel_and_crash_recovery():
+    """Anularea oprește cererea; o oprire a procesului nu afectează apelantul"""
+    print("🧪 TESTARE ANULARE ȘI REPORNIRE")
+    worker = make_worker()
+    try:
+        def check():
+            if time.time() - started > 0.2:
+                raise JobCancelled()
+        started = time.time()
+        progress = ProgressReporter(lambda info: None, min_interval=0, check=check)
+        try:
+            worker.call("Echo", "busy", 30, progress=progress)
+            assert False, "Cererea trebuia anulată"
+        except JobCancelled:
+            pass
+        assert time.time() - started < 10
+
+        first_pid = worker.call("Echo", "fill", Image.new("L", (2, 2)), "x", mask=np.zeros(1))["worker_pid"]
+        try:
+            worker.call("Echo", "crash")
+            assert False, "Oprirea procesului trebuia raportată"
+        except AIWorkerError:
+            pass
+        # Următoarea cerere repornește procesul
+        second_pid = worker.call("Echo", "fill", Image.new("L", (2, 2)), "x", mask=np.zeros(1))["worker_pid"]
+        assert second_pid != first_pid
+    finally:
+        worker.shutdown()
+    print("   ✅ Anulare și repornire corecte")
+
+
+def test_caller_stays_responsive():
+    """Procesul apelant nu este blocat cât timp procesul AI ține GIL-ul ocupat"""
+    print("🧪 TESTARE RĂSPUNS INTERFAȚĂ")
+    worker = make_worker()
+    try:
+        worker.preload("Echo")
+        ticks = []
+        stop = threading.Event()
+
+        def heartbeat():
+            while not stop.is_set():
+                ticks.append(time.perf_counter())
+                time.sleep(0.01)
+
+        thread = threading.Thread(target=heartbeat)
+        thread.start()
+        worker.call("Echo", "busy", 1.0)
+        stop.set()
+        thread.join()
+        longest = max(b - a for a, b in zip(ticks, ticks[1:]))
+        assert longest < 0.25, f"Pauză de {longest:.3f} s"
+    finally:
+        worker.shutdown()
+    print(f"   ✅ Pauza maximă: {longest * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    test_pack_roundtrip()
+    test_remote_calls_and_progress()
+    test_run_whole_operations()
+    test_cancel_and_crash_recovery()
+    test_caller_stays_responsive()
+    print("✅ Toate testele au trecut!")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test pentru procesarea în lot fără interfață (main.py batch)
+"""
+
+import sys
+import os
+import tempfile
+from unittest import mock
+import numpy as np
+from PIL import Image
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils import batch_processor
+from src.utils.batch_processor import BatchProcessor, parse_recipe, collect_inputs, plan_outputs
+
+
+def crashing_process_file(input_path, *args):
+    """Simulează un proces de lucru oprit brusc (ex: memorie epuizată) pentru fișierele "crash"."""
+    if "crash" in os.path.basename(input_path):
+        os._exit(1)
+    return process_file(input_path, *args)
+
+
+process_file = batch_processor.process_file
+
+
+def test_parse_recipe():
+    """Rețeta este transformată în pași ImageProcessor și format de export"""
+    print("🧪 TESTARE PARSARE REȚETĂ")
+    steps, export_format, quality = parse_recipe("auto_enhance,resize:640x480,sepia,export:webp:80")
+    assert steps == [
+        ("auto_enhance", {}),
+        ("resize_for_display", {"max_width": 640, "max_height": 480}),
+        ("apply_sepia", {}),
+    ]
+    assert export_format == "webp" and quality == 80
+
+    try:
+        parse_recipe("auto_enhance,unknown_step")
+        assert False, "Pasul necunoscut trebuia respins"
+    except ValueError:
+        print("   ✅ Pas necunoscut respins")
+
+
+def test_batch_run_and_skip():
+    """Imaginile sunt procesate în paralel, iar a doua rulare le sare"""
+    print("🧪 TESTARE PROCESARE ÎN LOT")
+    input_dir = tempfile.mkdtemp()
+    output_dir = os.path.join(input_dir, "out")
+    for i in range(4):
+        Image.new('RGB', (400, 300), (i * 50, 120, 60)).save(os.path.join(input_dir, f"img{i}.jpg"))
+
+    files = collect_inputs([input_dir])
+    assert len(files) == 4
+
+    processor = BatchProcessor("grayscale,resize:200x200,export:png", output_dir, max_workers=2, backend="pil")
+    stats = processor.run(files)
+    print(f"   Procesate: {stats['processed']}, {stats['images_per_second']:.2f} img/s")
+    assert stats["processed"] == 4 and stats["failed"] == 0
+    with Image.open(os.path.join(output_dir, "img0.png")) as result:
+        assert result.size == (200, 150)
+
+    stats = processor.run(files)
+    assert stats["processed"] == 0 and stats["skipped"] == 4
+    print("   ✅ Ieșirile actualizate au fost sărite")
+
+    # Altă rețetă în același director de ieșire: ieșirile nu mai sunt actualizate
+    stats = BatchProcessor("resize:100x100,export:png", output_dir, backend="pil").run(files)
+    assert stats["processed"] == 4 and stats["skipped"] == 0
+    with Image.open(os.path.join(output_dir, "img0.png")) as result:
+        assert result.size == (100, 75)
+    print("   ✅ Rețeta schimbată reprocesează ieșirile")
+
+
+def test_output_collisions():
+    """Intrările cu același nume nu se suprascriu una pe alta"""
+    print("🧪 TESTARE CONFLICTE DE NUME")
+    input_dir = tempfile.mkdtemp()
+    other_dir = os.path.join(input_dir, "other")
+    output_dir = os.path.join(input_dir, "out")
+    os.makedirs(other_dir)
+    Image.new('RGB', (40, 30), (200, 0, 0)).save(os.path.join(input_dir, "a.jpg"))
+    Image.new('RGB', (40, 30), (0, 0, 200)).save(os.path.join(input_dir, "a.png"))
+    Image.new('RGB', (40, 30), (0, 200, 0)).save(os.path.join(other_dir, "b.png"))
+    Image.new('RGB', (40, 30), (0, 200, 0)).save(os.path.join(input_dir, "b.png"))
+
+    files = collect_inputs([input_dir, other_dir])
+    stats = BatchProcessor("export:webp", output_dir, backend="pil").run(files)
+    assert sorted(os.listdir(output_dir)) == [".batch_manifest.json", "a_jpg.webp", "a_png.webp"]
+    assert stats["processed"] == 2 and stats["failed"] == 2
+    with Image.open(os.path.join(output_dir, "a_png.webp")) as result:
+        assert result.convert("RGB").getpixel((20, 15))[2] > 150
+
+    # Fără export, extensiile diferite dau deja nume diferite
+    outputs, conflicts = plan_outputs(["x/a.jpg", "x/a.png"], "out", None)
+    assert outputs == {"x/a.jpg": os.path.join("out", "a.jpg"), "x/a.png": os.path.join("out", "a.png")}
+    assert conflicts == {}
+    print("   ✅ Conflictele au fost evitate sau raportate")
+
+
+def test_worker_crash():
+    """Un proces de lucru oprit brusc nu oprește lotul: imaginile afectate sunt raportate ca eșuate"""
+    print("🧪 TESTARE PROCES DE LUCRU OPRIT")
+    input_dir = tempfile.mkdtemp()
+    output_dir = os.path.join(input_dir, "out")
+    names = ["a.png", "crash.png", "b.png", "c.png"]
+    for name in names:
+        Image.new('RGB', (40, 30), (0, 200, 0)).save(os.path.join(input_dir, name))
+    files = [os.path.join(input_dir, name) for name in names]
+
+    with mock.patch.object(batch_processor, "process_file", crashing_process_file):
+        stats = BatchProcessor("grayscale,export:png", output_dir, max_workers=1, backend="pil").run(files)
+    failed = [os.path.basename(path) for path, _ in stats["errors"]]
+    assert "crash.png" in failed
+    assert stats["processed"] + stats["failed"] == 4 and stats["processed"] >= 2
+    assert os.path.exists(os.path.join(output_dir, "c.png"))
+    print(f"   ✅ Lotul a continuat (eșuate: {', '.join(failed)})")
+
+
+def test_large_images_are_tiled():
+    """Imaginile foarte mari exportate ca TIFF/PNG sunt procesate pe tile-uri, cu același rezultat"""
+    print("🧪 TESTARE IMAGINI MARI PE TILE-URI")
+    work_dir = tempfile.mkdtemp()
+    input_path = os.path.join(work_dir, "large.tif")
+    array = np.random.default_rng(0).integers(0, 255, (300, 400, 3), dtype=np.uint8)
+    Image.fromarray(array).save(input_path, compression="tiff_lzw")
+    steps, _, _ = parse_recipe("brightness:1.2,blur:1,sepia")
+
+    process_file(input_path, os.path.join(work_dir, "memory.png"), steps, "png", 95, backend="pil")
+    with mock.patch.object(batch_processor, "is_large_image", return_value=True), \
+            mock.patch.object(batch_processor.TiledDocument, "open",
+                              wraps=batch_processor.TiledDocument.open) as tiled_open:
+        process_file(input_path, os.path.join(work_dir, "tiled.png"), steps, "png", 95, backend="pil")
+        assert tiled_open.call_count == 1
+        # Rotirea nu rulează pe tile-uri: imaginea este procesată în memorie
+        rotate, _, _ = parse_recipe("rotate:90")
+        process_file(input_path, os.path.join(work_dir, "rotated.png"), rotate, "png", 95, backend="pil")
+        assert tiled_open.call_count == 1
+
+    with Image.open(os.path.join(work_dir, "memory.png")) as expected, \
+            Image.open(os.path.join(work_dir, "tiled.png")) as tiled:
+        assert np.array_equal(np.array(expected), np.array(tiled))
+    assert not os.path.exists(os.path.join(work_dir, "tiled.png.tmp"))
+    print("   ✅ Imaginile mari sunt procesate pe tile-uri")
+
+
+if __name__ == "__main__":
+    test_parse_recipe()
+    test_batch_run_and_skip()
+    test_output_collisions()
+    test_worker_crash()
+    test_large_images_are_tiled()
+    print("✅ Toate testele au trecut!")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Test pentru inferența pe loturi (găleți de dimensiuni, bordare, mărimea lotului)
+"""
+
+import sys
+import os
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.batched_inference import (BatchInference, size_buckets, pad_image, crop_output,
+                                         choose_batch_size, background_remover_batch, stacked_batch_fn)
+from src.utils.recognition_cache import RecognitionCache
+from src.utils.u2net_batch import U2NetBatchRemover
+from src.utils.progress import ProgressReporter
+
+
+def make_images():
+    sizes = [(100, 80), (120, 70), (300, 200), (110, 100)]
+    images = []
+    for i, size in enumerate(sizes):
+        array = np.random.default_rng(i).integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+        images.append(Image.fromarray(array))
+    return images
+
+
+class FakeRemover:
+    """Model de test: masca alpha = canalul roșu; lotul cere imagini de aceeași dimensiune"""
+
+    def __init__(self):
+        self.batches = []
+
+    def remove_background(self, image):
+        result = image.convert("RGBA")
+        result.putalpha(image.getchannel("R"))
+        return result
+
+    def remove_background_batch(self, images):
+        assert len({image.size for image in images}) == 1
+        self.batches.append(len(images))
+        return [self.remove_background(image) for image in images]
+
+
+class FakeRecognizer:
+    def __init__(self):
+        self.calls = []
+
+    def analyze(self, image):
+        self.calls.append(image.size)
+        return {"caption": f"photo {image.width}x{image.height}", "embedding": [1.0, 0.0]}
+
+
+class FakeInput:
+    def __init__(self, batch_axis):
+        self.name = "input.1"
+        self.shape = [batch_axis, 3, 320, 320]
+
+
+class FakeSession:
+    """Sesiune ONNX de test: masca = primul canal normalizat, pentru tot lotul deodată"""
+
+    def __init__(self, batch_axis="batch"):
+        self.batch_axis = batch_axis
+        self.calls = []
+
+    def get_inputs(self):
+        return [FakeInput(self.batch_axis)]
+
+    def run(self, output_names, feeds):
+        batch = feeds["input.1"]
+        self.calls.append(batch.shape)
+        return [batch[:, :1]]
+
+
+def test_buckets_and_padding():
+    """Imaginile apropiate ca dimensiune ajung în aceeași găleată"""
+    print("🧪 TESTARE GĂLEȚI ȘI BORDARE")
+    images = make_images()
+    buckets = size_buckets(images, granularity=64)
+    assert buckets[(128, 128)] == [0, 1, 3] and buckets[(320, 256)] == [2]
+
+    padded = pad_image(images[0], (128, 128))
+    assert padded.size == (128, 128)
+    assert np.array_equal(np.asarray(padded)[:80, :100], np.asarray(images[0]))
+    # Bordura replică marginea imaginii
+    assert np.array_equal(np.asarray(padded)[:80, 127], np.asarray(images[0])[:, 99])
+
+    upscaled = padded.resize((512, 512))
+    assert crop_output(upscaled, (100, 80), (128, 128)).size == (400, 320)
+    assert crop_output("caption", (100, 80), (128, 128)) == "caption"
+    print("   ✅ Găleți și bordare corecte")
+
+
+def test_batch_size_from_memory():
+    """Mărimea lotului depinde de memoria disponibilă"""
+    print("🧪 TESTARE MĂRIME LOT")
+    assert choose_batch_size(100, max_batch=16, memory_fraction=0.5, available_bytes=1000) == 5
+    assert choose_batch_size(100, max_batch=4, memory_fraction=0.5, available_bytes=10 ** 9) == 4
+    assert choose_batch_size(10 ** 12, available_bytes=10 ** 9) == 1
+    assert choose_batch_size(1024) >= 1
+    print("   ✅ Mărime lot corectă")
+
+
+def test_batched_results_match_single():
+    """Rezultatele pe loturi sunt identice cu cele imagine cu imagine, în aceeași ordine"""
+    print("🧪 TESTARE REZULTATE PE LOTURI")
+    images = make_images()
+    remover = FakeRemover()
+    runner = background_remover_batch(remover, max_batch=2)
+    events = []
+    results = runner.run(images, ProgressReporter(events.append, min_interval=0))
+    for image, result in zip(images, results):
+        expected = remover.remove_background(image)
+        assert result.size == image.size
+        assert np.array_equal(np.asarray(result), np.asarray(expected))
+    assert sorted(remover.batches) == [1, 1, 2]
+    assert events[-1].done == 4 and events[-1].fraction == 1.0
+
+    stats = runner.compare_throughput(images)
+    assert stats["single_ips"] > 0 and stats["batched_ips"] > 0 and stats["batched"]
+
+    single_only = BatchInference(lambda image: image.size)
+    assert single_only.run(images) == [image.size for image in images]
+    assert not single_only.is_batched and not single_only.compare_throughput(images)["batched"]
+    print("   ✅ Rezultate pe loturi corecte")
+
+
+def test_stacked_batch_fn():
+    """Un lot rulează modelul o singură dată, pe tablourile stivuite"""
+    print("🧪 TESTARE LOT STIVUIT")
+    calls = []
+
+    def predict(batch):
+        calls.append(batch.shape)
+        return batch[..., 0]  # Masca = canalul roșu, pentru toate imaginile deodată
+
+    def postprocess(mask, image):
+        result = image.convert("RGBA")
+        result.putalpha(Image.fromarray(mask))
+        return result
+
+    remover = FakeRemover()
+    runner = BatchInference(remover.remove_background, stacked_batch_fn(np.asarray, predict, postprocess),
+                            max_batch=2)
+    images = make_images()
+    for image, result in zip(images, runner.run(images)):
+        assert np.array_equal(np.asarray(result), np.asarray(remover.remove_background(image)))
+    assert sorted(calls) == [(1, 128, 128, 3), (1, 256, 320, 3), (2, 128, 128, 3)]
+    print("   ✅ Lot stivuit corect")
+
+
+def test_u2net_single_forward():
+    """U2-Net: imaginile de dimensiuni diferite rulează într-un singur apel al rețelei"""
+    print("🧪 TESTARE U2-NET PE LOTURI")
+    images = make_images()
+    session = FakeSession()
+    remover = U2NetBatchRemover("u2net.onnx", session=session)
+    runner = background_remover_batch(remover)
+    assert runner.is_batched and not runner.pad
+
+    results = runner.run(images)
+    assert session.calls == [(4, 3, 320, 320)]
+    for image, result in zip(images, results):
+        assert result.mode == "RGBA" and result.size == image.size
+        single = remover.remove_background(image)
+        assert np.array_equal(np.asarray(result), np.asarray(single))
+    assert session.calls[-1] == (1, 3, 320, 320)
+
+    # Un export cu lotul fixat la 1 rulează imagine cu imagine
+    fixed = U2NetBatchRemover("u2net.onnx", session=FakeSession(batch_axis=1))
+    assert not background_remover_batch(fixed).is_batched
+    assert len(fixed.remove_background_batch(images)) == 4
+    assert fixed.session.calls == [(1, 3, 320, 320)] * 4
+    print("   ✅ U2-Net pe loturi corect")
+
+
+def test_recognition_many_and_cache():
+    """Recunoașterea mai multor imagini; rezultatele din cache nu sunt recalculate"""
+    print("🧪 TESTARE RECUNOAȘTERE ȘI CACHE")
+    images = make_images()
+    recognizer = FakeRecognizer()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = RecognitionCache("fake-v1", cache_dir=cache_dir)
+        events = []
+        results = cache.recognize_many(recognizer, images, ProgressReporter(events.append, min_interval=0))
+        assert [r["caption"] for r in results] == [f"photo {i.width}x{i.height}" for i in images]
+        assert recognizer.calls == [i.size for i in images]
+        assert events[-1].done == 4
+
+        recognizer.calls.clear()
+        again = cache.recognize_many(recognizer, images + [images[0].rotate(90, expand=True)])
+        assert recognizer.calls == [(80, 100)]
+        assert again[0]["caption"] == results[0]["caption"]
+    print("   ✅ Recunoaștere și cache corecte")
+
+
+if __name__ == "__main__":
+    test_buckets_and_padding()
+    test_batch_size_from_memory()
+    test_batched_results_match_single()
+    test_stacked_batch_fn()
+    test_u2net_single_forward()
+    test_recognition_many_and_cache()
+    print("✅ Toate testele au trecut!")
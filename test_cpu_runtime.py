@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test pentru profilul de execuție pe CPU (profil salvat, context de inferență, calibrare)
+"""
+
+import sys
+import os
+import contextlib
+import importlib.util
+import json
+import tempfile
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.cpu_runtime import CpuRuntime, RuntimeProfile, machine_signature
+from src.utils.lazy_models import LazyModel
+
+HAS_TORCH = importlib.util.find_spec("torch") is not None
+
+
+def test_profile_roundtrip():
+    """Profilul se salvează și se citește doar pentru aceeași mașină"""
+    print("🧪 TESTARE PROFIL SALVAT")
+    profile = RuntimeProfile(intra_threads=3, inter_threads=2, channels_last=False, compile=True)
+    assert RuntimeProfile.from_dict(profile.to_dict()).to_dict() == profile.to_dict()
+    assert RuntimeProfile().intra_threads == (os.cpu_count() or 1)
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        runtime = CpuRuntime(models_dir)
+        assert runtime.load_profile() is None and not runtime.is_calibrated
+
+        runtime._save(profile.to_dict(), [{"profile": profile.to_dict(), "seconds": 0.1}])
+        loaded = CpuRuntime(models_dir).load_profile()
+        assert loaded.to_dict() == profile.to_dict()
+
+        # Alt procesor / altă versiune PyTorch: profilul trebuie recalibrat
+        with open(runtime.profile_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data["machine"]["cpu_count"] = (machine_signature()["cpu_count"] or 1) + 1
+        with open(runtime.profile_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        assert CpuRuntime(models_dir).load_profile() is None
+    print("   ✅ Profil salvat corect")
+
+
+def test_call_context():
+    """Fiecare apel de metodă al modelului rulează în contextul de inferență"""
+    print("🧪 TESTARE CONTEXT DE INFERENȚĂ")
+    entered = []
+
+    @contextlib.contextmanager
+    def context():
+        entered.append(True)
+        yield
+
+    model = LazyModel("Decoder", "json.decoder", "JSONDecoder", call_context=context)
+    assert model.decode("[1, 2]") == [1, 2]
+    assert model.decode("{}") == {}
+    assert len(entered) == 2
+
+    runtime = CpuRuntime(tempfile.gettempdir())
+    with runtime.inference():
+        pass
+    print("   ✅ Context de inferență corect")
+
+
+def test_calibration_with_torch():
+    """Calibrarea alege profilul cel mai rapid și îl salvează (doar cu torch instalat)"""
+    if not HAS_TORCH:
+        print("⚠️ torch nu este instalat - test omis")
+        return
+    import torch
+    print("🧪 TESTARE CALIBRARE")
+
+    class Upscaler:
+        def __init__(self):
+            self.net = torch.nn.Sequential(torch.nn.Conv2d(3, 8, 3, padding=1), torch.nn.ReLU())
+            self.head = torch.nn.Linear(8, 8)
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        runtime = CpuRuntime(models_dir)
+        candidates = [RuntimeProfile(1, 1, False), RuntimeProfile(1, 1, True)]
+        timings = {False: 2.0, True: 1.0}
+        best = runtime.calibrate(benchmark=lambda profile: timings[profile.channels_last], candidates=candidates)
+        assert best.channels_last and CpuRuntime(models_dir).is_calibrated
+
+        model = runtime.prepare(Upscaler())
+        assert not model.net.training
+        assert model.net[0].weight.is_contiguous(memory_format=torch.channels_last)
+        with runtime.inference():
+            assert torch.is_inference_mode_enabled()
+    print("   ✅ Calibrare corectă")
+
+
+if __name__ == "__main__":
+    test_profile_roundtrip()
+    test_call_context()
+    test_calibration_with_torch()
+    print("✅ Toate testele au trecut!")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test pentru indexul local de embedding-uri CLIP (căutare imagini similare)
+"""
+
+import sys
+import os
+import tempfile
+import numpy as np
+from PIL import Image
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.ai_jobs import JobCancelled
+from src.utils.embedding_index import EmbeddingIndex, FolderIndexer
+
+
+def color_embedding(images):
+    """Embedding fals: culoarea medie a imaginii, centrată"""
+    return np.stack([np.array(image, dtype=np.float32).mean(axis=(0, 1)) - 127.5 for image in images])
+
+
+def create_photo_folder(colors):
+    """Creează un director cu imagini de culori cunoscute"""
+    folder = tempfile.mkdtemp()
+    for name, color in colors.items():
+        Image.new("RGB", (320, 240), color).save(os.path.join(folder, f"{name}.jpg"))
+    return folder
+
+
+def test_index_folder_and_search():
+    """Indexarea pe loturi și căutarea după similaritate"""
+    print("🧪 TESTARE INDEXARE ȘI CĂUTARE")
+    folder = create_photo_folder({
+        "red": (250, 10, 10), "dark_red": (180, 0, 0), "green": (10, 240, 10), "blue": (10, 10, 250),
+    })
+    index = EmbeddingIndex(index_dir=tempfile.mkdtemp())
+    progress = []
+    indexer = FolderIndexer(index, color_embedding, batch_size=3)
+    assert indexer.index_folder(folder, progress_callback=lambda d, t: progress.append((d, t))) == 4
+    assert progress[-1] == (4, 4)
+    # Reindexarea sare peste fișierele nemodificate
+    assert indexer.index_folder(folder) == 0
+
+    similar = index.find_similar(os.path.join(folder, "red.jpg"), k=1)
+    assert os.path.basename(similar[0][0]) == "dark_red.jpg"
+    results = index.search(np.array([-120.0, -120.0, 120.0]), k=2)
+    assert os.path.basename(results[0][0]) == "blue.jpg" and results[0][1] > 0.99
+
+    # Matricea este stocată ca float16 și se redeschide din metadate
+    reopened = EmbeddingIndex(index_dir=index.index_dir)
+    assert len(reopened) == 4 and reopened.matrix().dtype == np.float16
+    assert reopened.search(np.array([-120.0, -120.0, 120.0]), k=1)[0][0] == results[0][0]
+
+    # Anularea (check) oprește indexarea între loturi; loturile scrise rămân în index
+    index = EmbeddingIndex(index_dir=tempfile.mkdtemp())
+    checks = []
+
+    def cancel_second_batch():
+        checks.append(1)
+        if len(checks) == 2:
+            raise JobCancelled()
+    try:
+        FolderIndexer(index, color_embedding, batch_size=3).index_folder(folder, check=cancel_second_batch)
+        assert False, "Indexarea trebuia anulată"
+    except JobCancelled:
+        pass
+    assert len(index) == 3
+    assert FolderIndexer(index, color_embedding, batch_size=3).index_folder(folder) == 1
+
+
+def test_approximate_search_recall():
+    """Indexul aproximativ (IVF) găsește aceiași vecini ca și căutarea exactă"""
+    print("🧪 TESTARE CĂUTARE APROXIMATIVĂ")
+    rng = np.random.default_rng(0)
+    folder = tempfile.mkdtemp()
+    centers = rng.normal(size=(40, 64))
+    vectors = centers[rng.integers(0, 40, 5000)] + 0.15 * rng.normal(size=(5000, 64))
+    paths = []
+    for i in range(len(vectors)):
+        path = os.path.join(folder, f"{i}.bin")
+        open(path, "wb").close()
+        paths.append(path)
+
+    index = EmbeddingIndex(index_dir=tempfile.mkdtemp(), approximate_threshold=1000)
+    for start in range(0, len(paths), 1000):
+        index.add(paths[start:start + 1000], vectors[start:start + 1000])
+
+    recall = []
+    for query in vectors[rng.choice(len(vectors), 20, replace=False)]:
+        exact = {path for path, _ in index.search(query, k=10, approximate=False)}
+        approximate = {path for path, _ in index.search(query, k=10)}
+        recall.append(len(exact & approximate) / 10)
+    print(f"   Recall@10 mediu: {np.mean(recall):.2f}")
+    assert np.mean(recall) >= 0.9
+    assert index.ivf_path.exists()
+
+
+if __name__ == "__main__":
+    test_index_folder_and_search()
+    test_approximate_search_recall()
+    print("✅ Toate testele au trecut!")
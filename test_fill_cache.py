@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test pentru cache-ul determinist al umplerii generative (seed, mască, prompt) și variantele în lot
+"""
+
+import sys
+import os
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.fill_cache import GenerativeFillCache, fill_cache_key, mask_hash
+from src.utils.inpaint_regions import fill_masked_regions
+
+
+def seeded_fill(image, seed):
+    """Umplere falsă deterministă: culoarea depinde doar de seed."""
+    return Image.new("RGB", image.size, (seed * 40 % 256, 80, 160))
+
+
+def make_input():
+    image = Image.new("RGBA", (96, 64), (200, 100, 50, 255))
+    alpha = np.full((64, 96), 255, dtype=np.uint8)
+    alpha[20:40, 30:60] = 0
+    image.putalpha(Image.fromarray(alpha))
+    return image, alpha == 0
+
+
+def test_keys():
+    """Cheia se schimbă cu oricare dintre componente"""
+    print("🧪 TESTARE CHEI")
+    _, mask = make_input()
+    other = mask.copy()
+    other[0, 0] = True
+    assert mask_hash(mask) == mask_hash(mask.copy()) != mask_hash(other)
+    assert mask_hash(None) == "none"
+    base = ("img", mask_hash(mask), "sky", 1, 30, "model:1", 512, 64)
+    keys = {fill_cache_key(*base)}
+    for index, value in enumerate(("img2", "m", "sea", 2, 20, "model:2", 1024, 32)):
+        changed = list(base)
+        changed[index] = value
+        keys.add(fill_cache_key(*changed))
+    assert len(keys) == 9
+    print("   ✅ Chei corecte")
+
+
+def test_cached_seeds_and_batches():
+    """Seed-urile deja calculate vin din cache; cele lipsă se calculează într-un singur apel"""
+    print("🧪 TESTARE CACHE PER SEED")
+    image, mask = make_input()
+    calls = []
+
+    def compute(seeds):
+        calls.append(list(seeds))
+        return [seeded_fill(image, seed) for seed in seeds]
+
+    with tempfile.TemporaryDirectory() as folder:
+        cache = GenerativeFillCache(cache_dir=folder)
+        first = cache.fill_seeds(image, mask, "sky", [0], 30, "model:1", compute)
+        again = cache.fill_seeds(image.copy(), mask.copy(), "sky", [0], 30, "model:1", compute)
+        assert calls == [[0]]
+        assert np.array_equal(np.asarray(first[0]), np.asarray(again[0]))
+
+        variations = cache.fill_seeds(image, mask, "sky", [0, 1, 2, 3], 30, "model:1", compute)
+        assert calls == [[0], [1, 2, 3]]
+        assert [v.getpixel((0, 0))[0] for v in variations] == [0, 40, 80, 120]
+
+        # O sesiune nouă găsește rezultatele pe disc
+        cache = GenerativeFillCache(cache_dir=folder)
+        cache.fill_seeds(image, mask, "sky", [3, 1], 30, "model:1", compute)
+        assert calls == [[0], [1, 2, 3]] and cache.hits == 2
+
+        # Alt număr de pași sau alt model: rezultat nou
+        cache.fill_seeds(image, mask, "sky", [0], 50, "model:1", compute)
+        assert calls[-1] == [0] and len(calls) == 3
+
+        # Altă rezoluție nativă sau altă margine de context: decupaje diferite, rezultat nou
+        cache.fill_seeds(image, mask, "sky", [0], 30, "model:1", compute, native=1024)
+        cache.fill_seeds(image, mask, "sky", [0], 30, "model:1", compute, margin=32)
+        assert len(calls) == 5
+
+        # Fără seed, rezultatul nu este determinist: nu se păstrează
+        cache.fill_seeds(image, mask, "sky", [0], 30, "model:1", compute, deterministic=False)
+        assert len(calls) == 6
+    print("   ✅ Cache per seed corect")
+
+
+def test_batched_regions():
+    """fill_masked_regions compune separat fiecare variantă dintr-un apel în lot"""
+    print("🧪 TESTARE VARIANTE PE ZONE")
+    image, mask = make_input()
+    seeds = [1, 2, 3]
+    outputs = fill_masked_regions(image, mask, lambda region, mask=None: [seeded_fill(region, s) for s in seeds],
+                                  native=64, margin=8, feather=0)
+    assert isinstance(outputs, list) and len(outputs) == 3
+    for seed, output in zip(seeds, outputs):
+        assert output.getpixel((45, 30)) == (seed * 40, 80, 160)
+        assert output.getpixel((2, 2)) == (200, 100, 50)
+
+    single = fill_masked_regions(image, mask, lambda region: seeded_fill(region, 1), native=64, margin=8, feather=0)
+    assert isinstance(single, Image.Image) and single.getpixel((45, 30)) == (40, 80, 160)
+    print("   ✅ Variante corecte")
+
+
+if __name__ == "__main__":
+    test_keys()
+    test_cached_seeds_and_batches()
+    test_batched_regions()
+    print("✅ Toate testele au trecut!")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test pentru umplerea generativă limitată la zona măștii
+"""
+
+import sys
+import os
+import numpy as np
+from PIL import Image
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.inpaint_regions import (
+    expand_to_aspect, fill_accepts_mask, fill_masked_regions, mask_regions, model_input_size
+)
+
+
+def create_image_with_holes(holes, size=(2000, 1500)):
+    """Imagine RGBA cu găuri transparente la pozițiile date"""
+    array = np.full((size[1], size[0], 4), (40, 80, 120, 255), dtype=np.uint8)
+    for left, top, right, bottom in holes:
+        array[top:bottom, left:right, 3] = 0
+    return Image.fromarray(array)
+
+
+def test_regions_and_geometry():
+    """Zonele separate rămân separate, cele apropiate se unesc"""
+    print("🧪 TESTARE ZONE MASCĂ")
+    mask = np.zeros((1000, 1000), dtype=bool)
+    mask[100:150, 100:150] = True
+    mask[120:170, 180:220] = True  # Aproape de prima: se unește
+    mask[800:850, 800:900] = True
+    regions = mask_regions(mask, margin=20)
+    assert len(regions) == 2
+    assert (80, 80, 240, 190) in regions
+
+    square = expand_to_aspect((100, 100, 300, 150), (1000, 1000))
+    assert square[2] - square[0] == square[3] - square[1] == 200
+    assert expand_to_aspect((0, 0, 50, 900), (100, 1000)) == (0, 0, 100, 900)
+    assert model_input_size((300, 150)) == (512, 256)
+
+
+def test_fill_only_touches_hole():
+    """Modelul primește doar zona găurii, iar pixelii îndepărtați rămân neschimbați"""
+    print("🧪 TESTARE UMPLERE LIMITATĂ LA GAURĂ")
+    image = create_image_with_holes([(900, 700, 980, 760)])
+    calls = []
+
+    def fake_fill(region, mask=None):
+        calls.append((region.size, mask is not None))
+        return Image.new("RGB", region.size, (250, 250, 0))
+
+    assert fill_accepts_mask(fake_fill)
+    result = np.array(fill_masked_regions(image, np.array(image)[..., 3] == 0, fake_fill, margin=32, feather=4))
+    assert len(calls) == 1
+    assert calls[0] == ((512, 512), True)
+    # Interiorul găurii este complet umplut, restul imaginii este identic
+    assert np.all(result[705:755, 905:975] == (250, 250, 0))
+    assert np.all(result[:700] == (40, 80, 120))
+    assert np.all(result[:, :900] == (40, 80, 120))
+    # Tranziția graduală este în interiorul găurii
+    edge = result[730, 900:906, 0].astype(int)
+    assert 40 < edge[0] < edge[-1] == 250
+
+
+def test_opaque_pixels_next_to_hole_unchanged():
+    """Pixelii opaci vecini cu gaura nu sunt amestecați; pixelii ascunși ai găurii nu apar în tranziție"""
+    print("🧪 TESTARE PIXELI OPACI LÂNGĂ GAURĂ")
+    rng = np.random.default_rng(0)
+    array = rng.integers(100, 200, size=(400, 400, 4), dtype=np.uint8)
+    array[..., 3] = 255
+    array[150:250, 150:250] = (0, 0, 0, 0)  # Pixelii ascunși ai găurii: negri, transparenți
+    image = Image.fromarray(array)
+    mask = array[..., 3] == 0
+
+    result = np.array(fill_masked_regions(image, mask, lambda region: Image.new("RGB", region.size, (250, 250, 250)),
+                                          margin=32, feather=4))
+    assert np.array_equal(result[~mask], array[..., :3][~mask])
+    # Banda de tranziție pornește din culorile reale (100-200), nu din negru
+    assert result[mask].min() >= 100
+    assert np.all(result[160:240, 160:240] == 250)
+    print("   ✅ Pixelii opaci sunt neschimbați")
+
+
+def test_multiple_holes_scale_with_hole_size():
+    """Fiecare gaură este procesată separat; progresul este raportat per zonă"""
+    print("🧪 TESTARE GĂURI MULTIPLE")
+    image = create_image_with_holes([(50, 50, 100, 90), (1800, 1300, 1900, 1400)])
+    sizes = []
+    progress = []
+
+    def fill_without_mask(region):
+        sizes.append(region.size)
+        return Image.new("RGB", region.size, (0, 0, 0))
+
+    assert not fill_accepts_mask(fill_without_mask)
+    fill_masked_regions(image, np.array(image)[..., 3] == 0, fill_without_mask,
+                        progress_callback=lambda done, total: progress.append((done, total)))
+    assert len(sizes) == 2 and progress == [(1, 2), (2, 2)]
+
+
+if __name__ == "__main__":
+    test_regions_and_geometry()
+    test_fill_only_touches_hole()
+    test_opaque_pixels_next_to_hole_unchanged()
+    test_multiple_holes_scale_with_hole_size()
+    print("✅ Toate testele au trecut!")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test pentru verificarea integrității modelelor (sha256 prin mmap, evidență, verificare în fundal)
+"""
+
+import sys
+import os
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils import integrity
+from src.utils.integrity import IntegrityManifest, IntegrityVerifier, sha256_mmap
+from src.utils.model_manager import MODEL_WEIGHTS, ModelManager
+
+
+def write(path, data):
+    Path(path).write_bytes(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_sha256_mmap():
+    """Digest-ul prin mmap este identic cu hashlib, inclusiv pentru fișiere goale"""
+    print("🧪 TESTARE SHA256 PRIN MMAP")
+    with tempfile.TemporaryDirectory() as folder:
+        data = os.urandom(5 * 1024 * 1024 + 7)
+        path = os.path.join(folder, "model.bin")
+        expected = write(path, data)
+        progress = []
+        assert sha256_mmap(path, block_size=1024 * 1024, progress_callback=lambda d, t: progress.append(d)) == expected
+        assert progress[-1] == len(data) and len(progress) == 6
+
+        empty = os.path.join(folder, "empty.bin")
+        expected_empty = write(empty, b"")
+        assert sha256_mmap(empty) == expected_empty
+    print("   ✅ SHA256 corect")
+
+
+def test_manifest_skips_unchanged_files():
+    """Fișierele neschimbate nu sunt citite din nou; cele modificate da"""
+    print("🧪 TESTARE EVIDENȚĂ")
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "model.bin")
+        expected = write(path, b"weights" * 1000)
+        manifest = IntegrityManifest(os.path.join(folder, "integrity.json"))
+
+        with mock.patch.object(integrity, "file_digest", wraps=integrity.file_digest) as hashed:
+            assert manifest.verify(path, expected)
+            # Evidența este citită de o instanță nouă (sesiune nouă)
+            assert IntegrityManifest(os.path.join(folder, "integrity.json")).verify(path, expected)
+            assert hashed.call_count == 1
+
+            assert manifest.verify(path, expected, force=True)
+            assert hashed.call_count == 2
+
+            # Fișier rescris (alt inode / mtime / dimensiune): digest recalculat
+            os.remove(path)
+            write(path, b"corrupt" * 1000)
+            assert not manifest.verify(path, expected)
+            assert hashed.call_count == 3
+
+            # Checksum MD5 (modelele publicate doar cu MD5), păstrat alături de sha256
+            md5 = hashlib.md5(b"corrupt" * 1000).hexdigest()
+            assert manifest.verify(path, f"md5:{md5}")
+            assert manifest.verify(path, f"md5:{md5.upper()}") and hashed.call_count == 4
+            assert manifest.cached_digest(path) == hashlib.sha256(b"corrupt" * 1000).hexdigest()
+
+        manifest.forget(path)
+        assert manifest.cached_digest(path) is None
+    print("   ✅ Evidență corectă")
+
+
+def test_background_verification():
+    """Verificarea tuturor fișierelor pe un thread de fundal, cu progres cumulat"""
+    print("🧪 TESTARE VERIFICARE ÎN FUNDAL")
+    with tempfile.TemporaryDirectory() as folder:
+        good = os.path.join(folder, "good.bin")
+        bad = os.path.join(folder, "bad.bin")
+        unknown = os.path.join(folder, "unknown.bin")
+        files = {
+            "good": (good, write(good, os.urandom(300000))),
+            "bad": (bad, "0" * 64),
+            "unknown": (unknown, None),
+        }
+        write(bad, os.urandom(200000))
+        write(unknown, os.urandom(100000))
+
+        done = threading.Event()
+        outcome = {}
+        progress = []
+
+        def on_done(results, error):
+            outcome.update(results=results, error=error)
+            done.set()
+
+        verifier = IntegrityVerifier(IntegrityManifest(os.path.join(folder, "integrity.json")))
+        thread = verifier.start(files, progress_callback=lambda d, t: progress.append((d, t)), done_callback=on_done)
+        assert done.wait(10)
+        thread.join(5)
+        assert outcome["error"] is None
+        assert outcome["results"] == {"good": True, "bad": False, "unknown": None}
+        assert progress[-1] == (600000, 600000)
+        assert all(a[0] <= b[0] for a, b in zip(progress, progress[1:]))
+    print("   ✅ Verificare în fundal corectă")
+
+
+def test_model_manager_integrity():
+    """ModelManager verifică sha256 din model_info, folosind evidența"""
+    print("🧪 TESTARE MODELMANAGER")
+    with tempfile.TemporaryDirectory() as folder:
+        manager = ModelManager()
+        manager.models_dir = Path(folder)
+        manager.integrity = IntegrityManifest(os.path.join(folder, "integrity.json"))
+        expected = write(os.path.join(folder, "test.bin"), b"model" * 100)
+        manager.model_info = {"test": {"name": "Test", "url": "", "filename": "test.bin",
+                                       "size": "1KB", "sha256": expected}}
+        assert manager.verify_model_integrity("test")
+        manager.model_info["test"]["sha256"] = "f" * 64
+        assert not manager.verify_model_integrity("test")
+
+        # Versiunea pentru cache-uri: digest-ul ponderilor + modul INT8
+        version = manager.model_version("test", "wrapper:1")
+        assert version == f"sha256:{expected}:float32"
+        assert manager.model_version("test", "wrapper:2", quantized=True) == f"sha256:{expected}:int8"
+        assert manager.model_version(None, "wrapper:1") == "wrapper:1:float32"
+
+        # Cache-ul INT8 este cheiat pe ponderi, nu pe codul modelului
+        quantized_keys = []
+        manager.quantizer.apply = lambda name, instance, key: quantized_keys.append(key) or instance
+        MODEL_WEIGHTS["Test"] = "test"
+        try:
+            manager.quantize_model("Test", object(), "wrapper:1")
+            write(os.path.join(folder, "test.bin"), b"other weights")
+            manager.quantize_model("Test", object(), "wrapper:1")
+        finally:
+            del MODEL_WEIGHTS["Test"]
+        assert quantized_keys[0] == f"sha256:{expected}:int8" != quantized_keys[1]
+        assert manager.model_version("test", "wrapper:1") != version
+    print("   ✅ ModelManager corect")
+
+
+if __name__ == "__main__":
+    test_sha256_mmap()
+    test_manifest_skips_unchanged_files()
+    test_background_verification()
+    test_model_manager_integrity()
+    print("✅ Toate testele au trecut!")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test pentru încărcarea leneșă a modelelor AI și preîncărcarea în fundal
+"""
+
+import sys
+import os
+import tempfile
+import threading
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.lazy_models import LazyModel, ModelWarmup
+from src.utils.model_residency import ModelResidency
+
+FAKE_MODEL_SOURCE = '''
+import time
+CONSTRUCTED = []
+
+class FakeModel:
+    def __init__(self):
+        time.sleep(0.05)
+        CONSTRUCTED.append(self)
+
+    def upscale(self, value):
+        return value * 2
+'''
+
+
+def create_fake_model_module(name):
+    """Scrie un modul de model fals într-un director temporar"""
+    directory = tempfile.mkdtemp()
+    with open(os.path.join(directory, f"{name}.py"), "w") as f:
+        f.write(FAKE_MODEL_SOURCE)
+    sys.path.insert(0, directory)
+    return name
+
+
+def test_model_loads_on_first_use():
+    """Modulul nu este importat până la prima utilizare"""
+    print("🧪 TESTARE ÎNCĂRCARE LA PRIMA UTILIZARE")
+    module_name = create_fake_model_module("fake_lazy_model_a")
+    used = []
+    model = LazyModel("Fake", module_name, "FakeModel", on_first_use=used.append)
+    assert module_name not in sys.modules
+    assert model.state == LazyModel.NOT_LOADED
+
+    assert model.upscale(21) == 42
+    assert model.state == LazyModel.READY
+    assert model.is_loaded and model.load_time is not None
+    assert used == ["Fake"]
+
+
+def test_concurrent_first_use_constructs_once():
+    """Apelurile simultane așteaptă aceeași încărcare"""
+    print("🧪 TESTARE ÎNCĂRCARE CONCURENTĂ")
+    module_name = create_fake_model_module("fake_lazy_model_b")
+    model = LazyModel("Fake", module_name, "FakeModel")
+    threads = [threading.Thread(target=model.get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(sys.modules[module_name].CONSTRUCTED) == 1
+
+
+def test_failed_load_is_reported():
+    """Un model care nu poate fi importat trece în starea 'failed'"""
+    print("🧪 TESTARE EROARE LA ÎNCĂRCARE")
+    model = LazyModel("Missing", "modul_inexistent_ai", "Model")
+    assert model.preload() is False
+    assert model.state == LazyModel.FAILED
+    assert model.error is not None
+
+
+def test_evicted_model_reloads_transparently():
+    """Cu un buget de memorie, modelul descărcat este reîncărcat la următorul apel"""
+    print("🧪 TESTARE REÎNCĂRCARE DUPĂ EVACUARE")
+    residency = ModelResidency(budget_bytes=1024 ** 3)
+    model = LazyModel("Fake", create_fake_model_module("fake_lazy_model_f"), "FakeModel",
+                      residency=residency)
+    assert model.upscale(1) == 2
+    residency.evict("Fake")
+    assert model.state == LazyModel.EVICTED
+    assert model.upscale(2) == 4
+    assert model.state == LazyModel.READY
+    assert residency.stats()["models"]["Fake"]["reloads"] == 1
+
+
+def test_warmup_preloads_most_used_models():
+    """Preîncărcarea urmează statisticile de utilizare și poate fi suspendată"""
+    print("🧪 TESTARE PREÎNCĂRCARE")
+    usage_file = os.path.join(tempfile.mkdtemp(), "usage.json")
+    models = {
+        "Rare": LazyModel("Rare", create_fake_model_module("fake_lazy_model_c"), "FakeModel"),
+        "Often": LazyModel("Often", create_fake_model_module("fake_lazy_model_d"), "FakeModel"),
+        "Never": LazyModel("Never", create_fake_model_module("fake_lazy_model_e"), "FakeModel"),
+    }
+    warmup = ModelWarmup(models, usage_file=usage_file)
+    for _ in range(3):
+        warmup._counted.clear()
+        warmup.record_use("Often")
+    warmup.record_use("Rare")
+    warmup.record_use("Rare")  # O singură dată per sesiune
+    assert warmup.usage == {"Often": 3, "Rare": 1}
+    warmup.save_usage()
+
+    warmup = ModelWarmup(models, usage_file=usage_file, max_models=2)
+    assert warmup.warmup_order() == ["Often", "Rare"]
+    warmup.pause()
+    warmup.start()
+    warmup._thread.join(timeout=0.2)
+    assert not models["Often"].is_loaded  # Suspendată cât timp rulează o operație
+    warmup.resume()
+    warmup._thread.join(timeout=5)
+    assert models["Often"].is_loaded and models["Rare"].is_loaded
+    assert not models["Never"].is_loaded
+    print("   ✅ Preîncărcare în ordinea utilizării")
+
+
+if __name__ == "__main__":
+    test_model_loads_on_first_use()
+    test_concurrent_first_use_constructs_once()
+    test_failed_load_is_reported()
+    test_evicted_model_reloads_transparently()
+    test_warmup_preloads_most_used_models()
+    print("✅ Toate testele au trecut!")
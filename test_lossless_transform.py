@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test pentru rotațiile exacte și exportul JPEG fără re-encodare
+"""
+
+import sys
+import os
+import tempfile
+import numpy as np
+from PIL import Image, ImageDraw, ImageOps
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.image_processor import ImageProcessor
+from src.utils.lossless_transform import (
+    compose_orientation, export_lossless_jpeg, rotation_transpose
+)
+
+
+def create_test_jpeg(exif_orientation=None):
+    """Creează un JPEG de test asimetric"""
+    image = Image.new('RGB', (320, 240), (30, 60, 90))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([10, 10, 120, 60], fill=(255, 0, 0))
+    path = os.path.join(tempfile.mkdtemp(), "source.jpg")
+    if exif_orientation:
+        exif = Image.Exif()
+        exif[0x0112] = exif_orientation
+        image.save(path, quality=90, exif=exif)
+    else:
+        image.save(path, quality=90)
+    return path
+
+
+def test_rotate_multiples_of_90_are_exact():
+    """rotate_image folosește transpose pentru multiplii de 90°"""
+    print("🧪 TESTARE ROTIRE EXACTĂ")
+    image = Image.fromarray(np.random.default_rng(0).integers(0, 256, (30, 50, 3), dtype=np.uint8))
+    processor = ImageProcessor()
+    for angle, method in ((90, Image.Transpose.ROTATE_90), (-90, Image.Transpose.ROTATE_270),
+                          (180, Image.Transpose.ROTATE_180), (270, Image.Transpose.ROTATE_270)):
+        assert rotation_transpose(angle) == method
+        rotated = processor.rotate_image(image, angle)
+        assert np.array_equal(np.array(rotated), np.array(image.transpose(method)))
+    assert rotation_transpose(0) is None
+    assert rotation_transpose(30) is False
+    print("   ✅ Rotiri exacte")
+
+
+def test_compose_orientation():
+    """Compunerea transformărilor dă orientarea EXIF corectă"""
+    print("🧪 TESTARE COMPUNERE ORIENTARE")
+    rotate_right = ("transpose", Image.Transpose.ROTATE_270)
+    mirror = ("transpose", Image.Transpose.FLIP_LEFT_RIGHT)
+    assert compose_orientation([]) == 1
+    assert compose_orientation([rotate_right]) == 6
+    assert compose_orientation([rotate_right, rotate_right]) == 3
+    assert compose_orientation([mirror, mirror]) == 1
+    assert compose_orientation([("crop", (0, 0, 8, 8))]) is None
+
+
+def test_lossless_export_keeps_scan_data():
+    """Exportul păstrează datele comprimate și se afișează ca imaginea editată"""
+    print("🧪 TESTARE EXPORT JPEG FĂRĂ PIERDERI")
+    for source_orientation in (None, 8):
+        source = create_test_jpeg(source_orientation)
+        ops = [("transpose", Image.Transpose.ROTATE_270), ("transpose", Image.Transpose.FLIP_LEFT_RIGHT)]
+        output = os.path.join(os.path.dirname(source), "exported.jpg")
+        assert export_lossless_jpeg(source, ops, output)
+
+        with open(source, "rb") as f:
+            source_data = f.read()
+        with open(output, "rb") as f:
+            output_data = f.read()
+        # Datele de după markerul SOS sunt identice: imaginea nu a fost re-encodată
+        assert source_data[source_data.index(b"\xff\xda"):] == output_data[output_data.index(b"\xff\xda"):]
+
+        # Editorul lucrează pe pixelii neorientați; exportul trebuie să arate la fel
+        with Image.open(source) as img:
+            expected = img.convert("RGB")
+            for _, method in ops:
+                expected = expected.transpose(method)
+        with Image.open(output) as img:
+            displayed = ImageOps.exif_transpose(img)
+        assert np.array_equal(np.array(displayed), np.array(expected))
+        print(f"   ✅ Export fără pierderi (orientare sursă: {source_orientation})")
+
+
+if __name__ == "__main__":
+    test_rotate_multiples_of_90_are_exact()
+    test_compose_orientation()
+    test_lossless_export_keeps_scan_data()
+    print("✅ Toate testele au trecut!")
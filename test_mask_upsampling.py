@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test pentru eliminarea fundalului pe proxy micșorat cu mărirea ghidată a măștii
+"""
+
+import sys
+import os
+
+import numpy as np
+from PIL import Image
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.mask_upsampling import proxy_size, guided_upsample, remove_background_proxy
+
+
+def make_photo(size=(1600, 1200)):
+    """Subiect luminos pe fundal întunecat, cu o margine diagonală (neprinsă de grila proxy-ului)."""
+    width, height = size
+    y, x = np.mgrid[0:height, 0:width]
+    subject = x + 0.37 * y > 0.55 * width
+    rng = np.random.default_rng(0)
+    gray = np.where(subject, 210, 40) + rng.integers(-8, 9, size=subject.shape)
+    rgb = np.stack([gray, gray * 0.9, gray * 0.8], axis=-1).clip(0, 255).astype(np.uint8)
+    return Image.fromarray(rgb), subject
+
+
+def threshold_segmenter(calls):
+    """Segmentare falsă: subiectul este zona luminoasă."""
+    def remove_background(image, progress=None):
+        calls.append(image.size)
+        mask = (np.asarray(image.convert("L")) > 120).astype(np.uint8) * 255
+        result = image.convert("RGBA")
+        result.putalpha(Image.fromarray(mask, mode="L"))
+        return result
+    return remove_background
+
+
+def test_proxy_size():
+    """Latura mare este redusă la max_side; imaginile mici rămân neschimbate"""
+    print("🧪 TESTARE DIMENSIUNE PROXY")
+    assert proxy_size((4000, 3000), 1000) == (1000, 750)
+    assert proxy_size((3000, 4000), 1000) == (750, 1000)
+    assert proxy_size((800, 600), 1024) == (800, 600)
+    print("   ✅ Dimensiune corectă")
+
+
+def test_guided_edges_sharper_than_bilinear():
+    """Masca mărită ghidat urmează marginea reală mai bine decât interpolarea simplă"""
+    print("🧪 TESTARE MĂRIRE GHIDATĂ")
+    photo, subject = make_photo()
+    small = photo.resize(proxy_size(photo.size, 400), Image.LANCZOS)
+    mask_small = threshold_segmenter([])(small).getchannel("A")
+
+    truth = subject.astype(np.float32)
+    bilinear = np.asarray(mask_small.resize(photo.size, Image.BILINEAR), dtype=np.float32) / 255.0
+    guided = np.asarray(guided_upsample(mask_small, photo), dtype=np.float32) / 255.0
+    assert guided.shape == truth.shape
+
+    bilinear_error = np.abs(bilinear - truth).mean()
+    guided_error = np.abs(guided - truth).mean()
+    assert guided_error < bilinear_error * 0.7, (guided_error, bilinear_error)
+    # Marginea este abruptă: puțini pixeli rămân semi-transparenți
+    assert ((guided > 0.1) & (guided < 0.9)).mean() < ((bilinear > 0.1) & (bilinear < 0.9)).mean()
+    print(f"   ✅ Eroare medie: ghidat {guided_error:.4f}, biliniar {bilinear_error:.4f}")
+
+
+def test_remove_background_proxy():
+    """Segmentarea rulează pe proxy; rezultatul are rezoluția și pixelii originali"""
+    print("🧪 TESTARE ELIMINARE FUNDAL PE PROXY")
+    photo, subject = make_photo()
+    calls = []
+    result = remove_background_proxy(threshold_segmenter(calls), photo, max_side=512)
+    assert calls == [proxy_size(photo.size, 512)]
+    assert result.mode == "RGBA" and result.size == photo.size
+    assert np.array_equal(np.asarray(result)[..., :3], np.asarray(photo))
+    alpha = np.asarray(result.getchannel("A")) > 127
+    assert (alpha == subject).mean() > 0.99
+
+    # Imaginile mici sunt procesate direct
+    small = photo.resize((320, 240))
+    calls.clear()
+    remove_background_proxy(threshold_segmenter(calls), small, max_side=512)
+    assert calls == [(320, 240)]
+    print("   ✅ Eliminare pe proxy corectă")
+
+
+if __name__ == "__main__":
+    test_proxy_size()
+    test_guided_edges_sharper_than_bilinear()
+    test_remove_background_proxy()
+    print("✅ Toate testele au trecut!")
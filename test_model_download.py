@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Test pentru descărcarea modelelor (părți paralele, reluare, sha256), cu un server HTTP local
+"""
+
+import sys
+import os
+import hashlib
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.model_download import ParallelDownloader, DownloadError, split_ranges
+from src.utils.model_manager import ModelManager
+
+CONTENT = os.urandom(3 * 1024 * 1024 + 123)
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+MD5 = hashlib.md5(CONTENT).hexdigest()
+
+
+class FakeModelServer:
+    """Server HTTP local: suport Range opțional, întreruperea conexiunii după N octeți"""
+
+    def __init__(self, content=CONTENT, ranges=True):
+        self.content = content
+        self.ranges = ranges
+        self.cut_after = None   # Octeți trimiși per răspuns înainte de închiderea conexiunii
+        self.bytes_sent = 0
+        self.range_requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _headers(self, status, length, start=None, end=None):
+                self.send_response(status)
+                self.send_header("Content-Length", str(length))
+                if server.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                if start is not None:
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(server.content)}")
+                self.end_headers()
+
+            def do_HEAD(self):
+                self._headers(200, len(server.content))
+
+            def do_GET(self):
+                header = self.headers.get("Range")
+                start, end = 0, len(server.content) - 1
+                if header and server.ranges:
+                    first, _, last = header.replace("bytes=", "").partition("-")
+                    start, end = int(first), int(last) if last else end
+                    server.range_requests.append((start, end))
+                    self._headers(206, end - start + 1, start, end)
+                else:
+                    self._headers(200, len(server.content))
+                body = server.content[start:end + 1]
+                if server.cut_after is not None:
+                    body = body[:server.cut_after]
+                server.bytes_sent += len(body)
+                self.wfile.write(body)
+                if server.cut_after is not None:
+                    self.close_connection = True
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/model.bin"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def downloader(**kwargs):
+    options = {"connections": 4, "min_part_size": 512 * 1024, "chunk_size": 64 * 1024, "timeout": 5}
+    options.update(kwargs)
+    return ParallelDownloader(**options)
+
+
+def test_split_ranges():
+    """Intervalele acoperă tot fișierul, fără suprapuneri"""
+    print("🧪 TESTARE ÎMPĂRȚIRE ÎN PĂRȚI")
+    assert split_ranges(10, 3) == [(0, 3), (4, 7), (8, 9)]
+    assert split_ranges(5, 1) == [(0, 4)]
+    print("   ✅ Împărțire corectă")
+
+
+def test_parallel_download():
+    """Descărcare în părți paralele, verificată cu sha256"""
+    print("🧪 TESTARE DESCĂRCARE PARALELĂ")
+    server = FakeModelServer()
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            destination = os.path.join(folder, "model.bin")
+            fractions = []
+            downloader().download(server.url, destination, sha256=SHA256, progress_callback=fractions.append)
+            assert Path(destination).read_bytes() == CONTENT
+            assert len(server.range_requests) == 4
+            assert fractions[-1] == 1.0
+            assert sorted(os.listdir(folder)) == ["model.bin"]
+    finally:
+        server.close()
+    print("   ✅ Descărcare paralelă corectă")
+
+
+def test_resume_after_interruption():
+    """O descărcare întreruptă continuă de la octeții deja primiți"""
+    print("🧪 TESTARE RELUARE")
+    server = FakeModelServer()
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            destination = os.path.join(folder, "model.bin")
+            server.cut_after = 100 * 1024
+            try:
+                downloader(retries=0).download(server.url, destination, sha256=SHA256)
+                assert False, "Descărcarea trebuia să eșueze"
+            except DownloadError:
+                pass
+            assert not os.path.exists(destination)
+            assert os.path.exists(destination + ".tmp") and os.path.exists(destination + ".parts.tmp")
+            first_attempt = server.bytes_sent
+
+            server.cut_after = None
+            server.bytes_sent = 0
+            downloader().download(server.url, destination, sha256=SHA256)
+            assert Path(destination).read_bytes() == CONTENT
+            # A doua încercare nu descarcă din nou octeții deja primiți
+            assert len(CONTENT) - first_attempt <= server.bytes_sent < len(CONTENT)
+            assert sorted(os.listdir(folder)) == ["model.bin"]
+    finally:
+        server.close()
+    print("   ✅ Reluare corectă")
+
+
+def test_checksum_mismatch():
+    """Un fișier cu checksum diferit nu ajunge la calea finală"""
+    print("🧪 TESTARE CHECKSUM GREȘIT")
+    server = FakeModelServer()
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            destination = os.path.join(folder, "model.bin")
+            try:
+                downloader().download(server.url, destination, sha256="0" * 64)
+                assert False, "Checksum-ul trebuia respins"
+            except DownloadError:
+                pass
+            assert os.listdir(folder) == []
+            try:
+                downloader().download(server.url, destination, sha256=SHA256, md5="0" * 32)
+                assert False, "Checksum-ul MD5 trebuia respins"
+            except DownloadError:
+                pass
+            assert os.listdir(folder) == []
+    finally:
+        server.close()
+    print("   ✅ Checksum verificat corect")
+
+
+def test_server_without_ranges():
+    """Serverele fără suport Range sunt descărcate pe o singură conexiune"""
+    print("🧪 TESTARE SERVER FĂRĂ RANGE")
+    server = FakeModelServer(ranges=False)
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            destination = os.path.join(folder, "model.bin")
+            downloader().download(server.url, destination, sha256=SHA256)
+            assert Path(destination).read_bytes() == CONTENT
+            assert server.range_requests == []
+    finally:
+        server.close()
+    print("   ✅ Descărcare secvențială corectă")
+
+
+def test_model_manager_download():
+    """ModelManager descarcă prin .tmp și nu consideră prezent un fișier incomplet"""
+    print("🧪 TESTARE MODELMANAGER")
+    server = FakeModelServer()
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            manager = ModelManager()
+            manager.models_dir = Path(folder)
+            manager.downloader = downloader(retries=0)
+            manager.model_info = {"test": {"name": "Test", "url": server.url, "filename": "test.bin",
+                                           "size": "3MB", "sha256": SHA256}}
+            server.cut_after = 50 * 1024
+            assert manager.download_model("test") is None
+            assert manager.get_model_path("test") is None
+
+            server.cut_after = None
+            path = manager.download_model("test")
+            assert path and Path(path).read_bytes() == CONTENT
+            assert manager.verify_model_integrity("test")
+
+            # Modelele publicate doar cu MD5 sunt verificate cu MD5
+            manager.model_info["md5"] = {"name": "Md5", "url": server.url, "filename": "md5.bin", "size": "3MB",
+                                         "sha256": None, "md5": MD5}
+            assert manager.download_model("md5")
+            assert manager.integrity.cached_digest(manager.get_model_path("md5"), "md5") == MD5
+            assert manager.verify_model_integrity("md5")
+            manager.model_info["md5"]["md5"] = "0" * 32
+            assert not manager.verify_model_integrity("md5")
+
+        # Toate modelele livrate au un checksum publicat
+        assert all(ModelManager().expected_checksum(name) for name in ModelManager().model_info)
+    finally:
+        server.close()
+    print("   ✅ ModelManager corect")
+
+
+if __name__ == "__main__":
+    test_split_ranges()
+    test_parallel_download()
+    test_resume_after_interruption()
+    test_checksum_mismatch()
+    test_server_without_ranges()
+    test_model_manager_download()
+    print("✅ Toate testele au trecut!")
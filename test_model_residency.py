@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test pentru gestionarea memoriei modelelor (buget RAM, evacuare LRU, reîncărcare)
+"""
+
+import sys
+import os
+import threading
+import numpy as np
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.model_residency import ModelResidency, estimate_footprint
+from src.utils.model_manager import ModelManager
+
+MB = 1024 * 1024
+
+
+class FakeModel:
+    """Model fals cu greutăți de dimensiune cunoscută"""
+
+    def __init__(self, size_mb):
+        self.weights = {"layer": np.zeros(int(size_mb * MB), dtype=np.uint8)}
+
+    def predict(self, value):
+        return value + 1
+
+
+def test_footprint_estimate():
+    """Estimarea găsește tablourile din atributele imbricate"""
+    print("🧪 TESTARE ESTIMARE MEMORIE")
+    assert estimate_footprint(FakeModel(3)) == 3 * MB
+
+
+def test_lru_eviction_and_reload():
+    """Modelele folosite cel mai demult sunt descărcate și reîncărcate la cerere"""
+    print("🧪 TESTARE EVACUARE LRU")
+    residency = ModelResidency(budget_bytes=25 * MB)
+    for name in ("a", "b", "c"):
+        residency.register(name, lambda: FakeModel(10))
+
+    residency.acquire("a")
+    residency.acquire("b")
+    residency.acquire("a")  # "b" devine cel mai vechi
+    residency.acquire("c")
+    stats = residency.stats()
+    assert stats["models"]["b"]["loaded"] is False
+    assert stats["models"]["b"]["evictions"] == 1
+    assert stats["models"]["a"]["loaded"] and stats["models"]["c"]["loaded"]
+    assert stats["loaded_mb"] <= stats["budget_mb"]
+
+    residency.acquire("b")
+    stats = residency.stats()
+    assert stats["models"]["b"]["reloads"] == 1
+    assert stats["models"]["a"]["loaded"] is False
+    print(f"   Ordine LRU: {stats['lru_order']}")
+
+
+def test_model_in_use_is_not_evicted():
+    """Un model care rulează nu este descărcat, chiar dacă este cel mai vechi"""
+    print("🧪 TESTARE MODEL ÎN UTILIZARE")
+    residency = ModelResidency(budget_bytes=15 * MB)
+    residency.register("busy", lambda: FakeModel(10))
+    residency.register("other", lambda: FakeModel(10))
+    with residency.use("busy") as model:
+        residency.acquire("other")
+        assert residency.is_loaded("busy")
+        assert model.predict(1) == 2
+    residency.set_budget(5 * MB)
+    assert not residency.is_loaded("busy") and not residency.is_loaded("other")
+
+
+def test_concurrent_acquire_loads_once():
+    """Accesul simultan la același model îl încarcă o singură dată"""
+    residency = ModelResidency(budget_bytes=100 * MB)
+    residency.register("shared", lambda: FakeModel(1))
+    threads = [threading.Thread(target=residency.acquire, args=("shared",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert residency.stats()["models"]["shared"]["loads"] == 1
+
+
+def test_model_manager_api():
+    """ModelManager expune stratul de memorie"""
+    print("🧪 TESTARE API MODELMANAGER")
+    manager = ModelManager(memory_budget_mb=12)
+    manager.register_loaded_model("small", lambda: FakeModel(4))
+    manager.register_loaded_model("large", lambda: FakeModel(10))
+    assert manager.acquire_model("small").predict(0) == 1
+    manager.acquire_model("large")
+    stats = manager.get_residency_stats()
+    assert not stats["models"]["small"]["loaded"]
+    assert stats["models"]["large"]["footprint_mb"] >= 10
+    assert manager.unload_model("large") is True
+    assert manager.get_residency_stats()["loaded_mb"] == 0
+
+
+if __name__ == "__main__":
+    test_footprint_estimate()
+    test_lru_eviction_and_reload()
+    test_model_in_use_is_not_evicted()
+    test_concurrent_acquire_loads_once()
+    test_model_manager_api()
+    print("✅ Toate testele au trecut!")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test pentru reconstrucția fără AI pe mai multe scări (piramidă, bandă de rafinare, zone în paralel)
+"""
+
+import sys
+import os
+
+import numpy as np
+from PIL import Image
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.ai_jobs import JobCancelled
+from src.utils.multiscale_inpaint import pyramid_levels, inpaint_region, inpaint_multiscale
+from src.utils.progress import ProgressReporter
+
+
+def make_gradient(size=(640, 480)):
+    width, height = size
+    y, x = np.mgrid[0:height, 0:width]
+    return np.stack([x * 255 // width, y * 255 // height, (x + y) * 255 // (width + height)],
+                    axis=-1).astype(np.uint8)
+
+
+def make_holes(shape):
+    mask = np.zeros(shape[:2], dtype=bool)
+    mask[100:260, 120:320] = True   # Gaură mare
+    mask[380:420, 500:560] = True   # Gaură mică, separată
+    return mask
+
+
+def test_pyramid_levels():
+    """Gaura ajunge sub dimensiunea grosieră, fără ca decupajul să devină prea mic"""
+    print("🧪 TESTARE NIVELURI PIRAMIDĂ")
+    assert pyramid_levels(20, (200, 200)) == 0
+    assert pyramid_levels(200, (400, 400)) == 3
+    assert pyramid_levels(1000, (64, 64)) == 2
+    print("   ✅ Niveluri corecte")
+
+
+def test_fill_quality_and_known_pixels():
+    """Pixelii cunoscuți rămân neschimbați; gaura urmează gradientul din jur"""
+    print("🧪 TESTARE CALITATE RECONSTRUCȚIE")
+    original = make_gradient()
+    mask = make_holes(original.shape)
+    damaged = original.copy()
+    damaged[mask] = 0
+
+    result = np.asarray(inpaint_multiscale(Image.fromarray(damaged), mask))
+    assert np.array_equal(result[~mask], original[~mask])
+    error = np.abs(result[mask].astype(np.int32) - original[mask]).mean()
+    assert error < 12, error
+
+    # O zonă fără gaură este returnată neschimbată
+    assert np.array_equal(inpaint_region(original[:50, :50], np.zeros((50, 50), bool)), original[:50, :50])
+    print(f"   ✅ Eroare medie în gaură: {error:.1f}")
+
+
+def test_regions_progress_and_cancel():
+    """Zonele disjuncte sunt raportate pe rând; anularea oprește operația"""
+    print("🧪 TESTARE PROGRES ȘI ANULARE")
+    original = make_gradient()
+    mask = make_holes(original.shape)
+    image = Image.fromarray(original).convert("RGBA")
+
+    updates = []
+    progress = ProgressReporter(lambda info: updates.append((info.done, info.total)), min_interval=0)
+    inpaint_multiscale(image, mask, max_workers=2, progress=progress)
+    assert updates[-1] == (2, 2)
+
+    def cancel():
+        raise JobCancelled()
+    try:
+        inpaint_multiscale(image, mask, progress=ProgressReporter(lambda info: None, check=cancel))
+        assert False, "Operația trebuia anulată"
+    except JobCancelled:
+        pass
+
+    # Fără mască: imaginea este returnată ca RGB
+    untouched = inpaint_multiscale(image, np.zeros(mask.shape, bool))
+    assert untouched.mode == "RGB" and np.array_equal(np.asarray(untouched), original)
+    print("   ✅ Progres și anulare corecte")
+
+
+if __name__ == "__main__":
+    test_pyramid_levels()
+    test_fill_quality_and_known_pixels()
+    test_regions_progress_and_cancel()
+    print("✅ Toate testele au trecut!")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test pentru backend-urile de procesare (PIL vs OpenCV) și ProcessingSession
+"""
+
+import sys
+import os
+from unittest import mock
+import numpy as np
+from PIL import Image, ImageDraw, ImageEnhance
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.image_processor import ImageProcessor
+from src.utils.processing_backend import (
+    BENCHMARK_PARAMS, PILBackend, OpenCVBackend, ProcessingSession,
+    apply_chain, benchmark_backends, choose_backends
+)
+
+
+def create_test_image(width=400, height=300):
+    """Creează o imagine de test (gradient, ca reeșantionarea să fie comparabilă)"""
+    y, x = np.mgrid[0:height, 0:width]
+    array = np.dstack([x * 200 // width + 30, y * 200 // height + 30, (x + y) * 200 // (width + height) + 30])
+    image = Image.fromarray(array.astype(np.uint8))
+    ImageDraw.Draw(image).ellipse([50, 50, 250, 250], fill=(200, 40, 40))
+    return image
+
+
+def test_opencv_matches_pil():
+    """Fiecare operație OpenCV dă aproximativ același rezultat ca ImageProcessor"""
+    print("🧪 TESTARE OPENCV vs PIL")
+    array = np.array(create_test_image())
+    pil, opencv = PILBackend(), OpenCVBackend()
+    for operation, params in BENCHMARK_PARAMS.items():
+        expected, expected_mode = pil.apply(operation, array, "RGB", **params)
+        actual, actual_mode = opencv.apply(operation, array, "RGB", **params)
+        assert expected.shape == actual.shape, operation
+        assert expected_mode == actual_mode, operation
+        # Marginile diferă la filtre (PIL nu filtrează pixelii de pe margine)
+        diff = np.abs(expected[2:-2, 2:-2].astype(int) - actual[2:-2, 2:-2].astype(int))
+        print(f"   {operation:<22} diferență medie: {diff.mean():.3f}")
+        assert diff.mean() < 1.0, operation
+
+
+def test_exact_point_operations():
+    """Operațiile punctuale bazate pe LUT sunt identice cu PIL"""
+    print("🧪 TESTARE OPERAȚII PUNCTUALE EXACTE")
+    image = create_test_image()
+    processor = ImageProcessor()
+    session = ProcessingSession(image, backend="opencv")
+    session.apply("enhance_brightness", factor=1.3).apply("enhance_contrast", factor=0.8)
+    expected = processor.enhance_contrast(processor.enhance_brightness(image, 1.3), 0.8)
+    assert np.array_equal(np.array(session.to_image()), np.array(expected))
+
+
+def test_profile_chooses_backend():
+    """Benchmark-ul alege un backend pentru fiecare operație, iar sesiunea îl respectă"""
+    print("🧪 TESTARE PROFIL BACKEND-URI")
+    timings = benchmark_backends(size=(320, 240), repeats=1, operations=["apply_blur", "apply_sepia"])
+    choices = choose_backends(timings)
+    assert set(choices) == {"apply_blur", "apply_sepia"}
+    print(f"   Alegeri: {choices}")
+
+    session = ProcessingSession(create_test_image(), backend="auto", profile={"apply_blur": "opencv"})
+    assert session.backend_for("apply_blur").name == "opencv"
+    assert session.backend_for("apply_sepia").name == "pil"
+    # Modurile nesuportate de OpenCV revin la PIL
+    gray_session = ProcessingSession(create_test_image().convert("L"), backend="opencv")
+    assert gray_session.backend_for("apply_blur").name == "pil"
+
+
+def test_slider_adjustments_match_image_enhance():
+    """Lanțul slider-elor (luminozitate, contrast, saturație) pe buffer = ImageEnhance pe PIL"""
+    print("🧪 TESTARE SLIDER-E PE BUFFER")
+    image = create_test_image().convert("RGBA")
+    expected = ImageEnhance.Brightness(image).enhance(1.3)
+    expected = ImageEnhance.Color(ImageEnhance.Contrast(expected).enhance(0.8)).enhance(1.4)
+    for backend in ("pil", "opencv"):
+        session = ProcessingSession(image, backend=backend)
+        session.apply("enhance_brightness", factor=1.3).apply("enhance_contrast", factor=0.8)
+        result = session.apply("enhance_saturation", factor=1.4).to_image()
+        assert result.mode == "RGBA"
+        difference = np.abs(np.asarray(result, np.int16) - np.asarray(expected, np.int16)).max()
+        assert difference <= (0 if backend == "pil" else 1), (backend, difference)
+
+    # apply_chain: fără profil rămâne pe PIL (fără buffer numpy); cu OpenCV în profil, pe buffer
+    steps = [("enhance_brightness", {"factor": 1.3}), ("enhance_contrast", {"factor": 0.8}),
+             ("enhance_saturation", {"factor": 1.4})]
+    with mock.patch.object(ProcessingSession, "__init__", side_effect=AssertionError("buffer numpy")):
+        assert np.array_equal(np.asarray(apply_chain(image, steps, profile={})), np.asarray(expected))
+        assert np.array_equal(np.asarray(apply_chain(image, steps, profile={"apply_blur": "opencv"})),
+                              np.asarray(expected))
+    result = apply_chain(image, steps, profile={"enhance_brightness": "opencv"})
+    assert np.abs(np.asarray(result, np.int16) - np.asarray(expected, np.int16)).max() <= 1
+    print("   ✅ Slider-e corecte")
+
+
+if __name__ == "__main__":
+    test_opencv_matches_pil()
+    test_exact_point_operations()
+    test_profile_chooses_backend()
+    test_slider_adjustments_match_image_enhance()
+    print("✅ Toate testele au trecut!")
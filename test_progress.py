@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Test pentru protocolul de progres (pași reali, viteză, ETA, sub-etape, anulare)
+"""
+
+import sys
+import os
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.progress import ProgressReporter, ProgressInfo, TkProgressBridge, accepts_keyword, format_duration
+from src.utils.ai_jobs import JobCancelled
+from src.utils.inpaint_regions import fill_masked_regions
+
+
+def test_rate_eta_and_throttling():
+    """Viteza și ETA provin din pașii raportați; notificările sunt limitate"""
+    print("🧪 TESTARE VITEZĂ, ETA ȘI LIMITARE NOTIFICĂRI")
+    events = []
+    progress = ProgressReporter(events.append, stage="Upscale", min_interval=10)
+    progress.start(total=10, unit="tiles")
+    assert events[-1].fraction == 0.0 and events[-1].eta is None
+
+    for _ in range(5):
+        time.sleep(0.01)
+        progress.advance()
+    # Pașii intermediari nu generează notificări (min_interval mare)
+    assert len(events) == 1
+    info = progress.info()
+    assert info.fraction == 0.5 and info.rate > 0
+    assert 0 < info.eta < 5 * 1.0
+    assert "Upscale: 5/10 tiles" in info.text and "ETA" in info.text
+
+    progress.finish()
+    # Ultimul pas este notificat întotdeauna
+    assert events[-1].fraction == 1.0 and events[-1].eta == 0
+    print("   ✅ Viteză, ETA și limitare corecte")
+
+
+def test_indeterminate_and_text():
+    """Fără total, progresul este nedeterminat"""
+    print("🧪 TESTARE PROGRES NEDETERMINAT")
+    events = []
+    ProgressReporter(events.append, stage="Image Recognition").start()
+    assert events[-1].fraction is None and events[-1].text == "Image Recognition"
+    assert ProgressInfo("Fill", 0.5, 1, 2, "steps", 0.25, 65).text == "Fill: 1/2 steps · 4.0 s/steps · ETA 1:05"
+    assert format_duration(3725) == "1:02:05"
+    print("   ✅ Progres nedeterminat corect")
+
+
+def test_child_spans():
+    """O sub-etapă avansează bara doar în intervalul ei"""
+    print("🧪 TESTARE SUB-ETAPE")
+    events = []
+    parent = ProgressReporter(events.append, stage="Fill", min_interval=0)
+    child = parent.child(0.5, 1.0)
+    child.start(total=4)
+    child.update(2)
+    assert abs(events[-1].fraction - 0.75) < 1e-9
+    grandchild = child.child(0.5, 1.0)
+    grandchild.start(total=2)
+    grandchild.update(1)
+    assert abs(events[-1].fraction - 0.875) < 1e-9
+    print("   ✅ Sub-etape corecte")
+
+
+def test_check_cancels():
+    """check() este apelat la fiecare pas și poate opri operația"""
+    print("🧪 TESTARE ANULARE PRIN PROGRES")
+    cancelled = {"value": False}
+
+    def check():
+        if cancelled["value"]:
+            raise JobCancelled()
+
+    progress = ProgressReporter(lambda info: None, check=check)
+    progress.start(total=3)
+    progress.advance()
+    cancelled["value"] = True
+    try:
+        progress.advance()
+        assert False, "Operația trebuia anulată"
+    except JobCancelled:
+        pass
+    print("   ✅ Anulare corectă")
+
+
+def test_diffusers_callbacks():
+    """Callback-urile diffusers raportează pașii de denoising"""
+    print("🧪 TESTARE CALLBACK-URI DIFFUSERS")
+    events = []
+
+    class Pipeline:
+        num_timesteps = 20
+
+    progress = ProgressReporter(events.append, stage="Generative Fill", min_interval=0)
+    progress.start()
+    kwargs = {"latents": "x"}
+    assert progress.diffusers_step_end(Pipeline(), 4, 801, kwargs) is kwargs
+    assert events[-1].done == 5 and events[-1].total == 20 and events[-1].fraction == 0.25
+    progress.diffusers_legacy_callback(19, 1, None)
+    assert events[-1].fraction == 1.0
+    print("   ✅ Callback-uri diffusers corecte")
+
+
+def test_accepts_keyword_and_regions():
+    """Funcțiile care acceptă `progress` primesc câte o sub-etapă pe zonă"""
+    print("🧪 TESTARE PROGRES PE ZONE")
+    assert accepts_keyword(lambda image, progress=None: image, "progress")
+    assert accepts_keyword(lambda image, **kwargs: image, "progress")
+    assert not accepts_keyword(lambda image: image, "progress")
+    assert not accepts_keyword(len, "progress")
+
+    image = Image.new("RGB", (400, 200), (10, 20, 30))
+    mask = np.zeros((200, 400), dtype=bool)
+    mask[20:40, 20:40] = True
+    mask[150:180, 350:380] = True
+    events = []
+
+    def fill(region, progress=None):
+        progress.start(total=10)
+        for _ in range(10):
+            progress.advance()
+        return region
+
+    progress = ProgressReporter(events.append, stage="Generative Fill", min_interval=0)
+    fill_masked_regions(image, mask, fill, native=64, margin=8, progress=progress)
+    fractions = [info.fraction for info in events if info.fraction is not None]
+    assert fractions == sorted(fractions) and fractions[-1] == 1.0
+    assert any("region 2/2" in info.text for info in events)
+    print("   ✅ Progres pe zone corect")
+
+
+def test_bridge_runs_calls_on_tk_thread():
+    """Funcțiile puse în coadă de pe alte thread-uri rulează în bucla Tk, în ordine"""
+    print("🧪 TESTARE APELURI PE THREAD-UL TK")
+
+    class FakeRoot:
+        def __init__(self):
+            self.pending = []
+
+        def after(self, delay, func):
+            self.pending.append(func)
+
+    class FakeBar:
+        def set(self, value):
+            self.value = value
+
+    root = FakeRoot()
+    bridge = TkProgressBridge(root, FakeBar())
+    bridge.start()
+    calls = []
+    worker = threading.Thread(target=lambda: [bridge.call(lambda i: calls.append((i, threading.get_ident())), i)
+                                              for i in range(3)])
+    worker.start()
+    worker.join()
+    assert calls == []
+    bridge.call(lambda: 1 / 0)  # O eroare nu oprește preluarea
+    root.pending.pop(0)()
+    assert [i for i, _ in calls] == [0, 1, 2]
+    assert all(thread == threading.get_ident() for _, thread in calls)
+    assert len(root.pending) == 1
+
+    # O eroare a barei de progres nu pierde apelurile din coadă și nu oprește preluarea
+    class BrokenBar:
+        def set(self, value):
+            raise RuntimeError("widget indisponibil")
+
+    root = FakeRoot()
+    bridge = TkProgressBridge(root, BrokenBar())
+    bridge.start()
+    bridge.post(ProgressInfo("Upscale", 0.5))
+    bridge.call(calls.append, "aplicat")
+    root.pending.pop(0)()
+    assert calls[-1] == "aplicat" and len(root.pending) == 1
+    print("   ✅ Apeluri pe thread-ul Tk corecte")
+
+
+def test_concurrent_advance():
+    """Incrementele de pe mai multe thread-uri nu se pierd"""
+    print("🧪 TESTARE AVANSARE CONCURENTĂ")
+    progress = ProgressReporter(lambda info: None, min_interval=0)
+    progress.start(total=8000, unit="tiles")
+    workers = [threading.Thread(target=lambda: [progress.advance() for _ in range(1000)]) for _ in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert progress.done == 8000
+    print("   ✅ Avansare concurentă corectă")
+
+
+if __name__ == "__main__":
+    test_rate_eta_and_throttling()
+    test_indeterminate_and_text()
+    test_child_spans()
+    test_check_cancels()
+    test_diffusers_callbacks()
+    test_accepts_keyword_and_regions()
+    test_bridge_runs_calls_on_tk_thread()
+    test_concurrent_advance()
+    print("✅ Toate testele au trecut!")
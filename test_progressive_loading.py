@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test pentru încărcarea progresivă (draft JPEG + decodare completă în fundal)
+"""
+
+import sys
+import os
+import tempfile
+import time
+from PIL import Image, ImageDraw
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.image_loader import ProgressiveImageLoader
+
+
+def create_test_file(suffix, width=3000, height=2000):
+    """Creează un fișier imagine temporar"""
+    image = Image.new('RGB', (width, height), (40, 80, 120))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([500, 500, 1500, 1500], fill=(255, 0, 0))
+    path = os.path.join(tempfile.mkdtemp(), f"test{suffix}")
+    image.save(path)
+    return path
+
+
+def test_jpeg_preview_uses_draft():
+    """Previzualizarea JPEG este mică și cere o decodare completă ulterioară"""
+    print("🧪 TESTARE PREVIZUALIZARE DRAFT JPEG")
+    loader = ProgressiveImageLoader()
+    path = create_test_file(".jpg")
+
+    start = time.time()
+    preview, is_preview = loader.open_preview(path, max_size=(600, 400))
+    print(f"   Previzualizare: {preview.size} în {(time.time() - start) * 1000:.1f} ms")
+
+    assert is_preview
+    assert preview.width <= 600 and preview.height <= 400
+
+    full = loader.load_full_async(path).result(timeout=30)
+    print(f"   Imagine completă: {full.size}, format {full.format}")
+    assert full.size == (3000, 2000)
+    assert full.format == "JPEG"
+    loader.shutdown()
+
+
+def test_png_single_phase():
+    """Formatele fără draft sunt decodate complet într-o singură fază"""
+    print("🧪 TESTARE ÎNCĂRCARE PNG")
+    loader = ProgressiveImageLoader()
+    path = create_test_file(".png", 800, 600)
+
+    image, is_preview = loader.open_preview(path, max_size=(600, 400))
+    print(f"   Imagine: {image.size}, previzualizare: {is_preview}")
+    assert not is_preview
+    assert image.size == (800, 600)
+    loader.shutdown()
+
+
+if __name__ == "__main__":
+    test_jpeg_preview_uses_draft()
+    test_png_single_phase()
+    print("✅ Toate testele au trecut!")
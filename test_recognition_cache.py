@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test pentru cache-ul persistent al recunoașterii imaginilor
+"""
+
+import sys
+import os
+import tempfile
+import numpy as np
+from PIL import Image
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.recognition_cache import RecognitionCache, run_recognition
+
+
+class FakeRecognizer:
+    """Model fals care numără apelurile"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def analyze(self, image):
+        self.calls += 1
+        return {
+            "caption": "a red square",
+            "labels": {"square": 0.9, "circle": 0.1},
+            "embedding": np.linspace(-1, 1, 512),
+        }
+
+
+class TextOnlyRecognizer:
+    """Model care oferă doar descrierea text"""
+
+    def recognize(self, image):
+        return "a photo"
+
+
+def test_structured_results():
+    """Se păstrează descrierea, scorurile și embedding-ul"""
+    print("🧪 TESTARE REZULTATE STRUCTURATE")
+    image = Image.new("RGB", (64, 64), (255, 0, 0))
+    result = run_recognition(FakeRecognizer(), image)
+    assert result["description"].startswith("a red square")
+    assert "square: 90.0%" in result["description"]
+    assert result["embedding"].shape == (512,)
+
+    plain = run_recognition(TextOnlyRecognizer(), image)
+    assert plain["description"] == "a photo" and plain["embedding"] is None
+
+
+def test_cache_shared_across_sessions():
+    """O sesiune nouă regăsește rezultatul fără a rula modelul"""
+    print("🧪 TESTARE CACHE ÎNTRE SESIUNI")
+    cache_dir = tempfile.mkdtemp()
+    image = Image.new("RGB", (64, 64), (255, 0, 0))
+    recognizer = FakeRecognizer()
+
+    cache = RecognitionCache("blip+clip:v1", cache_dir=cache_dir)
+    assert cache.lookup(image) is None
+    first = cache.recognize(recognizer, image)
+    cache.recognize(recognizer, image.copy())
+    assert recognizer.calls == 1
+
+    reopened = RecognitionCache("blip+clip:v1", cache_dir=cache_dir)
+    restored = reopened.lookup(image)
+    assert restored["description"] == first["description"]
+    assert restored["labels"] == first["labels"]
+    # Embedding-ul este stocat compact, în float16
+    assert restored["embedding"].dtype == np.float16
+    assert np.allclose(restored["embedding"], first["embedding"], atol=1e-3)
+
+    # O versiune nouă a modelului nu folosește rezultatele vechi
+    assert RecognitionCache("blip+clip:v2", cache_dir=cache_dir).lookup(image) is None
+
+    # Versiunea dată ca funcție este evaluată la fiecare cheie (ex: comutarea modului INT8)
+    mode = ["blip+clip:v1"]
+    switching = RecognitionCache(lambda: mode[0], cache_dir=cache_dir)
+    assert switching.lookup(image)["description"] == first["description"]
+    mode[0] = "blip+clip:v1:int8"
+    assert switching.lookup(image) is None
+    print(f"   Statistici: {reopened.stats()}")
+
+
+if __name__ == "__main__":
+    test_structured_results()
+    test_cache_shared_across_sessions()
+    print("✅ Toate testele au trecut!")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test pentru cache-ul rezultatelor AI (măști de fundal)
+"""
+
+import sys
+import os
+import tempfile
+import time
+import numpy as np
+from PIL import Image
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.result_cache import ResultCache, image_content_hash, encode_png, decode_image
+
+
+def create_mask(seed, size=(200, 150)):
+    """Creează o mască de test"""
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 256, (size[1], size[0]), dtype=np.uint8))
+
+
+def test_content_hash():
+    """Hash-ul depinde doar de pixeli, mod și dimensiune"""
+    print("🧪 TESTARE HASH CONȚINUT")
+    image = create_mask(1).convert("RGB")
+    assert image_content_hash(image) == image_content_hash(image.copy())
+    changed = image.copy()
+    changed.putpixel((0, 0), (1, 2, 3))
+    assert image_content_hash(image) != image_content_hash(changed)
+    assert image_content_hash(image) != image_content_hash(image.convert("RGBA"))
+
+
+def test_memory_and_disk_hits():
+    """Rezultatele se regăsesc din memorie și, într-o sesiune nouă, de pe disc"""
+    print("🧪 TESTARE CACHE MEMORIE + DISC")
+    cache_dir = tempfile.mkdtemp()
+    cache = ResultCache("masks", encode_png, decode_image, memory_items=2, cache_dir=cache_dir)
+    mask = create_mask(2)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return mask
+
+    assert cache.get_or_compute("a", compute) is mask
+    start = time.time()
+    assert cache.get_or_compute("a", compute) is mask
+    assert (time.time() - start) < 0.05
+    assert len(calls) == 1
+
+    # O sesiune nouă citește de pe disc
+    reopened = ResultCache("masks", encode_png, decode_image, cache_dir=cache_dir)
+    restored = reopened.get("a")
+    assert np.array_equal(np.array(restored), np.array(mask))
+    assert reopened.get("b") is None
+    stats = reopened.stats()
+    assert stats["disk_hits"] == 1 and stats["misses"] == 1 and stats["hit_rate"] == 0.5
+    assert cache.stats()["memory_hits"] == 1
+    print(f"   Statistici: {stats}")
+
+
+def test_bounded_sizes():
+    """Memoria și discul sunt limitate; se elimină elementele folosite cel mai demult"""
+    print("🧪 TESTARE LIMITE CACHE")
+    cache_dir = tempfile.mkdtemp()
+    entry_size = len(encode_png(create_mask(0)))
+    cache = ResultCache("masks", encode_png, decode_image, memory_items=2,
+                        disk_limit_mb=2.5 * entry_size / (1024 * 1024), cache_dir=cache_dir)
+    for index in range(4):
+        cache.put(f"k{index}", create_mask(index))
+        # Timpii de modificare diferiți stabilesc ordinea LRU pe disc
+        os.utime(cache._path(f"k{index}"), (index, index))
+    assert cache.stats()["memory_items"] == 2
+    assert cache.disk_usage() <= cache.disk_limit_bytes
+    assert not cache._path("k0").exists() and cache._path("k3").exists()
+    cache.clear()
+    assert cache.disk_usage() == 0
+
+
+if __name__ == "__main__":
+    test_content_hash()
+    test_memory_and_disk_hits()
+    test_bounded_sizes()
+    print("✅ Toate testele au trecut!")
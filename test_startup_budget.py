@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test pentru timpul de pornire (importuri leneșe, buget de import, prima fereastră)
+"""
+
+import sys
+import os
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.lazy_imports import lazy_import
+from src.utils.startup_profiler import (parse_importtime, top_imports, total_import_ms,
+                                        profile_imports, measure_first_window)
+
+# Bugete generoase (mașini de CI lente); pornirea măsurată local este ~0.2 s pentru import
+IMPORT_BUDGET_MS = 1500
+FIRST_WINDOW_BUDGET_S = 4.0
+
+
+def test_lazy_module():
+    """Modulul este importat abia la primul acces la un atribut"""
+    print("🧪 TESTARE IMPORT LENEȘ")
+    module = lazy_import("json")
+    assert not module.is_loaded and "not loaded" in repr(module)
+    assert module.dumps([1]) == "[1]"
+    assert module.is_loaded and "loads" in dir(module)
+    print("   ✅ Import leneș corect")
+
+
+def test_parse_importtime():
+    """Ieșirea -X importtime este interpretată pe niveluri"""
+    print("🧪 TESTARE INTERPRETARE IMPORTTIME")
+    text = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |   _io\n"
+        "import time:       250 |        350 | io\n"
+        "import time:      2000 |       2000 | src.utils\n"
+    )
+    entries = parse_importtime(text)
+    assert [entry["module"] for entry in entries] == ["_io", "io", "src.utils"]
+    assert [entry["depth"] for entry in entries] == [1, 0, 0]
+    assert total_import_ms(entries) == 2.35
+    assert top_imports(entries, 1)[0]["module"] == "src.utils"
+    print("   ✅ Interpretare corectă")
+
+
+def test_import_budget():
+    """Interfața se importă în buget, fără dependențele grele"""
+    print("🧪 TESTARE BUGET DE IMPORT")
+    profile = profile_imports("src.ui.main_window")
+    assert profile["loaded"] == [], f"Importate la pornire: {profile['loaded']}"
+    assert profile["total_ms"] < IMPORT_BUDGET_MS, f"Import prea lent: {profile['total_ms']:.0f} ms"
+    print(f"   ✅ Import în {profile['total_ms']:.0f} ms")
+
+
+def test_first_window_budget():
+    """Prima fereastră apare în buget (necesită un display)"""
+    print("🧪 TESTARE PRIMA FEREASTRĂ")
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        print("   ⚠️ Niciun display disponibil - test omis")
+        return
+    window = measure_first_window()
+    assert window is not None, "Aplicația nu a ajuns la prima fereastră"
+    assert window["loaded"] == [], f"Importate înainte de fereastră: {window['loaded']}"
+    assert window["seconds"] < FIRST_WINDOW_BUDGET_S, f"Pornire prea lentă: {window['seconds']:.2f} s"
+    print(f"   ✅ Prima fereastră în {window['seconds']:.2f} s")
+
+
+if __name__ == "__main__":
+    test_lazy_module()
+    test_parse_importtime()
+    test_import_budget()
+    test_first_window_budget()
+    print("✅ Toate testele au trecut!")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test pentru procesarea out-of-core pe tile-uri (TiledDocument / TiledPipeline)
+"""
+
+import sys
+import os
+import struct
+import tempfile
+import zlib
+from unittest import mock
+import numpy as np
+from PIL import Image, ImageDraw, TiffImagePlugin
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.image_processor import ImageProcessor
+from src.utils import tiled_document
+from src.utils.tiled_document import TiledDocument, TiledPipeline, percentile_from_histogram
+
+
+def create_test_image(width=900, height=700):
+    """Creează o imagine de test cu zgomot și o formă"""
+    rng = np.random.default_rng(0)
+    array = (rng.random((height, width, 3)) * 120 + 40).astype(np.uint8)
+    image = Image.fromarray(array)
+    draw = ImageDraw.Draw(image)
+    draw.ellipse([100, 100, 600, 500], fill=(250, 30, 30))
+    return image
+
+
+def write_tiled_tiff(path, image, tile=64):
+    """Scrie un TIFF RGB pe tile-uri, comprimat Deflate (PIL nu poate scrie tile-uri)"""
+    array = np.array(image)
+    across, down = -(-image.width // tile), -(-image.height // tile)
+    padded = np.zeros((down * tile, across * tile, 3), dtype=np.uint8)
+    padded[:image.height, :image.width] = array
+    chunks = [zlib.compress(padded[r * tile:(r + 1) * tile, c * tile:(c + 1) * tile].tobytes())
+              for r in range(down) for c in range(across)]
+    ifd = TiffImagePlugin.ImageFileDirectory_v2(prefix=b"II")
+    for tag, value in ((256, image.width), (257, image.height), (258, (8, 8, 8)), (259, 8), (262, 2),
+                       (277, 3), (284, 1), (322, tile), (323, tile)):
+        ifd[tag] = value
+    ifd[325] = tuple(len(chunk) for chunk in chunks)
+    ifd.tagtype[325] = 4
+    ifd[324] = (0,) * len(chunks)
+    ifd.tagtype[324] = 4
+    start = 8 + len(ifd.tobytes(8))
+    ifd[324] = tuple(start + sum(len(chunk) for chunk in chunks[:i]) for i in range(len(chunks)))
+    with open(path, "wb") as f:
+        f.write(b"II*\x00" + struct.pack("<I", 8) + ifd.tobytes(8) + b"".join(chunks))
+
+
+def test_percentile_from_histogram():
+    """Percentilele din histogramă sunt identice cu np.percentile"""
+    print("🧪 TESTARE PERCENTILE DIN HISTOGRAMĂ")
+    values = np.random.default_rng(1).integers(0, 256, 10001).astype(np.uint8)
+    histogram = np.bincount(values, minlength=256)
+    for q in (1, 50, 99):
+        assert abs(percentile_from_histogram(histogram, q) - np.percentile(values, q)) < 1e-9
+    print("   ✅ Percentile corecte")
+
+
+def test_pipeline_matches_in_memory():
+    """Pipeline-ul pe tile-uri dă același rezultat ca procesarea în memorie"""
+    print("🧪 TESTARE PIPELINE PE TILE-URI")
+    processor = ImageProcessor()
+    image = create_test_image()
+    expected = processor.apply_sepia(processor.auto_enhance(
+        processor.apply_blur(processor.enhance_brightness(image, 1.3), 2)))
+
+    work_dir = tempfile.mkdtemp()
+    for name in ("input.tif", "input.png"):
+        path = os.path.join(work_dir, name)
+        image.save(path)
+        with TiledDocument.open(path, tile_size=128, scratch_dir=work_dir) as document:
+            pipeline = TiledPipeline(processor)
+            pipeline.add("brightness", factor=1.3).add("blur", radius=2).add("auto_enhance").add("sepia")
+            with pipeline.run(document) as result:
+                pixels = result.read_region((0, 0, result.width, result.height))
+                print(f"   {name}: {type(document._source).__name__}")
+                assert np.array_equal(pixels, np.array(expected))
+
+
+def test_export_in_strips():
+    """Exportul TIFF/PNG pe benzi poate fi citit de PIL"""
+    print("🧪 TESTARE EXPORT PE BENZI")
+    work_dir = tempfile.mkdtemp()
+    image = create_test_image(333, 257).convert("RGBA")
+    path = os.path.join(work_dir, "input.tif")
+    image.save(path)
+    with TiledDocument.open(path, tile_size=100, scratch_dir=work_dir) as document:
+        for name in ("out.tif", "out.png"):
+            out_path = os.path.join(work_dir, name)
+            assert document.save(out_path, strip_height=64)
+            with Image.open(out_path) as saved:
+                assert saved.mode == "RGBA"
+                assert np.array_equal(np.array(saved), np.array(image))
+            print(f"   ✅ {name} exportat corect")
+
+
+def test_compressed_tiff_in_bands():
+    """TIFF-urile comprimate (benzi sau tile-uri) sunt decodate bandă cu bandă, nu întregi"""
+    print("🧪 TESTARE TIFF COMPRIMAT PE BENZI")
+    work_dir = tempfile.mkdtemp()
+    image = create_test_image(333, 257)
+    image.save(os.path.join(work_dir, "lzw.tif"), compression="tiff_lzw")
+    image.convert("RGBA").save(os.path.join(work_dir, "deflate_rgba.tif"), compression="tiff_adobe_deflate")
+    write_tiled_tiff(os.path.join(work_dir, "tiles.tif"), image)
+
+    band_rows = []
+    band_tiff = tiled_document._band_tiff
+
+    def recording_band_tiff(tags, fp, width, rows, first, count):
+        band_rows.append(rows)
+        return band_tiff(tags, fp, width, rows, first, count)
+
+    for name in ("lzw.tif", "deflate_rgba.tif", "tiles.tif"):
+        path = os.path.join(work_dir, name)
+        band_rows.clear()
+        with mock.patch.object(tiled_document, "_band_tiff", recording_band_tiff), \
+                mock.patch.object(TiledDocument, "_decode_to_scratch", side_effect=AssertionError("decodare întreagă")):
+            with TiledDocument.open(path, tile_size=64, scratch_dir=work_dir, max_decode_pixels=1000) as document:
+                with Image.open(path) as expected:
+                    assert np.array_equal(document.read_region((0, 0, 333, 257)), np.array(expected))
+                    chunk_rows = expected.tag_v2.get(323) or expected.tag_v2.get(278)
+        # O bandă are cel mult înălțimea tile-ului (sau o singură bandă TIFF, dacă este mai mare)
+        assert sum(band_rows) == 257 and max(band_rows) <= max(64, chunk_rows) < 257
+        print(f"   ✅ {name}: {len(band_rows)} benzi")
+
+
+def test_decode_budget_and_global_limit():
+    """Limita anti "decompression bomb" a PIL rămâne neschimbată; PNG-urile peste buget sunt refuzate"""
+    print("🧪 TESTARE LIMITĂ DE DECODARE")
+    work_dir = tempfile.mkdtemp()
+    image = create_test_image(300, 200)
+    for name in ("input.tif", "input.png"):
+        image.save(os.path.join(work_dir, name))
+
+    limit = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = 1000  # Mai mică decât imaginea: TiledDocument nu depinde de ea
+    try:
+        with TiledDocument.open(os.path.join(work_dir, "input.tif"), scratch_dir=work_dir,
+                                max_decode_pixels=1000) as document:
+            # TIFF necomprimat: citit direct din fișier, fără decodare în memorie
+            assert type(document._source).__name__ == "_RawFileSource"
+        try:
+            TiledDocument.open(os.path.join(work_dir, "input.png"), scratch_dir=work_dir, max_decode_pixels=1000)
+            assert False, "PNG-ul peste buget trebuia refuzat"
+        except ValueError:
+            pass
+        assert Image.MAX_IMAGE_PIXELS == 1000
+    finally:
+        Image.MAX_IMAGE_PIXELS = limit
+    with TiledDocument.open(os.path.join(work_dir, "input.png"), scratch_dir=work_dir) as document:
+        assert np.array_equal(document.read_region((0, 0, 300, 200)), np.array(image))
+    print("   ✅ Limite corecte")
+
+
+if __name__ == "__main__":
+    test_percentile_from_histogram()
+    test_pipeline_matches_in_memory()
+    test_export_in_strips()
+    test_compressed_tiff_in_bands()
+    test_decode_budget_and_global_limit()
+    print("✅ Toate testele au trecut!")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test pentru mărirea imaginilor pe plăci cu suprapunere
+"""
+
+import sys
+import os
+import threading
+import numpy as np
+from PIL import Image
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.tiled_upscaler import TiledUpscaler, feather_ramp, tile_starts
+
+
+def nearest_upscale_x2(image):
+    """Upscaler fals, determinist: fiecare pixel devine un bloc 2x2"""
+    return image.resize((image.width * 2, image.height * 2), Image.Resampling.NEAREST)
+
+
+def create_test_image(width=500, height=330):
+    """Creează o imagine de test cu zgomot (orice cusătură ar fi vizibilă)"""
+    rng = np.random.default_rng(3)
+    return Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8))
+
+
+def test_tile_layout():
+    """Plăcile acoperă toată imaginea și au dimensiune completă"""
+    print("🧪 TESTARE AȘEZARE PLĂCI")
+    assert tile_starts(100, 128, 16) == [0]
+    starts = tile_starts(500, 128, 16)
+    assert starts[0] == 0 and starts[-1] == 500 - 128
+    assert all(b - a <= 128 - 16 for a, b in zip(starts, starts[1:]))
+    weights = feather_ramp(64, 16, 0)
+    assert weights[0] > 0 and weights[-1] == 1.0 and np.all(np.diff(weights) >= 0)
+
+
+def test_tiled_matches_whole_image():
+    """Rezultatul pe plăci este identic cu mărirea întregii imagini"""
+    print("🧪 TESTARE UPSCALE PE PLĂCI")
+    image = create_test_image()
+    tiles = []
+    lock = threading.Lock()
+
+    def recording_upscale(tile):
+        with lock:
+            tiles.append(tile.size)
+        return nearest_upscale_x2(tile)
+
+    progress = []
+    upscaler = TiledUpscaler(recording_upscale, tile_size=128, overlap=16, max_workers=4)
+    result = upscaler.upscale(image, progress_callback=lambda done, total: progress.append((done, total)))
+
+    expected = nearest_upscale_x2(image)
+    assert result.size == expected.size
+    assert np.array_equal(np.array(result), np.array(expected))
+    # Fiecare apel al modelului primește doar o placă
+    assert all(size == (128, 128) for size in tiles)
+    assert len(progress) == len(tiles) and progress[-1][0] == progress[-1][1]
+    print(f"   ✅ {len(tiles)} plăci, rezultat {result.size}")
+
+
+def test_feathered_seams():
+    """Cu un model care diferă între plăci, îmbinarea este graduală"""
+    print("🧪 TESTARE ÎMBINARE GRADUALĂ")
+    image = Image.new("RGB", (300, 100), (100, 100, 100))
+    brightness = iter(range(0, 1000, 40))
+    lock = threading.Lock()
+
+    def inconsistent_upscale(tile):
+        with lock:
+            offset = next(brightness)
+        upscaled = nearest_upscale_x2(tile)
+        return Image.fromarray(np.clip(np.array(upscaled).astype(int) + offset % 120, 0, 255).astype(np.uint8))
+
+    result = TiledUpscaler(inconsistent_upscale, tile_size=128, overlap=32, max_workers=1).upscale(image)
+    row = np.array(result)[50, :, 0].astype(int)
+    # Fără feathering, treptele dintre plăci ar fi de zeci de niveluri
+    assert np.abs(np.diff(row)).max() <= 5
+
+
+def test_alpha_and_small_images():
+    """Canalul alpha este păstrat, iar imaginile mici folosesc o singură placă"""
+    print("🧪 TESTARE ALPHA ȘI IMAGINI MICI")
+    image = create_test_image(60, 40).convert("RGBA")
+    image.putalpha(128)
+    result = TiledUpscaler(nearest_upscale_x2, tile_size=128, overlap=16).upscale(image)
+    assert result.mode == "RGBA" and result.size == (120, 80)
+    assert np.array(result)[:, :, 3].min() == 128
+
+
+if __name__ == "__main__":
+    test_tile_layout()
+    test_tiled_matches_whole_image()
+    test_feathered_seams()
+    test_alpha_and_small_images()
+    print("✅ Toate testele au trecut!")
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test pentru încărcarea ponderilor mapate în memorie (arhivă brută, copy-on-write, măsurare)
+"""
+
+import sys
+import os
+import tempfile
+import types
+from unittest import mock
+
+import numpy as np
+
+# Adaugă calea către src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.utils.lazy_models import LazyModel
+from src.utils.model_manager import MODEL_WEIGHTS, ModelManager
+from src.utils.weight_store import (save_weights, load_weights, read_header, measure_load,
+                                    extract_state_dict, ALIGNMENT)
+
+
+def make_weights():
+    rng = np.random.default_rng(0)
+    return {
+        "conv.weight": rng.standard_normal((8, 3, 3, 3), dtype=np.float32),
+        "conv.bias": rng.standard_normal(8, dtype=np.float32),
+        "embedding": rng.standard_normal((5, 7)).astype(np.float16),
+        "steps": np.arange(3, dtype=np.int64),
+        "empty": np.zeros((0, 4), dtype=np.float32),
+    }
+
+
+def test_roundtrip_and_alignment():
+    """Ponderile citite sunt identice, aliniate și nu sunt copiate în memorie"""
+    print("🧪 TESTARE ARHIVĂ DE PONDERI")
+    weights = make_weights()
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "model.weights")
+        save_weights(weights, path)
+        assert os.listdir(folder) == ["model.weights"]
+
+        entries, data_start = read_header(path)
+        assert data_start % ALIGNMENT == 0
+        assert all(entry["offset"] % ALIGNMENT == 0 for entry in entries.values())
+
+        loaded = load_weights(path, as_torch=False)
+        assert set(loaded) == set(weights)
+        for name, array in weights.items():
+            assert loaded[name].dtype == array.dtype and loaded[name].shape == array.shape
+            assert np.array_equal(loaded[name], array)
+
+        # Vederi peste fișierul mapat, nu copii
+        base = loaded["conv.weight"]
+        while getattr(base, "base", None) is not None:
+            base = base.base
+        assert "mmap" in type(base).__name__.lower()
+
+        # Copy-on-write: modificarea unui tensor nu schimbă fișierul
+        loaded["conv.bias"][:] = 0
+        assert np.array_equal(load_weights(path, as_torch=False)["conv.bias"], weights["conv.bias"])
+    print("   ✅ Arhivă corectă")
+
+
+def test_invalid_file():
+    """Un fișier care nu este arhivă de ponderi este respins"""
+    print("🧪 TESTARE FIȘIER INVALID")
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "model.weights")
+        with open(path, "wb") as f:
+            f.write(b"not a weights archive")
+        try:
+            load_weights(path, as_torch=False)
+            assert False, "Fișierul trebuia respins"
+        except ValueError:
+            pass
+    print("   ✅ Fișier invalid respins")
+
+
+def test_measure_load_and_state_dict():
+    """Măsurarea încărcării și extragerea ponderilor din checkpoint"""
+    print("🧪 TESTARE MĂSURARE ÎNCĂRCARE")
+    stats = measure_load(lambda: np.ones(8 * 1024 * 1024, dtype=np.uint8))
+    assert stats["seconds"] >= 0 and stats["result"].nbytes == 8 * 1024 * 1024
+    assert stats["rss_peak_mb"] >= max(stats["rss_before_mb"], stats["rss_after_mb"])
+
+    weights = {"a": np.zeros(1)}
+    assert extract_state_dict({"params_ema": weights, "params": {}}) is weights
+    assert extract_state_dict(weights) is weights
+    print("   ✅ Măsurare corectă")
+
+
+class FakeModule:
+    """Modul PyTorch fals: ponderile sunt doar înregistrate la load_state_dict."""
+
+    def __init__(self, names):
+        self.names = names
+        self.assigned = None
+
+    def parameters(self):
+        return iter(())
+
+    def named_modules(self):
+        return iter(())
+
+    def state_dict(self):
+        return dict.fromkeys(self.names)
+
+    def load_state_dict(self, tensors, strict=True, assign=False):
+        self.assigned = (tensors, assign)
+
+
+class MappedUpscaler:
+    """Model care își construiește rețeaua din ponderile primite."""
+
+    def __init__(self, weights=None):
+        self.net = FakeModule(list(weights or ()))
+        self.net.load_state_dict(weights, assign=True)
+
+
+class LegacyUpscaler:
+    """Model care citește singur checkpoint-ul."""
+
+    def __init__(self):
+        self.net = FakeModule(["conv.weight", "conv.bias"])
+
+
+def test_models_receive_mapped_weights():
+    """Modelele cu checkpoint gestionat sunt construite (sau trecute) pe ponderile mapate"""
+    print("🧪 TESTARE PONDERI MAPATE LA CONSTRUIRE")
+    tensors = {"conv.weight": np.zeros((8, 3, 3, 3), np.float32), "conv.bias": np.zeros(8, np.float32)}
+    module = types.ModuleType("fake_upscaler_models")
+    module.MappedUpscaler, module.LegacyUpscaler = MappedUpscaler, LegacyUpscaler
+    manager = ModelManager()
+    MODEL_WEIGHTS["Fake Upscaler"] = "upscaler"
+    try:
+        with mock.patch.dict(sys.modules, {"fake_upscaler_models": module}), \
+                mock.patch.object(manager, "get_model_path", return_value="RealESRGAN_x4plus.pth"), \
+                mock.patch.object(manager, "load_model_weights", return_value=tensors) as loaded:
+            def lazy(class_name):
+                return LazyModel("Fake Upscaler", "fake_upscaler_models", class_name,
+                                 post_load=lambda proxy, instance: manager.map_loaded_weights(
+                                     proxy.display_name, instance),
+                                 constructor_kwargs=lambda proxy, model_class: manager.constructor_weights(
+                                     proxy.display_name, model_class))
+
+            mapped = lazy("MappedUpscaler").get()
+            assert mapped.net.assigned == (tensors, True) and loaded.call_count == 1
+
+            legacy = lazy("LegacyUpscaler").get()
+            assert legacy.net.assigned == (tensors, True) and loaded.call_count == 2
+
+            # Modelele fără checkpoint gestionat nu sunt atinse
+            assert manager.constructor_weights("Recognition", MappedUpscaler) == {}
+            assert loaded.call_count == 2
+    finally:
+        del MODEL_WEIGHTS["Fake Upscaler"]
+    print("   ✅ Ponderi mapate folosite la construire")
+
+
+if __name__ == "__main__":
+    test_roundtrip_and_alignment()
+    test_invalid_file()
+    test_measure_load_and_state_dict()
+    test_models_receive_mapped_weights()
+    print("✅ Toate testele au trecut!")